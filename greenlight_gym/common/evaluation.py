@@ -7,6 +7,8 @@ import gymnasium as gym
 from stable_baselines3.common import type_aliases
 from stable_baselines3.common.vec_env import VecMonitor, VecEnv, is_vecenv_wrapped
 
+from greenlight_gym.common.utils import InfoChannel
+
 def evaluate_policy(
     model: "type_aliases.PolicyPredictor",
     env: Union[gym.Env, VecEnv],
@@ -100,6 +102,14 @@ def evaluate_policy(
     current_episode_obs = np.zeros((n_envs, N, env.observation_space.shape[0]))
     current_time_vec = np.zeros((n_envs, N))  # array to save time
 
+    # with a lean info_level the environments do not return the information in their info dicts,
+    # then it is read from a shared-memory side channel to which every environment writes its row
+    info_channel = None
+    if env.get_attr("info_level", indices=0)[0] != "full":
+        info_channel = InfoChannel(n_envs, nu)
+        for i in range(n_envs):
+            env.env_method("set_info_channel", info_channel, i, indices=i)
+
     observations = env.reset()
     states = None
     episode_starts = np.ones((env.num_envs,), dtype=bool)
@@ -119,9 +129,14 @@ def evaluate_policy(
         current_rewards += env.unnormalize_reward(rewards)
         current_lengths += 1
 
-        current_episode_profits[:, timestep] = np.array([info["profit"] for info in infos])
-        current_episode_violations[:, timestep, :] = np.array([info["violations"] for info in infos])
-        current_episode_actions[:, timestep, :] = np.array([info["controls"] for info in infos])
+        if info_channel is None:
+            current_episode_profits[:, timestep] = np.array([info["profit"] for info in infos])
+            current_episode_violations[:, timestep, :] = np.array([info["violations"] for info in infos])
+            current_episode_actions[:, timestep, :] = np.array([info["controls"] for info in infos])
+        else:
+            current_episode_profits[:, timestep] = info_channel.profit
+            current_episode_violations[:, timestep, :] = info_channel.violations
+            current_episode_actions[:, timestep, :] = info_channel.controls
         timestep += 1
 
         for i in range(n_envs):
@@ -178,6 +193,10 @@ def evaluate_policy(
         if render:
             env.render()
 
+    if info_channel is not None:
+        env.env_method("set_info_channel", None)
+        info_channel.close()
+
     mean_reward = np.mean(episode_rewards)
     std_reward = np.std(episode_rewards)
     if reward_threshold is not None:
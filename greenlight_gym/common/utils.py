@@ -1,8 +1,12 @@
+import json
+import heapq
 from scipy.interpolate import PchipInterpolator
 import numpy as np
 import pandas as pd
 from copy import deepcopy
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from multiprocessing import shared_memory
 
 def loadMatlabData(stepSize,date, stateNames):
     matlabStates = pd.read_csv(f"data/matlab/{date}/{stepSize}StepSizeStates.csv", sep=",", header=None)
@@ -16,6 +20,249 @@ def loadMatlabData(stepSize,date, stateNames):
     matlabWeather = pd.read_csv(f"data/matlab/{date}/{stepSize}StepSizeWeather.csv", sep=",", header=None)
     return matlabStates, matlabControls, matlabWeather
 
+class WeatherStore:
+    """
+    Process-level LRU cache with the parsed raw weather data files.
+    Every weather data file (location, source, year) is parsed once into a NumPy array,
+    such that a reset of the environment only has to slice this array instead of reading the csv file.
+    The least recently used years are evicted once the cached arrays exceed the memory cap.
+
+    The array of a year has the columns in WEATHER_COLUMNS:
+        0: time                 time since start of the year [s]
+        1: global radiation     [W m^{-2}]
+        2: air temperature      [deg C]
+        3: RH                   relative humidity [%]
+        4: wind speed           [m s^{-1}]
+        5: sky temperature      [deg C]
+
+    Args:
+        maxBytes    - memory cap of the cached arrays [bytes]
+    """
+    WEATHER_COLUMNS = ["time", "global radiation", "air temperature", "RH", "wind speed", "sky temperature"]
+
+    def __init__(self, maxBytes: int = 256*1024**2) -> None:
+        self.maxBytes = maxBytes
+        self.nBytes = 0
+        self.cache = OrderedDict()
+
+    def get(self, weatherDataDir: str, location: str, source: str, year: int) -> np.ndarray:
+        """
+        Returns the parsed weather data of a single year, reads the csv file if it is not cached.
+        The returned array is shared by all callers and should not be modified.
+        """
+        key = (weatherDataDir, location, source, int(year))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        weatherDataPath = weatherDataDir + location + "/" + source + str(year) + ".csv"
+        rawWeather = pd.read_csv(weatherDataPath, sep=",")
+        data = rawWeather[self.WEATHER_COLUMNS].to_numpy(dtype=np.float64)
+        data.setflags(write=False)
+
+        self.cache[key] = data
+        self.nBytes += data.nbytes
+        # evict least recently used years, but always keep the year we just loaded
+        while self.nBytes > self.maxBytes and len(self.cache) > 1:
+            _, evicted = self.cache.popitem(last=False)
+            self.nBytes -= evicted.nbytes
+        return data
+
+    def set_max_bytes(self, maxBytes: int) -> None:
+        """
+        Sets the memory cap of the cache [bytes], and evicts years if the cap is exceeded.
+        """
+        self.maxBytes = maxBytes
+        while self.nBytes > self.maxBytes and len(self.cache) > 1:
+            _, evicted = self.cache.popitem(last=False)
+            self.nBytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.nBytes = 0
+
+# weather store that is shared by all environments in a process
+WEATHER_STORE = WeatherStore()
+
+class WeatherDataset:
+    """
+    Read-only dataset with the derived disturbances d[0]-d[9] of the seasons of an environment config,
+    resampled to the solver steps. The dataset is created by pre_processing/build_weather_dataset.py,
+    and consists of a .npy file with the stacked seasons and a .json file with the index.
+    The .npy file is memory mapped, such that all processes share one page-cached copy,
+    and loadWeatherData returns zero-copy views of it.
+
+    Every season (location, source, growth year, start day) is stored as loadWeatherData resamples it from the csv files,
+    for the season length, prediction horizon and step size h of the dataset.
+    Hence a view equals the disturbances of the csv path, including seasons that continue in the next year.
+
+    Args:
+        path    - path to the dataset, without the .npy/.json extension
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.data = np.load(path + ".npy", mmap_mode="r")
+        with open(path + ".json", "r") as f:
+            index = json.load(f)
+        self.h = index["h"]
+        self.nDays = index["nDays"]
+        self.predHorizon = index["predHorizon"]
+        self.entries = index["entries"]
+
+    @staticmethod
+    def key(location: str, source: str, growthYear: int, startDay: int) -> str:
+        return location + "/" + source + str(int(growthYear)) + "/" + str(int(startDay))
+
+    def contains(self,
+                 location: str,
+                 source: str,
+                 growthYear: int,
+                 startDay: int,
+                 nDays: int,
+                 predHorizon: int,
+                 h: float) -> bool:
+        return (h, nDays, predHorizon) == (self.h, self.nDays, self.predHorizon) and \
+            self.key(location, source, growthYear, startDay) in self.entries
+
+    def view(self, location: str, source: str, growthYear: int, startDay: int, nd: int) -> np.ndarray:
+        """
+        Returns a read-only view of the disturbances of a season, equal to the array of loadWeatherData.
+        """
+        entry = self.entries[self.key(location, source, growthYear, startDay)]
+        return self.data[entry["offset"]:entry["offset"]+entry["rows"], :nd]
+
+# weather datasets that are opened in this process, shared by all environments
+WEATHER_DATASETS = {}
+
+def openWeatherDataset(path: str) -> WeatherDataset:
+    """
+    Opens the weather dataset at path, or returns it if it is already opened in this process.
+    """
+    if path not in WEATHER_DATASETS:
+        WEATHER_DATASETS[path] = WeatherDataset(path)
+    return WEATHER_DATASETS[path]
+
+class WarmStartLibrary:
+    """
+    Read-only library with spun-up climate and soil states x[0]-x[21] of the GreenLight model, indexed by (growth year, start day).
+    The library is created by pre_processing/build_warm_starts.py, which simulates the days before every start day
+    with the rule-based controller, such that a reset starts from realistic initial conditions
+    instead of the night setpoints of initStates, without simulating a warm-up during the episode.
+    The library is a single .npz file with the arrays years, startDays and states, and the settings of the spin-up.
+
+    Args:
+        path    - path to the .npz file of the library
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with np.load(path) as library:
+            self.states = library["states"]
+            years = library["years"]
+            startDays = library["startDays"]
+            self.spinupDays = float(library["spinupDays"])
+            self.location = str(library["location"])
+            self.source = str(library["source"])
+        self.states.setflags(write=False)
+        self.index = {(int(year), int(startDay)): i for i, (year, startDay) in enumerate(zip(years, startDays))}
+
+    def contains(self, growthYear: int, startDay: int) -> bool:
+        return (int(growthYear), int(startDay)) in self.index
+
+    def get(self, growthYear: int, startDay: int) -> np.ndarray:
+        """
+        Returns the spun-up climate and soil states at the start of the season, shared by all callers.
+        """
+        key = (int(growthYear), int(startDay))
+        if key not in self.index:
+            raise KeyError(f"Warm start library {self.path} has no state for year {key[0]} day {key[1]}, "
+                           "rebuild it with pre_processing/build_warm_starts.py")
+        return self.states[self.index[key]]
+
+# warm start libraries that are opened in this process, shared by all environments
+WARM_START_LIBRARIES = {}
+
+def openWarmStartLibrary(path: str) -> WarmStartLibrary:
+    """
+    Opens the warm start library at path, or returns it if it is already opened in this process.
+    """
+    if path not in WARM_START_LIBRARIES:
+        WARM_START_LIBRARIES[path] = WarmStartLibrary(path)
+    return WARM_START_LIBRARIES[path]
+
+# columns of an InfoChannel, followed by the nu control signals
+INFO_TIME = 0
+INFO_TIMESTEP = 1
+INFO_PROFIT = 2
+INFO_VIOLATIONS = 3
+INFO_CONTROLS = 6
+
+class InfoChannel:
+    """
+    Side channel in shared memory with the information of the last step of N environments,
+    i.e., the time, timestep, profit, violations and control signals that the info dicts hold with info_level full.
+    The evaluation creates the channel, and every environment writes its row at the end of a step,
+    also from the worker processes of SubprocVecEnv, such that the information is not pickled with the info dicts.
+    The channel is pickled by the name of the shared memory block, to which the worker processes attach.
+
+    Args:
+        nEnvs   - number of environments
+        nu      - number of control signals
+        name    - name of an existing channel to attach to, a new channel is created if None
+    """
+    def __init__(self, nEnvs: int, nu: int, name: str = None) -> None:
+        self.nEnvs = nEnvs
+        self.nu = nu
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=nEnvs*(INFO_CONTROLS+nu)*8)
+        self.data = np.ndarray((nEnvs, INFO_CONTROLS+nu), dtype=np.float64, buffer=self.shm.buf)
+        if self.owner:
+            self.data[:] = 0
+
+    def __reduce__(self):
+        return (InfoChannel, (self.nEnvs, self.nu, self.shm.name))
+
+    @property
+    def time(self) -> np.ndarray:
+        return self.data[:, INFO_TIME]
+
+    @property
+    def timestep(self) -> np.ndarray:
+        return self.data[:, INFO_TIMESTEP]
+
+    @property
+    def profit(self) -> np.ndarray:
+        return self.data[:, INFO_PROFIT]
+
+    @property
+    def violations(self) -> np.ndarray:
+        return self.data[:, INFO_VIOLATIONS:INFO_CONTROLS]
+
+    @property
+    def controls(self) -> np.ndarray:
+        return self.data[:, INFO_CONTROLS:]
+
+    def write(self, idx, time, timestep, profit, violations, controls) -> None:
+        """
+        Writes the information of the environment(s) idx, which is an index or an array of indices.
+        """
+        self.data[idx, INFO_TIME] = time
+        self.data[idx, INFO_TIMESTEP] = timestep
+        self.data[idx, INFO_PROFIT] = profit
+        self.data[idx, INFO_VIOLATIONS:INFO_CONTROLS] = violations
+        self.data[idx, INFO_CONTROLS:] = controls
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory block, the owner also removes it. Can be called more than once.
+        """
+        if self.data is None:
+            return
+        # the shared memory can only be closed once the array on its buffer is released
+        self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
 def loadWeatherData(weatherDataDir: str,
                     location: str,
                     source: str,
@@ -24,12 +271,15 @@ def loadWeatherData(weatherDataDir: str,
                     nDays: int,
                     predHorizon: int,
                     h: int,
-                    nd: int) -> np.ndarray:
+                    nd: int,
+                    weatherStore: WeatherStore = None,
+                    weatherDataset: "WeatherDataset" = None) -> np.ndarray:
     """
     Loads in rawweather data from matlab file and converts it to values GreenLight model uses in numpy array.
     If the solver requires data on a higher frequency we interpolate between available weather data.
     Time interval of matlab data usually is 5 minutes.
     The rawweather data is a file with 9 columns, which we convert to 7 columns used by the GreenLight.
+    The raw weather data is obtained from the weather store, which only reads the csv file once per process.
 
     Args:
         weatherDataDir  - path to raw weather data
@@ -38,6 +288,9 @@ def loadWeatherData(weatherDataDir: str,
         Np              - prediction horizon [days]
         h               - sample time of the solver
         nd              - number of weather variables
+        weatherStore    - cache with the parsed weather data, defaults to the process-level WEATHER_STORE
+        weatherDataset  - dataset with the derived disturbances, if it contains the season
+                          an equal read-only view of the dataset is returned instead (see WeatherDataset)
     
     Returns:
         Matrix with following interpolated weather variables:
@@ -52,13 +305,37 @@ def loadWeatherData(weatherDataDir: str,
         d[8]: isDay         Whether it is day or night [0,1]
         d[9]: isDaySmooth   Whether it is day or night [0,1] with a smooth transition
     """
-    weatherDataPath = weatherDataDir + location + "/" + source + str(growthYear) + ".csv"
+    if weatherDataset is not None and weatherDataset.contains(location, source, growthYear, startDay, nDays, predHorizon, h):
+        return weatherDataset.view(location, source, growthYear, startDay, nd)
+
+    # interpolate and resample
+    return loadWeatherInterpolation(weatherDataDir, location, source, growthYear, startDay, nDays, predHorizon, h, nd,
+                                    weatherStore).resample()
+
+def loadWeatherInterpolation(weatherDataDir: str,
+                             location: str,
+                             source: str,
+                             growthYear: int,
+                             startDay: int,
+                             nDays: int,
+                             predHorizon: int,
+                             h: int,
+                             nd: int,
+                             weatherStore: WeatherStore = None) -> "WeatherInterpolation":
+    """
+    Loads in the raw weather data, and computes the PCHIP interpolation of the disturbances without resampling them.
+    The arguments are equal to loadWeatherData, which resamples the returned interpolation at every solver step.
+
+    Returns:
+        WeatherInterpolation with the disturbances d[0]-d[9] of loadWeatherData
+    """
+    if weatherStore is None:
+        weatherStore = WEATHER_STORE
 
     c = 86400      # seconds in a day
-    CO2_PPM = 400  # assumed constant outdoor co2 concentration [ppm]
-    rawWeather = pd.read_csv(weatherDataPath, sep=",")
+    rawWeather = weatherStore.get(weatherDataDir, location, source, growthYear)
 
-    time = rawWeather["time"].values    # time since start of the year in [s]
+    time = rawWeather[:, 0]             # time since start of the year in [s]
     dt = np.mean(np.diff(time-time[0])) # sample period of data [s]
     N0 = int(np.ceil(startDay*c/dt))    # Start index
     Ns = int(np.ceil(nDays*c/dt))       # Number of samples we need from regular data
@@ -66,55 +343,108 @@ def loadWeatherData(weatherDataDir: str,
 
     # check whether we exceed data length and we are in the final season
     if N0+Ns+Np > len(time):
-        rawWeather = expandWeatherData(weatherDataDir, rawWeather, location, source, growthYear, time, dt)
-
-    weatherData = np.zeros((Ns+Np, nd))                                         # preallocate weather data matrix
-    time = rawWeather["time"].values[N0:N0+Ns+Np]                               # time since start of the year in [s]
-    weatherData[:, 0] = rawWeather["global radiation"][N0:N0+Ns+Np]             # iGlob
-    weatherData[:, 1] = rawWeather["air temperature"][N0:N0+Ns+Np] + 1.5        # tOut
-    vpDensity = rh2vaporDens(weatherData[:, 1], rawWeather["RH"][N0:N0+Ns+Np])  # vp Density
-    weatherData[:,2] = vaporDens2pres(weatherData[:, 1], vpDensity)             # vpOut
-    weatherData[:,3] = co2ppm2dens(weatherData[:, 1], CO2_PPM)*1e6              # co2Out (converted from kg/m^3 to mg/m^3)
-    weatherData[:,4] = rawWeather["wind speed"][N0:N0+Ns+Np]                    # wind
-    weatherData[:,5] = rawWeather["sky temperature"][N0:N0+Ns+Np]               # tSky
-    weatherData[:,6] = soilTempNl(rawWeather["time"][N0:N0+Ns+Np])              # tSoOut
-    weatherData[:, 7] = dailLightSum(time, weatherData[:,0], c) # daily sun radiation sum [MJ m^{-2} day^{-1}]
-    weatherData[:, 8], weatherData[:,9] = computeisDay(weatherData[:, 0], dt)   # isDay, isDaySmooth
+        rawWeather = expandWeatherData(weatherDataDir, rawWeather, location, source, growthYear, time, dt, weatherStore)
+
+    time, weatherData = computeDisturbances(rawWeather[N0:N0+Ns+Np], dt, nd)
 
     # number of samples required for the solver
     ns = int((dt/h) * (Ns+Np))
+    return WeatherInterpolation(time, weatherData, ns)
 
-    # interpolate and resample
-    interpolation = PchipInterpolator(time, weatherData)
-    timeRes = np.linspace(time[0], time[-1], ns)
-    weatherDataResampled = interpolation(timeRes)
- 
-    # set small radiation values to zero
-    weatherDataResampled[:,0 ][weatherDataResampled[:, 0] < 1e-10] = 0
-
-    return weatherDataResampled
+class WeatherInterpolation:
+    """
+    PCHIP interpolation of the disturbances at the samples (knots) of the raw weather data.
+    The interpolation is resampled at rows evenly spaced times between the first and last knot, i.e., the solver steps.
+    Instead of the resampled weather data, the GreenLight model can keep the knots and the coefficients of the polynomials,
+    and evaluate the weather data at every solver step on demand (see GreenLight.resetInterpolated).
+    This reduces the memory of the weather data by a factor (dt/h)*nd/(4*nd+1), e.g., 75 for dt=300 s and h=1 s.
 
-def expandWeatherData(weatherDataDir: str, rawWeather: pd.DataFrame, location: str, source: str, growthYear: int, time: np.ndarray, dt: int) -> pd.DataFrame:
+    Args:
+        time        - time of the knots [s]
+        weatherData - disturbances at the knots, of shape (len(time), nd)
+        rows        - number of solver steps
+    """
+    def __init__(self, time: np.ndarray, weatherData: np.ndarray, rows: int) -> None:
+        self.interpolation = PchipInterpolator(time, weatherData)
+        self.knots = np.ascontiguousarray(self.interpolation.x, dtype=np.float64)
+        self.coefficients = np.ascontiguousarray(self.interpolation.c, dtype=np.float64)
+        self.rows = rows
+
+    @property
+    def nbytes(self) -> int:
+        return self.knots.nbytes + self.coefficients.nbytes
+
+    def resample(self, every: int = 1) -> np.ndarray:
+        """
+        Resamples the interpolation at every solver step, or at every n-th solver step.
+        The times are equal to np.linspace(time[0], time[-1], rows)[::every].
+
+        Returns:
+            Matrix with the disturbances at the solver steps, of shape (ceil(rows/every), nd)
+        """
+        start, stop = self.knots[0], self.knots[-1]
+        rows = np.arange(0, self.rows, every)
+        timeRes = rows*((stop - start)/(self.rows - 1)) + start
+        if rows[-1] == self.rows - 1:
+            timeRes[-1] = stop
+        weatherDataResampled = self.interpolation(timeRes)
+
+        # set small radiation values to zero
+        weatherDataResampled[:,0 ][weatherDataResampled[:, 0] < 1e-10] = 0
+        return weatherDataResampled
+
+def expandWeatherData(weatherDataDir: str, rawWeather: np.ndarray, location: str, source: str, growthYear: int, time: np.ndarray, dt: int,
+                      weatherStore: WeatherStore = None) -> np.ndarray:
     """
     Function that loads in the weather data for the next year and appends it to the current weather data.
     Required when the simulation exceeds the length of the current weather data.
     Args:
         weatherDataDir  - path to raw weather data
-        rawWeather      - current weather data
+        rawWeather      - current weather data, with the columns of WeatherStore.WEATHER_COLUMNS
         location        - location of the greenhouse
         source          - source of the weather data (e.g. KNMI)
         growthYear      - year of the growth season
         time            - time since start of the year in [s]
         dt              - sample period of weather data [s]
+        weatherStore    - cache with the parsed weather data, defaults to the process-level WEATHER_STORE
     Returns:
         rawWeather      - weather data for the next year appended to the current weather data
     """
-    weatherDataPath = weatherDataDir + location +"/" + source + str(growthYear+1) + ".csv"
-    newRawWeather = pd.read_csv(weatherDataPath, sep=",")
-    newRawWeather["time"] += time[-1] + dt
-    rawWeather = pd.concat([rawWeather, newRawWeather.iloc[:, :]])
+    if weatherStore is None:
+        weatherStore = WEATHER_STORE
+    newRawWeather = weatherStore.get(weatherDataDir, location, source, growthYear+1).copy()
+    newRawWeather[:, 0] += time[-1] + dt
+    rawWeather = np.concatenate([rawWeather, newRawWeather])
     return rawWeather
 
+def computeDisturbances(rawWeather: np.ndarray, dt: float, nd: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Function that converts the raw weather data to the disturbances used by the GreenLight model.
+    Args:
+        rawWeather      - raw weather data, with the columns of WeatherStore.WEATHER_COLUMNS
+        dt              - sample period of weather data [s]
+        nd              - number of weather variables
+    Returns:
+        time            - time since start of the year in [s]
+        weatherData     - matrix with the disturbances d[0]-d[9], see loadWeatherData
+    """
+    c = 86400      # seconds in a day
+    CO2_PPM = 400  # assumed constant outdoor co2 concentration [ppm]
+
+    weatherData = np.zeros((rawWeather.shape[0], nd))                   # preallocate weather data matrix
+    time = rawWeather[:, 0]                                             # time since start of the year in [s]
+    weatherData[:, 0] = rawWeather[:, 1]                                # iGlob
+    weatherData[:, 1] = rawWeather[:, 2] + 1.5                          # tOut
+    vpDensity = rh2vaporDens(weatherData[:, 1], rawWeather[:, 3])       # vp Density
+    weatherData[:,2] = vaporDens2pres(weatherData[:, 1], vpDensity)     # vpOut
+    weatherData[:,3] = co2ppm2dens(weatherData[:, 1], CO2_PPM)*1e6      # co2Out (converted from kg/m^3 to mg/m^3)
+    weatherData[:,4] = rawWeather[:, 4]                                 # wind
+    weatherData[:,5] = rawWeather[:, 5]                                 # tSky
+    weatherData[:,6] = soilTempNl(time)                                 # tSoOut
+    weatherData[:, 7] = dailLightSum(time, weatherData[:,0], c) # daily sun radiation sum [MJ m^{-2} day^{-1}]
+    weatherData[:, 8], weatherData[:,9] = computeisDay(weatherData[:, 0], dt)   # isDay, isDaySmooth
+    return time, weatherData
+
 def days2date(timeInDays: float, referenceDate: str):
     """
     Function that converts the number of days since a reference date
@@ -143,6 +473,10 @@ def computeisDay(rad: np.ndarray, dt: int) -> tuple[np.ndarray, np.ndarray]:
     There is a tranisition period between day and night.
     To account for the twilight between day and night.
     Smooth transition is based on a sigmoid function.
+
+    Sunrises and sunsets are found with np.flatnonzero, instead of scanning every sample.
+    The transitions are applied in order, and the samples following a transition are checked again,
+    since a transition overwrites the flags around it (identical to a sample-by-sample scan).
     Args:
         rad     - radiation [W m^{-2}]
         dt      - sample period of the weather data [s]
@@ -159,23 +493,42 @@ def computeisDay(rad: np.ndarray, dt: int) -> tuple[np.ndarray, np.ndarray]:
 
     trans = np.linspace(0, 1, transSize)
     transSmooth = 1/(1+np.exp(-10*(trans-0.5)))
-    sunset = False  # indicates if we are during sunset
-
-    for k in range(transSize, len(isDay) - transSize):
-        if isDay[k] == 0:
-            sunset = False
+    halfSize = transSize // 2
+
+    # candidate transitions between night and day within the scanned range
+    start, stop = transSize, len(isDay) - transSize
+    candidates = np.flatnonzero(np.diff(isDay))
+    candidates = list(candidates[(candidates >= start) & (candidates < stop)])
+    heapq.heapify(candidates)
+
+    # a sunset flags the samples up to the first night sample after it,
+    # which lies at the end of the transition it wrote
+    sunsetUntil = -1
+    previous = -1
+    while candidates:
+        k = heapq.heappop(candidates)
+        if k == previous:
+            continue
+        previous = k
         if isDay[k] == 0 and isDay[k + 1] == 1:
             isDay[k - transSize // 2 : k + transSize // 2] = trans
             isDaySmooth[k - transSize // 2 : k + transSize // 2] = transSmooth
-        elif isDay[k] == 1 and isDay[k + 1] == 0 and not sunset:
+        elif isDay[k] == 1 and isDay[k + 1] == 0 and k >= sunsetUntil:
             isDay[k - transSize // 2: k + transSize // 2] = 1 - trans
             isDaySmooth[k - transSize // 2: k + transSize // 2] = 1 - transSmooth
-            sunset = True
+            sunsetUntil = k + max(halfSize - 1, 1)
+        else:
+            continue
+        # the written transition can create new transitions in the samples that are not scanned yet
+        for j in range(k + 1, min(k + halfSize, stop)):
+            heapq.heappush(candidates, j)
     return isDay, isDaySmooth
 
 def dailLightSum(time: np.ndarray, rad: np.ndarray, c: int):
     """
     Function that computes the DLI (Daily Light Integral) from a given radiation time series.
+    The midnights are found once with np.flatnonzero, after which the radiation is summed per day.
+    Every sample of a day gets the radiation sum of that day, including the sample at the next midnight.
     Args:
         time    - time since start of the year in [s]
         rad     - radiation [W m^{-2}]
@@ -185,29 +538,23 @@ def dailLightSum(time: np.ndarray, rad: np.ndarray, c: int):
     """
     interval = time[1]-time[0] # time interval between samples [s]
     time = time/c               # convert to days
+    n = len(time)
 
-    # index of the midnight before current point
-    mnBefore = 0
+    # samples before a midnight
+    midnights = np.flatnonzero(np.diff(np.floor(time)) == 1)
+    lightSum =  np.zeros(n)
 
-    # index of the midnight after current point
-    mnAfter = np.where(np.diff(np.floor(time)) == 1)[0] +1
-    if mnAfter.size == 0:
-        mnAfter = len(time)
-    else:
-        mnAfter = mnAfter[0]
-    lightSum =  np.zeros(len(time))
-
-    for i in range(len(time)):
-        lightSum[i] = np.sum(rad[mnBefore:mnAfter+1])
-
-        if i == mnAfter -1:
-            mnBefore = mnAfter
-            mnAfter = np.where(np.diff(np.floor(time[mnBefore+2:])) == 1)[0] + mnBefore+2
-            # mnAfter = len(time)
-            if mnAfter.size == 0:
-                mnAfter = len(time)
-            else:
-                mnAfter = mnAfter[0]
+    # the first day ends at the first sample after midnight
+    mnBefore = 0
+    mnAfter = midnights[0] + 1 if midnights.size > 0 else n
+    while mnBefore < n:
+        # np.sum per day, such that the summation (and rounding) is identical for every sample of the day
+        lightSum[mnBefore:mnAfter] = np.sum(rad[mnBefore:mnAfter+1])
+
+        # following days end at the last sample before midnight
+        mnBefore = mnAfter
+        nextMidnight = np.searchsorted(midnights, mnBefore + 2)
+        mnAfter = midnights[nextMidnight] if nextMidnight < midnights.size else n
     return lightSum*interval*1e-6
 
 def soilTempNl(time):
@@ -2,22 +2,23 @@ from define_parameters cimport Parameters
 # from define_parameters_old cimport Parameters
 from auxiliary_states cimport AuxiliaryStates, update, sensible
 # from auxiliary_states_old cimport AuxiliaryStates, update
-from libc.stdlib cimport malloc, free
 from libc.math cimport isnan, isinf, fabs, sqrt
 
 
-cdef inline double* ODE(AuxiliaryStates* a, Parameters* p, double* x, double* u, double* d, char nx):
-    cdef double* ki = <double*>malloc(nx * sizeof(double))
-    cdef unsigned char i
+cdef inline void ODE(AuxiliaryStates* a, Parameters* p, double* x, double* u, double* d, char nx, double* ki) nogil:
+    """
+    Computes the time derivatives of the states.
+    The derivatives are written into the caller-supplied buffer ki, which holds at least nx doubles.
+    """
 
     # Carbon concentration of greenhouse air [mg m^{-3} s^{-1}]
-    ki[0] = (1/p.capCo2Air) * (a.mcBlowAir+a.mcExtAir+a.mcPadAir-a.mcAirCan-a.mcAirTop-a.mcAirOut)    
+    ki[0] = p.invCapCo2Air * (a.mcBlowAir+a.mcExtAir+a.mcPadAir-a.mcAirCan-a.mcAirTop-a.mcAirOut)    
 
     # Carbon concentration of top compartment [mg m^{-3} s^{-1}]
-    ki[1] =(1/p.capCo2Top) * (a.mcAirTop-a.mcTopOut)
+    ki[1] =p.invCapCo2Top * (a.mcAirTop-a.mcTopOut)
 
     # % Greenhouse air temperature [�C s^{-1}]
-    ki[2] = (1/p.capAir) * (a.hCanAir+a.hPadAir-a.hAirMech+a.hPipeAir \
+    ki[2] = p.invCapAir * (a.hCanAir+a.hPadAir-a.hAirMech+a.hPipeAir \
         +a.hPasAir+a.hBlowAir+a.rGlobSunAir-a.hAirFlr-a.hAirThScr-a.hAirOut \
         -a.hAirTop-a.hAirOutPad-a.lAirFog-a.hAirBlScr \
         +a.hLampAir+a.rLampAir \
@@ -25,7 +26,7 @@ cdef inline double* ODE(AuxiliaryStates* a, Parameters* p, double* x, double* u,
 
     # # % Air above screen temperature [�C s^{-1}]
     # # setOde(gl, 'tTop', 1/p.capTop*(a.hThScrTop+a.hAirTop-a.hTopCovIn-a.hTopOut+a.hBlScrTop));
-    ki[3] = (1/p.capTop) * (a.hThScrTop+a.hAirTop-a.hTopCovIn-a.hTopOut+a.hBlScrTop)
+    ki[3] = p.invCapTop * (a.hThScrTop+a.hAirTop-a.hTopCovIn-a.hTopOut+a.hBlScrTop)
 
     # % Canopy temperature [�C s^{-1}]
     ki[4] = (1/a.capCan)*(a.rParSunCan+a.rNirSunCan+a.rPipeCan \
@@ -46,35 +47,35 @@ cdef inline double* ODE(AuxiliaryStates* a, Parameters* p, double* x, double* u,
     ki[6] = (1/a.capCovE)*(a.rGlobSunCovE+a.hCovInCovE-a.hCovEOut-a.rCovESky)
 
     # % Thermal screen temperature [�C s^{-1}]
-    ki[7] = (1/p.capThScr)*(a.hAirThScr+a.lAirThScr+a.rCanThScr+ \
+    ki[7] = p.invCapThScr*(a.hAirThScr+a.lAirThScr+a.rCanThScr+ \
         a.rFlrThScr+a.rPipeThScr-a.hThScrTop-a.rThScrCovIn-a.rThScrSky+a.rBlScrThScr+ \
         a.rLampThScr+a.rIntLampThScr)
 
     # % Greenhouse floor temperature [�C s^{-1}]
-    ki[8] = (1/p.capFlr)*(a.hAirFlr+a.rParSunFlr+a.rNirSunFlr \
+    ki[8] = p.invCapFlr*(a.hAirFlr+a.rParSunFlr+a.rNirSunFlr \
         +a.rCanFlr+a.rPipeFlr-a.hFlrSo1-a.rFlrCovIn-a.rFlrSky-a.rFlrThScr \
         +a.rParLampFlr+a.rNirLampFlr+a.rFirLampFlr-a.rFlrBlScr \
         +a.rParIntLampFlr+a.rNirIntLampFlr+a.rFirIntLampFlr)
 
     # Pipe temperature [�C s^{-1}]
-    ki[9] = (1/p.capPipe)*(a.hBoilPipe+a.hIndPipe+a.hGeoPipe-a.rPipeSky \
+    ki[9] = p.invCapPipe*(a.hBoilPipe+a.hIndPipe+a.hGeoPipe-a.rPipeSky \
     -a.rPipeCovIn-a.rPipeCan-a.rPipeFlr-a.rPipeThScr-a.hPipeAir \
     +a.rLampPipe-a.rPipeBlScr+a.hBufHotPipe+a.rIntLampPipe)
 
     # Soil layer 1 temperature [�C s^{-1}]
-    ki[10] = (1/p.capSo1)*(a.hFlrSo1-a.hSo1So2)
+    ki[10] = p.invCapSo1*(a.hFlrSo1-a.hSo1So2)
 
     # Soil layer 2 temperature [�C s^{-1}]
-    ki[11] = (1/p.capSo2)*(a.hSo1So2-a.hSo2So3)
+    ki[11] = p.invCapSo2*(a.hSo1So2-a.hSo2So3)
 
     # Soil layer 3 temperature [�C s^{-1}]
-    ki[12] = (1/p.capSo3)*(a.hSo2So3-a.hSo3So4)
+    ki[12] = p.invCapSo3*(a.hSo2So3-a.hSo3So4)
 
     # Soil layer 4 temperature [�C s^{-1}]
-    ki[13] = (1/p.capSo4)*(a.hSo3So4-a.hSo4So5)
+    ki[13] = p.invCapSo4*(a.hSo3So4-a.hSo4So5)
 
     # Soil layer 5 temperature [�C s^{-1}]
-    ki[14] = (1/p.capSo5)*(a.hSo4So5-a.hSo5SoOut)
+    ki[14] = p.invCapSo5*(a.hSo4So5-a.hSo5SoOut)
 
     ## Vapor balance
 
@@ -86,23 +87,23 @@ cdef inline double* ODE(AuxiliaryStates* a, Parameters* p, double* x, double* u,
     ki[16] = (1/a.capVpTop) * (a.mvAirTop-a.mvTopCovIn-a.mvTopOut)
 
     # Lamp temperature [�C s^{-1}]
-    ki[17] = (1/p.capLamp) * (a.qLampIn-a.hLampAir-a.rLampSky-a.rLampCovIn \
+    ki[17] = p.invCapLamp * (a.qLampIn-a.hLampAir-a.rLampSky-a.rLampCovIn \
         -a.rLampThScr-a.rLampPipe-a.rLampAir - a.rLampBlScr \
         -a.rParLampFlr-a.rNirLampFlr-a.rFirLampFlr \
         -a.rParLampCan-a.rNirLampCan-a.rFirLampCan-a.hLampCool+a.rIntLampLamp)
 
     # Interlight temperature [�C s^{-1}]
-    ki[18] = (1/p.capIntLamp) * (a.qIntLampIn-a.hIntLampAir-a.rIntLampSky-a.rIntLampCovIn \
+    ki[18] = p.invCapIntLamp * (a.qIntLampIn-a.hIntLampAir-a.rIntLampSky-a.rIntLampCovIn \
         -a.rIntLampThScr-a.rIntLampPipe-a.rIntLampAir-a.rIntLampBlScr \
         -a.rParIntLampFlr-a.rNirIntLampFlr-a.rFirIntLampFlr \
         -a.rParIntLampCan-a.rNirIntLampCan-a.rFirIntLampCan-a.rIntLampLamp)
 
     # Grow pipes temperature [�C s^{-1}]
-    ki[19] = (1/p.capGroPipe) * (a.hBoilGroPipe-a.rGroPipeCan-a.hGroPipeAir)
+    ki[19] = p.invCapGroPipe * (a.hBoilGroPipe-a.rGroPipeCan-a.hGroPipeAir)
 
     # % Blackout screen temperature [�C s^{-1}]
     # % Equation A1 [5], Equation 7.1 [6]
-    ki[20] = (1/p.capBlScr) * (a.hAirBlScr+a.lAirBlScr+a.rCanBlScr+ \
+    ki[20] = p.invCapBlScr * (a.hAirBlScr+a.lAirBlScr+a.rCanBlScr+ \
         a.rFlrBlScr+a.rPipeBlScr-a.hBlScrTop-a.rBlScrCovIn-a.rBlScrSky-a.rBlScrThScr+ \
         a.rLampBlScr+a.rIntLampBlScr)
 
@@ -128,5 +129,3 @@ cdef inline double* ODE(AuxiliaryStates* a, Parameters* p, double* x, double* u,
 
     # time in days since 00-00-0000
     ki[27] = 1/86400
-
-    return ki
@@ -0,0 +1,1360 @@
+# Generated by generate_soa.py from auxiliary_states.pxd and ODE.pxd, do not edit.
+# Struct-of-arrays variant of the auxiliary states and the ODE for blocks of SOA_BLOCK greenhouses.
+# The states, control signals, weather and derivatives of a block are stored per variable,
+# e.g., x[i*SOA_BLOCK + n] holds state i of greenhouse n.
+cimport cython
+from define_parameters cimport Parameters
+from auxiliary_states cimport AuxiliaryStates, tau12, rhoUp, rhoDn, rad2degrees, fir, sensible, airMv, smoothHar, airMc
+from precision cimport real, cos, exp, sqrt, fabs, fmax, fmin, log, pow
+from libc.math cimport M_PI, floor
+from utils cimport satVp, cond, co2dens2ppm
+
+cdef enum:
+    SOA_BLOCK = 8     # number of greenhouses in a block
+
+cdef struct AuxiliaryStatesSoA:
+    real tauThScrPar[SOA_BLOCK]
+    real rhoThScrPar[SOA_BLOCK]
+    real tauCovThScrPar[SOA_BLOCK]
+    real rhoCovThScrParUp[SOA_BLOCK]
+    real rhoCovThScrParDn[SOA_BLOCK]
+    real tauThScrNir[SOA_BLOCK]
+    real rhoThScrNir[SOA_BLOCK]
+    real tauCovThScrNir[SOA_BLOCK]
+    real rhoCovThScrNirUp[SOA_BLOCK]
+    real rhoCovThScrNirDn[SOA_BLOCK]
+    real tauBlScrPar[SOA_BLOCK]
+    real rhoBlScrPar[SOA_BLOCK]
+    real tauCovBlScrPar[SOA_BLOCK]
+    real rhoCovBlScrParUp[SOA_BLOCK]
+    real rhoCovBlScrParDn[SOA_BLOCK]
+    real tauBlScrNir[SOA_BLOCK]
+    real rhoBlScrNir[SOA_BLOCK]
+    real tauCovBlScrNir[SOA_BLOCK]
+    real rhoCovBlScrNirUp[SOA_BLOCK]
+    real rhoCovBlScrNirDn[SOA_BLOCK]
+    real tauCovPar[SOA_BLOCK]
+    real rhoCovPar[SOA_BLOCK]
+    real tauCovNir[SOA_BLOCK]
+    real rhoCovNir[SOA_BLOCK]
+    real tauCovFir[SOA_BLOCK]
+    real rhoCovFir[SOA_BLOCK]
+    real aCovPar[SOA_BLOCK]
+    real aCovNir[SOA_BLOCK]
+    real aCovFir[SOA_BLOCK]
+    real epsCovFir[SOA_BLOCK]
+    real capCov[SOA_BLOCK]
+    real lai[SOA_BLOCK]
+    real capCan[SOA_BLOCK]
+    real capCovE[SOA_BLOCK]
+    real capCovIn[SOA_BLOCK]
+    real capVpAir[SOA_BLOCK]
+    real capVpTop[SOA_BLOCK]
+    real qLampIn[SOA_BLOCK]
+    real qIntLampIn[SOA_BLOCK]
+    real rParGhSun[SOA_BLOCK]
+    real rParGhLamp[SOA_BLOCK]
+    real rParGhIntLamp[SOA_BLOCK]
+    real rCanSun[SOA_BLOCK]
+    real rCanLamp[SOA_BLOCK]
+    real rCanIntLamp[SOA_BLOCK]
+    real rCan[SOA_BLOCK]
+    real rParSunCanDown[SOA_BLOCK]
+    real rParLampCanDown[SOA_BLOCK]
+    real fIntLampCanPar[SOA_BLOCK]
+    real fIntLampCanNir[SOA_BLOCK]
+    real rParIntLampCanDown[SOA_BLOCK]
+    real rParSunFlrCanUp[SOA_BLOCK]
+    real rParLampFlrCanUp[SOA_BLOCK]
+    real rParIntLampFlrCanUp[SOA_BLOCK]
+    real rParSunCan[SOA_BLOCK]
+    real rParLampCan[SOA_BLOCK]
+    real rParIntLampCan[SOA_BLOCK]
+    real tauHatCovNir[SOA_BLOCK]
+    real tauHatFlrNir[SOA_BLOCK]
+    real tauHatCanNir[SOA_BLOCK]
+    real rhoHatCanNir[SOA_BLOCK]
+    real tauHatCanParDn[SOA_BLOCK]
+    real tauHatCanParUp[SOA_BLOCK]
+    real tauHatCanFir[SOA_BLOCK]
+    real tauCovCanNir[SOA_BLOCK]
+    real rhoCovCanNirUp[SOA_BLOCK]
+    real rhoCovCanNirDn[SOA_BLOCK]
+    real tauCovCanFlrNir[SOA_BLOCK]
+    real rhoCovCanFlrNir[SOA_BLOCK]
+    real aCanNir[SOA_BLOCK]
+    real aFlrNir[SOA_BLOCK]
+    real rNirSunCan[SOA_BLOCK]
+    real rNirLampCan[SOA_BLOCK]
+    real rNirIntLampCan[SOA_BLOCK]
+    real rNirSunFlr[SOA_BLOCK]
+    real rNirLampFlr[SOA_BLOCK]
+    real rNirIntLampFlr[SOA_BLOCK]
+    real rParSunFlr[SOA_BLOCK]
+    real rParLampFlr[SOA_BLOCK]
+    real rParIntLampFlr[SOA_BLOCK]
+    real rLampAir[SOA_BLOCK]
+    real rIntLampAir[SOA_BLOCK]
+    real rGlobSunAir[SOA_BLOCK]
+    real rGlobSunCovE[SOA_BLOCK]
+    real tauThScrFirU[SOA_BLOCK]
+    real tauBlScrFirU[SOA_BLOCK]
+    real aCan[SOA_BLOCK]
+    real rCanCovIn[SOA_BLOCK]
+    real rCanSky[SOA_BLOCK]
+    real rCanThScr[SOA_BLOCK]
+    real rCanFlr[SOA_BLOCK]
+    real rPipeCovIn[SOA_BLOCK]
+    real rPipeSky[SOA_BLOCK]
+    real rPipeThScr[SOA_BLOCK]
+    real rPipeFlr[SOA_BLOCK]
+    real rPipeCan[SOA_BLOCK]
+    real rFlrCovIn[SOA_BLOCK]
+    real rFlrSky[SOA_BLOCK]
+    real rFlrThScr[SOA_BLOCK]
+    real rThScrCovIn[SOA_BLOCK]
+    real rThScrSky[SOA_BLOCK]
+    real rCovESky[SOA_BLOCK]
+    real rFirLampFlr[SOA_BLOCK]
+    real rLampPipe[SOA_BLOCK]
+    real rFirLampCan[SOA_BLOCK]
+    real rLampThScr[SOA_BLOCK]
+    real rLampCovIn[SOA_BLOCK]
+    real rLampSky[SOA_BLOCK]
+    real rGroPipeCan[SOA_BLOCK]
+    real rFlrBlScr[SOA_BLOCK]
+    real rPipeBlScr[SOA_BLOCK]
+    real rCanBlScr[SOA_BLOCK]
+    real rBlScrThScr[SOA_BLOCK]
+    real rBlScrCovIn[SOA_BLOCK]
+    real rBlScrSky[SOA_BLOCK]
+    real rLampBlScr[SOA_BLOCK]
+    real fIntLampCanUp[SOA_BLOCK]
+    real fIntLampCanDown[SOA_BLOCK]
+    real rFirIntLampFlr[SOA_BLOCK]
+    real rIntLampPipe[SOA_BLOCK]
+    real rFirIntLampCan[SOA_BLOCK]
+    real rIntLampLamp[SOA_BLOCK]
+    real rIntLampBlScr[SOA_BLOCK]
+    real rIntLampThScr[SOA_BLOCK]
+    real rIntLampCovIn[SOA_BLOCK]
+    real rIntLampSky[SOA_BLOCK]
+    real aRoofU[SOA_BLOCK]
+    real aRoofUMax[SOA_BLOCK]
+    real aRoofMin[SOA_BLOCK]
+    real aSideU[SOA_BLOCK]
+    real etaRoof[SOA_BLOCK]
+    real etaRoofNoSide[SOA_BLOCK]
+    real etaSide[SOA_BLOCK]
+    real cD[SOA_BLOCK]
+    real cW[SOA_BLOCK]
+    real fVentRoof2[SOA_BLOCK]
+    real fVentRoofSide2[SOA_BLOCK]
+    real fVentSide2[SOA_BLOCK]
+    real fLeakage[SOA_BLOCK]
+    real fVentRoof[SOA_BLOCK]
+    real fVentSide[SOA_BLOCK]
+    real timeOfDay[SOA_BLOCK]
+    real dayOfYear[SOA_BLOCK]
+    real co2InPpm[SOA_BLOCK]
+    real rhIn[SOA_BLOCK]
+    real rhoTop[SOA_BLOCK]
+    real rhoAir[SOA_BLOCK]
+    real rhoAirMean[SOA_BLOCK]
+    real fThScr[SOA_BLOCK]
+    real fBlScr[SOA_BLOCK]
+    real fScr[SOA_BLOCK]
+    char fVentForced[SOA_BLOCK]
+    real hCanAir[SOA_BLOCK]
+    real hAirFlr[SOA_BLOCK]
+    real hAirThScr[SOA_BLOCK]
+    real hAirBlScr[SOA_BLOCK]
+    real hAirOut[SOA_BLOCK]
+    real hAirTop[SOA_BLOCK]
+    real hThScrTop[SOA_BLOCK]
+    real hBlScrTop[SOA_BLOCK]
+    real hTopCovIn[SOA_BLOCK]
+    real hTopOut[SOA_BLOCK]
+    real hCovEOut[SOA_BLOCK]
+    real hPipeAir[SOA_BLOCK]
+    real hFlrSo1[SOA_BLOCK]
+    real hSo1So2[SOA_BLOCK]
+    real hSo2So3[SOA_BLOCK]
+    real hSo3So4[SOA_BLOCK]
+    real hSo4So5[SOA_BLOCK]
+    real hSo5SoOut[SOA_BLOCK]
+    real hCovInCovE[SOA_BLOCK]
+    real hLampAir[SOA_BLOCK]
+    real hGroPipeAir[SOA_BLOCK]
+    real hIntLampAir[SOA_BLOCK]
+    real sRs[SOA_BLOCK]
+    real cEvap3[SOA_BLOCK]
+    real cEvap4[SOA_BLOCK]
+    real rfRCan[SOA_BLOCK]
+    real rfCo2[SOA_BLOCK]
+    real rfVp[SOA_BLOCK]
+    real rS[SOA_BLOCK]
+    real vecCanAir[SOA_BLOCK]
+    real mvCanAir[SOA_BLOCK]
+    char mvPadAir[SOA_BLOCK]
+    char mvFogAir[SOA_BLOCK]
+    char mvBlowAir[SOA_BLOCK]
+    char mvAirOutPad[SOA_BLOCK]
+    real mvAirThScr[SOA_BLOCK]
+    real mvAirBlScr[SOA_BLOCK]
+    real mvTopCovIn[SOA_BLOCK]
+    real mvAirTop[SOA_BLOCK]
+    real mvTopOut[SOA_BLOCK]
+    real mvAirOut[SOA_BLOCK]
+    real lCanAir[SOA_BLOCK]
+    real lAirThScr[SOA_BLOCK]
+    real lAirBlScr[SOA_BLOCK]
+    real lTopCovIn[SOA_BLOCK]
+    real parCan[SOA_BLOCK]
+    real j25CanMax[SOA_BLOCK]
+    real gamma[SOA_BLOCK]
+    real co2Stom[SOA_BLOCK]
+    real jPot[SOA_BLOCK]
+    real j[SOA_BLOCK]
+    real p[SOA_BLOCK]
+    real r[SOA_BLOCK]
+    real hAirBuf[SOA_BLOCK]
+    real mcAirBuf[SOA_BLOCK]
+    real gTCan24[SOA_BLOCK]
+    real hTCan24[SOA_BLOCK]
+    real hTCan[SOA_BLOCK]
+    real hTCanSum[SOA_BLOCK]
+    real hBufOrg[SOA_BLOCK]
+    real mcBufLeaf[SOA_BLOCK]
+    real mcBufStem[SOA_BLOCK]
+    real mcBufFruit[SOA_BLOCK]
+    real mcBufAir[SOA_BLOCK]
+    real mcLeafAir[SOA_BLOCK]
+    real mcStemAir[SOA_BLOCK]
+    real mcFruitAir[SOA_BLOCK]
+    real mcOrgAir[SOA_BLOCK]
+    real mcLeafHar[SOA_BLOCK]
+    real mcFruitHar[SOA_BLOCK]
+    double mcFruitHarSum[SOA_BLOCK]
+    real mcAirCan[SOA_BLOCK]
+    real mcAirTop[SOA_BLOCK]
+    real mcTopOut[SOA_BLOCK]
+    real mcAirOut[SOA_BLOCK]
+    real hBoilPipe[SOA_BLOCK]
+    real hBoilGroPipe[SOA_BLOCK]
+    real mcExtAir[SOA_BLOCK]
+    real hLampCool[SOA_BLOCK]
+    char mcBlowAir[SOA_BLOCK]
+    char mcPadAir[SOA_BLOCK]
+    char hPadAir[SOA_BLOCK]
+    char hPasAir[SOA_BLOCK]
+    char hBlowAir[SOA_BLOCK]
+    char hAirPadOut[SOA_BLOCK]
+    char hAirOutPad[SOA_BLOCK]
+    char lAirFog[SOA_BLOCK]
+    char hIndPipe[SOA_BLOCK]
+    char hGeoPipe[SOA_BLOCK]
+    char hecMechAir[SOA_BLOCK]
+    char hAirMech[SOA_BLOCK]
+    char mvAirMech[SOA_BLOCK]
+    char lAirMech[SOA_BLOCK]
+    char hBufHotPipe[SOA_BLOCK]
+
+cdef inline void loadAuxStatesSoA(AuxiliaryStatesSoA* dst, AuxiliaryStates* src, unsigned int count) nogil:
+    """
+    Copies the auxiliary states of count greenhouses (at most SOA_BLOCK) into a block.
+    """
+    cdef unsigned int n
+    for n in range(count):
+        dst.tauThScrPar[n] = src[n].tauThScrPar
+        dst.rhoThScrPar[n] = src[n].rhoThScrPar
+        dst.tauCovThScrPar[n] = src[n].tauCovThScrPar
+        dst.rhoCovThScrParUp[n] = src[n].rhoCovThScrParUp
+        dst.rhoCovThScrParDn[n] = src[n].rhoCovThScrParDn
+        dst.tauThScrNir[n] = src[n].tauThScrNir
+        dst.rhoThScrNir[n] = src[n].rhoThScrNir
+        dst.tauCovThScrNir[n] = src[n].tauCovThScrNir
+        dst.rhoCovThScrNirUp[n] = src[n].rhoCovThScrNirUp
+        dst.rhoCovThScrNirDn[n] = src[n].rhoCovThScrNirDn
+        dst.tauBlScrPar[n] = src[n].tauBlScrPar
+        dst.rhoBlScrPar[n] = src[n].rhoBlScrPar
+        dst.tauCovBlScrPar[n] = src[n].tauCovBlScrPar
+        dst.rhoCovBlScrParUp[n] = src[n].rhoCovBlScrParUp
+        dst.rhoCovBlScrParDn[n] = src[n].rhoCovBlScrParDn
+        dst.tauBlScrNir[n] = src[n].tauBlScrNir
+        dst.rhoBlScrNir[n] = src[n].rhoBlScrNir
+        dst.tauCovBlScrNir[n] = src[n].tauCovBlScrNir
+        dst.rhoCovBlScrNirUp[n] = src[n].rhoCovBlScrNirUp
+        dst.rhoCovBlScrNirDn[n] = src[n].rhoCovBlScrNirDn
+        dst.tauCovPar[n] = src[n].tauCovPar
+        dst.rhoCovPar[n] = src[n].rhoCovPar
+        dst.tauCovNir[n] = src[n].tauCovNir
+        dst.rhoCovNir[n] = src[n].rhoCovNir
+        dst.tauCovFir[n] = src[n].tauCovFir
+        dst.rhoCovFir[n] = src[n].rhoCovFir
+        dst.aCovPar[n] = src[n].aCovPar
+        dst.aCovNir[n] = src[n].aCovNir
+        dst.aCovFir[n] = src[n].aCovFir
+        dst.epsCovFir[n] = src[n].epsCovFir
+        dst.capCov[n] = src[n].capCov
+        dst.lai[n] = src[n].lai
+        dst.capCan[n] = src[n].capCan
+        dst.capCovE[n] = src[n].capCovE
+        dst.capCovIn[n] = src[n].capCovIn
+        dst.capVpAir[n] = src[n].capVpAir
+        dst.capVpTop[n] = src[n].capVpTop
+        dst.qLampIn[n] = src[n].qLampIn
+        dst.qIntLampIn[n] = src[n].qIntLampIn
+        dst.rParGhSun[n] = src[n].rParGhSun
+        dst.rParGhLamp[n] = src[n].rParGhLamp
+        dst.rParGhIntLamp[n] = src[n].rParGhIntLamp
+        dst.rCanSun[n] = src[n].rCanSun
+        dst.rCanLamp[n] = src[n].rCanLamp
+        dst.rCanIntLamp[n] = src[n].rCanIntLamp
+        dst.rCan[n] = src[n].rCan
+        dst.rParSunCanDown[n] = src[n].rParSunCanDown
+        dst.rParLampCanDown[n] = src[n].rParLampCanDown
+        dst.fIntLampCanPar[n] = src[n].fIntLampCanPar
+        dst.fIntLampCanNir[n] = src[n].fIntLampCanNir
+        dst.rParIntLampCanDown[n] = src[n].rParIntLampCanDown
+        dst.rParSunFlrCanUp[n] = src[n].rParSunFlrCanUp
+        dst.rParLampFlrCanUp[n] = src[n].rParLampFlrCanUp
+        dst.rParIntLampFlrCanUp[n] = src[n].rParIntLampFlrCanUp
+        dst.rParSunCan[n] = src[n].rParSunCan
+        dst.rParLampCan[n] = src[n].rParLampCan
+        dst.rParIntLampCan[n] = src[n].rParIntLampCan
+        dst.tauHatCovNir[n] = src[n].tauHatCovNir
+        dst.tauHatFlrNir[n] = src[n].tauHatFlrNir
+        dst.tauHatCanNir[n] = src[n].tauHatCanNir
+        dst.rhoHatCanNir[n] = src[n].rhoHatCanNir
+        dst.tauHatCanParDn[n] = src[n].tauHatCanParDn
+        dst.tauHatCanParUp[n] = src[n].tauHatCanParUp
+        dst.tauHatCanFir[n] = src[n].tauHatCanFir
+        dst.tauCovCanNir[n] = src[n].tauCovCanNir
+        dst.rhoCovCanNirUp[n] = src[n].rhoCovCanNirUp
+        dst.rhoCovCanNirDn[n] = src[n].rhoCovCanNirDn
+        dst.tauCovCanFlrNir[n] = src[n].tauCovCanFlrNir
+        dst.rhoCovCanFlrNir[n] = src[n].rhoCovCanFlrNir
+        dst.aCanNir[n] = src[n].aCanNir
+        dst.aFlrNir[n] = src[n].aFlrNir
+        dst.rNirSunCan[n] = src[n].rNirSunCan
+        dst.rNirLampCan[n] = src[n].rNirLampCan
+        dst.rNirIntLampCan[n] = src[n].rNirIntLampCan
+        dst.rNirSunFlr[n] = src[n].rNirSunFlr
+        dst.rNirLampFlr[n] = src[n].rNirLampFlr
+        dst.rNirIntLampFlr[n] = src[n].rNirIntLampFlr
+        dst.rParSunFlr[n] = src[n].rParSunFlr
+        dst.rParLampFlr[n] = src[n].rParLampFlr
+        dst.rParIntLampFlr[n] = src[n].rParIntLampFlr
+        dst.rLampAir[n] = src[n].rLampAir
+        dst.rIntLampAir[n] = src[n].rIntLampAir
+        dst.rGlobSunAir[n] = src[n].rGlobSunAir
+        dst.rGlobSunCovE[n] = src[n].rGlobSunCovE
+        dst.tauThScrFirU[n] = src[n].tauThScrFirU
+        dst.tauBlScrFirU[n] = src[n].tauBlScrFirU
+        dst.aCan[n] = src[n].aCan
+        dst.rCanCovIn[n] = src[n].rCanCovIn
+        dst.rCanSky[n] = src[n].rCanSky
+        dst.rCanThScr[n] = src[n].rCanThScr
+        dst.rCanFlr[n] = src[n].rCanFlr
+        dst.rPipeCovIn[n] = src[n].rPipeCovIn
+        dst.rPipeSky[n] = src[n].rPipeSky
+        dst.rPipeThScr[n] = src[n].rPipeThScr
+        dst.rPipeFlr[n] = src[n].rPipeFlr
+        dst.rPipeCan[n] = src[n].rPipeCan
+        dst.rFlrCovIn[n] = src[n].rFlrCovIn
+        dst.rFlrSky[n] = src[n].rFlrSky
+        dst.rFlrThScr[n] = src[n].rFlrThScr
+        dst.rThScrCovIn[n] = src[n].rThScrCovIn
+        dst.rThScrSky[n] = src[n].rThScrSky
+        dst.rCovESky[n] = src[n].rCovESky
+        dst.rFirLampFlr[n] = src[n].rFirLampFlr
+        dst.rLampPipe[n] = src[n].rLampPipe
+        dst.rFirLampCan[n] = src[n].rFirLampCan
+        dst.rLampThScr[n] = src[n].rLampThScr
+        dst.rLampCovIn[n] = src[n].rLampCovIn
+        dst.rLampSky[n] = src[n].rLampSky
+        dst.rGroPipeCan[n] = src[n].rGroPipeCan
+        dst.rFlrBlScr[n] = src[n].rFlrBlScr
+        dst.rPipeBlScr[n] = src[n].rPipeBlScr
+        dst.rCanBlScr[n] = src[n].rCanBlScr
+        dst.rBlScrThScr[n] = src[n].rBlScrThScr
+        dst.rBlScrCovIn[n] = src[n].rBlScrCovIn
+        dst.rBlScrSky[n] = src[n].rBlScrSky
+        dst.rLampBlScr[n] = src[n].rLampBlScr
+        dst.fIntLampCanUp[n] = src[n].fIntLampCanUp
+        dst.fIntLampCanDown[n] = src[n].fIntLampCanDown
+        dst.rFirIntLampFlr[n] = src[n].rFirIntLampFlr
+        dst.rIntLampPipe[n] = src[n].rIntLampPipe
+        dst.rFirIntLampCan[n] = src[n].rFirIntLampCan
+        dst.rIntLampLamp[n] = src[n].rIntLampLamp
+        dst.rIntLampBlScr[n] = src[n].rIntLampBlScr
+        dst.rIntLampThScr[n] = src[n].rIntLampThScr
+        dst.rIntLampCovIn[n] = src[n].rIntLampCovIn
+        dst.rIntLampSky[n] = src[n].rIntLampSky
+        dst.aRoofU[n] = src[n].aRoofU
+        dst.aRoofUMax[n] = src[n].aRoofUMax
+        dst.aRoofMin[n] = src[n].aRoofMin
+        dst.aSideU[n] = src[n].aSideU
+        dst.etaRoof[n] = src[n].etaRoof
+        dst.etaRoofNoSide[n] = src[n].etaRoofNoSide
+        dst.etaSide[n] = src[n].etaSide
+        dst.cD[n] = src[n].cD
+        dst.cW[n] = src[n].cW
+        dst.fVentRoof2[n] = src[n].fVentRoof2
+        dst.fVentRoofSide2[n] = src[n].fVentRoofSide2
+        dst.fVentSide2[n] = src[n].fVentSide2
+        dst.fLeakage[n] = src[n].fLeakage
+        dst.fVentRoof[n] = src[n].fVentRoof
+        dst.fVentSide[n] = src[n].fVentSide
+        dst.timeOfDay[n] = src[n].timeOfDay
+        dst.dayOfYear[n] = src[n].dayOfYear
+        dst.co2InPpm[n] = src[n].co2InPpm
+        dst.rhIn[n] = src[n].rhIn
+        dst.rhoTop[n] = src[n].rhoTop
+        dst.rhoAir[n] = src[n].rhoAir
+        dst.rhoAirMean[n] = src[n].rhoAirMean
+        dst.fThScr[n] = src[n].fThScr
+        dst.fBlScr[n] = src[n].fBlScr
+        dst.fScr[n] = src[n].fScr
+        dst.fVentForced[n] = src[n].fVentForced
+        dst.hCanAir[n] = src[n].hCanAir
+        dst.hAirFlr[n] = src[n].hAirFlr
+        dst.hAirThScr[n] = src[n].hAirThScr
+        dst.hAirBlScr[n] = src[n].hAirBlScr
+        dst.hAirOut[n] = src[n].hAirOut
+        dst.hAirTop[n] = src[n].hAirTop
+        dst.hThScrTop[n] = src[n].hThScrTop
+        dst.hBlScrTop[n] = src[n].hBlScrTop
+        dst.hTopCovIn[n] = src[n].hTopCovIn
+        dst.hTopOut[n] = src[n].hTopOut
+        dst.hCovEOut[n] = src[n].hCovEOut
+        dst.hPipeAir[n] = src[n].hPipeAir
+        dst.hFlrSo1[n] = src[n].hFlrSo1
+        dst.hSo1So2[n] = src[n].hSo1So2
+        dst.hSo2So3[n] = src[n].hSo2So3
+        dst.hSo3So4[n] = src[n].hSo3So4
+        dst.hSo4So5[n] = src[n].hSo4So5
+        dst.hSo5SoOut[n] = src[n].hSo5SoOut
+        dst.hCovInCovE[n] = src[n].hCovInCovE
+        dst.hLampAir[n] = src[n].hLampAir
+        dst.hGroPipeAir[n] = src[n].hGroPipeAir
+        dst.hIntLampAir[n] = src[n].hIntLampAir
+        dst.sRs[n] = src[n].sRs
+        dst.cEvap3[n] = src[n].cEvap3
+        dst.cEvap4[n] = src[n].cEvap4
+        dst.rfRCan[n] = src[n].rfRCan
+        dst.rfCo2[n] = src[n].rfCo2
+        dst.rfVp[n] = src[n].rfVp
+        dst.rS[n] = src[n].rS
+        dst.vecCanAir[n] = src[n].vecCanAir
+        dst.mvCanAir[n] = src[n].mvCanAir
+        dst.mvPadAir[n] = src[n].mvPadAir
+        dst.mvFogAir[n] = src[n].mvFogAir
+        dst.mvBlowAir[n] = src[n].mvBlowAir
+        dst.mvAirOutPad[n] = src[n].mvAirOutPad
+        dst.mvAirThScr[n] = src[n].mvAirThScr
+        dst.mvAirBlScr[n] = src[n].mvAirBlScr
+        dst.mvTopCovIn[n] = src[n].mvTopCovIn
+        dst.mvAirTop[n] = src[n].mvAirTop
+        dst.mvTopOut[n] = src[n].mvTopOut
+        dst.mvAirOut[n] = src[n].mvAirOut
+        dst.lCanAir[n] = src[n].lCanAir
+        dst.lAirThScr[n] = src[n].lAirThScr
+        dst.lAirBlScr[n] = src[n].lAirBlScr
+        dst.lTopCovIn[n] = src[n].lTopCovIn
+        dst.parCan[n] = src[n].parCan
+        dst.j25CanMax[n] = src[n].j25CanMax
+        dst.gamma[n] = src[n].gamma
+        dst.co2Stom[n] = src[n].co2Stom
+        dst.jPot[n] = src[n].jPot
+        dst.j[n] = src[n].j
+        dst.p[n] = src[n].p
+        dst.r[n] = src[n].r
+        dst.hAirBuf[n] = src[n].hAirBuf
+        dst.mcAirBuf[n] = src[n].mcAirBuf
+        dst.gTCan24[n] = src[n].gTCan24
+        dst.hTCan24[n] = src[n].hTCan24
+        dst.hTCan[n] = src[n].hTCan
+        dst.hTCanSum[n] = src[n].hTCanSum
+        dst.hBufOrg[n] = src[n].hBufOrg
+        dst.mcBufLeaf[n] = src[n].mcBufLeaf
+        dst.mcBufStem[n] = src[n].mcBufStem
+        dst.mcBufFruit[n] = src[n].mcBufFruit
+        dst.mcBufAir[n] = src[n].mcBufAir
+        dst.mcLeafAir[n] = src[n].mcLeafAir
+        dst.mcStemAir[n] = src[n].mcStemAir
+        dst.mcFruitAir[n] = src[n].mcFruitAir
+        dst.mcOrgAir[n] = src[n].mcOrgAir
+        dst.mcLeafHar[n] = src[n].mcLeafHar
+        dst.mcFruitHar[n] = src[n].mcFruitHar
+        dst.mcFruitHarSum[n] = src[n].mcFruitHarSum
+        dst.mcAirCan[n] = src[n].mcAirCan
+        dst.mcAirTop[n] = src[n].mcAirTop
+        dst.mcTopOut[n] = src[n].mcTopOut
+        dst.mcAirOut[n] = src[n].mcAirOut
+        dst.hBoilPipe[n] = src[n].hBoilPipe
+        dst.hBoilGroPipe[n] = src[n].hBoilGroPipe
+        dst.mcExtAir[n] = src[n].mcExtAir
+        dst.hLampCool[n] = src[n].hLampCool
+        dst.mcBlowAir[n] = src[n].mcBlowAir
+        dst.mcPadAir[n] = src[n].mcPadAir
+        dst.hPadAir[n] = src[n].hPadAir
+        dst.hPasAir[n] = src[n].hPasAir
+        dst.hBlowAir[n] = src[n].hBlowAir
+        dst.hAirPadOut[n] = src[n].hAirPadOut
+        dst.hAirOutPad[n] = src[n].hAirOutPad
+        dst.lAirFog[n] = src[n].lAirFog
+        dst.hIndPipe[n] = src[n].hIndPipe
+        dst.hGeoPipe[n] = src[n].hGeoPipe
+        dst.hecMechAir[n] = src[n].hecMechAir
+        dst.hAirMech[n] = src[n].hAirMech
+        dst.mvAirMech[n] = src[n].mvAirMech
+        dst.lAirMech[n] = src[n].lAirMech
+        dst.hBufHotPipe[n] = src[n].hBufHotPipe
+
+cdef inline void storeAuxStatesSoA(AuxiliaryStates* dst, AuxiliaryStatesSoA* src, unsigned int count) nogil:
+    """
+    Copies the auxiliary states of the first count greenhouses of a block back to their structs.
+    """
+    cdef unsigned int n
+    for n in range(count):
+        dst[n].tauThScrPar = src.tauThScrPar[n]
+        dst[n].rhoThScrPar = src.rhoThScrPar[n]
+        dst[n].tauCovThScrPar = src.tauCovThScrPar[n]
+        dst[n].rhoCovThScrParUp = src.rhoCovThScrParUp[n]
+        dst[n].rhoCovThScrParDn = src.rhoCovThScrParDn[n]
+        dst[n].tauThScrNir = src.tauThScrNir[n]
+        dst[n].rhoThScrNir = src.rhoThScrNir[n]
+        dst[n].tauCovThScrNir = src.tauCovThScrNir[n]
+        dst[n].rhoCovThScrNirUp = src.rhoCovThScrNirUp[n]
+        dst[n].rhoCovThScrNirDn = src.rhoCovThScrNirDn[n]
+        dst[n].tauBlScrPar = src.tauBlScrPar[n]
+        dst[n].rhoBlScrPar = src.rhoBlScrPar[n]
+        dst[n].tauCovBlScrPar = src.tauCovBlScrPar[n]
+        dst[n].rhoCovBlScrParUp = src.rhoCovBlScrParUp[n]
+        dst[n].rhoCovBlScrParDn = src.rhoCovBlScrParDn[n]
+        dst[n].tauBlScrNir = src.tauBlScrNir[n]
+        dst[n].rhoBlScrNir = src.rhoBlScrNir[n]
+        dst[n].tauCovBlScrNir = src.tauCovBlScrNir[n]
+        dst[n].rhoCovBlScrNirUp = src.rhoCovBlScrNirUp[n]
+        dst[n].rhoCovBlScrNirDn = src.rhoCovBlScrNirDn[n]
+        dst[n].tauCovPar = src.tauCovPar[n]
+        dst[n].rhoCovPar = src.rhoCovPar[n]
+        dst[n].tauCovNir = src.tauCovNir[n]
+        dst[n].rhoCovNir = src.rhoCovNir[n]
+        dst[n].tauCovFir = src.tauCovFir[n]
+        dst[n].rhoCovFir = src.rhoCovFir[n]
+        dst[n].aCovPar = src.aCovPar[n]
+        dst[n].aCovNir = src.aCovNir[n]
+        dst[n].aCovFir = src.aCovFir[n]
+        dst[n].epsCovFir = src.epsCovFir[n]
+        dst[n].capCov = src.capCov[n]
+        dst[n].lai = src.lai[n]
+        dst[n].capCan = src.capCan[n]
+        dst[n].capCovE = src.capCovE[n]
+        dst[n].capCovIn = src.capCovIn[n]
+        dst[n].capVpAir = src.capVpAir[n]
+        dst[n].capVpTop = src.capVpTop[n]
+        dst[n].qLampIn = src.qLampIn[n]
+        dst[n].qIntLampIn = src.qIntLampIn[n]
+        dst[n].rParGhSun = src.rParGhSun[n]
+        dst[n].rParGhLamp = src.rParGhLamp[n]
+        dst[n].rParGhIntLamp = src.rParGhIntLamp[n]
+        dst[n].rCanSun = src.rCanSun[n]
+        dst[n].rCanLamp = src.rCanLamp[n]
+        dst[n].rCanIntLamp = src.rCanIntLamp[n]
+        dst[n].rCan = src.rCan[n]
+        dst[n].rParSunCanDown = src.rParSunCanDown[n]
+        dst[n].rParLampCanDown = src.rParLampCanDown[n]
+        dst[n].fIntLampCanPar = src.fIntLampCanPar[n]
+        dst[n].fIntLampCanNir = src.fIntLampCanNir[n]
+        dst[n].rParIntLampCanDown = src.rParIntLampCanDown[n]
+        dst[n].rParSunFlrCanUp = src.rParSunFlrCanUp[n]
+        dst[n].rParLampFlrCanUp = src.rParLampFlrCanUp[n]
+        dst[n].rParIntLampFlrCanUp = src.rParIntLampFlrCanUp[n]
+        dst[n].rParSunCan = src.rParSunCan[n]
+        dst[n].rParLampCan = src.rParLampCan[n]
+        dst[n].rParIntLampCan = src.rParIntLampCan[n]
+        dst[n].tauHatCovNir = src.tauHatCovNir[n]
+        dst[n].tauHatFlrNir = src.tauHatFlrNir[n]
+        dst[n].tauHatCanNir = src.tauHatCanNir[n]
+        dst[n].rhoHatCanNir = src.rhoHatCanNir[n]
+        dst[n].tauHatCanParDn = src.tauHatCanParDn[n]
+        dst[n].tauHatCanParUp = src.tauHatCanParUp[n]
+        dst[n].tauHatCanFir = src.tauHatCanFir[n]
+        dst[n].tauCovCanNir = src.tauCovCanNir[n]
+        dst[n].rhoCovCanNirUp = src.rhoCovCanNirUp[n]
+        dst[n].rhoCovCanNirDn = src.rhoCovCanNirDn[n]
+        dst[n].tauCovCanFlrNir = src.tauCovCanFlrNir[n]
+        dst[n].rhoCovCanFlrNir = src.rhoCovCanFlrNir[n]
+        dst[n].aCanNir = src.aCanNir[n]
+        dst[n].aFlrNir = src.aFlrNir[n]
+        dst[n].rNirSunCan = src.rNirSunCan[n]
+        dst[n].rNirLampCan = src.rNirLampCan[n]
+        dst[n].rNirIntLampCan = src.rNirIntLampCan[n]
+        dst[n].rNirSunFlr = src.rNirSunFlr[n]
+        dst[n].rNirLampFlr = src.rNirLampFlr[n]
+        dst[n].rNirIntLampFlr = src.rNirIntLampFlr[n]
+        dst[n].rParSunFlr = src.rParSunFlr[n]
+        dst[n].rParLampFlr = src.rParLampFlr[n]
+        dst[n].rParIntLampFlr = src.rParIntLampFlr[n]
+        dst[n].rLampAir = src.rLampAir[n]
+        dst[n].rIntLampAir = src.rIntLampAir[n]
+        dst[n].rGlobSunAir = src.rGlobSunAir[n]
+        dst[n].rGlobSunCovE = src.rGlobSunCovE[n]
+        dst[n].tauThScrFirU = src.tauThScrFirU[n]
+        dst[n].tauBlScrFirU = src.tauBlScrFirU[n]
+        dst[n].aCan = src.aCan[n]
+        dst[n].rCanCovIn = src.rCanCovIn[n]
+        dst[n].rCanSky = src.rCanSky[n]
+        dst[n].rCanThScr = src.rCanThScr[n]
+        dst[n].rCanFlr = src.rCanFlr[n]
+        dst[n].rPipeCovIn = src.rPipeCovIn[n]
+        dst[n].rPipeSky = src.rPipeSky[n]
+        dst[n].rPipeThScr = src.rPipeThScr[n]
+        dst[n].rPipeFlr = src.rPipeFlr[n]
+        dst[n].rPipeCan = src.rPipeCan[n]
+        dst[n].rFlrCovIn = src.rFlrCovIn[n]
+        dst[n].rFlrSky = src.rFlrSky[n]
+        dst[n].rFlrThScr = src.rFlrThScr[n]
+        dst[n].rThScrCovIn = src.rThScrCovIn[n]
+        dst[n].rThScrSky = src.rThScrSky[n]
+        dst[n].rCovESky = src.rCovESky[n]
+        dst[n].rFirLampFlr = src.rFirLampFlr[n]
+        dst[n].rLampPipe = src.rLampPipe[n]
+        dst[n].rFirLampCan = src.rFirLampCan[n]
+        dst[n].rLampThScr = src.rLampThScr[n]
+        dst[n].rLampCovIn = src.rLampCovIn[n]
+        dst[n].rLampSky = src.rLampSky[n]
+        dst[n].rGroPipeCan = src.rGroPipeCan[n]
+        dst[n].rFlrBlScr = src.rFlrBlScr[n]
+        dst[n].rPipeBlScr = src.rPipeBlScr[n]
+        dst[n].rCanBlScr = src.rCanBlScr[n]
+        dst[n].rBlScrThScr = src.rBlScrThScr[n]
+        dst[n].rBlScrCovIn = src.rBlScrCovIn[n]
+        dst[n].rBlScrSky = src.rBlScrSky[n]
+        dst[n].rLampBlScr = src.rLampBlScr[n]
+        dst[n].fIntLampCanUp = src.fIntLampCanUp[n]
+        dst[n].fIntLampCanDown = src.fIntLampCanDown[n]
+        dst[n].rFirIntLampFlr = src.rFirIntLampFlr[n]
+        dst[n].rIntLampPipe = src.rIntLampPipe[n]
+        dst[n].rFirIntLampCan = src.rFirIntLampCan[n]
+        dst[n].rIntLampLamp = src.rIntLampLamp[n]
+        dst[n].rIntLampBlScr = src.rIntLampBlScr[n]
+        dst[n].rIntLampThScr = src.rIntLampThScr[n]
+        dst[n].rIntLampCovIn = src.rIntLampCovIn[n]
+        dst[n].rIntLampSky = src.rIntLampSky[n]
+        dst[n].aRoofU = src.aRoofU[n]
+        dst[n].aRoofUMax = src.aRoofUMax[n]
+        dst[n].aRoofMin = src.aRoofMin[n]
+        dst[n].aSideU = src.aSideU[n]
+        dst[n].etaRoof = src.etaRoof[n]
+        dst[n].etaRoofNoSide = src.etaRoofNoSide[n]
+        dst[n].etaSide = src.etaSide[n]
+        dst[n].cD = src.cD[n]
+        dst[n].cW = src.cW[n]
+        dst[n].fVentRoof2 = src.fVentRoof2[n]
+        dst[n].fVentRoofSide2 = src.fVentRoofSide2[n]
+        dst[n].fVentSide2 = src.fVentSide2[n]
+        dst[n].fLeakage = src.fLeakage[n]
+        dst[n].fVentRoof = src.fVentRoof[n]
+        dst[n].fVentSide = src.fVentSide[n]
+        dst[n].timeOfDay = src.timeOfDay[n]
+        dst[n].dayOfYear = src.dayOfYear[n]
+        dst[n].co2InPpm = src.co2InPpm[n]
+        dst[n].rhIn = src.rhIn[n]
+        dst[n].rhoTop = src.rhoTop[n]
+        dst[n].rhoAir = src.rhoAir[n]
+        dst[n].rhoAirMean = src.rhoAirMean[n]
+        dst[n].fThScr = src.fThScr[n]
+        dst[n].fBlScr = src.fBlScr[n]
+        dst[n].fScr = src.fScr[n]
+        dst[n].fVentForced = src.fVentForced[n]
+        dst[n].hCanAir = src.hCanAir[n]
+        dst[n].hAirFlr = src.hAirFlr[n]
+        dst[n].hAirThScr = src.hAirThScr[n]
+        dst[n].hAirBlScr = src.hAirBlScr[n]
+        dst[n].hAirOut = src.hAirOut[n]
+        dst[n].hAirTop = src.hAirTop[n]
+        dst[n].hThScrTop = src.hThScrTop[n]
+        dst[n].hBlScrTop = src.hBlScrTop[n]
+        dst[n].hTopCovIn = src.hTopCovIn[n]
+        dst[n].hTopOut = src.hTopOut[n]
+        dst[n].hCovEOut = src.hCovEOut[n]
+        dst[n].hPipeAir = src.hPipeAir[n]
+        dst[n].hFlrSo1 = src.hFlrSo1[n]
+        dst[n].hSo1So2 = src.hSo1So2[n]
+        dst[n].hSo2So3 = src.hSo2So3[n]
+        dst[n].hSo3So4 = src.hSo3So4[n]
+        dst[n].hSo4So5 = src.hSo4So5[n]
+        dst[n].hSo5SoOut = src.hSo5SoOut[n]
+        dst[n].hCovInCovE = src.hCovInCovE[n]
+        dst[n].hLampAir = src.hLampAir[n]
+        dst[n].hGroPipeAir = src.hGroPipeAir[n]
+        dst[n].hIntLampAir = src.hIntLampAir[n]
+        dst[n].sRs = src.sRs[n]
+        dst[n].cEvap3 = src.cEvap3[n]
+        dst[n].cEvap4 = src.cEvap4[n]
+        dst[n].rfRCan = src.rfRCan[n]
+        dst[n].rfCo2 = src.rfCo2[n]
+        dst[n].rfVp = src.rfVp[n]
+        dst[n].rS = src.rS[n]
+        dst[n].vecCanAir = src.vecCanAir[n]
+        dst[n].mvCanAir = src.mvCanAir[n]
+        dst[n].mvPadAir = src.mvPadAir[n]
+        dst[n].mvFogAir = src.mvFogAir[n]
+        dst[n].mvBlowAir = src.mvBlowAir[n]
+        dst[n].mvAirOutPad = src.mvAirOutPad[n]
+        dst[n].mvAirThScr = src.mvAirThScr[n]
+        dst[n].mvAirBlScr = src.mvAirBlScr[n]
+        dst[n].mvTopCovIn = src.mvTopCovIn[n]
+        dst[n].mvAirTop = src.mvAirTop[n]
+        dst[n].mvTopOut = src.mvTopOut[n]
+        dst[n].mvAirOut = src.mvAirOut[n]
+        dst[n].lCanAir = src.lCanAir[n]
+        dst[n].lAirThScr = src.lAirThScr[n]
+        dst[n].lAirBlScr = src.lAirBlScr[n]
+        dst[n].lTopCovIn = src.lTopCovIn[n]
+        dst[n].parCan = src.parCan[n]
+        dst[n].j25CanMax = src.j25CanMax[n]
+        dst[n].gamma = src.gamma[n]
+        dst[n].co2Stom = src.co2Stom[n]
+        dst[n].jPot = src.jPot[n]
+        dst[n].j = src.j[n]
+        dst[n].p = src.p[n]
+        dst[n].r = src.r[n]
+        dst[n].hAirBuf = src.hAirBuf[n]
+        dst[n].mcAirBuf = src.mcAirBuf[n]
+        dst[n].gTCan24 = src.gTCan24[n]
+        dst[n].hTCan24 = src.hTCan24[n]
+        dst[n].hTCan = src.hTCan[n]
+        dst[n].hTCanSum = src.hTCanSum[n]
+        dst[n].hBufOrg = src.hBufOrg[n]
+        dst[n].mcBufLeaf = src.mcBufLeaf[n]
+        dst[n].mcBufStem = src.mcBufStem[n]
+        dst[n].mcBufFruit = src.mcBufFruit[n]
+        dst[n].mcBufAir = src.mcBufAir[n]
+        dst[n].mcLeafAir = src.mcLeafAir[n]
+        dst[n].mcStemAir = src.mcStemAir[n]
+        dst[n].mcFruitAir = src.mcFruitAir[n]
+        dst[n].mcOrgAir = src.mcOrgAir[n]
+        dst[n].mcLeafHar = src.mcLeafHar[n]
+        dst[n].mcFruitHar = src.mcFruitHar[n]
+        dst[n].mcFruitHarSum = src.mcFruitHarSum[n]
+        dst[n].mcAirCan = src.mcAirCan[n]
+        dst[n].mcAirTop = src.mcAirTop[n]
+        dst[n].mcTopOut = src.mcTopOut[n]
+        dst[n].mcAirOut = src.mcAirOut[n]
+        dst[n].hBoilPipe = src.hBoilPipe[n]
+        dst[n].hBoilGroPipe = src.hBoilGroPipe[n]
+        dst[n].mcExtAir = src.mcExtAir[n]
+        dst[n].hLampCool = src.hLampCool[n]
+        dst[n].mcBlowAir = src.mcBlowAir[n]
+        dst[n].mcPadAir = src.mcPadAir[n]
+        dst[n].hPadAir = src.hPadAir[n]
+        dst[n].hPasAir = src.hPasAir[n]
+        dst[n].hBlowAir = src.hBlowAir[n]
+        dst[n].hAirPadOut = src.hAirPadOut[n]
+        dst[n].hAirOutPad = src.hAirOutPad[n]
+        dst[n].lAirFog = src.lAirFog[n]
+        dst[n].hIndPipe = src.hIndPipe[n]
+        dst[n].hGeoPipe = src.hGeoPipe[n]
+        dst[n].hecMechAir = src.hecMechAir[n]
+        dst[n].hAirMech = src.hAirMech[n]
+        dst[n].mvAirMech = src.mvAirMech[n]
+        dst[n].lAirMech = src.lAirMech[n]
+        dst[n].hBufHotPipe = src.hBufHotPipe[n]
+
+@cython.cdivision(True)
+cdef inline void updateControlsSoA(AuxiliaryStatesSoA* a, Parameters* p, double* u) nogil:
+    """
+    SoA variant of updateControls in auxiliary_states.pxd.
+    """
+    cdef unsigned int n
+    for n in range(SOA_BLOCK):
+        a.tauThScrPar[n] = 1 - u[2 * SOA_BLOCK + n] * (1 - p.tauThScrPar)
+    for n in range(SOA_BLOCK):
+        a.rhoThScrPar[n] = u[2 * SOA_BLOCK + n] * p.rhoThScrPar
+    for n in range(SOA_BLOCK):
+        a.tauCovThScrPar[n] = tau12(p.tauRfPar, a.tauThScrPar[n], p.rhoRfPar, a.rhoThScrPar[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovThScrParUp[n] = rhoUp(p.tauRfPar, p.rhoRfPar, p.rhoRfPar, a.rhoThScrPar[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovThScrParDn[n] = rhoDn(a.tauThScrPar[n], p.rhoRfPar, a.rhoThScrPar[n], a.rhoThScrPar[n])
+    for n in range(SOA_BLOCK):
+        a.tauThScrNir[n] = 1 - u[2 * SOA_BLOCK + n] * (1 - p.tauThScrNir)
+    for n in range(SOA_BLOCK):
+        a.rhoThScrNir[n] = u[2 * SOA_BLOCK + n] * p.rhoThScrNir
+    for n in range(SOA_BLOCK):
+        a.tauCovThScrNir[n] = tau12(p.tauRfNir, a.tauThScrNir[n], p.rhoRfNir, a.rhoThScrNir[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovThScrNirUp[n] = rhoUp(p.tauRfNir, p.rhoRfNir, p.rhoRfNir, a.rhoThScrNir[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovThScrNirDn[n] = rhoDn(a.tauThScrNir[n], p.rhoRfNir, a.rhoThScrNir[n], a.rhoThScrNir[n])
+    for n in range(SOA_BLOCK):
+        a.tauBlScrPar[n] = 1 - u[7 * SOA_BLOCK + n] * (1 - p.tauBlScrPar)
+    for n in range(SOA_BLOCK):
+        a.rhoBlScrPar[n] = u[7 * SOA_BLOCK + n] * p.rhoBlScrPar
+    for n in range(SOA_BLOCK):
+        a.tauCovBlScrPar[n] = tau12(a.tauCovThScrPar[n], a.tauBlScrPar[n], a.rhoCovThScrParDn[n], a.rhoBlScrPar[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovBlScrParUp[n] = rhoUp(a.tauCovThScrPar[n], a.rhoCovThScrParUp[n], a.rhoCovThScrParDn[n], a.rhoBlScrPar[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovBlScrParDn[n] = rhoDn(a.tauBlScrPar[n], a.rhoCovThScrParDn[n], a.rhoBlScrPar[n], a.rhoBlScrPar[n])
+    for n in range(SOA_BLOCK):
+        a.tauBlScrNir[n] = 1 - u[7 * SOA_BLOCK + n] * (1 - p.tauBlScrNir)
+    for n in range(SOA_BLOCK):
+        a.rhoBlScrNir[n] = u[7 * SOA_BLOCK + n] * p.rhoBlScrNir
+    for n in range(SOA_BLOCK):
+        a.tauCovBlScrNir[n] = tau12(a.tauCovThScrNir[n], a.tauBlScrNir[n], a.rhoCovThScrNirDn[n], a.rhoBlScrNir[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovBlScrNirUp[n] = rhoUp(a.tauCovThScrNir[n], a.rhoCovThScrNirUp[n], a.rhoCovThScrNirDn[n], a.rhoBlScrNir[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovBlScrNirDn[n] = rhoDn(a.tauBlScrNir[n], a.rhoCovThScrNirDn[n], a.rhoBlScrNir[n], a.rhoBlScrNir[n])
+    for n in range(SOA_BLOCK):
+        a.tauCovPar[n] = tau12(a.tauCovBlScrPar[n], p.tauLampPar, a.rhoCovBlScrParDn[n], p.rhoLampPar)
+    for n in range(SOA_BLOCK):
+        a.rhoCovPar[n] = rhoUp(a.tauCovBlScrPar[n], a.rhoCovBlScrParUp[n], a.rhoCovBlScrParDn[n], p.rhoLampPar)
+    for n in range(SOA_BLOCK):
+        a.tauCovNir[n] = tau12(a.tauCovBlScrNir[n], p.tauLampNir, a.rhoCovBlScrNirDn[n], p.rhoLampNir)
+    for n in range(SOA_BLOCK):
+        a.rhoCovNir[n] = rhoUp(a.tauCovBlScrNir[n], a.rhoCovBlScrNirUp[n], a.rhoCovBlScrNirDn[n], p.rhoLampNir)
+    for n in range(SOA_BLOCK):
+        a.tauCovFir[n] = p.tauRfFir
+    for n in range(SOA_BLOCK):
+        a.rhoCovFir[n] = p.rhoRfFir
+    for n in range(SOA_BLOCK):
+        a.aCovPar[n] = 1 - a.tauCovPar[n] - a.rhoCovPar[n]
+    for n in range(SOA_BLOCK):
+        a.aCovNir[n] = 1 - a.tauCovNir[n] - a.rhoCovNir[n]
+    for n in range(SOA_BLOCK):
+        a.aCovFir[n] = 1 - a.tauCovFir[n] - a.rhoCovFir[n]
+    for n in range(SOA_BLOCK):
+        a.epsCovFir[n] = a.aCovFir[n]
+    for n in range(SOA_BLOCK):
+        a.capCov[n] = cos(rad2degrees(p.psi)) * p.hRf * p.rhoRf * p.cPRf
+    for n in range(SOA_BLOCK):
+        a.capCovE[n] = 0.1 * a.capCov[n]
+    for n in range(SOA_BLOCK):
+        a.capCovIn[n] = 0.1 * a.capCov[n]
+    for n in range(SOA_BLOCK):
+        a.qLampIn[n] = p.thetaLampMax * u[4 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        a.qIntLampIn[n] = p.thetaIntLampMax * u[5 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        a.rParGhLamp[n] = p.etaLampPar * a.qLampIn[n]
+    for n in range(SOA_BLOCK):
+        a.rParGhIntLamp[n] = p.etaIntLampPar * a.qIntLampIn[n]
+    for n in range(SOA_BLOCK):
+        a.rCanLamp[n] = (p.etaLampPar + p.etaLampNir) * a.qLampIn[n]
+    for n in range(SOA_BLOCK):
+        a.rCanIntLamp[n] = (p.etaIntLampPar + p.etaIntLampNir) * a.qIntLampIn[n]
+    for n in range(SOA_BLOCK):
+        a.tauHatCovNir[n] = 1 - a.rhoCovNir[n]
+    for n in range(SOA_BLOCK):
+        a.tauHatFlrNir[n] = 1 - p.rhoFlrNir
+    for n in range(SOA_BLOCK):
+        a.tauThScrFirU[n] = 1 - u[2 * SOA_BLOCK + n] * (1 - p.tauThScrFir)
+    for n in range(SOA_BLOCK):
+        a.tauBlScrFirU[n] = 1 - u[7 * SOA_BLOCK + n] * (1 - p.tauBlScrFir)
+    for n in range(SOA_BLOCK):
+        a.aRoofU[n] = u[3 * SOA_BLOCK + n] * p.aRoof
+    for n in range(SOA_BLOCK):
+        a.aRoofUMax[n] = p.aRoof
+    for n in range(SOA_BLOCK):
+        a.aRoofMin[n] = 0
+    for n in range(SOA_BLOCK):
+        a.aSideU[n] = 0
+    for n in range(SOA_BLOCK):
+        a.etaRoof[n] = 1
+    for n in range(SOA_BLOCK):
+        a.etaRoofNoSide[n] = 1
+    for n in range(SOA_BLOCK):
+        a.etaSide[n] = 0
+    for n in range(SOA_BLOCK):
+        a.cD[n] = p.cDgh
+    for n in range(SOA_BLOCK):
+        a.cW[n] = p.cWgh
+    for n in range(SOA_BLOCK):
+        a.fVentSide2[n] = 0
+    for n in range(SOA_BLOCK):
+        a.fVentForced[n] = 0
+    for n in range(SOA_BLOCK):
+        a.mvPadAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.mvFogAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.mvBlowAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.mvAirOutPad[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hBoilPipe[n] = u[0 * SOA_BLOCK + n] * p.pBoil / p.aFlr
+    for n in range(SOA_BLOCK):
+        a.hBoilGroPipe[n] = u[6 * SOA_BLOCK + n] * p.pBoilGro / p.aFlr
+    for n in range(SOA_BLOCK):
+        a.mcExtAir[n] = u[1 * SOA_BLOCK + n] * p.phiExtCo2 / p.aFlr
+    for n in range(SOA_BLOCK):
+        a.mcBlowAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.mcPadAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hPadAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hPasAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hBlowAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hAirPadOut[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hAirOutPad[n] = 0
+    for n in range(SOA_BLOCK):
+        a.lAirFog[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hIndPipe[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hGeoPipe[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hLampCool[n] = p.etaLampCool * a.qLampIn[n]
+    for n in range(SOA_BLOCK):
+        a.hecMechAir[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hAirMech[n] = 0
+    for n in range(SOA_BLOCK):
+        a.mvAirMech[n] = 0
+    for n in range(SOA_BLOCK):
+        a.lAirMech[n] = 0
+    for n in range(SOA_BLOCK):
+        a.hBufHotPipe[n] = 0
+
+@cython.cdivision(True)
+cdef inline void updateSlowSoA(AuxiliaryStatesSoA* a, Parameters* p, double* u, double* x) nogil:
+    """
+    SoA variant of updateSlow in auxiliary_states.pxd.
+    """
+    cdef unsigned int n
+    for n in range(SOA_BLOCK):
+        a.lai[n] = p.sla * x[23 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        a.tauHatCanParDn[n] = exp(-p.k1Par * a.lai[n])
+    for n in range(SOA_BLOCK):
+        a.tauHatCanParUp[n] = exp(-p.k2Par * a.lai[n])
+    for n in range(SOA_BLOCK):
+        a.tauHatCanFir[n] = exp(-p.kFir * a.lai[n])
+    for n in range(SOA_BLOCK):
+        a.capCan[n] = p.capLeaf * a.lai[n]
+    for n in range(SOA_BLOCK):
+        a.rParLampCanDown[n] = a.rParGhLamp[n] * (1 - p.rhoCanPar) * (1 - a.tauHatCanParDn[n])
+    for n in range(SOA_BLOCK):
+        a.fIntLampCanPar[n] = 1 - p.fIntLampDown * exp(-p.k1IntPar * p.vIntLampPos * a.lai[n]) + (p.fIntLampDown - 1) * exp(p.negK1IntParUp * a.lai[n])
+    for n in range(SOA_BLOCK):
+        a.fIntLampCanNir[n] = 1 - p.fIntLampDown * exp(-p.kIntNir * p.vIntLampPos * a.lai[n]) + (p.fIntLampDown - 1) * exp(p.negKIntNirUp * a.lai[n])
+    for n in range(SOA_BLOCK):
+        a.rParIntLampCanDown[n] = a.rParGhIntLamp[n] * a.fIntLampCanPar[n] * (1 - p.rhoCanPar)
+    for n in range(SOA_BLOCK):
+        a.rParLampFlrCanUp[n] = a.rParGhLamp[n] * a.tauHatCanParDn[n] * p.rhoFlrPar * (1 - p.rhoCanPar) * (1 - a.tauHatCanParUp[n])
+    for n in range(SOA_BLOCK):
+        a.rParIntLampFlrCanUp[n] = a.rParGhIntLamp[n] * p.fIntLampDown * exp(-p.k1IntPar * p.vIntLampPos * a.lai[n]) * p.rhoFlrPar * (1 - p.rhoCanPar) * (1 - exp(-p.k2IntPar * a.lai[n]))
+    for n in range(SOA_BLOCK):
+        a.rParLampCan[n] = a.rParLampCanDown[n] + a.rParLampFlrCanUp[n]
+    for n in range(SOA_BLOCK):
+        a.rParIntLampCan[n] = a.rParIntLampCanDown[n] + a.rParIntLampFlrCanUp[n]
+    for n in range(SOA_BLOCK):
+        a.tauHatCanNir[n] = exp(-p.kNir * a.lai[n])
+    for n in range(SOA_BLOCK):
+        a.rhoHatCanNir[n] = p.rhoCanNir * (1 - a.tauHatCanNir[n])
+    for n in range(SOA_BLOCK):
+        a.tauCovCanNir[n] = tau12(a.tauHatCovNir[n], a.tauHatCanNir[n], a.rhoCovNir[n], a.rhoHatCanNir[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovCanNirUp[n] = rhoUp(a.tauHatCanNir[n], a.rhoCovNir[n], a.rhoCovNir[n], a.rhoHatCanNir[n])
+    for n in range(SOA_BLOCK):
+        a.rhoCovCanNirDn[n] = rhoDn(a.tauHatCanNir[n], a.rhoCovNir[n], a.rhoHatCanNir[n], a.rhoHatCanNir[n])
+    for n in range(SOA_BLOCK):
+        a.tauCovCanFlrNir[n] = tau12(a.tauCovCanNir[n], a.tauHatFlrNir[n], a.rhoCovCanNirDn[n], p.rhoFlrNir)
+    for n in range(SOA_BLOCK):
+        a.rhoCovCanFlrNir[n] = rhoUp(a.tauCovCanNir[n], a.rhoCovCanNirUp[n], a.rhoCovCanNirDn[n], p.rhoFlrNir)
+    for n in range(SOA_BLOCK):
+        a.aCanNir[n] = 1 - a.tauCovCanFlrNir[n] - a.rhoCovCanFlrNir[n]
+    for n in range(SOA_BLOCK):
+        a.aFlrNir[n] = a.tauCovCanFlrNir[n]
+    for n in range(SOA_BLOCK):
+        a.rNirLampCan[n] = p.etaLampNir * a.qLampIn[n] * (1 - p.rhoCanNir) * (1 - exp(-p.kNir * a.lai[n]))
+    for n in range(SOA_BLOCK):
+        a.rNirIntLampCan[n] = p.etaIntLampNir * a.qIntLampIn[n] * a.fIntLampCanNir[n] * (1 - p.rhoCanNir)
+    for n in range(SOA_BLOCK):
+        a.rNirLampFlr[n] = (1 - p.rhoFlrNir) * exp(-p.kNir * a.lai[n]) * p.etaLampNir * a.qLampIn[n]
+    for n in range(SOA_BLOCK):
+        a.rNirIntLampFlr[n] = p.fIntLampDownFlrNir * exp(-p.kIntNir * a.lai[n] * p.vIntLampPos) * p.etaIntLampNir * a.qIntLampIn[n]
+    for n in range(SOA_BLOCK):
+        a.rParLampFlr[n] = (1 - p.rhoFlrPar) * a.tauHatCanParDn[n] * a.rParGhLamp[n]
+    for n in range(SOA_BLOCK):
+        a.rParIntLampFlr[n] = a.rParGhIntLamp[n] * p.fIntLampDown * (1 - p.rhoFlrPar) * exp(-p.k1IntPar * a.lai[n] * p.vIntLampPos)
+    for n in range(SOA_BLOCK):
+        a.rLampAir[n] = (p.etaLampPar + p.etaLampNir) * a.qLampIn[n] - a.rParLampCan[n] - a.rNirLampCan[n] - a.rParLampFlr[n] - a.rNirLampFlr[n]
+    for n in range(SOA_BLOCK):
+        a.rIntLampAir[n] = (p.etaIntLampPar + p.etaIntLampNir) * a.qIntLampIn[n] - a.rParIntLampCan[n] - a.rNirIntLampCan[n] - a.rParIntLampFlr[n] - a.rNirIntLampFlr[n]
+    for n in range(SOA_BLOCK):
+        a.aCan[n] = 1 - a.tauHatCanFir[n]
+    for n in range(SOA_BLOCK):
+        a.fIntLampCanUp[n] = 1 - exp(p.negKIntFirUp * a.lai[n])
+    for n in range(SOA_BLOCK):
+        a.fIntLampCanDown[n] = 1 - exp(-p.kIntFir * p.vIntLampPos * a.lai[n])
+    for n in range(SOA_BLOCK):
+        a.hSo1So2[n] = sensible(p.hecSo1So2, x[10 * SOA_BLOCK + n], x[11 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hSo2So3[n] = sensible(p.hecSo2So3, x[11 * SOA_BLOCK + n], x[12 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hSo3So4[n] = sensible(p.hecSo3So4, x[12 * SOA_BLOCK + n], x[13 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hSo4So5[n] = sensible(p.hecSo4So5, x[13 * SOA_BLOCK + n], x[14 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.j25CanMax[n] = a.lai[n] * p.j25LeafMax
+    for n in range(SOA_BLOCK):
+        a.hAirBuf[n] = 1.0 / (1 + exp(0.0005 * (x[22 * SOA_BLOCK + n] - p.cBufMax)))
+    for n in range(SOA_BLOCK):
+        a.gTCan24[n] = 0.047 * x[21 * SOA_BLOCK + n] + 0.06
+    for n in range(SOA_BLOCK):
+        a.hTCan24[n] = 1.0 / (1 + exp(-1.1587 * (x[21 * SOA_BLOCK + n] - p.tCan24Min))) * 1 / (1 + exp(1.3904 * (x[21 * SOA_BLOCK + n] - p.tCan24Max)))
+    for n in range(SOA_BLOCK):
+        a.hTCanSum[n] = 0.5 * (x[26 * SOA_BLOCK + n] / p.tEndSum + sqrt((x[26 * SOA_BLOCK + n] / p.tEndSum) ** 2 + 0.0001)) - 0.5 * ((x[26 * SOA_BLOCK + n] - p.tEndSum) / p.tEndSum + sqrt(((x[26 * SOA_BLOCK + n] - p.tEndSum) / p.tEndSum) ** 2 + 0.0001))
+    for n in range(SOA_BLOCK):
+        a.hBufOrg[n] = 1.0 / (1 + exp(-0.005 * (x[22 * SOA_BLOCK + n] - p.cBufMin)))
+    for n in range(SOA_BLOCK):
+        a.mcBufLeaf[n] = a.hBufOrg[n] * a.hTCan24[n] * a.gTCan24[n] * p.rgLeaf
+    for n in range(SOA_BLOCK):
+        a.mcBufStem[n] = a.hBufOrg[n] * a.hTCan24[n] * a.gTCan24[n] * p.rgStem
+    for n in range(SOA_BLOCK):
+        a.mcLeafAir[n] = p.fRgrMaint * pow(p.q10m, 0.1 * (x[21 * SOA_BLOCK + n] - 25)) * x[23 * SOA_BLOCK + n] * p.cLeafM
+    for n in range(SOA_BLOCK):
+        a.mcStemAir[n] = p.fRgrMaint * pow(p.q10m, 0.1 * (x[21 * SOA_BLOCK + n] - 25)) * x[24 * SOA_BLOCK + n] * p.cStemM
+    for n in range(SOA_BLOCK):
+        a.mcFruitAir[n] = p.fRgrMaint * pow(p.q10m, 0.1 * (x[21 * SOA_BLOCK + n] - 25)) * x[25 * SOA_BLOCK + n] * p.cFruitM
+    for n in range(SOA_BLOCK):
+        a.mcOrgAir[n] = a.mcLeafAir[n] + a.mcStemAir[n] + a.mcFruitAir[n]
+    for n in range(SOA_BLOCK):
+        a.mcLeafHar[n] = smoothHar(x[23 * SOA_BLOCK + n], p.cLeafMax, 10000.0, 50000.0)
+    for n in range(SOA_BLOCK):
+        a.mcFruitHar[n] = smoothHar(x[25 * SOA_BLOCK + n], p.cFruitMax, 10000.0, 50000.0)
+
+@cython.cdivision(True)
+cdef inline void updateWeatherSoA(AuxiliaryStatesSoA* a, Parameters* p, double* u, double* d) nogil:
+    """
+    SoA variant of updateWeather in auxiliary_states.pxd.
+    """
+    cdef unsigned int n
+    for n in range(SOA_BLOCK):
+        a.rParGhSun[n] = (1 - p.etaGlobAir) * a.tauCovPar[n] * p.etaGlobPar * d[0 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        a.rCanSun[n] = (1 - p.etaGlobAir) * d[0 * SOA_BLOCK + n] * (p.etaGlobPar * a.tauCovPar[n] + p.etaGlobNir * a.tauCovNir[n])
+    for n in range(SOA_BLOCK):
+        a.rCan[n] = a.rCanSun[n] + a.rCanLamp[n] + a.rCanIntLamp[n]
+    for n in range(SOA_BLOCK):
+        a.rGlobSunCovE[n] = (a.aCovPar[n] * p.etaGlobPar + a.aCovNir[n] * p.etaGlobNir) * d[0 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        if d[4 * SOA_BLOCK + n] < p.minWind:
+            a.fLeakage[n] = p.minWind * p.cLeakage
+        else:
+            a.fLeakage[n] = p.cLeakage * d[4 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        a.sRs[n] = 1.0 / (1 + exp(p.sRs * (a.rCan[n] - p.rCanSp)))
+    for n in range(SOA_BLOCK):
+        a.cEvap3[n] = p.cEvap3Night * (1 - a.sRs[n]) + p.cEvap3Day * a.sRs[n]
+    for n in range(SOA_BLOCK):
+        a.cEvap4[n] = p.cEvap4Night * (1 - a.sRs[n]) + p.cEvap4Day * a.sRs[n]
+    for n in range(SOA_BLOCK):
+        a.rfRCan[n] = (a.rCan[n] + p.cEvap1) / (a.rCan[n] + p.cEvap2)
+
+@cython.cdivision(True)
+cdef inline void updateFastSoA(AuxiliaryStatesSoA* a, Parameters* p, double* u, double* x, double* d) nogil:
+    """
+    SoA variant of updateFast in auxiliary_states.pxd.
+    """
+    cdef unsigned int n
+    for n in range(SOA_BLOCK):
+        a.capVpAir[n] = p.mWater * p.hAir / (p.R * (x[2 * SOA_BLOCK + n] + 273.15))
+    for n in range(SOA_BLOCK):
+        a.capVpTop[n] = p.mWaterHTop / (p.R * (x[3 * SOA_BLOCK + n] + 273.15))
+    for n in range(SOA_BLOCK):
+        a.rParSunCanDown[n] = a.rParGhSun[n] * (1 - p.rhoCanPar) * (1 - a.tauHatCanParDn[n])
+    for n in range(SOA_BLOCK):
+        a.rParSunFlrCanUp[n] = a.rParGhSun[n] * a.tauHatCanParDn[n] * p.rhoFlrPar * (1 - p.rhoCanPar) * (1 - a.tauHatCanParUp[n])
+    for n in range(SOA_BLOCK):
+        a.rParSunCan[n] = a.rParSunCanDown[n] + a.rParSunFlrCanUp[n]
+    for n in range(SOA_BLOCK):
+        a.rNirSunCan[n] = (1 - p.etaGlobAir) * a.aCanNir[n] * p.etaGlobNir * d[0 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        a.rNirSunFlr[n] = (1 - p.etaGlobAir) * a.aFlrNir[n] * p.etaGlobNir * d[0 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        a.rParSunFlr[n] = (1 - p.rhoFlrPar) * a.tauHatCanParDn[n] * a.rParGhSun[n]
+    for n in range(SOA_BLOCK):
+        a.rGlobSunAir[n] = p.etaGlobAir * d[0 * SOA_BLOCK + n] * (a.tauCovPar[n] * p.etaGlobPar + (a.aCanNir[n] + a.aFlrNir[n]) * p.etaGlobNir)
+    for n in range(SOA_BLOCK):
+        a.rCanCovIn[n] = fir(a.aCan[n], p.epsCan, a.epsCovFir[n], p.tauLampFir * a.tauThScrFirU[n] * a.tauBlScrFirU[n], x[4 * SOA_BLOCK + n], x[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rCanSky[n] = fir(a.aCan[n], p.epsCan, p.epsSky, p.tauLampFir * a.tauCovFir[n] * a.tauThScrFirU[n] * a.tauBlScrFirU[n], x[4 * SOA_BLOCK + n], d[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rCanThScr[n] = fir(a.aCan[n], p.epsCan, p.epsThScrFir, p.tauLampFir * u[2 * SOA_BLOCK + n] * a.tauBlScrFirU[n], x[4 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rCanFlr[n] = fir(a.aCan[n], p.epsCan, p.epsFlr, p.fCanFlr, x[4 * SOA_BLOCK + n], x[8 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rPipeCovIn[n] = fir(p.aPipe, p.epsPipe, a.epsCovFir[n], p.tauIntLampFir * p.tauLampFir * a.tauThScrFirU[n] * a.tauBlScrFirU[n] * 0.49 * a.tauHatCanFir[n], x[9 * SOA_BLOCK + n], x[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rPipeSky[n] = fir(p.aPipe, p.epsPipe, p.epsSky, p.tauIntLampFir * p.tauLampFir * a.tauCovFir[n] * a.tauThScrFirU[n] * 0.49 * a.tauHatCanFir[n], x[9 * SOA_BLOCK + n], d[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rPipeThScr[n] = fir(p.aPipe, p.epsPipe, p.epsThScrFir, p.tauIntLampFir * p.tauLampFir * u[2 * SOA_BLOCK + n] * a.tauBlScrFirU[n] * 0.49 * a.tauHatCanFir[n], x[9 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rPipeFlr[n] = fir(p.aPipe, p.epsPipe, p.epsFlr, 0.49, x[9 * SOA_BLOCK + n], x[8 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rPipeCan[n] = fir(p.aPipe, p.epsPipe, p.epsCan, 0.49 * (1 - a.tauHatCanFir[n]), x[9 * SOA_BLOCK + n], x[4 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rFlrCovIn[n] = fir(1, p.epsFlr, a.epsCovFir[n], p.tauIntLampFir * p.tauLampFir * a.tauThScrFirU[n] * a.tauBlScrFirU[n] * p.fNoPipe * a.tauHatCanFir[n], x[8 * SOA_BLOCK + n], x[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rFlrSky[n] = fir(1, p.epsFlr, p.epsSky, p.tauIntLampFir * p.tauLampFir * a.tauCovFir[n] * a.tauThScrFirU[n] * a.tauBlScrFirU[n] * p.fNoPipe * a.tauHatCanFir[n], x[8 * SOA_BLOCK + n], d[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rFlrThScr[n] = fir(1, p.epsFlr, p.epsThScrFir, p.tauIntLampFir * p.tauLampFir * u[2 * SOA_BLOCK + n] * a.tauBlScrFirU[n] * p.fNoPipe * a.tauHatCanFir[n], x[8 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rThScrCovIn[n] = fir(1, p.epsThScrFir, a.epsCovFir[n], u[2 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n], x[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rThScrSky[n] = fir(1, p.epsThScrFir, p.epsSky, a.tauCovFir[n] * u[2 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n], d[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rCovESky[n] = fir(1, a.aCovFir[n], p.epsSky, 1, x[6 * SOA_BLOCK + n], d[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rFirLampFlr[n] = fir(p.aLamp, p.epsLampBottom, p.epsFlr, p.tauIntLampFirNoPipe * a.tauHatCanFir[n], x[17 * SOA_BLOCK + n], x[8 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rLampPipe[n] = fir(p.aLamp, p.epsLampBottom, p.epsPipe, p.tauIntLampFirPipe * a.tauHatCanFir[n], x[17 * SOA_BLOCK + n], x[9 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rFirLampCan[n] = fir(p.aLamp, p.epsLampBottom, p.epsCan, a.aCan[n], x[17 * SOA_BLOCK + n], x[4 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rLampThScr[n] = fir(p.aLamp, p.epsLampTop, p.epsThScrFir, u[2 * SOA_BLOCK + n] * a.tauBlScrFirU[n], x[17 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rLampCovIn[n] = fir(p.aLamp, p.epsLampTop, a.epsCovFir[n], a.tauThScrFirU[n] * a.tauBlScrFirU[n], x[17 * SOA_BLOCK + n], x[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rLampSky[n] = fir(p.aLamp, p.epsLampTop, p.epsSky, a.tauCovFir[n] * a.tauThScrFirU[n] * a.tauBlScrFirU[n], x[17 * SOA_BLOCK + n], d[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rGroPipeCan[n] = fir(p.aGroPipe, p.epsGroPipe, p.epsCan, 1, x[19 * SOA_BLOCK + n], x[4 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rFlrBlScr[n] = fir(1, p.epsFlr, p.epsBlScrFir, p.tauIntLampFir * p.tauLampFir * u[7 * SOA_BLOCK + n] * p.fNoPipe * a.tauHatCanFir[n], x[8 * SOA_BLOCK + n], x[20 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rPipeBlScr[n] = fir(p.aPipe, p.epsPipe, p.epsBlScrFir, p.tauIntLampFir * p.tauLampFir * u[7 * SOA_BLOCK + n] * 0.49 * a.tauHatCanFir[n], x[9 * SOA_BLOCK + n], x[20 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rCanBlScr[n] = fir(a.aCan[n], p.epsCan, p.epsBlScrFir, p.tauLampFir * u[7 * SOA_BLOCK + n], x[4 * SOA_BLOCK + n], x[20 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rBlScrThScr[n] = fir(u[7 * SOA_BLOCK + n], p.epsBlScrFir, p.epsThScrFir, u[2 * SOA_BLOCK + n], x[20 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rBlScrCovIn[n] = fir(u[7 * SOA_BLOCK + n], p.epsBlScrFir, a.epsCovFir[n], a.tauThScrFirU[n], x[20 * SOA_BLOCK + n], x[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rBlScrSky[n] = fir(u[7 * SOA_BLOCK + n], p.epsBlScrFir, p.epsSky, a.tauCovFir[n] * a.tauThScrFirU[n], x[20 * SOA_BLOCK + n], d[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rLampBlScr[n] = fir(p.aLamp, p.epsLampTop, p.epsBlScrFir, u[7 * SOA_BLOCK + n], x[17 * SOA_BLOCK + n], x[20 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rFirIntLampFlr[n] = fir(p.aIntLamp, p.epsIntLamp, p.epsFlr, p.fNoPipe * (1 - a.fIntLampCanDown[n]), x[18 * SOA_BLOCK + n], x[8 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rIntLampPipe[n] = fir(p.aIntLamp, p.epsIntLamp, p.epsPipe, p.fPipe * (1 - a.fIntLampCanDown[n]), x[18 * SOA_BLOCK + n], x[9 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rFirIntLampCan[n] = fir(p.aIntLamp, p.epsIntLamp, p.epsCan, a.fIntLampCanDown[n] + a.fIntLampCanUp[n], x[18 * SOA_BLOCK + n], x[4 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rIntLampLamp[n] = fir(p.aIntLamp, p.epsIntLamp, p.epsLampBottom, (1 - a.fIntLampCanUp[n]) * p.aLamp, x[18 * SOA_BLOCK + n], x[17 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rIntLampBlScr[n] = fir(p.aIntLamp, p.epsIntLamp, p.epsBlScrFir, u[7 * SOA_BLOCK + n] * p.tauLampFir * (1 - a.fIntLampCanUp[n]), x[18 * SOA_BLOCK + n], x[20 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rIntLampThScr[n] = fir(p.aIntLamp, p.epsIntLamp, p.epsThScrFir, u[2 * SOA_BLOCK + n] * a.tauBlScrFirU[n] * p.tauLampFir * (1 - a.fIntLampCanUp[n]), x[18 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rIntLampCovIn[n] = fir(p.aIntLamp, p.epsIntLamp, a.epsCovFir[n], a.tauThScrFirU[n] * a.tauBlScrFirU[n] * p.tauLampFir * (1 - a.fIntLampCanUp[n]), x[18 * SOA_BLOCK + n], x[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.rIntLampSky[n] = fir(p.aIntLamp, p.epsIntLamp, p.epsSky, a.tauCovFir[n] * a.tauThScrFirU[n] * a.tauBlScrFirU[n] * p.tauLampFir * (1 - a.fIntLampCanUp[n]), x[18 * SOA_BLOCK + n], d[5 * SOA_BLOCK + n], p.sigma)
+    for n in range(SOA_BLOCK):
+        a.fVentRoof2[n] = u[3 * SOA_BLOCK + n] * p.aRoof * a.cD[n] / (2 * p.aFlr) * sqrt(fabs(p.g * p.hVent * (x[2 * SOA_BLOCK + n] - d[1 * SOA_BLOCK + n]) / (2 * (0.5 * x[2 * SOA_BLOCK + n] + 0.5 * d[1 * SOA_BLOCK + n] + 273.15)) + a.cW[n] * d[4 * SOA_BLOCK + n] ** 2))
+    for n in range(SOA_BLOCK):
+        a.fVentRoofSide2[n] = a.cD[n] / p.aFlr * sqrt((a.aRoofU[n] * a.aSideU[n] / sqrt(fmax(a.aRoofU[n] ** 2 + a.aSideU[n] ** 2, 0.01))) ** 2 * (p.twoGHSideRoof * (x[2 * SOA_BLOCK + n] - d[1 * SOA_BLOCK + n]) / (0.5 * x[2 * SOA_BLOCK + n] + +0.5 * d[1 * SOA_BLOCK + n] + 273.15)) + (a.aRoofU[n] + a.aSideU[n] / 2.0) ** 2 * a.cW[n] * d[4 * SOA_BLOCK + n] ** 2)
+    for n in range(SOA_BLOCK):
+        if a.etaRoof[n] >= p.etaRoofThr:
+            a.fVentRoof[n] = p.etaInsScr * a.fVentRoof2[n] + p.cLeakTop * a.fLeakage[n]
+        else:
+            a.fVentRoof[n] = p.etaInsScr * (fmax(u[2 * SOA_BLOCK + n], u[7 * SOA_BLOCK + n]) * a.fVentRoof2[n] + (1 - fmax(u[2 * SOA_BLOCK + n], u[7 * SOA_BLOCK + n])) * a.fVentRoofSide2[n] * a.etaRoof[n]) + p.cLeakTop * a.fLeakage[n]
+    for n in range(SOA_BLOCK):
+        if a.etaRoof[n] >= p.etaRoofThr:
+            a.fVentSide[n] = p.etaInsScr * a.fVentSide2[n] + (1 - p.cLeakTop) * a.fLeakage[n]
+        else:
+            a.fVentSide[n] = p.etaInsScr * (fmax(u[2 * SOA_BLOCK + n], u[7 * SOA_BLOCK + n]) * a.fVentSide2[n] + (1 - fmax(u[2 * SOA_BLOCK + n], u[7 * SOA_BLOCK + n])) * a.fVentRoofSide2[n] * a.etaSide[n]) + (1 - p.cLeakTop) * a.fLeakage[n]
+    for n in range(SOA_BLOCK):
+        a.timeOfDay[n] = 24 * (x[27 * SOA_BLOCK + n] - floor(x[27 * SOA_BLOCK + n]))
+    for n in range(SOA_BLOCK):
+        a.dayOfYear[n] = x[27 * SOA_BLOCK + n] % 365.2425
+    for n in range(SOA_BLOCK):
+        a.co2InPpm[n] = co2dens2ppm(x[2 * SOA_BLOCK + n], 1e-06 * x[0 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.rhIn[n] = 100 * x[15 * SOA_BLOCK + n] / satVp(x[2 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.rhoTop[n] = p.mAir * p.pressure / ((x[3 * SOA_BLOCK + n] + 273.15) * p.R)
+    for n in range(SOA_BLOCK):
+        a.rhoAir[n] = p.mAir * p.pressure / ((x[2 * SOA_BLOCK + n] + 273.15) * p.R)
+    for n in range(SOA_BLOCK):
+        a.rhoAirMean[n] = 0.5 * (a.rhoTop[n] + a.rhoAir[n])
+    for n in range(SOA_BLOCK):
+        a.fThScr[n] = u[2 * SOA_BLOCK + n] * p.kThScr * pow(fabs(x[2 * SOA_BLOCK + n] - x[3 * SOA_BLOCK + n]), <real>(0.66)) + (1 - u[2 * SOA_BLOCK + n]) / a.rhoAirMean[n] * sqrt(0.5 * a.rhoAirMean[n] * (1 - u[2 * SOA_BLOCK + n]) * p.g * fabs(a.rhoAir[n] - a.rhoTop[n]))
+    for n in range(SOA_BLOCK):
+        a.fBlScr[n] = u[7 * SOA_BLOCK + n] * p.kBlScr * pow(fabs(x[2 * SOA_BLOCK + n] - x[3 * SOA_BLOCK + n]), <real>(0.66)) + (1 - u[7 * SOA_BLOCK + n]) / a.rhoAirMean[n] * sqrt(0.5 * a.rhoAirMean[n] * (1 - u[7 * SOA_BLOCK + n]) * p.g * fabs(a.rhoAir[n] - a.rhoTop[n]))
+    for n in range(SOA_BLOCK):
+        a.fScr[n] = fmin(a.fThScr[n], a.fBlScr[n])
+    for n in range(SOA_BLOCK):
+        a.hCanAir[n] = sensible(2 * p.alfaLeafAir * a.lai[n], x[4 * SOA_BLOCK + n], x[2 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        if x[8 * SOA_BLOCK + n] > x[2 * SOA_BLOCK + n]:
+            a.hAirFlr[n] = sensible(1.7 * pow(fabs(x[8 * SOA_BLOCK + n] - x[2 * SOA_BLOCK + n]), <real>(1.0 / 3.0)), x[2 * SOA_BLOCK + n], x[8 * SOA_BLOCK + n])
+        else:
+            a.hAirFlr[n] = sensible(1.3 * pow(fabs(x[2 * SOA_BLOCK + n] - x[8 * SOA_BLOCK + n]), <real>(1.0 / 4.0)), x[2 * SOA_BLOCK + n], x[8 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hAirThScr[n] = sensible(1.7 * u[2 * SOA_BLOCK + n] * pow(fabs(x[2 * SOA_BLOCK + n] - x[7 * SOA_BLOCK + n]), <real>(1.0 / 3.0)), x[2 * SOA_BLOCK + n], x[7 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hAirBlScr[n] = sensible(1.7 * u[7 * SOA_BLOCK + n] * pow(fabs(x[2 * SOA_BLOCK + n] - x[20 * SOA_BLOCK + n]), <real>(1.0 / 3.0)), x[2 * SOA_BLOCK + n], x[20 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hAirOut[n] = sensible(p.rhoAir * p.cPAir * (a.fVentSide[n] + a.fVentForced[n]), x[2 * SOA_BLOCK + n], d[1 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hAirTop[n] = sensible(p.rhoAir * p.cPAir * a.fScr[n], x[2 * SOA_BLOCK + n], x[3 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hThScrTop[n] = sensible(1.7 * u[2 * SOA_BLOCK + n] * pow(fabs(x[7 * SOA_BLOCK + n] - x[3 * SOA_BLOCK + n]), <real>(1.0 / 3.0)), x[7 * SOA_BLOCK + n], x[3 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hBlScrTop[n] = sensible(1.7 * u[7 * SOA_BLOCK + n] * pow(fabs(x[20 * SOA_BLOCK + n] - x[3 * SOA_BLOCK + n]), <real>(1.0 / 3.0)), x[20 * SOA_BLOCK + n], x[3 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hTopCovIn[n] = sensible(p.cHecIn * pow(fabs(x[3 * SOA_BLOCK + n] - x[5 * SOA_BLOCK + n]), <real>(1.0 / 3.0)) * p.aCov / p.aFlr, x[3 * SOA_BLOCK + n], x[5 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hTopOut[n] = sensible(p.rhoAir * p.cPAir * a.fVentRoof[n], x[3 * SOA_BLOCK + n], d[1 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hCovEOut[n] = sensible(p.aCovPerFlr * (p.cHecOut1 + p.cHecOut2 * pow(d[4 * SOA_BLOCK + n], p.cHecOut3)), x[6 * SOA_BLOCK + n], d[1 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hPipeAir[n] = sensible(p.cHecPipeAir * pow(fabs(x[9 * SOA_BLOCK + n] - x[2 * SOA_BLOCK + n]), <real>(0.32)), x[9 * SOA_BLOCK + n], x[2 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hFlrSo1[n] = sensible(p.hecFlrSo1, x[8 * SOA_BLOCK + n], x[10 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hSo5SoOut[n] = sensible(p.hecSo5SoOut, x[14 * SOA_BLOCK + n], d[6 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hCovInCovE[n] = sensible(p.hecCovInCovE, x[5 * SOA_BLOCK + n], x[6 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hLampAir[n] = sensible(p.cHecLampAir, x[17 * SOA_BLOCK + n], x[2 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hGroPipeAir[n] = sensible(p.cHecGroPipeAir * pow(fabs(x[19 * SOA_BLOCK + n] - x[2 * SOA_BLOCK + n]), <real>(0.32)), x[19 * SOA_BLOCK + n], x[2 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.hIntLampAir[n] = sensible(p.cHecIntLampAir, x[18 * SOA_BLOCK + n], x[2 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.rfCo2[n] = fmin(1.5, 1 + a.cEvap3[n] * (p.etaMgPpm * x[0 * SOA_BLOCK + n] - 200) ** 2)
+    for n in range(SOA_BLOCK):
+        a.rfVp[n] = fmin(5.8, 1 + a.cEvap4[n] * (satVp(x[4 * SOA_BLOCK + n]) - x[15 * SOA_BLOCK + n]) ** 2)
+    for n in range(SOA_BLOCK):
+        a.rS[n] = p.rSMin * a.rfRCan[n] * a.rfCo2[n] * a.rfVp[n]
+    for n in range(SOA_BLOCK):
+        a.vecCanAir[n] = p.twoRhoCPAir * a.lai[n] / (p.L * p.gamma * (p.rB + a.rS[n]))
+    for n in range(SOA_BLOCK):
+        a.mvCanAir[n] = (satVp(x[4 * SOA_BLOCK + n]) - x[15 * SOA_BLOCK + n]) * a.vecCanAir[n]
+    for n in range(SOA_BLOCK):
+        a.mvAirThScr[n] = cond(1.7 * u[2 * SOA_BLOCK + n] * pow(fabs(x[2 * SOA_BLOCK + n] - x[7 * SOA_BLOCK + n]), <real>(1.0 / 3.0)), x[15 * SOA_BLOCK + n], satVp(x[7 * SOA_BLOCK + n]))
+    for n in range(SOA_BLOCK):
+        a.mvAirBlScr[n] = cond(1.7 * u[7 * SOA_BLOCK + n] * pow(fabs(x[2 * SOA_BLOCK + n] - x[20 * SOA_BLOCK + n]), <real>(1.0 / 3.0)), x[15 * SOA_BLOCK + n], satVp(x[20 * SOA_BLOCK + n]))
+    for n in range(SOA_BLOCK):
+        a.mvTopCovIn[n] = cond(p.cHecIn * pow(fabs(x[3 * SOA_BLOCK + n] - x[5 * SOA_BLOCK + n]), <real>(1.0 / 3.0)) * p.aCov / p.aFlr, x[16 * SOA_BLOCK + n], satVp(x[5 * SOA_BLOCK + n]))
+    for n in range(SOA_BLOCK):
+        a.mvAirTop[n] = airMv(a.fScr[n], x[15 * SOA_BLOCK + n], x[16 * SOA_BLOCK + n], x[2 * SOA_BLOCK + n], x[3 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.mvTopOut[n] = airMv(a.fVentRoof[n], x[16 * SOA_BLOCK + n], d[2 * SOA_BLOCK + n], x[3 * SOA_BLOCK + n], d[1 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.mvAirOut[n] = airMv(a.fVentSide[n] + a.fVentForced[n], x[15 * SOA_BLOCK + n], d[2 * SOA_BLOCK + n], x[2 * SOA_BLOCK + n], d[1 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.lCanAir[n] = p.L * a.mvCanAir[n]
+    for n in range(SOA_BLOCK):
+        a.lAirThScr[n] = p.L * a.mvAirThScr[n]
+    for n in range(SOA_BLOCK):
+        a.lAirBlScr[n] = p.L * a.mvAirBlScr[n]
+    for n in range(SOA_BLOCK):
+        a.lTopCovIn[n] = p.L * a.mvTopCovIn[n]
+    for n in range(SOA_BLOCK):
+        a.parCan[n] = p.zetaLampPar * a.rParLampCan[n] + p.parJtoUmolSun * a.rParSunCan[n] + p.zetaIntLampPar * a.rParIntLampCan[n]
+    for n in range(SOA_BLOCK):
+        a.gamma[n] = p.j25LeafMax / a.j25CanMax[n] * p.cGamma * x[4 * SOA_BLOCK + n] + 20 * p.cGamma * (1 - p.j25LeafMax / a.j25CanMax[n])
+    for n in range(SOA_BLOCK):
+        a.co2Stom[n] = p.etaCo2AirStom * a.co2InPpm[n]
+    for n in range(SOA_BLOCK):
+        a.jPot[n] = a.j25CanMax[n] * exp(p.eJ * (x[4 * SOA_BLOCK + n] + 273.15 - p.t25k) / (0.001 * p.R * (x[4 * SOA_BLOCK + n] + 273.15) * p.t25k)) * p.jPotDeact25 / (1 + exp((p.S * (x[4 * SOA_BLOCK + n] + 273.15) - p.H) / (0.001 * p.R * (x[4 * SOA_BLOCK + n] + 273.15))))
+    for n in range(SOA_BLOCK):
+        a.j[n] = p.invTwoTheta * (a.jPot[n] + p.alpha * a.parCan[n] - sqrt((a.jPot[n] + p.alpha * a.parCan[n]) ** 2 - 4 * p.theta * a.jPot[n] * p.alpha * a.parCan[n]))
+    for n in range(SOA_BLOCK):
+        a.p[n] = a.j[n] * (a.co2Stom[n] - a.gamma[n]) / (4 * (a.co2Stom[n] + 2 * a.gamma[n]))
+    for n in range(SOA_BLOCK):
+        a.r[n] = a.p[n] * a.gamma[n] / a.co2Stom[n]
+    for n in range(SOA_BLOCK):
+        a.mcAirBuf[n] = p.mCh2o * a.hAirBuf[n] * (a.p[n] - a.r[n])
+    for n in range(SOA_BLOCK):
+        a.hTCan[n] = 1.0 / (1 + exp(-0.869 * (x[4 * SOA_BLOCK + n] - p.tCanMin))) * 1 / (1 + exp(0.5793 * (x[4 * SOA_BLOCK + n] - p.tCanMax)))
+    for n in range(SOA_BLOCK):
+        a.mcBufFruit[n] = a.hBufOrg[n] * a.hTCan[n] * a.hTCan24[n] * a.hTCanSum[n] * a.gTCan24[n] * p.rgFruit
+    for n in range(SOA_BLOCK):
+        a.mcBufAir[n] = p.cLeafG * a.mcBufLeaf[n] + p.cStemG * a.mcBufStem[n] + p.cFruitG * a.mcBufFruit[n]
+    for n in range(SOA_BLOCK):
+        a.mcAirCan[n] = p.mCo2PerCh2o * (a.mcAirBuf[n] - a.mcBufAir[n] - a.mcOrgAir[n])
+    for n in range(SOA_BLOCK):
+        a.mcAirTop[n] = airMc(a.fScr[n], x[0 * SOA_BLOCK + n], x[1 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.mcTopOut[n] = airMc(a.fVentRoof[n], x[1 * SOA_BLOCK + n], d[3 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        a.mcAirOut[n] = airMc(a.fVentSide[n] + a.fVentForced[n], x[0 * SOA_BLOCK + n], d[3 * SOA_BLOCK + n])
+
+@cython.cdivision(True)
+cdef inline void ODESoA(AuxiliaryStatesSoA* a, Parameters* p, double* x, double* u, double* d, double* ki) nogil:
+    """
+    SoA variant of ODE in ODE.pxd, ki holds nx*SOA_BLOCK doubles.
+    """
+    cdef unsigned int n
+    for n in range(SOA_BLOCK):
+        ki[0 * SOA_BLOCK + n] = p.invCapCo2Air * (a.mcBlowAir[n] + a.mcExtAir[n] + a.mcPadAir[n] - a.mcAirCan[n] - a.mcAirTop[n] - a.mcAirOut[n])
+    for n in range(SOA_BLOCK):
+        ki[1 * SOA_BLOCK + n] = p.invCapCo2Top * (a.mcAirTop[n] - a.mcTopOut[n])
+    for n in range(SOA_BLOCK):
+        ki[2 * SOA_BLOCK + n] = p.invCapAir * (a.hCanAir[n] + a.hPadAir[n] - a.hAirMech[n] + a.hPipeAir[n] + a.hPasAir[n] + a.hBlowAir[n] + a.rGlobSunAir[n] - a.hAirFlr[n] - a.hAirThScr[n] - a.hAirOut[n] - a.hAirTop[n] - a.hAirOutPad[n] - a.lAirFog[n] - a.hAirBlScr[n] + a.hLampAir[n] + a.rLampAir[n] + a.hGroPipeAir[n] + a.hIntLampAir[n] + a.rIntLampAir[n])
+    for n in range(SOA_BLOCK):
+        ki[3 * SOA_BLOCK + n] = p.invCapTop * (a.hThScrTop[n] + a.hAirTop[n] - a.hTopCovIn[n] - a.hTopOut[n] + a.hBlScrTop[n])
+    for n in range(SOA_BLOCK):
+        ki[4 * SOA_BLOCK + n] = 1.0 / a.capCan[n] * (a.rParSunCan[n] + a.rNirSunCan[n] + a.rPipeCan[n] - a.hCanAir[n] - a.lCanAir[n] - a.rCanCovIn[n] - a.rCanFlr[n] - a.rCanSky[n] - a.rCanThScr[n] - a.rCanBlScr[n] + a.rParLampCan[n] + a.rNirLampCan[n] + a.rFirLampCan[n] + a.rGroPipeCan[n] + a.rParIntLampCan[n] + a.rNirIntLampCan[n] + a.rFirIntLampCan[n])
+    for n in range(SOA_BLOCK):
+        ki[5 * SOA_BLOCK + n] = 1.0 / a.capCovIn[n] * (a.hTopCovIn[n] + a.lTopCovIn[n] + a.rCanCovIn[n] + a.rFlrCovIn[n] + a.rPipeCovIn[n] + a.rThScrCovIn[n] - a.hCovInCovE[n] + a.rLampCovIn[n] + a.rBlScrCovIn[n] + a.rIntLampCovIn[n])
+    for n in range(SOA_BLOCK):
+        ki[6 * SOA_BLOCK + n] = 1.0 / a.capCovE[n] * (a.rGlobSunCovE[n] + a.hCovInCovE[n] - a.hCovEOut[n] - a.rCovESky[n])
+    for n in range(SOA_BLOCK):
+        ki[7 * SOA_BLOCK + n] = p.invCapThScr * (a.hAirThScr[n] + a.lAirThScr[n] + a.rCanThScr[n] + a.rFlrThScr[n] + a.rPipeThScr[n] - a.hThScrTop[n] - a.rThScrCovIn[n] - a.rThScrSky[n] + a.rBlScrThScr[n] + a.rLampThScr[n] + a.rIntLampThScr[n])
+    for n in range(SOA_BLOCK):
+        ki[8 * SOA_BLOCK + n] = p.invCapFlr * (a.hAirFlr[n] + a.rParSunFlr[n] + a.rNirSunFlr[n] + a.rCanFlr[n] + a.rPipeFlr[n] - a.hFlrSo1[n] - a.rFlrCovIn[n] - a.rFlrSky[n] - a.rFlrThScr[n] + a.rParLampFlr[n] + a.rNirLampFlr[n] + a.rFirLampFlr[n] - a.rFlrBlScr[n] + a.rParIntLampFlr[n] + a.rNirIntLampFlr[n] + a.rFirIntLampFlr[n])
+    for n in range(SOA_BLOCK):
+        ki[9 * SOA_BLOCK + n] = p.invCapPipe * (a.hBoilPipe[n] + a.hIndPipe[n] + a.hGeoPipe[n] - a.rPipeSky[n] - a.rPipeCovIn[n] - a.rPipeCan[n] - a.rPipeFlr[n] - a.rPipeThScr[n] - a.hPipeAir[n] + a.rLampPipe[n] - a.rPipeBlScr[n] + a.hBufHotPipe[n] + a.rIntLampPipe[n])
+    for n in range(SOA_BLOCK):
+        ki[10 * SOA_BLOCK + n] = p.invCapSo1 * (a.hFlrSo1[n] - a.hSo1So2[n])
+    for n in range(SOA_BLOCK):
+        ki[11 * SOA_BLOCK + n] = p.invCapSo2 * (a.hSo1So2[n] - a.hSo2So3[n])
+    for n in range(SOA_BLOCK):
+        ki[12 * SOA_BLOCK + n] = p.invCapSo3 * (a.hSo2So3[n] - a.hSo3So4[n])
+    for n in range(SOA_BLOCK):
+        ki[13 * SOA_BLOCK + n] = p.invCapSo4 * (a.hSo3So4[n] - a.hSo4So5[n])
+    for n in range(SOA_BLOCK):
+        ki[14 * SOA_BLOCK + n] = p.invCapSo5 * (a.hSo4So5[n] - a.hSo5SoOut[n])
+    for n in range(SOA_BLOCK):
+        ki[15 * SOA_BLOCK + n] = 1.0 / a.capVpAir[n] * (a.mvCanAir[n] + a.mvPadAir[n] + a.mvFogAir[n] + a.mvBlowAir[n] - a.mvAirThScr[n] - a.mvAirTop[n] - a.mvAirOut[n] - a.mvAirOutPad[n] - a.mvAirMech[n] - a.mvAirBlScr[n])
+    for n in range(SOA_BLOCK):
+        ki[16 * SOA_BLOCK + n] = 1.0 / a.capVpTop[n] * (a.mvAirTop[n] - a.mvTopCovIn[n] - a.mvTopOut[n])
+    for n in range(SOA_BLOCK):
+        ki[17 * SOA_BLOCK + n] = p.invCapLamp * (a.qLampIn[n] - a.hLampAir[n] - a.rLampSky[n] - a.rLampCovIn[n] - a.rLampThScr[n] - a.rLampPipe[n] - a.rLampAir[n] - a.rLampBlScr[n] - a.rParLampFlr[n] - a.rNirLampFlr[n] - a.rFirLampFlr[n] - a.rParLampCan[n] - a.rNirLampCan[n] - a.rFirLampCan[n] - a.hLampCool[n] + a.rIntLampLamp[n])
+    for n in range(SOA_BLOCK):
+        ki[18 * SOA_BLOCK + n] = p.invCapIntLamp * (a.qIntLampIn[n] - a.hIntLampAir[n] - a.rIntLampSky[n] - a.rIntLampCovIn[n] - a.rIntLampThScr[n] - a.rIntLampPipe[n] - a.rIntLampAir[n] - a.rIntLampBlScr[n] - a.rParIntLampFlr[n] - a.rNirIntLampFlr[n] - a.rFirIntLampFlr[n] - a.rParIntLampCan[n] - a.rNirIntLampCan[n] - a.rFirIntLampCan[n] - a.rIntLampLamp[n])
+    for n in range(SOA_BLOCK):
+        ki[19 * SOA_BLOCK + n] = p.invCapGroPipe * (a.hBoilGroPipe[n] - a.rGroPipeCan[n] - a.hGroPipeAir[n])
+    for n in range(SOA_BLOCK):
+        ki[20 * SOA_BLOCK + n] = p.invCapBlScr * (a.hAirBlScr[n] + a.lAirBlScr[n] + a.rCanBlScr[n] + a.rFlrBlScr[n] + a.rPipeBlScr[n] - a.hBlScrTop[n] - a.rBlScrCovIn[n] - a.rBlScrSky[n] - a.rBlScrThScr[n] + a.rLampBlScr[n] + a.rIntLampBlScr[n])
+    for n in range(SOA_BLOCK):
+        ki[21 * SOA_BLOCK + n] = 1.0 / 86400.0 * (x[4 * SOA_BLOCK + n] - x[21 * SOA_BLOCK + n])
+    for n in range(SOA_BLOCK):
+        ki[22 * SOA_BLOCK + n] = a.mcAirBuf[n] - a.mcBufFruit[n] - a.mcBufLeaf[n] - a.mcBufStem[n] - a.mcBufAir[n]
+    for n in range(SOA_BLOCK):
+        ki[23 * SOA_BLOCK + n] = a.mcBufLeaf[n] - a.mcLeafAir[n] - a.mcLeafHar[n]
+    for n in range(SOA_BLOCK):
+        ki[24 * SOA_BLOCK + n] = a.mcBufStem[n] - a.mcStemAir[n]
+    for n in range(SOA_BLOCK):
+        ki[25 * SOA_BLOCK + n] = a.mcBufFruit[n] - a.mcFruitAir[n] - a.mcFruitHar[n]
+    for n in range(SOA_BLOCK):
+        ki[26 * SOA_BLOCK + n] = 1.0 / 86400.0 * x[4 * SOA_BLOCK + n]
+    for n in range(SOA_BLOCK):
+        ki[27 * SOA_BLOCK + n] = 1.0 / 86400.0
@@ -1,12 +1,16 @@
 from auxiliary_states cimport AuxiliaryStates
 from define_parameters cimport Parameters
 from utils cimport satVp, co2dens2ppm
-from libc.math cimport exp, log, fmax, fmin, floor
+from libc.math cimport log, fmax, fmin, floor
+IF GL_FAST_MATH:
+    from fast_math cimport fastExp as exp
+ELSE:
+    from libc.math cimport exp
 
-cdef inline double proportionalControl(processVar, setPt, pBand, minVal, maxVal):
+cdef inline double proportionalControl(double processVar, double setPt, double pBand, double minVal, double maxVal) nogil:
     return minVal + (maxVal - minVal)*(1/(1+exp(-2/pBand*log(100)*(processVar - setPt - pBand/2))))
 
-cdef inline double* controlSignal(AuxiliaryStates* a, Parameters* p, double* x, double* u, double* d):
+cdef inline double* controlSignal(AuxiliaryStates* a, Parameters* p, double* x, double* u, double* d) nogil:
     cdef double lampTimeOfDay
     cdef double lampDayOfYear
     cdef double lampNoCons
@@ -27,6 +31,8 @@ cdef inline double* controlSignal(AuxiliaryStates* a, Parameters* p, double* x,
     cdef double thScrCold
     cdef double thScrHeat
     cdef double thScrRh
+    cdef double lampOn
+    cdef double intLampOn
 
     # Control of the lamp according to the time of day [0/1]
     # if p.lampsOn < p.lampsOff, lamps are on from p.lampsOn to p.lampsOff each day
@@ -1,46 +1,47 @@
 from libc.math cimport exp, INFINITY, pi, M_PI
+from precision cimport real
 
 cdef packed struct Parameters:
     char alfaLeafAir        # Convective heat transfer coefficient between leaf and greenhouse air
-    double L                # Latent heat of evaporation
-    double sigma            # Stefan-Boltzmann constant
+    real L                  # Latent heat of evaporation
+    real sigma              # Stefan-Boltzmann constant
     char epsCan             # FIR emission coefficient of canopy
     char epsSky             # FIR emission coefficient of the sky
     float etaGlobNir        # Ratio of NIR in global radiation
     float etaGlobPar        # Ratio of PAR in global radiation
     
-    double etaMgPpm         # CO2 conversion factor from mg/m^{3} to ppm
-    double etaRoofThr       # Ratio between roof vent area and total vent area where no chimney effects is assumed
-    double rhoAir0          # Density of air at sealevel
-    double rhoCanPar        # Density of PAR
-    double rhoCanNir        # Density of NIR
+    real etaMgPpm           # CO2 conversion factor from mg/m^{3} to ppm
+    real etaRoofThr         # Ratio between roof vent area and total vent area where no chimney effects is assumed
+    real rhoAir0            # Density of air at sealevel
+    real rhoCanPar          # Density of PAR
+    real rhoCanNir          # Density of NIR
     short rhoSteel          # Density of steel
     short rhoWater          # Density of water
-    double gamma            # Psychrometric constant
-    double omega            # Yearly frequency to calculate soil temperature
+    real gamma              # Psychrometric constant
+    real omega              # Yearly frequency to calculate soil temperature
     short capLeaf           # Heat capacity of canopy leaves
-    double cEvap1           # Coefficient for radiation effect on stomatal resistance
-    double cEvap2           # Coeficient for radiation effect on stomatal resistance
+    real cEvap1             # Coefficient for radiation effect on stomatal resistance
+    real cEvap2             # Coeficient for radiation effect on stomatal resistance
 
-    double cEvap3Day        # Coefficient for co2 effect on stomatal resistance (day)
-    double cEvap3Night      # Coefficient for co2 effect on stomatal resistance (night)
-    double cEvap4Day        # Coefficient for vapor pressure effect on stomatal resistance (day)
-    double cEvap4Night      # Coefficient for vapor pressure effect on stomatal resistance (night)
+    real cEvap3Day          # Coefficient for co2 effect on stomatal resistance (day)
+    real cEvap3Night        # Coefficient for co2 effect on stomatal resistance (night)
+    real cEvap4Day          # Coefficient for vapor pressure effect on stomatal resistance (day)
+    real cEvap4Night        # Coefficient for vapor pressure effect on stomatal resistance (night)
     short cPAir             # Specific heat capacity of air
     short cPSteel           # Specific heat capacity of steel
     short cPWater           # Specific heat capacity of water
-    double g                # Acceleration of gravity
-    double hSo1             # Thickness of soil layer 1
-    double hSo2             # Thickness of soil layer 2
-    double hSo3             # Thickness of soil layer 3
-    double hSo4             # Thickness of soil layer 4
-    double hSo5             # Thickness of soil layer 5
-    double k1Par            # PAR extinction coefficient of the canopy
-    double k2Par            # PAR extinction coefficient of the canopy for light reflected from the floor
-    double kNir             # NIR extinction coefficient of the canopy
-    double kFir             # FIR extinction coefficient of the canopy
-    double mAir             # Molar mass of air
-    double hSoOut           # Thickness of the external soil layer
+    real g                  # Acceleration of gravity
+    real hSo1               # Thickness of soil layer 1
+    real hSo2               # Thickness of soil layer 2
+    real hSo3               # Thickness of soil layer 3
+    real hSo4               # Thickness of soil layer 4
+    real hSo5               # Thickness of soil layer 5
+    real k1Par              # PAR extinction coefficient of the canopy
+    real k2Par              # PAR extinction coefficient of the canopy for light reflected from the floor
+    real kNir               # NIR extinction coefficient of the canopy
+    real kFir               # FIR extinction coefficient of the canopy
+    real mAir               # Molar mass of air
+    real hSoOut             # Thickness of the external soil layer
 
     char mWater             # Molar mass of water
     short R                 # Molar gas constant
@@ -49,38 +50,38 @@ cdef packed struct Parameters:
     char rSMin              # Minimum canopy resistance for transpiration
     char sRs                # Slope of smoothed stomatal resistance model
 
-    double etaGlobAir       # Ratio of global radiation absorbed by the greenhouse construction
+    real etaGlobAir         # Ratio of global radiation absorbed by the greenhouse construction
     char psi                # Mean greenhouse cover slope
     short aFlr              # Floor area of greenhouse
     short aCov              # Surface of the cover including side walls
-    double hAir             # Height of the main compartment
-    double hGh              # Mean height of the greenhouse
-    double cHecIn           # Convective heat exchange between cover and outdoor air
-    double cHecOut1         # Convective heat exchange parameter between cover and outdoor air
-    double cHecOut2         # Convective heat exchange parameter between cover and outdoor air
+    real hAir               # Height of the main compartment
+    real hGh                # Mean height of the greenhouse
+    real cHecIn             # Convective heat exchange between cover and outdoor air
+    real cHecOut1           # Convective heat exchange parameter between cover and outdoor air
+    real cHecOut2           # Convective heat exchange parameter between cover and outdoor air
     char cHecOut3           # Convective heat exchange parameter between cover and outdoor air
     char hElevation         # Altitude of greenhouse
 
     short aRoof             # Roof ventilation area
-    double hVent            # Vertical dimension of single ventilation opening
+    real hVent              # Vertical dimension of single ventilation opening
     char etaInsScr          # Porosity of the insect screen
     char aSide              # Side ventilation area
     float cDgh              # Ventilation discharge coefficient
-    double cLeakage         # Greenhouse leakage coefficient
-    double cWgh             # Ventilation global wind pressure coefficient
+    real cLeakage           # Greenhouse leakage coefficient
+    real cWgh               # Ventilation global wind pressure coefficient
     char hSideRoof          # Vertical distance between mid points of side wall and roof ventilation opening
 
-    double epsRfFir         # FIR emission coefficient of the roof
+    real epsRfFir           # FIR emission coefficient of the roof
     short rhoRf             # Density of the roof layer
-    double rhoRfNir         # NIR reflection coefficient of the roof
-    double rhoRfPar         # PAR reflection coefficient of the roof
-    double rhoRfFir         # FIR reflection coefficient of the roof
-    double tauRfNir         # NIR transmission coefficient of the roof
-    double tauRfPar         # PAR transmission coefficient of the roof
-    double tauRfFir         # FIR transmission coefficient of the roof
-    double lambdaRf         # Thermal heat conductivity of the roof
+    real rhoRfNir           # NIR reflection coefficient of the roof
+    real rhoRfPar           # PAR reflection coefficient of the roof
+    real rhoRfFir           # FIR reflection coefficient of the roof
+    real tauRfNir           # NIR transmission coefficient of the roof
+    real tauRfPar           # PAR transmission coefficient of the roof
+    real tauRfFir           # FIR transmission coefficient of the roof
+    real lambdaRf           # Thermal heat conductivity of the roof
     short cPRf              # Specific heat capacity of roof layer
-    double hRf              # Thickness of roof layer
+    real hRf                # Thickness of roof layer
 
     # char epsPerFir        # FIR emission coefficient of the whitewash
     # char rhoShScrPer      # Density of the whitewash
@@ -104,106 +105,106 @@ cdef packed struct Parameters:
     # char etaShScrCw          # Effect of shadow screen on wind pressure coefficient
     # char kShScr              # Shadow screen flux coefficient
 
-    double epsThScrFir       # FIR emission coefficient of the thermal screen
+    real epsThScrFir         # FIR emission coefficient of the thermal screen
     unsigned char rhoThScr   # Density of thermal screen
-    double rhoThScrNir       # NIR reflection coefficient of thermal screen
-    double rhoThScrPar       # PAR reflection coefficient of thermal screen
-    double rhoThScrFir       # FIR reflection coefficient of thermal screen
-    double tauThScrNir       # NIR transmission coefficient of thermal screen
-    double tauThScrPar       # PAR transmission coefficient of thermal screen
-    double tauThScrFir       # FIR transmission coefficient of thermal screen
+    real rhoThScrNir         # NIR reflection coefficient of thermal screen
+    real rhoThScrPar         # PAR reflection coefficient of thermal screen
+    real rhoThScrFir         # FIR reflection coefficient of thermal screen
+    real tauThScrNir         # NIR transmission coefficient of thermal screen
+    real tauThScrPar         # PAR transmission coefficient of thermal screen
+    real tauThScrFir         # FIR transmission coefficient of thermal screen
     short cPThScr            # Specific heat capacity of thermal screen
-    double hThScr            # Thickness of thermal screen
-    double kThScr            # Thermal screen flux coefficient
+    real hThScr              # Thickness of thermal screen
+    real kThScr              # Thermal screen flux coefficient
 
-    double epsBlScrFir       # FIR emission coefficient of the blackout screen
+    real epsBlScrFir         # FIR emission coefficient of the blackout screen
     unsigned char rhoBlScr   # Density of blackout screen
-    double rhoBlScrNir       # NIR reflection coefficient of blackout screen
-    double rhoBlScrPar       # PAR reflection coefficient of blackout screen
-    double tauBlScrNir       # NIR transmission coefficient of blackout screen
-    double tauBlScrPar       # PAR transmission coefficient of blackout screen
-    double tauBlScrFir       # FIR transmission coefficient of blackout screen
+    real rhoBlScrNir         # NIR reflection coefficient of blackout screen
+    real rhoBlScrPar         # PAR reflection coefficient of blackout screen
+    real tauBlScrNir         # NIR transmission coefficient of blackout screen
+    real tauBlScrPar         # PAR transmission coefficient of blackout screen
+    real tauBlScrFir         # FIR transmission coefficient of blackout screen
     short cPBlScr            # Specific heat capacity of blackout screen
-    double hBlScr            # Thickness of blackout screen
-    double kBlScr            # Blackout screen flux coefficient
+    real hBlScr              # Thickness of blackout screen
+    real kBlScr              # Blackout screen flux coefficient
 
     char epsFlr             # FIR emission coefficient of the floor
     short rhoFlr            # Density of the floor
     float rhoFlrNir         # NIR reflection coefficient of the floor
-    double rhoFlrPar        # PAR reflection coefficient of the floor
-    double lambdaFlr        # Thermal heat conductivity of the floor
+    real rhoFlrPar          # PAR reflection coefficient of the floor
+    real lambdaFlr          # Thermal heat conductivity of the floor
     short cPFlr             # Specific heat capacity of the floor
-    double hFlr             # Thickness of floor
+    real hFlr               # Thickness of floor
 
     int rhoCpSo             # Volumetric heat capacity of the soil
-    double lambdaSo         # Thermal heat conductivity of the soil layers
+    real lambdaSo           # Thermal heat conductivity of the soil layers
 
-    double epsPipe          # FIR emission coefficient of the heating pipes
-    double phiPipeE         # External diameter of pipes
-    double phiPipeI         # Internal diameter of pipes
-    double lPipe            # Length of heating pipes per gh floor area
+    real epsPipe            # FIR emission coefficient of the heating pipes
+    real phiPipeE           # External diameter of pipes
+    real phiPipeI           # Internal diameter of pipes
+    real lPipe              # Length of heating pipes per gh floor area
     int pBoil               # Capacity of the heating system [W]
 
     int phiExtCo2           # Capacity of external CO2 source
-    double capPipe          # Heat capacity of heating pipes
-    double rhoAir           # Density of air
-
-    double capAir           # Heat capacity of air
-    double capFlr           # Heat capacity of floor
-    double capSo1           # Heat capacity of soil layer 1
-    double capSo2           # Heat capacity of soil layer 2
-    double capSo3           # Heat capacity of soil layer 3
-    double capSo4           # Heat capacity of soil layer 4
-    double capSo5           # Heat capacity of soil layer 5
-    double capThScr         # Heat capacity of thermal screen
-    double capTop           # Heat capacity of air in top compartments
-    double capBlScr         # Heat capacity of blackout screen
-
-    double capCo2Air        # Capacity for CO2 in air
-    double capCo2Top        # Capacity for CO2 in top compartments
-
-    double aPipe            # Surface of pipes for floor area
-    double fCanFlr          # View factor from canopy to floor
-    double pressure         # Absolute air pressure at given elevation
-    double energyContentGas  # Energy content of fossil gas
-
-
-    double globJtoUmol       # Conversion factor from global radiation to PAR
+    real capPipe            # Heat capacity of heating pipes
+    real rhoAir             # Density of air
+
+    real capAir             # Heat capacity of air
+    real capFlr             # Heat capacity of floor
+    real capSo1             # Heat capacity of soil layer 1
+    real capSo2             # Heat capacity of soil layer 2
+    real capSo3             # Heat capacity of soil layer 3
+    real capSo4             # Heat capacity of soil layer 4
+    real capSo5             # Heat capacity of soil layer 5
+    real capThScr           # Heat capacity of thermal screen
+    real capTop             # Heat capacity of air in top compartments
+    real capBlScr           # Heat capacity of blackout screen
+
+    real capCo2Air          # Capacity for CO2 in air
+    real capCo2Top          # Capacity for CO2 in top compartments
+
+    real aPipe              # Surface of pipes for floor area
+    real fCanFlr            # View factor from canopy to floor
+    real pressure           # Absolute air pressure at given elevation
+    real energyContentGas    # Energy content of fossil gas
+
+
+    real globJtoUmol         # Conversion factor from global radiation to PAR
     unsigned char j25LeafMax # Maximal rate of electron transport at 25�C of the leaf
-    double cGamma            # Effect of canopy temperature on CO2 compensation point
-    double etaCo2AirStom     # Conversion from greenhouse air co2 concentration and stomatal co2 concentration
+    real cGamma              # Effect of canopy temperature on CO2 compensation point
+    real etaCo2AirStom       # Conversion from greenhouse air co2 concentration and stomatal co2 concentration
     unsigned short eJ        # Activation energy for Jpot calcualtion
-    double t25k              # Reference temperature for Jpot calculation
+    real t25k                # Reference temperature for Jpot calculation
     short S                  # Enthropy term for Jpot calculation
     int H                    # Deactivation energy for Jpot calculation
-    double theta             # Degree of curvature of the electron transport rate
-    double alpha             # Conversion factor from photons to electrons including efficiency term
-    double mCh2o             # Molar mass of CH2O
-    double mCo2              # Molar mass of CO2
+    real theta               # Degree of curvature of the electron transport rate
+    real alpha               # Conversion factor from photons to electrons including efficiency term
+    real mCh2o               # Molar mass of CH2O
+    real mCo2                # Molar mass of CO2
 
-    double parJtoUmolSun    # Conversion factor of sun's PAR from J to umol{photons} J^{-1}
+    real parJtoUmolSun      # Conversion factor of sun's PAR from J to umol{photons} J^{-1}
     char laiMax             # Max leaf area index
-    double sla              # Specific leaf area
-    double rgr              # Relative growth rate
-    double cLeafMax         # Maximum leaf size
+    real sla                # Specific leaf area
+    real rgr                # Relative growth rate
+    real cLeafMax           # Maximum leaf size
 
     int cFruitMax           # Maximum fruit size
-    double cFruitG          # Fruit growth respiration coefficient
-    double cLeafG           # Leaf growth respiration coefficient
-    double cStemG           # Stem growth respiration coefficient
+    real cFruitG            # Fruit growth respiration coefficient
+    real cLeafG             # Leaf growth respiration coefficient
+    real cStemG             # Stem growth respiration coefficient
     int cRgr                # Regression coefficient in maintenance respiration function
     char q10m               # Q10 value of temperature effect on maintenance respiration
-    double cFruitM          # Fruit maintenance respiration coefficient
-    double cLeafM           # Leaf maintenance respiration coefficient
-    double cStemM           # Stem maintenance respiration coefficient
+    real cFruitM            # Fruit maintenance respiration coefficient
+    real cLeafM             # Leaf maintenance respiration coefficient
+    real cStemM             # Stem maintenance respiration coefficient
     
-    double rgFruit          # Potential fruit growth coefficient
-    double rgLeaf           # Potential leaf growth coefficient
-    double rgStem           # Potential stem growth coefficient
+    real rgFruit            # Potential fruit growth coefficient
+    real rgLeaf             # Potential leaf growth coefficient
+    real rgStem             # Potential stem growth coefficient
 
     short cBufMax           # Maximum capacity of carbohydrate buffer
     short cBufMin           # Minimum capacity of carbohydrate buffer
-    double tCan24Max        # Inhibition of carbohydrate flow because of high temperatures
+    real tCan24Max          # Inhibition of carbohydrate flow because of high temperatures
     char tCan24Min          # Inhibition of carbohydrate flow because of low temperatures
     char tCanMax            # Inhibition of carbohydrate flow because of high instantenous temperatures
     char tCanMin            # Inhibition of carbohydrate flow because of low instantenous temperatures
@@ -212,7 +213,7 @@ cdef packed struct Parameters:
     char rhMax              # Upper bound on relative humidity
     char dayThresh          # Threshold to consider switch from night to day
     float tSpDay            # Heat is on below this point in day
-    double tSpNight         # Heat is on below this point in night
+    real tSpNight           # Heat is on below this point in night
     char tHeatBand          # P-band for heating
     char tVentOff           # Distance from heating setpoint where ventilation stops (even if humidity is too high)
     char tScreenOn          # Distance from screen setpoint where screen is on (even if humidity is too high)
@@ -248,30 +249,30 @@ cdef packed struct Parameters:
     char mechCoolDeadZone # Zone between heating setpoint and mechanical cooling setpoint
 
     char epsGroPipe       # Emissivity of grow pipes
-    double lGroPipe         # Length of grow pipes per gh floor area
-    double phiGroPipeE      # External diameter of grow pipes
-    double phiGroPipeI      # Internal diameter of grow pipes
+    real lGroPipe           # Length of grow pipes per gh floor area
+    real phiGroPipeE        # External diameter of grow pipes
+    real phiGroPipeI        # Internal diameter of grow pipes
 
-    double aGroPipe         # Surface area of pipes for floor area
+    real aGroPipe           # Surface area of pipes for floor area
     char pBoilGro         # Capacity of the grow pipe heating system
-    double capGroPipe       # Heat capacity of grow pipes
+    real capGroPipe         # Heat capacity of grow pipes
 
-    double thetaLampMax     # Maximum intensity of lamps
+    real thetaLampMax       # Maximum intensity of lamps
     char heatCorrection     # correction for temperature setpoint when lamps are on
-    double etaLampPar       # fraction of lamp input converted to PAR
-    double etaLampNir       # fraction of lamp input converted to NIR
-    double tauLampPar       # transmissivity of lamp layer to PAR
+    real etaLampPar         # fraction of lamp input converted to PAR
+    real etaLampNir         # fraction of lamp input converted to NIR
+    real tauLampPar         # transmissivity of lamp layer to PAR
     char rhoLampPar         # reflectivity of lamp layer to PAR
-    double tauLampNir       # transmissivity of lamp layer to NIR
+    real tauLampNir         # transmissivity of lamp layer to NIR
     char rhoLampNir         # reflectivity of lamp later to NIR
-    double tauLampFir       # transmissivity of lamp later to FIR
-    double aLamp            # lamp area
-    double epsLampTop       # emissivity of top side of lamp
-    double epsLampBottom    # emissivity of bottom side of lamp
+    real tauLampFir         # transmissivity of lamp later to FIR
+    real aLamp              # lamp area
+    real epsLampTop         # emissivity of top side of lamp
+    real epsLampBottom      # emissivity of bottom side of lamp
     short capLamp           # heat capacity of lamp
-    double cHecLampAir      # heat exchange coefficient of lamp
+    real cHecLampAir        # heat exchange coefficient of lamp
     char etaLampCool        # fraction of lamp input removed by cooling
-    double zetaLampPar      # J to umol conversion of PAR output of lamp
+    real zetaLampPar        # J to umol conversion of PAR output of lamp
 
     char intLamps           # whether we use intercropping lamps
     float vIntLampPos     # Vertical position of the interlights within the canopy [0-1, 0 is above canopy and 1 is below]
@@ -285,15 +286,58 @@ cdef packed struct Parameters:
     char zetaIntLampPar # J to umol conversion of PAR output of interlight lamp
     char cHecIntLampAir # heat exchange coefficient of interlight lamp
     char tauIntLampFir  # transmissivity of interlight lamp later to FIR
-    double k1IntPar     # PAR extinction coefficient of the canopy
-    double k2IntPar     # PAR extinction coefficient of the canopy for light reflected from the floor
-    double kIntNir      # NIR extinction coefficient of the canopy
-    double kIntFir      # FIR extinction coefficient of the canopy
+    real k1IntPar       # PAR extinction coefficient of the canopy
+    real k2IntPar       # PAR extinction coefficient of the canopy for light reflected from the floor
+    real kIntNir        # NIR extinction coefficient of the canopy
+    real kIntFir        # FIR extinction coefficient of the canopy
 
     float cLeakTop      # Fraction of leakage ventilation going from the top 
-    double minWind      #  wind speed where the effect of wind on leakage begins
-
-    double dmfm         # Dry matter to Fresh matter conversion rate
+    real minWind        #  wind speed where the effect of wind on leakage begins
+
+    real dmfm           # Dry matter to Fresh matter conversion rate
+
+    # Derived parameters, pure parameter expressions of the auxiliary states and the ODE, see initDerivedParameters
+    real invCapCo2Air           # 1/capCo2Air
+    real invCapCo2Top           # 1/capCo2Top
+    real invCapAir              # 1/capAir
+    real invCapTop              # 1/capTop
+    real invCapThScr            # 1/capThScr
+    real invCapFlr              # 1/capFlr
+    real invCapPipe             # 1/capPipe
+    real invCapSo1              # 1/capSo1
+    real invCapSo2              # 1/capSo2
+    real invCapSo3              # 1/capSo3
+    real invCapSo4              # 1/capSo4
+    real invCapSo5              # 1/capSo5
+    real invCapLamp             # 1/capLamp
+    real invCapIntLamp          # 1/capIntLamp
+    real invCapGroPipe          # 1/capGroPipe
+    real invCapBlScr            # 1/capBlScr
+    real negK1IntParUp          # PAR extinction exponent per LAI of the canopy above the interlights
+    real negKIntNirUp           # NIR extinction exponent per LAI of the canopy above the interlights
+    real negKIntFirUp           # FIR extinction exponent per LAI of the canopy above the interlights
+    real fIntLampDownFlrNir     # Fraction of the interlight NIR directed downwards and absorbed by the floor
+    real hecSo1So2              # Heat exchange coefficient between soil layers 1 and 2
+    real hecSo2So3              # Heat exchange coefficient between soil layers 2 and 3
+    real hecSo3So4              # Heat exchange coefficient between soil layers 3 and 4
+    real hecSo4So5              # Heat exchange coefficient between soil layers 4 and 5
+    real hecSo5SoOut            # Heat exchange coefficient between soil layer 5 and the external soil layer
+    real hecFlrSo1              # Heat exchange coefficient between the floor and soil layer 1
+    real hecCovInCovE           # Heat exchange coefficient between the internal and external cover
+    real fRgrMaint              # Reduction of the maintenance respiration by the relative growth rate
+    real mWaterHTop             # Molar mass of water times the height of the top compartment
+    real fPipe                  # View factor of the heating pipes seen from the floor
+    real fNoPipe                # 1 - fPipe
+    real tauIntLampFirNoPipe    # tauIntLampFir*fNoPipe
+    real tauIntLampFirPipe      # tauIntLampFir*fPipe
+    real twoGHSideRoof          # 2*g*hSideRoof, stack effect of the side and roof ventilation
+    real aCovPerFlr             # Ratio of the cover surface to the floor area
+    real cHecPipeAir            # Convective heat exchange coefficient of the heating pipes, without the temperature difference
+    real cHecGroPipeAir         # Convective heat exchange coefficient of the grow pipes, without the temperature difference
+    real twoRhoCPAir            # 2*rhoAir*cPAir
+    real jPotDeact25            # Deactivation term of jPot at the reference temperature t25k
+    real invTwoTheta            # 1/(2*theta)
+    real mCo2PerCh2o            # Ratio of the molar masses of CO2 and CH2O
 
 # Initialize the values of a Parameters struct
 cdef inline void initParameters(Parameters* p, char noLamps, char ledLamps, char hpsLamps, char intLamps):
@@ -678,3 +722,56 @@ cdef inline void initParameters(Parameters* p, char noLamps, char ledLamps, char
     p.minWind = 0.25
 
     p.dmfm = 0.0627
+    initDerivedParameters(p)
+
+# Compute the derived parameters of a Parameters struct, call again after changing a parameter
+cdef inline void initDerivedParameters(Parameters* p) nogil:
+    """
+    Computes the pure parameter expressions of the auxiliary states and the ODE,
+    such that they are not evaluated at every stage of the integrators.
+    Every expression is computed exactly as it was written in the model, hence the results are unchanged.
+    """
+    p.invCapCo2Air = 1/p.capCo2Air
+    p.invCapCo2Top = 1/p.capCo2Top
+    p.invCapAir = 1/p.capAir
+    p.invCapTop = 1/p.capTop
+    p.invCapThScr = 1/p.capThScr
+    p.invCapFlr = 1/p.capFlr
+    p.invCapPipe = 1/p.capPipe
+    p.invCapSo1 = 1/p.capSo1
+    p.invCapSo2 = 1/p.capSo2
+    p.invCapSo3 = 1/p.capSo3
+    p.invCapSo4 = 1/p.capSo4
+    p.invCapSo5 = 1/p.capSo5
+    p.invCapLamp = 1/p.capLamp
+    p.invCapIntLamp = 1/p.capIntLamp
+    p.invCapGroPipe = 1/p.capGroPipe
+    p.invCapBlScr = 1/p.capBlScr
+
+    p.negK1IntParUp = -p.k1IntPar * (1 - p.vIntLampPos)
+    p.negKIntNirUp = -p.kIntNir * (1 - p.vIntLampPos)
+    p.negKIntFirUp = -p.kIntFir * (1-p.vIntLampPos)
+    p.fIntLampDownFlrNir = p.fIntLampDown * (1-p.rhoFlrNir)
+
+    p.hecSo1So2 = 2*p.lambdaSo/(p.hSo1+p.hSo2)
+    p.hecSo2So3 = 2*p.lambdaSo/(p.hSo2+p.hSo3)
+    p.hecSo3So4 = 2*p.lambdaSo/(p.hSo3+p.hSo4)
+    p.hecSo4So5 = 2*p.lambdaSo/(p.hSo4+p.hSo5)
+    p.hecSo5SoOut = 2*p.lambdaSo/(p.hSo5+p.hSoOut)
+    p.hecFlrSo1 = 2/(p.hFlr/p.lambdaFlr + p.hSo1/p.lambdaSo)
+    p.hecCovInCovE = 1/(p.hRf/p.lambdaRf)
+
+    p.fRgrMaint = 1- exp(-p.cRgr*p.rgr)
+    p.mWaterHTop = p.mWater * (p.hGh - p.hAir)
+    p.fPipe = 0.49*M_PI*p.lPipe*p.phiPipeE
+    p.fNoPipe = 1 - 0.49*M_PI*p.lPipe*p.phiPipeE
+    p.tauIntLampFirNoPipe = p.tauIntLampFir * (1 - 0.49*M_PI*p.lPipe*p.phiPipeE)
+    p.tauIntLampFirPipe = p.tauIntLampFir*0.49*M_PI*p.lPipe*p.phiPipeE
+    p.twoGHSideRoof = 2*p.g*p.hSideRoof
+    p.aCovPerFlr = p.aCov/p.aFlr
+    p.cHecPipeAir = 1.99 * M_PI * p.phiPipeE * p.lPipe
+    p.cHecGroPipeAir = 1.99 * M_PI * p.phiGroPipeE * p.lGroPipe
+    p.twoRhoCPAir = 2*p.rhoAir * p.cPAir
+    p.jPotDeact25 = 1 + exp((p.S*p.t25k-p.H) / (1e-3*p.R*p.t25k))
+    p.invTwoTheta = 1/(2*p.theta)
+    p.mCo2PerCh2o = p.mCo2/p.mCh2o
@@ -1,91 +1,188 @@
 from define_parameters cimport Parameters
-from auxiliary_states cimport AuxiliaryStates, update
+from auxiliary_states cimport AuxiliaryStates, update, updateWeather, updateStage, updateFast
+from auxiliary_states_soa cimport AuxiliaryStatesSoA, SOA_BLOCK, updateWeatherSoA, updateSlowSoA, updateFastSoA, ODESoA
 
 
 from compute_controls cimport controlSignal
 from ODE cimport ODE
-from libc.stdlib cimport malloc, free
-from libc.math cimport isnan, sqrt, fabs
+from weather cimport WeatherData, weatherRow
+from precision cimport REAL_EPSILON
+from libc.math cimport isnan, sqrt, fabs, fmax, fmin, pow
 
-cdef inline double* fRK4(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, float h, char nx):
+cdef inline void fRK4(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, float h, char nx, double* k, double* xs) nogil:
     """
     Difference function that computes the next state.
+    The state x is updated in place.
+    The stages are written into caller-supplied buffers,
+    k holds at least 4*nx doubles (stage derivatives) and xs at least 3*nx doubles (stage states).
+    The auxiliary states of the weather are updated once per step, those of the control inputs u
+    should be updated by the caller with updateControls.
     """
-    cdef double* k1
-    cdef double* k2
-    cdef double* k3
-    cdef double* k4
+    cdef double* k1 = k
+    cdef double* k2 = k + nx
+    cdef double* k3 = k + 2*nx
+    cdef double* k4 = k + 3*nx
 
-    cdef double* x2 = <double*>malloc(nx * sizeof(double))
-    cdef double* x3 = <double*>malloc(nx * sizeof(double))
-    cdef double* x4 = <double*>malloc(nx * sizeof(double))
+    cdef double* x2 = xs
+    cdef double* x3 = xs + nx
+    cdef double* x4 = xs + 2*nx
 
     cdef unsigned char i
     cdef unsigned char j
-    cdef unsigned char k
     cdef unsigned char l
+    cdef unsigned char m
 
     # update auxiliary states
-    update(a, p, u, x, d)
+    updateWeather(a, p, u, d)
+    updateStage(a, p, u, x, d)
 
     # comptures the harvested fruit over the timestep
     a.mcFruitHarSum += a.mcFruitHar*h
 
-    k1 = ODE(a, p, x, u, d, nx)
+    ODE(a, p, x, u, d, nx, k1)
 
     for i in range(nx):
         x2[i] = x[i] + h/2*k1[i]
 
-    update(a, p, u, x2, d)
-    k2 = ODE(a, p, x2, u, d, nx)
+    updateStage(a, p, u, x2, d)
+    ODE(a, p, x2, u, d, nx, k2)
 
     for j in range(nx):
         x3[j] = x[j] + h/2*k2[j]
 
-    update(a, p, u, x3, d)
-    k3 = ODE(a, p, x3, u, d, nx)
+    updateStage(a, p, u, x3, d)
+    ODE(a, p, x3, u, d, nx, k3)
 
-    for k in range(nx):
-        x4[k] = x[k] + h*k3[k]
+    for m in range(nx):
+        x4[m] = x[m] + h*k3[m]
 
-    update(a, p, u, x4, d)
-    k4 = ODE(a, p, x4, u, d, nx)
+    updateStage(a, p, u, x4, d)
+    ODE(a, p, x4, u, d, nx, k4)
 
     # Runge-Kutta 4th order method
     for l in range(nx):
         x[l] += h/6 * (k1[l] + 2*k2[l] + 2*k3[l] + k4[l])
 
-    free(k1)
-    free(k2)
-    free(k3)
-    free(k4)
+cdef inline void fRK4Fast(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, float h, char nx, double* k, double* xs) nogil:
+    """
+    Difference function of the multirate integrator, which is fRK4 with only the fast auxiliary states updated at every stage.
+    The auxiliary states of updateControls and updateSlow are held at the start of the macro-step, which the caller updates.
+    The state x is updated in place, the buffers are the same as for fRK4.
+    """
+    cdef double* k1 = k
+    cdef double* k2 = k + nx
+    cdef double* k3 = k + 2*nx
+    cdef double* k4 = k + 3*nx
+
+    cdef double* x2 = xs
+    cdef double* x3 = xs + nx
+    cdef double* x4 = xs + 2*nx
+
+    cdef unsigned char i
 
-    free(x2)
-    free(x3)
-    free(x4)
-    return x
+    updateWeather(a, p, u, d)
+    updateFast(a, p, u, x, d)
+
+    # comptures the harvested fruit over the timestep
+    a.mcFruitHarSum += a.mcFruitHar*h
 
-cdef inline double* fRK45(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, double h, char nx, unsigned int timestep):
+    ODE(a, p, x, u, d, nx, k1)
+
+    for i in range(nx):
+        x2[i] = x[i] + h/2*k1[i]
+    updateFast(a, p, u, x2, d)
+    ODE(a, p, x2, u, d, nx, k2)
+
+    for i in range(nx):
+        x3[i] = x[i] + h/2*k2[i]
+    updateFast(a, p, u, x3, d)
+    ODE(a, p, x3, u, d, nx, k3)
+
+    for i in range(nx):
+        x4[i] = x[i] + h*k3[i]
+    updateFast(a, p, u, x4, d)
+    ODE(a, p, x4, u, d, nx, k4)
+
+    for i in range(nx):
+        x[i] += h/6 * (k1[i] + 2*k2[i] + 2*k3[i] + k4[i])
+
+cdef inline void stageSoA(AuxiliaryStatesSoA* a, Parameters* p, double* u, double* x, double* d, char slow) nogil:
     """
-    Difference function that computes the next state.
+    Updates the auxiliary states of a block of greenhouses at a stage, see updateStage.
+    The auxiliary states of updateSlow are only updated if slow is true.
+    """
+    if slow:
+        updateSlowSoA(a, p, u, x)
+    updateFastSoA(a, p, u, x, d)
+
+cdef inline void fRK4SoA(AuxiliaryStatesSoA* a, Parameters* p, double* u, double* x, double* d, float h, char nx, double* k, double* xs,
+                         char slow) nogil:
     """
-    cdef double* k1
-    cdef double* k2
-    cdef double* k3
-    cdef double* k4
-    cdef double* k5
-    cdef double* k6
+    Difference function of fRK4 (slow is true) or fRK4Fast (slow is false) for a block of SOA_BLOCK greenhouses,
+    in the struct-of-arrays layout of auxiliary_states_soa.pxd, i.e., x[i*SOA_BLOCK + n] is state i of greenhouse n.
+    The states x are updated in place, k holds at least 4*nx*SOA_BLOCK doubles and xs at least 3*nx*SOA_BLOCK doubles.
+    """
+    cdef unsigned int m = nx*SOA_BLOCK
+    cdef double* k1 = k
+    cdef double* k2 = k + m
+    cdef double* k3 = k + 2*m
+    cdef double* k4 = k + 3*m
+
+    cdef double* x2 = xs
+    cdef double* x3 = xs + m
+    cdef double* x4 = xs + 2*m
+
+    cdef unsigned int i
+
+    updateWeatherSoA(a, p, u, d)
+    stageSoA(a, p, u, x, d, slow)
+
+    # comptures the harvested fruit over the timestep
+    for i in range(SOA_BLOCK):
+        a.mcFruitHarSum[i] += a.mcFruitHar[i]*h
+
+    ODESoA(a, p, x, u, d, k1)
 
-    # cdef double* xnew 
-    cdef double* x2 = <double*>malloc(nx * sizeof(double))
-    cdef double* x3 = <double*>malloc(nx * sizeof(double))
-    cdef double* x4 = <double*>malloc(nx * sizeof(double))
-    cdef double* x5 = <double*>malloc(nx * sizeof(double))
-    cdef double* x6 = <double*>malloc(nx * sizeof(double))
+    for i in range(m):
+        x2[i] = x[i] + h/2*k1[i]
+    stageSoA(a, p, u, x2, d, slow)
+    ODESoA(a, p, x2, u, d, k2)
+
+    for i in range(m):
+        x3[i] = x[i] + h/2*k2[i]
+    stageSoA(a, p, u, x3, d, slow)
+    ODESoA(a, p, x3, u, d, k3)
+
+    for i in range(m):
+        x4[i] = x[i] + h*k3[i]
+    stageSoA(a, p, u, x4, d, slow)
+    ODESoA(a, p, x4, u, d, k4)
+
+    for i in range(m):
+        x[i] += h/6 * (k1[i] + 2*k2[i] + 2*k3[i] + k4[i])
+
+cdef inline void fRK45(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, double h, char nx, double* k, double* xs) nogil:
+    """
+    Difference function that computes the next state.
+    The state x is updated in place.
+    The stages are written into caller-supplied buffers,
+    k holds at least 6*nx doubles (stage derivatives) and xs at least 5*nx doubles (stage states).
+    """
+    cdef double* k1 = k
+    cdef double* k2 = k + nx
+    cdef double* k3 = k + 2*nx
+    cdef double* k4 = k + 3*nx
+    cdef double* k5 = k + 4*nx
+    cdef double* k6 = k + 5*nx
+
+    cdef double* x2 = xs
+    cdef double* x3 = xs + nx
+    cdef double* x4 = xs + 2*nx
+    cdef double* x5 = xs + 3*nx
+    cdef double* x6 = xs + 4*nx
 
     cdef unsigned char i
     cdef unsigned char j
-    cdef unsigned char k
     cdef unsigned char l
     cdef unsigned char m
     cdef unsigned char n
@@ -120,71 +217,320 @@ cdef inline double* fRK45(AuxiliaryStates* a, Parameters* p, double* u, double*
     # Actually, this is the euler method...
     a.mcFruitHarSum += a.mcFruitHar*h
 
-    k1 = ODE(a, p, x, u, d, nx)
+    ODE(a, p, x, u, d, nx, k1)
 
     for i in range(nx):
         x2[i] = x[i] + h*(b11*k1[i])
 
     update(a, p, u, x2, d)
-    k2 = ODE(a, p, x2, u, d, nx)
+    ODE(a, p, x2, u, d, nx, k2)
 
     for j in range(nx):
         x3[j] = x[j] + h*(b21*k1[j] + b22*k2[j])
 
     update(a, p, u, x3, d)
-    k3 = ODE(a, p, x3, u, d, nx)
+    ODE(a, p, x3, u, d, nx, k3)
 
-    for k in range(nx):
-        x4[k] = x[k] + h*(b31*k1[k] + b32*k2[k] + b33*k3[k])
+    for q in range(nx):
+        x4[q] = x[q] + h*(b31*k1[q] + b32*k2[q] + b33*k3[q])
 
     update(a, p, u, x4, d)
-    k4 = ODE(a, p, x4, u, d, nx)
+    ODE(a, p, x4, u, d, nx, k4)
 
     for l in range(nx):
         x5[l] = x[l] + h*(b41*k1[l] + b42*k2[l] + b43*k3[l] + b44*k4[l])
 
     update(a, p, u, x5, d)
-    k5 = ODE(a, p, x5, u, d, nx)
+    ODE(a, p, x5, u, d, nx, k5)
 
     for m in range(nx):
         x6[m] = x[m] + h*(b51*k1[m] + b52*k2[m] + b53*k3[m] + b54*k4[m] + b55*k5[m])
 
     update(a, p, u, x6, d)
-    k6 = ODE(a, p, x6, u, d, nx)
+    ODE(a, p, x6, u, d, nx, k6)
 
     # Runge-Kutta 6th order method
     for n in range(nx):
         x[n] = x[n] + h*(b61*k1[n] + b63*k3[n] + b64*k4[n] + b65*k5[n] + b66*k6[n])
 
-    free(k1)
-    free(k2)
-    free(k3)
-    free(k4)
-    free(k5)
-    free(k6)
 
-    free(x2)
-    free(x3)
-    free(x4)
-    free(x5)
-    free(x6)
-    return x
+cdef inline double fDopri5(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, double h, char nx, double* k, double* xs,
+                           double rtol, double atol, double* harvest) nogil:
+    """
+    Attempts a single step of size h with the Dormand-Prince 5(4) method.
+    The fifth order solution is written into xs + nx, the state x is not changed.
+    The stages are written into caller-supplied buffers,
+    k holds at least 7*nx doubles (stage derivatives) and xs at least 2*nx doubles (stage state and solution).
+    The harvest rate at the start of the step is written into harvest.
+    The auxiliary states of the control inputs u should be updated by the caller with updateControls.
+
+    Returns the root mean square of the error estimate, scaled by atol + rtol*|x|.
+    The step is accepted if the scaled error is at most one.
+    """
+    cdef double* k1 = k
+    cdef double* k2 = k + nx
+    cdef double* k3 = k + 2*nx
+    cdef double* k4 = k + 3*nx
+    cdef double* k5 = k + 4*nx
+    cdef double* k6 = k + 5*nx
+    cdef double* k7 = k + 6*nx
 
+    cdef double* xStage = xs
+    cdef double* xNew = xs + nx
 
-cdef inline double* fEuler(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, float h, char nx):
+    cdef unsigned char i
+    cdef double e
+    cdef double err = 0
+
+    cdef double b11=1/5
+    cdef double b21=3/40
+    cdef double b31=44/45
+    cdef double b41=19372/6561
+    cdef double b51=9017/3168
+    cdef double b61=35/384
+    cdef double b22=9/40
+    cdef double b32=-56/15
+    cdef double b42=-25360/2187
+    cdef double b52=-355/33
+    cdef double b33=32/9
+    cdef double b43=64448/6561
+    cdef double b53=46732/5247
+    cdef double b63=500/1113
+    cdef double b44=-212/729
+    cdef double b54=49/176
+    cdef double b64=125/192
+    cdef double b55=-5103/18656
+    cdef double b65=-2187/6784
+    cdef double b66=11/84
+
+    # difference between the fifth and fourth order solution
+    cdef double e1=71/57600
+    cdef double e3=-71/16695
+    cdef double e4=71/1920
+    cdef double e5=-17253/339200
+    cdef double e6=22/525
+    cdef double e7=-1/40
+
+    updateWeather(a, p, u, d)
+    updateStage(a, p, u, x, d)
+    harvest[0] = a.mcFruitHar
+    ODE(a, p, x, u, d, nx, k1)
+
+    for i in range(nx):
+        xStage[i] = x[i] + h*(b11*k1[i])
+    updateStage(a, p, u, xStage, d)
+    ODE(a, p, xStage, u, d, nx, k2)
+
+    for i in range(nx):
+        xStage[i] = x[i] + h*(b21*k1[i] + b22*k2[i])
+    updateStage(a, p, u, xStage, d)
+    ODE(a, p, xStage, u, d, nx, k3)
+
+    for i in range(nx):
+        xStage[i] = x[i] + h*(b31*k1[i] + b32*k2[i] + b33*k3[i])
+    updateStage(a, p, u, xStage, d)
+    ODE(a, p, xStage, u, d, nx, k4)
+
+    for i in range(nx):
+        xStage[i] = x[i] + h*(b41*k1[i] + b42*k2[i] + b43*k3[i] + b44*k4[i])
+    updateStage(a, p, u, xStage, d)
+    ODE(a, p, xStage, u, d, nx, k5)
+
+    for i in range(nx):
+        xStage[i] = x[i] + h*(b51*k1[i] + b52*k2[i] + b53*k3[i] + b54*k4[i] + b55*k5[i])
+    updateStage(a, p, u, xStage, d)
+    ODE(a, p, xStage, u, d, nx, k6)
+
+    for i in range(nx):
+        xNew[i] = x[i] + h*(b61*k1[i] + b63*k3[i] + b64*k4[i] + b65*k5[i] + b66*k6[i])
+
+    # the auxiliary states are left at the new state
+    updateStage(a, p, u, xNew, d)
+    ODE(a, p, xNew, u, d, nx, k7)
+
+    for i in range(nx):
+        e = h*(e1*k1[i] + e3*k3[i] + e4*k4[i] + e5*k5[i] + e6*k6[i] + e7*k7[i])
+        e = e/(atol + rtol*fmax(fabs(x[i]), fabs(xNew[i])))
+        err += e*e
+    return sqrt(err/nx)
+
+cdef inline unsigned int integrateDopri5(AuxiliaryStates* a, Parameters* p, double* u, double* x, WeatherData* w, unsigned int row0,
+                                         unsigned short solverSteps, float h, char nx, double* k, double* xs,
+                                         double rtol, double atol, double maxStep, double* hNext) nogil:
+    """
+    Integrates the state x in place over one control interval of solverSteps*h seconds with adaptive Dormand-Prince steps.
+    The weather data starts at row row0, with a row for every h seconds.
+    The disturbances are held at the row at the midpoint of every step.
+    A step never exceeds maxStep, which only limits the steps if maxStep is smaller than the control interval,
+    since the steps already end at the end of the control interval.
+    hNext holds the initial step size, and is set to the step size proposed for the next control interval.
+
+    Returns the number of evaluations of the ODE.
+    """
+    cdef double tEnd = solverSteps*h
+    cdef double hMin = 1e-3*h   # accept steps below this size, to guarantee progress for nan states
+    cdef double t = 0
+    cdef double dt = hNext[0]
+    cdef double err, fac, harvest
+    cdef bint lastStep
+    cdef unsigned int row
+    cdef unsigned int nEvaluations = 0
+    cdef unsigned char i
+    cdef double* xNew = xs + nx
+
+    while t < tEnd:
+        dt = fmin(dt, maxStep)
+        # finish the control interval instead of leaving a small remainder
+        lastStep = t + 1.01*dt >= tEnd
+        if lastStep:
+            dt = tEnd - t
+
+        row = row0 + <unsigned int>fmin((t + dt/2)/h, solverSteps - 1)
+        err = fDopri5(a, p, u, x, weatherRow(w, row), dt, nx, k, xs, rtol, atol, &harvest)
+        nEvaluations += 7
+
+        # step size controller with safety factor 0.9, the step size changes at most a factor 5
+        if isnan(err):
+            fac = 0.2
+        elif err > 0:
+            fac = fmin(5, fmax(0.2, 0.9*pow(err, -0.2)))
+        else:
+            fac = 5
+        if err <= 1 or dt <= hMin:
+            a.mcFruitHarSum += harvest*dt
+            for i in range(nx):
+                x[i] = xNew[i]
+            t += dt
+            # the last step is shortened to the end of the interval, hence it only proposes smaller step sizes
+            if not lastStep or dt*fac < hNext[0]:
+                hNext[0] = dt*fac
+        else:
+            fac = fmin(fac, 1)
+        dt = dt*fac
+    return nEvaluations
+
+cdef inline void luFactor(double* A, unsigned char* piv, char n) nogil:
+    """
+    LU factorization with partial pivoting of the n x n row-major matrix A, in place.
+    The row swapped with row i is written into piv[i].
+    """
+    cdef unsigned char i, j, r, pivRow
+    cdef double pivot, factor, tmp
+
+    for i in range(n):
+        # pick the largest element in column i as pivot
+        pivRow = i
+        for r in range(i+1, n):
+            if fabs(A[r*n + i]) > fabs(A[pivRow*n + i]):
+                pivRow = r
+        piv[i] = pivRow
+        if pivRow != i:
+            for j in range(n):
+                tmp = A[i*n + j]
+                A[i*n + j] = A[pivRow*n + j]
+                A[pivRow*n + j] = tmp
+
+        pivot = A[i*n + i]
+        # a singular matrix yields inf states instead of a division by zero
+        if pivot == 0:
+            pivot = 1e-300
+            A[i*n + i] = pivot
+        for r in range(i+1, n):
+            factor = A[r*n + i] / pivot
+            A[r*n + i] = factor
+            for j in range(i+1, n):
+                A[r*n + j] -= factor*A[i*n + j]
+
+cdef inline void luSolve(double* A, unsigned char* piv, char n, double* b) nogil:
+    """
+    Solves A y = b in place for the LU factorization of luFactor.
+    """
+    cdef int i, j
+    cdef double tmp
+
+    for i in range(n):
+        if piv[i] != i:
+            tmp = b[i]
+            b[i] = b[piv[i]]
+            b[piv[i]] = tmp
+    # forward substitution with the unit lower triangular matrix
+    for i in range(1, n):
+        for j in range(i):
+            b[i] -= A[i*n + j]*b[j]
+    # backward substitution with the upper triangular matrix
+    for i in range(n-1, -1, -1):
+        for j in range(i+1, n):
+            b[i] -= A[i*n + j]*b[j]
+        b[i] /= A[i*n + i]
+
+cdef inline void fRos2(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, double h, char nx, double* k, double* xs,
+                       double* W, unsigned char* piv) nogil:
+    """
+    Difference function that computes the next state with the second order, L-stable, Rosenbrock method ROS2
+    (Verwer et al., 1999). The method is linearly implicit, hence stable for the fast compartments at large step sizes.
+    Every step solves two linear systems with W = I - gamma*h*J, where the Jacobian J of the ODE is approximated
+    by forward differences at the state x, with perturbations relative to the square root of the machine epsilon
+    of the auxiliary states. A step costs nx+2 evaluations of the ODE.
+    The state x is updated in place.
+    The stages are written into caller-supplied buffers, k holds at least 2*nx doubles (stage derivatives),
+    xs at least nx doubles (stage state), W nx*nx doubles (row-major) and piv nx pivots.
+    The auxiliary states of the control inputs u should be updated by the caller with updateControls.
+    """
+    cdef double gamma = 1 + 1/sqrt(2.)
+    cdef double* k1 = k
+    cdef double* k2 = k + nx
+    cdef double delta
+    cdef unsigned char i, j
+
+    # update auxiliary states
+    updateWeather(a, p, u, d)
+    updateStage(a, p, u, x, d)
+
+    # comptures the harvested fruit over the timestep
+    a.mcFruitHarSum += a.mcFruitHar*h
+
+    ODE(a, p, x, u, d, nx, k1)
+
+    # W = I - gamma*h*J, with the columns of J approximated by forward differences
+    for i in range(nx):
+        xs[i] = x[i]
+    for j in range(nx):
+        delta = sqrt(REAL_EPSILON)*fmax(fabs(x[j]), 1)
+        xs[j] = x[j] + delta
+        updateStage(a, p, u, xs, d)
+        ODE(a, p, xs, u, d, nx, k2)
+        xs[j] = x[j]
+        for i in range(nx):
+            W[i*nx + j] = -gamma*h*(k2[i] - k1[i])/delta
+        W[j*nx + j] += 1
+    luFactor(W, piv, nx)
+
+    # W k1 = f(x)
+    luSolve(W, piv, nx, k1)
+
+    # W k2 = f(x + h k1) - 2 k1
+    for i in range(nx):
+        xs[i] = x[i] + h*k1[i]
+    updateStage(a, p, u, xs, d)
+    ODE(a, p, xs, u, d, nx, k2)
+    for i in range(nx):
+        k2[i] -= 2*k1[i]
+    luSolve(W, piv, nx, k2)
+
+    for i in range(nx):
+        x[i] += h*(1.5*k1[i] + 0.5*k2[i])
+
+cdef inline void fEuler(AuxiliaryStates* a, Parameters* p, double* u, double* x, double* d, float h, char nx, double* k1) nogil:
     """
     Difference function that computes the next state.
+    The state x is updated in place, k1 is a caller-supplied buffer of at least nx doubles.
     """
-    cdef double* k1
     cdef unsigned char l
 
     # update auxiliary states
     update(a, p, u, x, d)
-    k1 = ODE(a, p, x, u, d, nx)
+    ODE(a, p, x, u, d, nx, k1)
 
     # Forward Euler
     for l in range(nx):
         x[l] += h * (k1[l])
-
-    free(k1)
-    return x
@@ -0,0 +1,84 @@
+# Fast approximations of exp, log and pow for the fast-math variant of the GreenLight model.
+# The extension greenlight_cy_fast is compiled with GL_FAST_MATH=True, for which precision.pxd replaces the functions of math.h
+# that dominate the cost of the auxiliary states (satVp, the exp based smooth switches, the convective heat exchange
+# coefficients and the FIR fluxes) by the inline functions below. The default build keeps the exact functions of math.h.
+#
+# Error bounds (maximum over 1e6 random arguments, relative to math.h):
+#   fastExp     relative error < 1e-11 for -708 < x < 709, the result saturates outside this range
+#   fastLog     absolute error < 2e-11 for all positive normal x
+#   fastPow     relative error < 1.2e-11*(1 + |y*log(x)|), falls back to pow for x <= 0, subnormal or non-finite x
+#   fastPow4    x*x*x*x, relative error < 4.5e-16
+from libc.math cimport pow
+from libc.float cimport DBL_MIN, DBL_MAX
+
+cdef union DoubleBits:
+    double d
+    unsigned long long u
+
+DEF LOG2E = 1.4426950408889634
+DEF LN2 = 0.6931471805599453
+DEF LN2_HI = 0.6931471803691238         # ln(2) with 32 significant bits, such that k*LN2_HI is exact
+DEF LN2_LO = 1.9082149292705877e-10     # ln(2) - LN2_HI
+DEF SQRT2 = 1.4142135623730951
+DEF ROUND_SHIFT = 6755399441055744.0    # 1.5*2^52, adding it rounds to the nearest integer in its least significant bits
+
+cdef inline double fastExp(double x) nogil:
+    """
+    exp(x) = 2^k * exp(r), with k the nearest integer of x/ln(2) and |r| <= ln(2)/2.
+    exp(r) is approximated by its Taylor polynomial of degree 9 (evaluated with Estrin's scheme),
+    with a truncation error below 7e-12. The branch free evaluation allows the C compiler to vectorize it.
+    """
+    cdef DoubleBits t, scale
+    cdef double k, r, r2, r4
+    # saturate instead of overflowing the exponent of the result, NaN passes through
+    x = -708.0 if x < -708.0 else x
+    x = 709.0 if x > 709.0 else x
+    t.d = x*LOG2E + ROUND_SHIFT
+    k = t.d - ROUND_SHIFT
+    r = x - k*LN2_HI - k*LN2_LO
+    r2 = r*r
+    r4 = r2*r2
+    # the least significant bits of t hold k, which become the exponent of the scale 2^k
+    scale.u = (t.u + 1023) << 52
+    return scale.d * ((1 + r + r2*(1/2. + r*(1/6.)))
+                      + r4*((1/24. + r*(1/120.)) + r2*((1/720. + r*(1/5040.)) + r2*(1/40320. + r*(1/362880.)))))
+
+cdef inline double fastLog(double x) nogil:
+    """
+    log(x) = e*ln(2) + log(m), with x = m*2^e and sqrt(1/2) <= m < sqrt(2), for positive normal x.
+    log(m) = 2*atanh(s), with s = (m-1)/(m+1) and |s| <= 0.172, is approximated by its series up to s^11,
+    with a truncation error below 2e-11.
+    """
+    cdef DoubleBits m
+    cdef double e, s, s2, s4
+    m.d = x
+    e = <double>(<long long>(m.u >> 52) - 1023)
+    m.u = (m.u & 0x000fffffffffffffULL) | 0x3ff0000000000000ULL
+    if m.d > SQRT2:
+        m.d = 0.5*m.d
+        e = e + 1
+    s = (m.d - 1)/(m.d + 1)
+    s2 = s*s
+    s4 = s2*s2
+    return e*LN2 + 2*s*((1 + s2*(1/3.)) + s4*((1/5. + s2*(1/7.)) + s4*(1/9. + s2*(1/11.))))
+
+cdef inline double fastPow(double x, double y) nogil:
+    """
+    x^y = exp(y*log(x)) for positive normal x, other bases use pow of math.h.
+    """
+    if not (x >= DBL_MIN and x <= DBL_MAX):
+        return pow(x, y)
+    return fastExp(y*fastLog(x))
+
+cdef inline double fastPow4(double x) nogil:
+    """
+    x^4 by two multiplications, pow(x, 4) of math.h is a library call.
+    """
+    cdef double x2 = x*x
+    return x2*x2
+
+cdef inline double exactPow4(double x) nogil:
+    """
+    x^4 by pow of math.h, the pow4 of the builds without GL_FAST_MATH.
+    """
+    return pow(x, 4)
@@ -0,0 +1,175 @@
+"""
+Generates auxiliary_states_soa.pxd, the struct-of-arrays (SoA) variant of the auxiliary states and the ODE
+for blocks of SOA_BLOCK greenhouses, from auxiliary_states.pxd and ODE.pxd.
+
+In the SoA variant every auxiliary state is an array over the greenhouses of a block,
+and the states, control signals, weather and derivatives are stored per variable, e.g., x[i*SOA_BLOCK + n] for state i of greenhouse n.
+The body of every update function (and of the ODE) becomes the body of a loop over the greenhouses,
+with every access to an auxiliary state or to x, u, d and ki indexed by the greenhouse.
+Since the block size is a compile-time constant and the auxiliary states are members of a single struct,
+the C compiler can vectorize these loops across the greenhouses.
+
+Run from the root of the repository after changing auxiliary_states.pxd or ODE.pxd:
+    python greenlight_gym/envs/cython/generate_soa.py
+"""
+import ast
+import os
+import re
+
+CYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+SOA_BLOCK = 8
+
+# functions of auxiliary_states.pxd that are converted, the ODE is converted from ODE.pxd
+UPDATE_FUNCTIONS = ["updateControls", "updateSlow", "updateWeather", "updateFast"]
+# per greenhouse arrays, indexed as array[i*SOA_BLOCK + n]
+ARRAYS = {"x", "u", "d", "ki"}
+# auxiliary states that the integrators accumulate over a time interval
+ACCUMULATORS = ["mcFruitHarSum"]
+
+HEADER = '''# Generated by generate_soa.py from auxiliary_states.pxd and ODE.pxd, do not edit.
+# Struct-of-arrays variant of the auxiliary states and the ODE for blocks of SOA_BLOCK greenhouses.
+# The states, control signals, weather and derivatives of a block are stored per variable,
+# e.g., x[i*SOA_BLOCK + n] holds state i of greenhouse n.
+cimport cython
+from define_parameters cimport Parameters
+from auxiliary_states cimport AuxiliaryStates, tau12, rhoUp, rhoDn, rad2degrees, fir, sensible, airMv, smoothHar, airMc
+from precision cimport real, cos, exp, sqrt, fabs, fmax, fmin, log, pow
+from libc.math cimport M_PI, floor
+from utils cimport satVp, cond, co2dens2ppm
+
+cdef enum:
+    SOA_BLOCK = {block}     # number of greenhouses in a block
+
+'''
+
+def function_body(source, name):
+    """
+    Returns the dedented body of the function name in source, without its docstring.
+    """
+    start = source.index(f"cdef inline void {name}(")
+    start = source.index("\n", source.index(") nogil:", start)) + 1
+    end = source.find("\ncdef ", start)
+    lines = source[start:end if end > 0 else len(source)].split("\n")
+    body = "\n".join(line[4:] if line.startswith("    ") else line.lstrip() for line in lines)
+    # the casts to real are not valid python, they are restored after the conversion
+    body = re.sub(r"<real>\(", "_real_(", body)
+    body = re.sub(r"<real>([\w.]+)", r"_real_(\1)", body)
+    tree = ast.parse(body)
+    if tree.body and isinstance(tree.body[0], ast.Expr) and isinstance(tree.body[0].value, ast.Constant):
+        tree.body = tree.body[1:]
+    return tree
+
+class BlockIndexer(ast.NodeTransformer):
+    """
+    Indexes the auxiliary states and the per greenhouse arrays by the greenhouse n of the block.
+    """
+    def __init__(self, integers):
+        self.fields = set()
+        # integer members of the parameters and auxiliary states, as attribute names
+        self.integers = integers
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == "a":
+            self.fields.add(node.attr)
+            return ast.Subscript(value=node, slice=ast.Name(id="n", ctx=ast.Load()), ctx=node.ctx)
+        return self.generic_visit(node)
+
+    def is_integer(self, node):
+        """
+        Returns whether node is an integer expression, i.e., a constant or an integer member or arithmetic of those.
+        """
+        if isinstance(node, ast.Constant):
+            return type(node.value) is int
+        if isinstance(node, ast.Subscript):
+            node = node.value
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            return (node.value.id, node.attr) in self.integers
+        if isinstance(node, ast.UnaryOp):
+            return self.is_integer(node.operand)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult)):
+            return self.is_integer(node.left) and self.is_integer(node.right)
+        return False
+
+    def visit_BinOp(self, node):
+        # the SoA functions use C division, integer operands are converted such that divisions remain true divisions
+        node = self.generic_visit(node)
+        if isinstance(node.op, ast.Div):
+            for operand in (node.left, node.right):
+                if isinstance(operand, ast.Constant) and type(operand.value) is int:
+                    operand.value = float(operand.value)
+            if self.is_integer(node.left) and self.is_integer(node.right):
+                node.left = ast.Call(func=ast.Name(id="_double_", ctx=ast.Load()), args=[node.left], keywords=[])
+        return node
+
+    def visit_Subscript(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id in ARRAYS:
+            index = ast.BinOp(left=ast.BinOp(left=self.visit(node.slice), op=ast.Mult(), right=ast.Name(id="SOA_BLOCK", ctx=ast.Load())),
+                              op=ast.Add(), right=ast.Name(id="n", ctx=ast.Load()))
+            return ast.Subscript(value=node.value, slice=index, ctx=node.ctx)
+        return self.generic_visit(node)
+
+def block_loop(tree, indexer):
+    """
+    Returns the Cython code of the loops over the greenhouses of a block, one loop per statement of the converted body of tree.
+    """
+    tree = indexer.visit(tree)
+    loops = []
+    for statement in tree.body:
+        code = ast.unparse(statement)
+        code = re.sub(r"_real_\(", "<real>(", code)
+        code = re.sub(r"_double_\(", "<double>(", code)
+        loops.append("    for n in range(SOA_BLOCK):\n" + "\n".join("        " + line for line in code.split("\n")) + "\n")
+    return "".join(loops)
+
+def struct_fields(source, struct="AuxiliaryStates"):
+    """
+    Returns the names and types of the members of the packed struct in source.
+    """
+    start = source.index(f"cdef packed struct {struct}:")
+    end = source.find("\ncdef ", start)
+    return re.findall(r"^\s+((?:unsigned )?(?:char|short|int)|real|double|float)\s+(\w+)", source[start:end if end > 0 else len(source)], re.M)
+
+def generate():
+    with open(os.path.join(CYTHON_DIR, "auxiliary_states.pxd")) as f:
+        aux_source = f.read()
+    with open(os.path.join(CYTHON_DIR, "ODE.pxd")) as f:
+        ode_source = f.read()
+    with open(os.path.join(CYTHON_DIR, "define_parameters.pxd")) as f:
+        parameter_source = f.read()
+
+    integers = {("p", name) for ctype, name in struct_fields(parameter_source, "Parameters") if ctype not in ("real", "double", "float")}
+    integers |= {("a", name) for ctype, name in struct_fields(aux_source) if ctype not in ("real", "double", "float")}
+    indexer = BlockIndexer(integers)
+    functions = []
+    for name in UPDATE_FUNCTIONS:
+        args = {"updateControls": "double* u", "updateSlow": "double* u, double* x",
+                "updateWeather": "double* u, double* d", "updateFast": "double* u, double* x, double* d"}[name]
+        loop = block_loop(function_body(aux_source, name), indexer)
+        functions.append('@cython.cdivision(True)\n'
+                         f'cdef inline void {name}SoA(AuxiliaryStatesSoA* a, Parameters* p, {args}) nogil:\n'
+                         f'    """\n    SoA variant of {name} in auxiliary_states.pxd.\n    """\n'
+                         f'    cdef unsigned int n\n{loop}')
+    loop = block_loop(function_body(ode_source, "ODE"), indexer)
+    functions.append('@cython.cdivision(True)\n'
+                     'cdef inline void ODESoA(AuxiliaryStatesSoA* a, Parameters* p, double* x, double* u, double* d, double* ki) nogil:\n'
+                     '    """\n    SoA variant of ODE in ODE.pxd, ki holds nx*SOA_BLOCK doubles.\n    """\n'
+                     f'    cdef unsigned int n\n{loop}')
+
+    types = dict((name, ctype) for ctype, name in struct_fields(aux_source))
+    fields = [name for _, name in struct_fields(aux_source) if name in indexer.fields or name in ACCUMULATORS]
+    struct = "cdef struct AuxiliaryStatesSoA:\n" + "".join(f"    {types[name]} {name}[SOA_BLOCK]\n" for name in fields) + "\n"
+
+    copies = "".join(f"        dst.{name}[n] = src[n].{name}\n" for name in fields)
+    load = ('cdef inline void loadAuxStatesSoA(AuxiliaryStatesSoA* dst, AuxiliaryStates* src, unsigned int count) nogil:\n'
+            '    """\n    Copies the auxiliary states of count greenhouses (at most SOA_BLOCK) into a block.\n    """\n'
+            '    cdef unsigned int n\n    for n in range(count):\n' + copies + "\n")
+    copies = "".join(f"        dst[n].{name} = src.{name}[n]\n" for name in fields)
+    store = ('cdef inline void storeAuxStatesSoA(AuxiliaryStates* dst, AuxiliaryStatesSoA* src, unsigned int count) nogil:\n'
+             '    """\n    Copies the auxiliary states of the first count greenhouses of a block back to their structs.\n    """\n'
+             '    cdef unsigned int n\n    for n in range(count):\n' + copies + "\n")
+
+    with open(os.path.join(CYTHON_DIR, "auxiliary_states_soa.pxd"), "w") as f:
+        f.write(HEADER.format(block=SOA_BLOCK) + struct + load + store + "\n".join(functions))
+
+if __name__ == "__main__":
+    generate()
@@ -6,13 +6,18 @@ The python environment will send setpoints as actions to the cython module.
 Next, cython will compute the control signals, and simulate the new state of the greenhouse.
 Finally, the new state/measurement/disturbances will be returned to the python environment.
 '''
-from auxiliary_states cimport AuxiliaryStates, initAuxStates
+from auxiliary_states cimport AuxiliaryStates, initAuxStates, updateControls, updateSlow
 from define_parameters cimport Parameters, initParameters
-from difference_function cimport fRK4
+from auxiliary_states_soa cimport AuxiliaryStatesSoA, SOA_BLOCK, updateControlsSoA, updateSlowSoA, storeAuxStatesSoA
+from difference_function cimport fRK4, fRK4Fast, fRK4SoA, fRos2, integrateDopri5
 from compute_controls cimport controlSignal
+from weather cimport WeatherInterpolation, WeatherData, weatherRow
 from utils cimport satVp
 from libc.stdlib cimport malloc, free
-from libc.math cimport cos, pi, sin
+from libc.string cimport memcpy
+from libc.math cimport atan, cos, pi, sin, NAN
+from cython.parallel cimport prange
+cimport openmp
 import cython
 
 import numpy as np
@@ -20,13 +25,452 @@ cimport numpy as cnp
 
 cnp.import_array()
 
+# integrators to solve the ODE, selected by name with setIntegrator
+cdef enum:
+    RK4 = 0         # fixed step size h
+    DOPRI5 = 1      # adaptive step size with error control
+    ROS2 = 2        # fixed step size h, linearly implicit for stiff states
+    MULTIRATE = 3   # fixed step size h for the fast states, slow auxiliary states updated once per time interval
+INTEGRATORS = {"rk4": RK4, "dopri5": DOPRI5, "ros2": ROS2, "multirate": MULTIRATE}
+
+cdef char integratorIndex(str integrator) except -1:
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator {integrator}, expected one of {list(INTEGRATORS)}")
+    return INTEGRATORS[integrator]
+
+# memory layouts of the auxiliary states of GreenLightBatch during the integration, selected by name with setLayout
+cdef enum:
+    AOS = 0         # array of AuxiliaryStates structs, every greenhouse is integrated separately
+    SOA = 1         # struct of arrays over blocks of SOA_BLOCK greenhouses, which are integrated in lockstep
+LAYOUTS = {"aos": AOS, "soa": SOA}
+
+# variables that can be observed from the model with fill_obs, resolved once by name into codes with observation_codes
+cdef enum:
+    OBS_AIR_TEMP
+    OBS_CO2_CONC
+    OBS_IN_RH
+    OBS_FRUIT_WEIGHT
+    OBS_FRUIT_HARVEST
+    OBS_PAR
+    OBS_DAILY_AVG_TEMP
+    OBS_CO2_RESOURCE
+    OBS_GAS_RESOURCE
+    OBS_HEAT_DEMAND
+    OBS_ELECTRICAL_RESOURCE
+    OBS_CO2_INJECTION_RATE
+    OBS_HOUR_OF_DAY_SIN
+    OBS_HOUR_OF_DAY_COS
+    OBS_DAY_OF_YEAR_SIN
+    OBS_DAY_OF_YEAR_COS
+    OBS_TIME
+    OBS_UBOIL
+    OBS_UCO2
+    OBS_UVENT
+    OBS_UTHSCR
+    OBS_ULAMP
+OBSERVATIONS = {"air_temp": OBS_AIR_TEMP, "co2_conc": OBS_CO2_CONC, "in_rh": OBS_IN_RH, "fruit_weight": OBS_FRUIT_WEIGHT,
+                "fruit_harvest": OBS_FRUIT_HARVEST, "PAR": OBS_PAR, "daily_avg_temp": OBS_DAILY_AVG_TEMP,
+                "co2_resource": OBS_CO2_RESOURCE, "gas_resource": OBS_GAS_RESOURCE, "heat_demand": OBS_HEAT_DEMAND,
+                "electrical_resource": OBS_ELECTRICAL_RESOURCE, "co2InjectionRate": OBS_CO2_INJECTION_RATE,
+                "hour_of_day_sin": OBS_HOUR_OF_DAY_SIN, "hour_of_day_cos": OBS_HOUR_OF_DAY_COS,
+                "day_of_year_sin": OBS_DAY_OF_YEAR_SIN, "day_of_year_cos": OBS_DAY_OF_YEAR_COS, "time": OBS_TIME,
+                "uBoil": OBS_UBOIL, "uCO2": OBS_UCO2, "uVent": OBS_UVENT, "uThScr": OBS_UTHSCR, "uLamp": OBS_ULAMP}
+
+def observation_codes(list varNames):
+    """
+    Resolves the names of observed model variables into the codes of fill_obs.
+    The names are equal to the properties of GreenLight and GreenLightBatch.
+    """
+    unknown = [name for name in varNames if name not in OBSERVATIONS]
+    if unknown:
+        raise ValueError(f"Unknown model observations {unknown}, expected any of {list(OBSERVATIONS)}")
+    return np.array([OBSERVATIONS[name] for name in varNames], dtype=np.intc)
+
+cdef inline double observation(int code, Parameters* p, AuxiliaryStates* a, double* x, double* u, float timeInterval) nogil:
+    """
+    Returns the observed variable code of a single greenhouse, equal to the property of GreenLight with the same name.
+    """
+    if code == OBS_AIR_TEMP:
+        return x[2]
+    elif code == OBS_CO2_CONC:
+        return a.co2InPpm
+    elif code == OBS_IN_RH:
+        return a.rhIn
+    elif code == OBS_FRUIT_WEIGHT:
+        return x[25] * 1e-6
+    elif code == OBS_FRUIT_HARVEST:
+        return a.mcFruitHarSum * 1e-6
+    elif code == OBS_PAR:
+        return a.rParGhSun + a.rParGhLamp
+    elif code == OBS_DAILY_AVG_TEMP:
+        return x[21]
+    elif code == OBS_CO2_RESOURCE:
+        return a.mcExtAir*timeInterval*1e-6
+    elif code == OBS_GAS_RESOURCE:
+        return (a.hBoilPipe*timeInterval*1e-6)/p.energyContentGas
+    elif code == OBS_HEAT_DEMAND:
+        return a.hBoilPipe
+    elif code == OBS_ELECTRICAL_RESOURCE:
+        return a.qLampIn
+    elif code == OBS_CO2_INJECTION_RATE:
+        return a.mcExtAir
+    elif code == OBS_HOUR_OF_DAY_SIN:
+        return 0.5 * (1+sin(2*pi * (a.timeOfDay/24)))
+    elif code == OBS_HOUR_OF_DAY_COS:
+        return 0.5 * (1+cos(2*pi * (a.timeOfDay/24)))
+    elif code == OBS_DAY_OF_YEAR_SIN:
+        return 0.5 * (1+sin(2*pi * (a.dayOfYear/365)))
+    elif code == OBS_DAY_OF_YEAR_COS:
+        return 0.5 * (1+cos(2*pi * (a.dayOfYear/365)))
+    elif code == OBS_TIME:
+        return x[27]
+    elif code == OBS_UBOIL:
+        return u[0]
+    elif code == OBS_UCO2:
+        return u[1]
+    elif code == OBS_UVENT:
+        return u[2]
+    elif code == OBS_UTHSCR:
+        return u[3]
+    elif code == OBS_ULAMP:
+        return u[4]
+    return NAN
+
+# outputs of the reward kernel of a single greenhouse, see setReward
+cdef enum:
+    REWARD_PROFIT = 0       # profit over the time interval [€ m^-2]
+    REWARD_VIOLATIONS = 1   # violations of the bounds of the indoor temperature, CO2 concentration and relative humidity
+    REWARD_PENALTY = 4      # mean of the arctan penalties of the violations [-1, 0]
+    REWARD_TOTAL = 5        # reward of the agent, combination of the scaled profit and the penalty
+    N_REWARD_OUTPUTS = 6
+    N_INDOOR_OBS = 3
+
+# combinations of the scaled profit and the penalty, see rewards.py:AdditiveReward and MultiplicativeReward
+cdef enum:
+    ADDITIVE = 0
+    MULTIPLICATIVE = 1
+REWARD_COMBINATIONS = {"additive": ADDITIVE, "multiplicative": MULTIPLICATIVE}
+
+cdef struct RewardParameters:
+    char combination
+    double co2Price     # price for carbon dioxide [€/kg]
+    double gasPrice     # price for gas [€/m3]
+    double tomPrice     # price for tomatoes [€/[FW] kg]
+    double dmfm         # dry matter fraction of the fruit
+    double rmin         # minimum and maximum profit over the time interval, used to scale the profit [€ m^-2]
+    double rmax
+    double omega        # weight of the penalty in the multiplicative reward
+    double k[N_INDOOR_OBS]          # penalty weights
+    double obsLow[N_INDOOR_OBS]     # lower and upper bounds of the indoor climate
+    double obsHigh[N_INDOOR_OBS]
+
+cdef void initRewardParameters(RewardParameters* r, str combination, double co2Price, double gasPrice, double tomPrice,
+                               double dmfm, double rmin, double rmax, object k, object obsLow, object obsHigh,
+                               double omega) except *:
+    cdef unsigned char i
+    if combination not in REWARD_COMBINATIONS:
+        raise ValueError(f"Unknown reward combination {combination}, expected one of {list(REWARD_COMBINATIONS)}")
+    if len(k) != N_INDOOR_OBS or len(obsLow) != N_INDOOR_OBS or len(obsHigh) != N_INDOOR_OBS:
+        raise ValueError(f"Expected {N_INDOOR_OBS} penalty weights and bounds, got {len(k)}, {len(obsLow)} and {len(obsHigh)}")
+    r.combination = REWARD_COMBINATIONS[combination]
+    r.co2Price = co2Price
+    r.gasPrice = gasPrice
+    r.tomPrice = tomPrice
+    r.dmfm = dmfm
+    r.rmin = rmin
+    r.rmax = rmax
+    r.omega = omega
+    for i in range(N_INDOOR_OBS):
+        r.k[i] = k[i]
+        r.obsLow[i] = obsLow[i]
+        r.obsHigh[i] = obsHigh[i]
+
+@cython.cdivision(True)
+cdef inline void rewardKernel(RewardParameters* r, Parameters* p, AuxiliaryStates* a, double* x, double* u, float timeInterval,
+                               double* out) nogil:
+    """
+    Computes the profit, the violations of the indoor climate bounds, the arctan penalty and the reward of a single greenhouse,
+    following the reward modules of rewards.py (HarvestHeatCO2Reward, ArcTanPenaltyReward and their combination).
+    """
+    cdef unsigned char i
+    cdef double lowerbound, upperbound, penalty, scaledProfit
+    cdef double indoor[N_INDOOR_OBS]
+    indoor[0] = x[2]
+    indoor[1] = a.co2InPpm
+    indoor[2] = a.rhIn
+
+    out[REWARD_PROFIT] = observation(OBS_FRUIT_HARVEST, p, a, x, u, timeInterval)/r.dmfm * r.tomPrice \
+        - observation(OBS_CO2_RESOURCE, p, a, x, u, timeInterval)*r.co2Price \
+        - observation(OBS_GAS_RESOURCE, p, a, x, u, timeInterval)*r.gasPrice
+    penalty = 0
+    for i in range(N_INDOOR_OBS):
+        lowerbound = r.obsLow[i] - indoor[i]
+        if lowerbound < 0:
+            lowerbound = 0
+        upperbound = indoor[i] - r.obsHigh[i]
+        if upperbound < 0:
+            upperbound = 0
+        out[REWARD_VIOLATIONS + i] = lowerbound + upperbound
+        penalty += 2/pi*atan(-r.k[i]*out[REWARD_VIOLATIONS + i])
+    out[REWARD_PENALTY] = penalty/N_INDOOR_OBS
+
+    scaledProfit = (out[REWARD_PROFIT] - r.rmin)/(r.rmax - r.rmin)
+    if r.combination == MULTIPLICATIVE:
+        out[REWARD_TOTAL] = scaledProfit * (1.0 - r.omega*(-out[REWARD_PENALTY]))
+    else:
+        out[REWARD_TOTAL] = scaledProfit + out[REWARD_PENALTY]
+
+cdef enum:
+    N_CLIMATE_STATES = 22   # climate and soil states x[0]-x[21] that are set by a warm start, see setClimateState
+
+cdef void initStates(Parameters* p, double* x, double* d0, unsigned int timeInDays):
+    """
+    Function to initialize the states x of a single greenhouse.
+    CO2 concentration is equal to outdoor CO2	
+    x[0]: co2Air    CO2 concentration in main air compartment [mg m^{-3}]
+    x[1]: co2Top    CO2 concentration in top air compartment [mg m^{-3}]
+    x[2]: tAir      Air temperature in main compartment [deg C]
+    x[3]: tTop      Air temperature in top compartment [deg C]
+    x[4]: tCan      Temperature of the canopy [deg C]
+    x[5]: tCovIn    Indoor cover temperature [deg C]
+    x[6]: tCovE     Outdoor cover temperature [deg C]
+    x[7]: tThScr    Thermal screen temperature [deg C]
+    x[8]: tFlr      Floor temperature [deg C]
+    x[9]: tPipe     Pipe temperature [deg C]
+    x[10]: tSoil1   First soil layer temperature [deg C]
+    x[11]: tSoil2   Second soil layer temperature [deg C]
+    x[12]: tSoil3   Third soil layer temperature [deg C]
+    x[13]: tSoil4   Fourth soil layer temperature [deg C]
+    x[14]: tSoil5   Fifth soil layer temperature [deg C]
+    x[15]: vpAir    Vapor pressure of main air compartment [Pa]
+    x[16]: vpTop    Vapor pressure of top air compartment [Pa]
+    x[17]: tLamp    Lamp temperature [deg C]
+    x[18]: tIntLamp Interlight temperature [deg C]
+    x[19]: tGroPipe Grow pipe temperature [deg C]
+    x[20]: tBlScr   Blackout screen temperature [deg C]
+    x[21]: tCan24   Average temperature of the canopy over last 24 hours [deg C]
+    
+    x[22]: cBuf     Carbohydrates in crop buffer [mg{CH20} m^{-2}]
+    x[23]: cLeaf    Carbohydrates in leaves [mg{CH20} m^{-2}]
+    x[24]: cStem    Carbohydrates in stem [mg{CH20} m^{-2}]
+    x[25]: cFruit   Carbohydrates in fruit [mg{CH20} m^{-2}]
+    x[26]: tCanSum  Crop development stage [C day]
+
+    x[27]: time     Time since 01-01-0001 [days]
+    """
+    # Air and vapor pressure are assumed to start at the night setpoints
+    x[0] = d0[3] # co2Air
+
+    # x.co2Top.val = x.co2Air.val
+    x[1] = x[0] # co2Top
+
+    # x.tAir.val = p.tSpNight.val
+    x[2] = p.tSpNight # tAir
+
+    # x.tTop.val = x.tAir.val
+    x[3] = x[2] # tTop
+
+    # x.tCan.val = x.tAir.val+4
+    x[4] = x[2] + 4
+
+    # x.tCovIn.val = x.tAir.val
+    x[5] = x[2]
+
+    # x.tCovE.val = x.tAir.val
+    x[6] = x[2]
+
+    # x.tThScr.val = x.tAir.val
+    x[7] = x[2]
+
+    # x.tFlr.val = x.tAir.val
+    x[8] = x[2]
+
+    # x.tPipe.val = x.tAir.val
+    x[9] = x[2]
+
+    # x.tSo1.val = x.tAir.val
+    x[10] = x[2]
+
+    # x.tSo2.val = 1/4*(3*x.tAir.val+d.tSoOut.val(1,2))
+    x[11] = 1/4*(3*x[2] + d0[6])
+
+    # # x.tSo3.val = 1/4*(2*x.tAir.val + 2*d.tSoOut.val(1,2))
+    x[12] = 1/4*(2*x[2] + 2*d0[6])
+
+    # # x.tSo4.val = 1/4*(x.tAir.val+3*d.tSoOut.val(1,2))
+    x[13] = 1/4*(x[2] + 3*d0[6])
+
+    # # x.tSo5.val = d.tSoOut.val(1,2)
+    x[14] = d0[6]
+
+    # # x.vpAir.val = p.rhMax.val/100*satVp(x.tAir.val)
+    x[15] = p.rhMax/100*satVp(x[2])
+
+    # # x.vpTop.val = x.vpAir.val
+    x[16] = x[15]
+
+    # # x.tLamp.val = x.tAir.val
+    x[17] = x[2]
+
+    # # x.tIntLamp.val = x.tAir.val
+    x[18] = x[2]
+
+    # # x.tGroPipe.val = x.tAir.val
+    x[19] = x[2]
+
+    # # x.tBlScr.val = x.tAir.val
+    x[20] = x[2]
+    
+    # x.tCan24.val = x.tCan.val
+    x[21] = x[4]
+
+    ## crop model
+    # x.cBuf.val = 0
+    x[22] = 0
+
+    # # start with 3.12 plants/m2, assume they are each 2 g = 6240 mg/m2.
+    x[23] = 0.7*6240   # 70% in leafs
+    x[24] = 0.25*6240  # 25% in stems
+    x[25] = 0.05*6240 # 5% in fruits we only harvest if this is > 300K
+
+    # x.tCanSum.val = 0
+    x[26] = 0
+
+    # time since 01-01-0001 [days]:
+    x[27] = timeInDays
+
+cdef const double[:, ::1] initWeatherView(object weather, char nd):
+    """
+    Returns a C-contiguous view of the weather data, which is only copied if it is not C-contiguous or not of type double.
+    """
+    cdef const double[:, ::1] view = np.ascontiguousarray(weather, dtype=np.double)
+    if view.shape[0] == 0 or view.shape[1] < nd:
+        raise ValueError(f"Weather data should have at least one row and {nd} columns, got shape {np.shape(weather)}")
+    return view
+
+cdef void initWeatherData(WeatherData* w, double* dLazy, char nd):
+    """
+    Initializes the weather data of a single greenhouse without weather, dLazy is a buffer of nd doubles.
+    """
+    w.d = NULL
+    w.stride = 0
+    w.rows = 0
+    w.lazy = False
+    w.dLazy = dLazy
+    w.nd = nd
+
+cdef void setWeatherView(WeatherData* w, const double[:, ::1] view):
+    """
+    Points the weather data to the resampled weather data supplied by python, see initWeatherView.
+    """
+    w.d = &view[0, 0]
+    w.stride = view.shape[1]
+    w.rows = view.shape[0]
+    w.lazy = False
+
+cdef void initWeatherInterpolation(WeatherData* w, const double[::1] knots, const double[:, :, ::1] coefficients,
+                                   unsigned int rows) except *:
+    """
+    Points the weather data to the knots and coefficients of the PCHIP interpolation supplied by python,
+    which is evaluated at every solver step. See common/utils.py:WeatherInterpolation.
+    """
+    cdef char nd = w.nd
+    if knots.shape[0] < 2 or rows < 2:
+        raise ValueError(f"Weather interpolation requires at least two knots and two rows, got {knots.shape[0]} knots and {rows} rows")
+    if coefficients.shape[0] != 4 or coefficients.shape[1] != knots.shape[0] - 1 or coefficients.shape[2] != nd:
+        raise ValueError(f"Expected coefficients of shape (4, {knots.shape[0] - 1}, {nd}), got ({coefficients.shape[0]}, {coefficients.shape[1]}, {coefficients.shape[2]})")
+    w.wi.knots = &knots[0]
+    w.wi.coefficients = &coefficients[0, 0, 0]
+    w.wi.nKnots = knots.shape[0]
+    w.wi.rows = rows
+    w.wi.start = knots[0]
+    w.wi.stop = knots[knots.shape[0] - 1]
+    w.wi.step = (w.wi.stop - w.wi.start) / (rows - 1)
+    w.rows = rows
+    w.lazy = True
+
+# header of a snapshot of the simulator state of a greenhouse, followed by the states (nx doubles),
+# the control signals (nu doubles) and the AuxiliaryStates struct, see GreenLight.get_snapshot
+cdef packed struct SnapshotHeader:
+    unsigned int timestep               # current timestep, the weather data is read from row timestep*solverSteps onwards
+    double hAdaptive                    # step size proposed by the adaptive integrator
+    unsigned long long nEvaluations     # number of evaluations of the ODE since the reset
+
+cdef Py_ssize_t snapshotSize(char nx, char nu):
+    return sizeof(SnapshotHeader) + (nx + nu)*sizeof(double) + sizeof(AuxiliaryStates)
+
+cdef object packSnapshot(SnapshotHeader* header, double* x, double* u, AuxiliaryStates* a, char nx, char nu):
+    """
+    Copies the simulator state of a greenhouse into a new uint8 array.
+    """
+    snapshot = np.empty(snapshotSize(nx, nu), dtype=np.uint8)
+    cdef unsigned char[::1] view = snapshot
+    cdef unsigned char* out = &view[0]
+    memcpy(out, header, sizeof(SnapshotHeader))
+    out += sizeof(SnapshotHeader)
+    memcpy(out, x, nx*sizeof(double))
+    out += nx*sizeof(double)
+    memcpy(out, u, nu*sizeof(double))
+    out += nu*sizeof(double)
+    memcpy(out, a, sizeof(AuxiliaryStates))
+    return snapshot
+
+cdef void unpackSnapshot(object snapshot, SnapshotHeader* header, double* x, double* u, AuxiliaryStates* a,
+                         char nx, char nu, unsigned int weatherRows, unsigned short solverSteps) except *:
+    """
+    Copies a snapshot of packSnapshot back into the simulator state of a greenhouse.
+    The snapshot is validated before anything is copied, such that a failed restore leaves the state unchanged.
+    """
+    cdef const unsigned char[::1] view = snapshot
+    cdef const unsigned char* data
+    cdef SnapshotHeader restored
+    if view.shape[0] != snapshotSize(nx, nu):
+        raise ValueError(f"Snapshot should have {snapshotSize(nx, nu)} bytes for nx={nx} and nu={nu}, got {view.shape[0]}")
+    data = &view[0]
+    memcpy(&restored, data, sizeof(SnapshotHeader))
+    if <unsigned long long>restored.timestep*solverSteps > weatherRows:
+        raise ValueError(f"Snapshot at timestep {restored.timestep} is beyond the weather data of {weatherRows} solver steps")
+    header[0] = restored
+    data += sizeof(SnapshotHeader)
+    memcpy(x, data, nx*sizeof(double))
+    data += nx*sizeof(double)
+    memcpy(u, data, nu*sizeof(double))
+    data += nu*sizeof(double)
+    memcpy(a, data, sizeof(AuxiliaryStates))
+
+cdef void setClimateStates(double* x, AuxiliaryStates* a, const double[::1] states) except *:
+    """
+    Overwrites the climate and soil states x[0]-x[21] of a single greenhouse, e.g., with a spun-up state of a warm start library,
+    and recomputes the auxiliary states that are observed at the start of the simulation.
+    The crop states and the time are left unchanged.
+    """
+    cdef unsigned char i
+    if states.shape[0] != N_CLIMATE_STATES:
+        raise ValueError(f"Expected {N_CLIMATE_STATES} climate states, got {states.shape[0]}")
+    for i in range(N_CLIMATE_STATES):
+        x[i] = states[i]
+    initAuxStates(a, x)
+
 cdef class GreenLight:
     cdef Parameters* p      # pointer to Parameters struct
     cdef AuxiliaryStates* a # pointer to AuxiliaryStates struct
-    cdef double (*d)[10]    # pointer to weather data
+    cdef const double[:, ::1] weather # weather data supplied by python, referenced instead of copied
+    cdef WeatherData w      # weather data of the simulation, resampled by python or interpolated at every solver step
+    cdef object weatherKnots        # knots and coefficients of the weather interpolation supplied by python
+    cdef object weatherCoefficients
     cdef double* x          # pointer to states
     cdef double* u          # pointer to control signals
+    cdef double* k          # stage derivatives of the solver, allocated once (7*nx)
+    cdef double* xs         # intermediate stage states of the solver, allocated once (5*nx)
+    cdef double* W          # LU factorization of the Rosenbrock matrix, allocated once (nx*nx)
+    cdef unsigned char* piv # pivots of the LU factorization (nx)
     cdef float h            # step size
+    cdef char integrator    # integrator to solve the ODE (RK4, DOPRI5, ROS2 or MULTIRATE)
+    cdef double rtol        # relative tolerance of the adaptive integrator
+    cdef double atol        # absolute tolerance of the adaptive integrator
+    cdef double maxStep     # maximum step size of the adaptive integrator [s]
+    cdef double hAdaptive   # step size proposed by the adaptive integrator for the next time interval [s]
+    cdef unsigned long long nEvaluations    # number of evaluations of the ODE since the reset
     cdef unsigned int timestep  # current timestep
     cdef char nx            # number of states
     cdef char nu            # number of control signals
@@ -34,6 +478,10 @@ cdef class GreenLight:
 
     cdef unsigned short solverSteps # number of steps to take by solver between time interval for observing the env
     cdef float time_interval
+    cdef RewardParameters r # settings of the reward kernel, see setReward
+    cdef bint rewardEnabled # whether the reward kernel is evaluated at the end of every step
+    cdef object rewardArray # preallocated outputs of the reward kernel (N_REWARD_OUTPUTS)
+    cdef double* rewardOut  # data of rewardArray
 
     def __cinit__(self,
                 float h,
@@ -51,7 +499,12 @@ cdef class GreenLight:
         self.a = <AuxiliaryStates*>malloc(sizeof(AuxiliaryStates))
         self.u = <double*>malloc(nu * sizeof(double))
         self.x = <double*>malloc(nx * sizeof(double))
-        self.d = NULL
+        # solver buffers are sized for fDopri5 (seven stages), such that every integrator can reuse them
+        self.k = <double*>malloc(7 * nx * sizeof(double))
+        self.xs = <double*>malloc(5 * nx * sizeof(double))
+        self.W = <double*>malloc(nx * nx * sizeof(double))
+        self.piv = <unsigned char*>malloc(nx * sizeof(unsigned char))
+        initWeatherData(&self.w, <double*>malloc(nd * sizeof(double)), nd)
         initParameters(self.p, noLamps, ledLamps, hpsLamps, intLamps)
 
         self.h = h
@@ -62,6 +515,10 @@ cdef class GreenLight:
         self.timestep = 0
         self.solverSteps = solverSteps
         self.time_interval = solverSteps * h
+        self.setIntegrator("rk4")
+        self.rewardEnabled = False
+        self.rewardArray = np.zeros(N_REWARD_OUTPUTS, dtype=np.double)
+        self.rewardOut = <double*>cnp.PyArray_DATA(self.rewardArray)
 
     def __dealloc__(self):
         if self.a is not NULL:
@@ -70,27 +527,96 @@ cdef class GreenLight:
         if self.p is not NULL:
             free(self.p)
             self.p = NULL
-        if self.d is not NULL:
-            free(self.d)
-            self.d = NULL
         if self.x is not NULL:
             free(self.x)
             self.x = NULL
         if self.u is not NULL:
             free(self.u)
             self.u = NULL
+        if self.k is not NULL:
+            free(self.k)
+            self.k = NULL
+        if self.xs is not NULL:
+            free(self.xs)
+            self.xs = NULL
+        if self.W is not NULL:
+            free(self.W)
+            self.W = NULL
+        if self.piv is not NULL:
+            free(self.piv)
+            self.piv = NULL
+        if self.w.dLazy is not NULL:
+            free(self.w.dLazy)
+            self.w.dLazy = NULL
 
     cpdef void reset(self, 
-                    cnp.ndarray[cnp.double_t, ndim=2] weather,
+                    object weather,
                     unsigned int timeInDays
-                    ):
+                    ) except *:
 
         # compute auxiliary states once before start of simulation
         self.initWeather(weather)
-        self.initStates(self.d[0], timeInDays)
+        self.initSimulation(timeInDays)
+
+    cpdef void resetInterpolated(self,
+                    object knots,
+                    object coefficients,
+                    unsigned int rows,
+                    unsigned int timeInDays
+                    ) except *:
+        """
+        Resets the model with the PCHIP interpolation of the weather data, instead of the resampled weather data.
+        The weather data is evaluated at every solver step on demand, such that only the knots (the raw weather samples)
+        and the coefficients are kept in memory, instead of the weather data at every solver step.
+        The disturbances are equal to the resampled weather data of loadWeatherData.
+
+        Args:
+            knots (np.ndarray)          - Time of the knots [s], of shape (nKnots,).
+            coefficients (np.ndarray)   - Coefficients of the interpolation, of shape (4, nKnots-1, nd).
+            rows (int)                  - Number of solver steps the weather data is resampled to.
+            timeInDays (int)            - Time since 01-01-0001 [days] at the start of the simulation.
+        """
+        initWeatherInterpolation(&self.w, knots, coefficients, rows)
+        self.weatherKnots = knots
+        self.weatherCoefficients = coefficients
+        self.initSimulation(timeInDays)
+
+    cdef void initSimulation(self, unsigned int timeInDays):
+        """
+        Initializes the states, controls and auxiliary states at the start of the simulation.
+        """
+        initStates(self.p, self.x, weatherRow(&self.w, 0), timeInDays)
         self.init_controls()
         initAuxStates(self.a, self.x)
         self.timestep = 0
+        self.hAdaptive = self.h
+        self.nEvaluations = 0
+
+    cpdef void setIntegrator(self, str integrator, double rtol=1e-4, double atol=1e-4, double maxStep=300) except *:
+        """
+        Selects the integrator that solves the ODE over a time interval.
+            rk4     - fixed step size Runge-Kutta 4, with step size h.
+            dopri5  - adaptive step size Dormand-Prince 5(4), with error control based on rtol and atol.
+                      The disturbances are held at the midpoint of every step, and steps do not exceed maxStep.
+            ros2    - fixed step size Rosenbrock method of second order, with step size h.
+                      Stable for the stiff states, such that h can be 30-60 seconds.
+                      The Jacobian is approximated at every step by finite differences.
+            multirate - rk4 for the fast states, while the auxiliary states that only depend on the slow states
+                      (soil, tCan24 and crop) and the controls are updated once per time interval (macro-step).
+                      The slow states themselves are still integrated with rk4 at every step of size h, not at the macro-step,
+                      hence multirate is only about 5-20% faster than rk4, see greenlight_gym/tests/multirate_integrator.py.
+
+        Args:
+            integrator (str)    - Name of the integrator, rk4, dopri5, ros2 or multirate.
+            rtol (float)        - Relative tolerance of the adaptive integrator.
+            atol (float)        - Absolute tolerance of the adaptive integrator.
+            maxStep (float)     - Maximum step size of the adaptive integrator [s].
+                                  Only limits the steps if it is smaller than the time interval.
+        """
+        self.integrator = integratorIndex(integrator)
+        self.rtol = rtol
+        self.atol = atol
+        self.maxStep = maxStep
 
     cdef void init_controls(self):
         """
@@ -119,36 +645,93 @@ cdef class GreenLight:
         # we have controls inputs that are based on setpoits (computed here)
         # and we have control inputs that are learned (computed in python environment)
         # compute control signal at specific time step
-        self.u = controlSignal(self.a, self.p, self.x, self.u, self.d[self.timestep*self.solverSteps])
+        self.u = controlSignal(self.a, self.p, self.x, self.u, weatherRow(&self.w, self.timestep*self.solverSteps))
 
         for i in range(len(learnedControlIdx)):
             self.u[learnedControlIdx[i]] = controls[i]
 
+        # the auxiliary states of the control inputs are constant over the time interval
+        updateControls(self.a, self.p, self.u)
         self.a.mcFruitHarSum = 0
-        for j in range(self.solverSteps):
-            self.x = fRK4(self.a, self.p, self.u, self.x, self.d[self.timestep * self.solverSteps + j], self.h, self.nx)
+        if self.integrator == DOPRI5:
+            self.nEvaluations += integrateDopri5(self.a, self.p, self.u, self.x, &self.w, self.timestep*self.solverSteps, self.solverSteps,
+                                                 self.h, self.nx, self.k, self.xs, self.rtol, self.atol, self.maxStep, &self.hAdaptive)
+        elif self.integrator == ROS2:
+            for j in range(self.solverSteps):
+                fRos2(self.a, self.p, self.u, self.x, weatherRow(&self.w, self.timestep * self.solverSteps + j), self.h, self.nx,
+                      self.k, self.xs, self.W, self.piv)
+            self.nEvaluations += (self.nx + 2)*self.solverSteps
+        elif self.integrator == MULTIRATE:
+            updateSlow(self.a, self.p, self.u, self.x)
+            for j in range(self.solverSteps):
+                fRK4Fast(self.a, self.p, self.u, self.x, weatherRow(&self.w, self.timestep * self.solverSteps + j), self.h, self.nx, self.k, self.xs)
+            self.nEvaluations += 4*self.solverSteps
+        else:
+            for j in range(self.solverSteps):
+                fRK4(self.a, self.p, self.u, self.x, weatherRow(&self.w, self.timestep * self.solverSteps + j), self.h, self.nx, self.k, self.xs)
+            self.nEvaluations += 4*self.solverSteps
         self.timestep += 1
+        if self.rewardEnabled:
+            self.computeReward()
 
-    cdef void initWeather(self, cnp.ndarray[cnp.double_t, ndim=2] weather):
+    cdef void initWeather(self, object weather) except *:
         """
         Function to initialize the weather data in the cython module of GreenLight.
-        We copy the array with weather data that was loaded in by the python environment to an array in the cython module.
+        The model keeps a reference to the array with weather data that was loaded in by the python environment,
+        such that the cost of a reset does not depend on the length of the season.
+        Only arrays that are not C-contiguous doubles are copied. Read-only arrays (e.g., memory mapped) are supported.
+        The array should not be modified during the simulation.
+
+        Args:
+            weather (np.ndarray): Array with weather data of shape (rows, nd).
+        """
+        self.weather = initWeatherView(weather, self.nd)
+        setWeatherView(&self.w, self.weather)
+        self.weatherKnots = None
+        self.weatherCoefficients = None
+
+    cpdef object get_snapshot(self):
+        """
+        Captures the simulator state, i.e., the states, control signals, auxiliary states, timestep
+        and the state of the adaptive integrator, in a compact uint8 array.
+        The weather data is not part of the snapshot, the timestep determines the offset into the weather data.
+        Parameters and the integrator are fixed after construction and are not captured either.
+
+        Returns:
+            np.ndarray: Snapshot of the simulator state, of dtype uint8.
+        """
+        cdef SnapshotHeader header
+        header.timestep = self.timestep
+        header.hAdaptive = self.hAdaptive
+        header.nEvaluations = self.nEvaluations
+        return packSnapshot(&header, self.x, self.u, self.a, self.nx, self.nu)
+
+    cpdef void restore_snapshot(self, object snapshot) except *:
+        """
+        Restores the simulator state from a snapshot of get_snapshot, by copying it into the buffers of the model.
+        The model should simulate the same weather data as when the snapshot was taken,
+        e.g., reset the model with that weather data before restoring a snapshot of another episode.
+        Snapshots are interchangeable between GreenLight and a greenhouse of GreenLightBatch with the same nx and nu.
 
         Args:
-            weather (np.ndarray): Array with weather data.
+            snapshot (np.ndarray or bytes)  - Snapshot of the simulator state.
         """
-        cdef int i, j
-        cdef cnp.ndarray[cnp.double_t, ndim=2] np_weather = np.asarray(weather, dtype=np.double)
-        cdef int n = np_weather.shape[0]
-        cdef char l = self.nd
+        cdef SnapshotHeader header
+        unpackSnapshot(snapshot, &header, self.x, self.u, self.a, self.nx, self.nu, self.w.rows, self.solverSteps)
+        self.timestep = header.timestep
+        self.hAdaptive = header.hAdaptive
+        self.nEvaluations = header.nEvaluations
 
-        if self.d is not NULL:
-            free(self.d)
-        self.d = <double(*)[10]>malloc(n * sizeof(double[10]))
+    cpdef void setClimateState(self, const double[::1] states) except *:
+        """
+        Function to set the climate and soil states x[0]-x[21] of the GreenLight model after a reset,
+        such that the simulation starts from a spun-up state instead of the night setpoints of initStates.
+        See common/utils.py:WarmStartLibrary.
 
-        for i in range(n):
-            for j in range(l):
-                self.d[i][j] = np_weather[i, j]
+        Args:
+            states (np.ndarray): Array with the 22 climate and soil states.
+        """
+        setClimateStates(self.x, self.a, states)
 
     cpdef void setCropState(self, float cLeaf, float cStem, float cFruit, float tCanSum):
         """
@@ -184,135 +767,26 @@ cdef class GreenLight:
             # if i != testIndex:
             self.x[i] = np_states[i]
 
-    cdef void initStates(self, double* d0, unsigned int timeInDays):
-        """
-        CO2 concentration is equal to outdoor CO2	
-        x[0]: co2Air    CO2 concentration in main air compartment [mg m^{-3}]
-        x[1]: co2Top    CO2 concentration in top air compartment [mg m^{-3}]
-        x[2]: tAir      Air temperature in main compartment [deg C]
-        x[3]: tTop      Air temperature in top compartment [deg C]
-        x[4]: tCan      Temperature of the canopy [deg C]
-        x[5]: tCovIn    Indoor cover temperature [deg C]
-        x[6]: tCovE     Outdoor cover temperature [deg C]
-        x[7]: tThScr    Thermal screen temperature [deg C]
-        x[8]: tFlr      Floor temperature [deg C]
-        x[9]: tPipe     Pipe temperature [deg C]
-        x[10]: tSoil1   First soil layer temperature [deg C]
-        x[11]: tSoil2   Second soil layer temperature [deg C]
-        x[12]: tSoil3   Third soil layer temperature [deg C]
-        x[13]: tSoil4   Fourth soil layer temperature [deg C]
-        x[14]: tSoil5   Fifth soil layer temperature [deg C]
-        x[15]: vpAir    Vapor pressure of main air compartment [Pa]
-        x[16]: vpTop    Vapor pressure of top air compartment [Pa]
-        x[17]: tLamp    Lamp temperature [deg C]
-        x[18]: tIntLamp Interlight temperature [deg C]
-        x[19]: tGroPipe Grow pipe temperature [deg C]
-        x[20]: tBlScr   Blackout screen temperature [deg C]
-        x[21]: tCan24   Average temperature of the canopy over last 24 hours [deg C]
-        
-        x[22]: cBuf     Carbohydrates in crop buffer [mg{CH20} m^{-2}]
-        x[23]: cLeaf    Carbohydrates in leaves [mg{CH20} m^{-2}]
-        x[24]: cStem    Carbohydrates in stem [mg{CH20} m^{-2}]
-        x[25]: cFruit   Carbohydrates in fruit [mg{CH20} m^{-2}]
-        x[26]: tCanSum  Crop development stage [C day]
-
-        x[27]: time     Time since 01-01-0001 [days]
-    """
-        # Air and vapor pressure are assumed to start at the night setpoints
-        self.x[0] = d0[3] # co2Air
-
-        # x.co2Top.val = x.co2Air.val
-        self.x[1] = self.x[0] # co2Top
-
-        # x.tAir.val = p.tSpNight.val
-        self.x[2] = self.p.tSpNight # tAir
-
-        # x.tTop.val = x.tAir.val
-        self.x[3] = self.x[2] # tTop
-
-        # x.tCan.val = x.tAir.val+4
-        self.x[4] = self.x[2] + 4
-
-        # x.tCovIn.val = x.tAir.val
-        self.x[5] = self.x[2]
-
-        # x.tCovE.val = x.tAir.val
-        self.x[6] = self.x[2]
-
-        # x.tThScr.val = x.tAir.val
-        self.x[7] = self.x[2]
-
-        # x.tFlr.val = x.tAir.val
-        self.x[8] = self.x[2]
-
-        # x.tPipe.val = x.tAir.val
-        self.x[9] = self.x[2]
-
-        # x.tSo1.val = x.tAir.val
-        self.x[10] = self.x[2]
-
-        # x.tSo2.val = 1/4*(3*x.tAir.val+d.tSoOut.val(1,2))
-        self.x[11] = 1/4*(3*self.x[2] + d0[6])
-
-        # # x.tSo3.val = 1/4*(2*x.tAir.val + 2*d.tSoOut.val(1,2))
-        self.x[12] = 1/4*(2*self.x[2] + 2*d0[6])
-
-        # # x.tSo4.val = 1/4*(x.tAir.val+3*d.tSoOut.val(1,2))
-        self.x[13] = 1/4*(self.x[2] + 3*d0[6])
-
-        # # x.tSo5.val = d.tSoOut.val(1,2)
-        self.x[14] = d0[6]
-
-        # # x.vpAir.val = p.rhMax.val/100*satVp(x.tAir.val)
-        self.x[15] = self.p.rhMax/100*satVp(self.x[2])
-
-        # # x.vpTop.val = x.vpAir.val
-        self.x[16] = self.x[15]
-
-        # # x.tLamp.val = x.tAir.val
-        self.x[17] = self.x[2]
-
-        # # x.tIntLamp.val = x.tAir.val
-        self.x[18] = self.x[2]
-
-        # # x.tGroPipe.val = x.tAir.val
-        self.x[19] = self.x[2]
-
-        # # x.tBlScr.val = x.tAir.val
-        self.x[20] = self.x[2]
-        
-        # x.tCan24.val = x.tCan.val
-        self.x[21] = self.x[4]
-
-        ## crop model
-        # x.cBuf.val = 0
-        self.x[22] = 0
-
-        # # start with 3.12 plants/m2, assume they are each 2 g = 6240 mg/m2.
-        self.x[23] = 0.7*6240   # 70% in leafs
-        self.x[24] = 0.25*6240  # 25% in stems
-        self.x[25] = 0.05*6240 # 5% in fruits we only harvest if this is > 300K
-
-        # x.tCanSum.val = 0
-        self.x[26] = 0
-
-        # time since 01-01-0001 [days]:
-        self.x[27] = timeInDays
-
     cpdef getWeatherArray(self):
         """
         Function that copies weather data from the cython module to a numpy array.
         Such that we can acces the weather data in the python environment.
         Currently copies complete array with weather data, but this can be changed to only copy the relevant data.
         For example, a future weather prediction.
+        With lazy weather, the interpolation is evaluated at every solver step.
         """
-        cdef int n = 105121
-        cdef unsigned char m = self.nd
-        cdef cnp.ndarray[cnp.double_t, ndim=1] np_d = np.zeros((m), dtype=np.double)
-        for i in range(n):
-            for j in range(m):
-                np_d[i, j] = self.d[i][j]
-        return np_d
+        cdef unsigned int row
+        cdef unsigned char i
+        cdef double* d
+        cdef cnp.ndarray[cnp.double_t, ndim=2] np_weather
+        if not self.w.lazy:
+            return np.array(self.weather[:, :self.nd])
+        np_weather = np.zeros((self.w.rows, self.nd), dtype=np.double)
+        for row in range(self.w.rows):
+            d = weatherRow(&self.w, row)
+            for i in range(self.nd):
+                np_weather[row, i] = d[i]
+        return np_weather
 
     cpdef getControlsArray(self):
         """
@@ -336,6 +810,65 @@ cdef class GreenLight:
             np_x[i] = self.x[i]
         return np_x
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef void fill_obs(self, double[:] out, const int[::1] codes) except *:
+        """
+        Writes the observed model variables into out, with a single call instead of a property per variable.
+        The codes are resolved once from the variable names with observation_codes.
+
+        Args:
+            out (np.ndarray)    - Array of at least len(codes) doubles, e.g., a slice of a preallocated observation.
+            codes (np.ndarray)  - Codes of the observed variables, of dtype intc.
+        """
+        cdef Py_ssize_t i
+        if out.shape[0] < codes.shape[0]:
+            raise ValueError(f"Expected an output of at least {codes.shape[0]} observations, got {out.shape[0]}")
+        for i in range(codes.shape[0]):
+            out[i] = observation(codes[i], self.p, self.a, self.x, self.u, self.time_interval)
+
+    cpdef void setReward(self,
+                         str combination,
+                         double co2Price,
+                         double gasPrice,
+                         double tomPrice,
+                         double dmfm,
+                         double rmin,
+                         double rmax,
+                         object k,
+                         object obsLow,
+                         object obsHigh,
+                         double omega=1.0,
+                         ) except *:
+        """
+        Configures the reward kernel, which computes the profit, the violations of the indoor climate bounds,
+        the arctan penalty and the reward at the end of every step, into a preallocated array.
+        The outputs are available from the reward, profit, violations and penalty properties.
+        The reward modules of rewards.py configure the kernel with their settings, see BaseReward.kernel_args.
+
+        Args:
+            combination (str)       - Combination of the scaled profit and the penalty, "additive" or "multiplicative".
+            co2Price (float)        - Price for carbon dioxide [€/kg].
+            gasPrice (float)        - Price for gas [€/m3].
+            tomPrice (float)        - Price for tomatoes [€/[FW] kg].
+            dmfm (float)            - Dry matter fraction of the fruit.
+            rmin (float)            - Minimum profit over the time interval [€ m^-2].
+            rmax (float)            - Maximum profit over the time interval [€ m^-2].
+            k (List[float])         - Penalty weights of the indoor temperature, CO2 concentration and relative humidity.
+            obsLow (List[float])    - Lower bounds of the indoor climate.
+            obsHigh (List[float])   - Upper bounds of the indoor climate.
+            omega (float)           - Weight of the penalty in the multiplicative reward.
+        """
+        initRewardParameters(&self.r, combination, co2Price, gasPrice, tomPrice, dmfm, rmin, rmax, k, obsLow, obsHigh, omega)
+        self.rewardEnabled = True
+
+    cpdef void computeReward(self):
+        """
+        Evaluates the reward kernel for the current state, e.g., after restoring a snapshot.
+        Is called at the end of every step once the kernel is configured with setReward.
+        """
+        rewardKernel(&self.r, self.p, self.a, self.x, self.u, self.time_interval, self.rewardOut)
+
     cpdef update_h(self, double h):
         self.h = h
 
@@ -346,6 +879,26 @@ cdef class GreenLight:
         np_indoor_obs[2] = self.a.rhIn
         return np_indoor_obs
 
+    @property
+    def reward(self):
+        # Returns the reward of the past time step, computed by the reward kernel
+        return self.rewardOut[REWARD_TOTAL]
+
+    @property
+    def profit(self):
+        # Returns the profit over the past time step [€ m^-2]
+        return self.rewardOut[REWARD_PROFIT]
+
+    @property
+    def violations(self):
+        # Returns the violations of the bounds of the indoor temperature, CO2 concentration and relative humidity
+        return self.rewardArray[REWARD_VIOLATIONS:REWARD_VIOLATIONS+N_INDOOR_OBS]
+
+    @property
+    def penalty(self):
+        # Returns the mean of the arctan penalties of the violations
+        return self.rewardOut[REWARD_PENALTY]
+
     cpdef double cyclic_cos(self, double t):
         return 0.5 * (1+cos(2*pi * t))
 
@@ -485,6 +1038,11 @@ cdef class GreenLight:
         # returns the current timestep
         return self.timestep
 
+    @property
+    def n_evaluations(self):
+        # returns the number of evaluations of the ODE since the reset
+        return self.nEvaluations
+
     @property
     def time_interval(self):
         # Returns the time interval of the simulation
@@ -501,4 +1059,758 @@ cdef class GreenLight:
         return self.nu
 
     def get_h(self):
-        return self.h
\ No newline at end of file
+        return self.h
+cdef class GreenLightBatch:
+    """
+    Batch of N GreenLight greenhouses that share the same model parameters.
+    The states, control signals and solver buffers of all greenhouses are stored in contiguous (N, nx), (N, nu) arrays,
+    and the auxiliary states in an array of N AuxiliaryStates structs.
+    Every greenhouse has its own weather data and timestep, such that greenhouses can be reset independently.
+    Integration of all greenhouses is done without the GIL, in parallel over the greenhouses using OpenMP.
+    Every greenhouse uses its own solver buffers, such that the results do not depend on the number of threads.
+    With the struct-of-arrays layout (setLayout("soa")) the greenhouses are integrated in blocks of SOA_BLOCK greenhouses,
+    with the auxiliary states stored per block as arrays over the greenhouses (see auxiliary_states_soa.pxd),
+    such that the C compiler can vectorize the model across the greenhouses. Both layouts give identical results.
+    """
+    cdef Parameters* p      # pointer to Parameters struct, shared between all greenhouses
+    cdef AuxiliaryStates* a # pointer to N AuxiliaryStates structs
+    cdef list weatherRefs   # references to the N weather data arrays supplied by python
+    cdef WeatherData* w     # weather data of the N greenhouses
+    cdef double* dLazy      # weather data of the current solver step of every greenhouse with lazy weather (N*nd)
+    cdef double* x          # pointer to states (N*nx)
+    cdef double* u          # pointer to control signals (N*nu)
+    cdef double* k          # stage derivatives of the solver (N*7*nx)
+    cdef double* xs         # intermediate stage states of the solver (N*5*nx)
+    cdef double* W          # LU factorization of the Rosenbrock matrix of every greenhouse (N*nx*nx)
+    cdef unsigned char* piv # pivots of the LU factorizations (N*nx)
+    cdef unsigned int* timesteps    # current timestep of every greenhouse
+    cdef float h            # step size
+    cdef char integrator    # integrator to solve the ODE (RK4, DOPRI5, ROS2 or MULTIRATE), shared by all greenhouses
+    cdef double rtol        # relative tolerance of the adaptive integrator
+    cdef double atol        # absolute tolerance of the adaptive integrator
+    cdef double maxStep     # maximum step size of the adaptive integrator [s]
+    cdef double* hAdaptive  # step size proposed by the adaptive integrator for every greenhouse [s]
+    cdef unsigned long long* nEvaluations   # number of evaluations of the ODE since the reset of every greenhouse
+    cdef char nx            # number of states
+    cdef char nu            # number of control signals
+    cdef char nd            # number of disturbances
+    cdef unsigned int nEnvs # number of greenhouses
+    cdef int numThreads     # number of OpenMP threads used to integrate the greenhouses
+    cdef char layout        # memory layout of the auxiliary states during the integration (AOS or SOA)
+    cdef unsigned int nBlocks       # number of blocks of SOA_BLOCK greenhouses in the SoA layout
+    cdef AuxiliaryStatesSoA* aSoA   # auxiliary states of every block in the SoA layout (nBlocks)
+    cdef double* xSoA       # states of every block, x[i*SOA_BLOCK + n] is state i of greenhouse n (nBlocks*SOA_BLOCK*nx)
+    cdef double* uSoA       # control signals of every block (nBlocks*SOA_BLOCK*nu)
+    cdef double* dSoA       # weather data of the current solver step of every block (nBlocks*SOA_BLOCK*nd)
+    cdef double* kSoA       # stage derivatives of the solver of every block (nBlocks*SOA_BLOCK*4*nx)
+    cdef double* xsSoA      # intermediate stage states of the solver of every block (nBlocks*SOA_BLOCK*3*nx)
+
+    cdef unsigned short solverSteps # number of steps to take by solver between time interval for observing the env
+    cdef float time_interval
+    cdef RewardParameters r # settings of the reward kernel, shared between all greenhouses, see setReward
+    cdef bint rewardEnabled # whether the reward kernel is evaluated at the end of every step
+    cdef object rewardArray # preallocated outputs of the reward kernel of every greenhouse (N, N_REWARD_OUTPUTS)
+    cdef double* rewardOut  # data of rewardArray
+
+    def __cinit__(self,
+                float h,
+                char nx,
+                char nu,
+                char nd,
+                char noLamps,
+                char ledLamps,
+                char hpsLamps,
+                char intLamps,
+                unsigned short solverSteps,
+                unsigned int nEnvs,
+                int numThreads = 0,
+                ):
+        cdef unsigned int n
+
+        self.nEnvs = nEnvs
+        self.p = <Parameters*>malloc(sizeof(Parameters))
+        self.a = <AuxiliaryStates*>malloc(nEnvs * sizeof(AuxiliaryStates))
+        self.u = <double*>malloc(nEnvs * nu * sizeof(double))
+        self.x = <double*>malloc(nEnvs * nx * sizeof(double))
+        self.k = <double*>malloc(nEnvs * 7 * nx * sizeof(double))
+        self.xs = <double*>malloc(nEnvs * 5 * nx * sizeof(double))
+        self.W = <double*>malloc(nEnvs * nx * nx * sizeof(double))
+        self.piv = <unsigned char*>malloc(nEnvs * nx * sizeof(unsigned char))
+        self.w = <WeatherData*>malloc(nEnvs * sizeof(WeatherData))
+        self.timesteps = <unsigned int*>malloc(nEnvs * sizeof(unsigned int))
+        self.hAdaptive = <double*>malloc(nEnvs * sizeof(double))
+        self.nEvaluations = <unsigned long long*>malloc(nEnvs * sizeof(unsigned long long))
+        self.dLazy = <double*>malloc(nEnvs * nd * sizeof(double))
+        self.nBlocks = nEnvs // SOA_BLOCK
+        self.aSoA = <AuxiliaryStatesSoA*>malloc(self.nBlocks * sizeof(AuxiliaryStatesSoA))
+        self.xSoA = <double*>malloc(self.nBlocks * SOA_BLOCK * nx * sizeof(double))
+        self.uSoA = <double*>malloc(self.nBlocks * SOA_BLOCK * nu * sizeof(double))
+        self.dSoA = <double*>malloc(self.nBlocks * SOA_BLOCK * nd * sizeof(double))
+        self.kSoA = <double*>malloc(self.nBlocks * SOA_BLOCK * 4 * nx * sizeof(double))
+        self.xsSoA = <double*>malloc(self.nBlocks * SOA_BLOCK * 3 * nx * sizeof(double))
+        self.weatherRefs = [None] * nEnvs
+        for n in range(nEnvs):
+            initWeatherData(&self.w[n], &self.dLazy[n*nd], nd)
+            self.timesteps[n] = 0
+            self.hAdaptive[n] = h
+            self.nEvaluations[n] = 0
+        initParameters(self.p, noLamps, ledLamps, hpsLamps, intLamps)
+
+        self.h = h
+        self.nx = nx
+        self.nu = nu
+        self.nd = nd
+
+        self.solverSteps = solverSteps
+        self.time_interval = solverSteps * h
+        self.set_num_threads(numThreads)
+        self.layout = AOS
+        self.setIntegrator("rk4")
+        self.rewardEnabled = False
+        self.rewardArray = np.zeros((nEnvs, N_REWARD_OUTPUTS), dtype=np.double)
+        self.rewardOut = <double*>cnp.PyArray_DATA(self.rewardArray)
+
+    def __dealloc__(self):
+        cdef unsigned int n
+        if self.w is not NULL:
+            free(self.w)
+            self.w = NULL
+        if self.dLazy is not NULL:
+            free(self.dLazy)
+            self.dLazy = NULL
+        if self.a is not NULL:
+            free(self.a)
+            self.a = NULL
+        if self.p is not NULL:
+            free(self.p)
+            self.p = NULL
+        if self.x is not NULL:
+            free(self.x)
+            self.x = NULL
+        if self.u is not NULL:
+            free(self.u)
+            self.u = NULL
+        if self.k is not NULL:
+            free(self.k)
+            self.k = NULL
+        if self.xs is not NULL:
+            free(self.xs)
+            self.xs = NULL
+        if self.W is not NULL:
+            free(self.W)
+            self.W = NULL
+        if self.piv is not NULL:
+            free(self.piv)
+            self.piv = NULL
+        if self.timesteps is not NULL:
+            free(self.timesteps)
+            self.timesteps = NULL
+        if self.hAdaptive is not NULL:
+            free(self.hAdaptive)
+            self.hAdaptive = NULL
+        if self.nEvaluations is not NULL:
+            free(self.nEvaluations)
+            self.nEvaluations = NULL
+        if self.aSoA is not NULL:
+            free(self.aSoA)
+            self.aSoA = NULL
+        if self.xSoA is not NULL:
+            free(self.xSoA)
+            self.xSoA = NULL
+        if self.uSoA is not NULL:
+            free(self.uSoA)
+            self.uSoA = NULL
+        if self.dSoA is not NULL:
+            free(self.dSoA)
+            self.dSoA = NULL
+        if self.kSoA is not NULL:
+            free(self.kSoA)
+            self.kSoA = NULL
+        if self.xsSoA is not NULL:
+            free(self.xsSoA)
+            self.xsSoA = NULL
+
+    cdef void checkIndex(self, unsigned int idx) except *:
+        if idx >= self.nEnvs:
+            raise IndexError(f"Greenhouse index {idx} out of range for batch of {self.nEnvs} greenhouses")
+
+    cpdef void reset(self,
+                    unsigned int idx,
+                    object weather,
+                    unsigned int timeInDays
+                    ) except *:
+        """
+        Resets a single greenhouse of the batch with new weather data.
+
+        Args:
+            idx (int)               - Index of the greenhouse in the batch.
+            weather (np.ndarray)    - Array with weather data.
+            timeInDays (int)        - Time since 01-01-0001 [days] at the start of the simulation.
+        """
+        self.checkIndex(idx)
+        self.initWeather(idx, weather)
+        self.initSimulation(idx, timeInDays)
+
+    cpdef void resetInterpolated(self,
+                    unsigned int idx,
+                    object knots,
+                    object coefficients,
+                    unsigned int rows,
+                    unsigned int timeInDays
+                    ) except *:
+        """
+        Resets a single greenhouse of the batch with the PCHIP interpolation of the weather data.
+        See GreenLight.resetInterpolated.
+        """
+        self.checkIndex(idx)
+        initWeatherInterpolation(&self.w[idx], knots, coefficients, rows)
+        self.weatherRefs[idx] = (knots, coefficients)
+        self.initSimulation(idx, timeInDays)
+
+    cdef void initSimulation(self, unsigned int idx, unsigned int timeInDays):
+        """
+        Initializes the states, controls and auxiliary states of a single greenhouse at the start of the simulation.
+        """
+        cdef unsigned char i
+        initStates(self.p, &self.x[idx*self.nx], weatherRow(&self.w[idx], 0), timeInDays)
+        for i in range(self.nu):
+            self.u[idx*self.nu + i] = 0
+        initAuxStates(&self.a[idx], &self.x[idx*self.nx])
+        self.timesteps[idx] = 0
+        self.hAdaptive[idx] = self.h
+        self.nEvaluations[idx] = 0
+
+    cdef void initWeather(self, unsigned int idx, object weather) except *:
+        """
+        Keeps a reference to the weather data of a single greenhouse, see GreenLight.initWeather.
+        """
+        cdef const double[:, ::1] view = initWeatherView(weather, self.nd)
+        self.weatherRefs[idx] = view
+        setWeatherView(&self.w[idx], view)
+
+    cpdef object get_snapshot(self, unsigned int idx):
+        """
+        Captures the simulator state of a single greenhouse of the batch, see GreenLight.get_snapshot.
+        """
+        self.checkIndex(idx)
+        cdef SnapshotHeader header
+        header.timestep = self.timesteps[idx]
+        header.hAdaptive = self.hAdaptive[idx]
+        header.nEvaluations = self.nEvaluations[idx]
+        return packSnapshot(&header, &self.x[idx*self.nx], &self.u[idx*self.nu], &self.a[idx], self.nx, self.nu)
+
+    cpdef void restore_snapshot(self, unsigned int idx, object snapshot) except *:
+        """
+        Restores the simulator state of a single greenhouse of the batch, see GreenLight.restore_snapshot.
+        Restoring the same snapshot into several greenhouses branches rollouts from a single state.
+        """
+        self.checkIndex(idx)
+        cdef SnapshotHeader header
+        unpackSnapshot(snapshot, &header, &self.x[idx*self.nx], &self.u[idx*self.nu], &self.a[idx], self.nx, self.nu,
+                       self.w[idx].rows, self.solverSteps)
+        self.timesteps[idx] = header.timestep
+        self.hAdaptive[idx] = header.hAdaptive
+        self.nEvaluations[idx] = header.nEvaluations
+
+    cpdef void setClimateState(self, unsigned int idx, const double[::1] states) except *:
+        """
+        Function to set the climate and soil states of a single greenhouse of the batch.
+        See GreenLight.setClimateState.
+        """
+        self.checkIndex(idx)
+        setClimateStates(&self.x[idx*self.nx], &self.a[idx], states)
+
+    cpdef void setCropState(self, unsigned int idx, float cLeaf, float cStem, float cFruit, float tCanSum) except *:
+        """
+        Function to set the crop state of a single greenhouse of the batch.
+        See GreenLight.setCropState.
+        """
+        self.checkIndex(idx)
+        cdef double* x = &self.x[idx*self.nx]
+        x[23] = cLeaf
+        x[24] = cStem
+        x[25] = cFruit
+        x[26] = tCanSum
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef void step(self, cnp.ndarray[cnp.float32_t, ndim=2, mode="c"] controls, cnp.ndarray[cnp.uint8_t, ndim=1, mode="c"] learnedControlIdx) except *:
+        """
+        Simulate the state of all greenhouses at the next time step using the GreenLight model.
+        For every greenhouse the rule-based control signals are computed, after which the learned control signals are copied,
+        and the greenhouse is integrated over the time interval. This is done in parallel over the greenhouses without the GIL.
+        Args:
+            controls (np.ndarray)           - Array with control signals of shape (N, len(learnedControlIdx)).
+            learnedControlIdx (np.ndarray)  - Array with indices of control signals that are learned.
+        """
+        cdef unsigned int n
+        cdef int m
+        cdef unsigned char nLearned = learnedControlIdx.shape[0]
+        cdef float* learnedControls = <float*>controls.data
+        cdef unsigned char* learnedIdx = <unsigned char*>learnedControlIdx.data
+
+        if controls.shape[0] != self.nEnvs or controls.shape[1] != nLearned:
+            raise ValueError(f"Expected controls of shape ({self.nEnvs}, {nLearned}), got ({controls.shape[0]}, {controls.shape[1]})")
+        for n in range(self.nEnvs):
+            if (self.timesteps[n] + 1) * self.solverSteps > self.w[n].rows:
+                raise IndexError(f"Greenhouse {n} has no weather data left, call reset first")
+
+        if self.layout == SOA:
+            for m in prange(<int>(self.nBlocks*SOA_BLOCK), nogil=True, schedule="static", num_threads=self.numThreads):
+                self.controlEnv(m, &learnedControls[m*nLearned], learnedIdx, nLearned)
+            for m in prange(<int>self.nBlocks, nogil=True, schedule="static", num_threads=self.numThreads):
+                self.stepBlock(m)
+            # the greenhouses that do not fill a block are integrated separately
+            for m in prange(<int>(self.nBlocks*SOA_BLOCK), <int>self.nEnvs, nogil=True, schedule="static", num_threads=self.numThreads):
+                self.stepEnv(m, &learnedControls[m*nLearned], learnedIdx, nLearned)
+        else:
+            for m in prange(<int>self.nEnvs, nogil=True, schedule="static", num_threads=self.numThreads):
+                self.stepEnv(m, &learnedControls[m*nLearned], learnedIdx, nLearned)
+        if self.rewardEnabled:
+            self.computeReward()
+
+    cpdef void setReward(self,
+                         str combination,
+                         double co2Price,
+                         double gasPrice,
+                         double tomPrice,
+                         double dmfm,
+                         double rmin,
+                         double rmax,
+                         object k,
+                         object obsLow,
+                         object obsHigh,
+                         double omega=1.0,
+                         ) except *:
+        """
+        Configures the reward kernel of all greenhouses, see GreenLight.setReward.
+        The outputs are preallocated arrays of shape (N,), and (N, 3) for the violations.
+        """
+        initRewardParameters(&self.r, combination, co2Price, gasPrice, tomPrice, dmfm, rmin, rmax, k, obsLow, obsHigh, omega)
+        self.rewardEnabled = True
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef void computeReward(self):
+        """
+        Evaluates the reward kernel of all greenhouses for their current state, in parallel without the GIL.
+        Is called at the end of every step once the kernel is configured with setReward.
+        """
+        cdef int m
+        for m in prange(<int>self.nEnvs, nogil=True, schedule="static", num_threads=self.numThreads):
+            rewardKernel(&self.r, self.p, &self.a[m], &self.x[m*self.nx], &self.u[m*self.nu], self.time_interval,
+                         &self.rewardOut[m*N_REWARD_OUTPUTS])
+
+    cpdef void set_num_threads(self, int numThreads):
+        """
+        Sets the number of OpenMP threads used to integrate the greenhouses.
+        Uses the OpenMP default (OMP_NUM_THREADS or the number of cores) if numThreads is smaller than one.
+        """
+        if numThreads < 1:
+            numThreads = openmp.omp_get_max_threads()
+        self.numThreads = numThreads
+
+    cpdef void setIntegrator(self, str integrator, double rtol=1e-4, double atol=1e-4, double maxStep=300) except *:
+        """
+        Selects the integrator of all greenhouses, see GreenLight.setIntegrator.
+        The struct-of-arrays layout only supports the fixed step size integrators rk4 and multirate.
+        """
+        cdef char index = integratorIndex(integrator)
+        if self.layout == SOA and index != RK4 and index != MULTIRATE:
+            raise ValueError(f"The soa layout does not support the {integrator} integrator, use rk4 or multirate")
+        self.integrator = index
+        self.rtol = rtol
+        self.atol = atol
+        self.maxStep = maxStep
+
+    cpdef void setLayout(self, str layout) except *:
+        """
+        Selects the memory layout of the auxiliary states during the integration, "aos" (default) or "soa".
+        With "soa" the greenhouses are integrated in lockstep in blocks of SOA_BLOCK greenhouses,
+        which requires the rk4 or multirate integrator. The remaining nEnvs % SOA_BLOCK greenhouses use the aos layout.
+        The soa layout is experimental, compare its throughput with the aos layout with experiments/benchmark_layout.py.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout {layout}, expected one of {list(LAYOUTS)}")
+        if LAYOUTS[layout] == SOA and self.integrator != RK4 and self.integrator != MULTIRATE:
+            raise ValueError("The soa layout requires the rk4 or multirate integrator")
+        self.layout = LAYOUTS[layout]
+
+    cdef void controlEnv(self, unsigned int n, float* learnedControls, unsigned char* learnedIdx, unsigned char nLearned) nogil:
+        """
+        Computes the rule-based control signals of a single greenhouse, after which the learned control signals are copied.
+        """
+        cdef unsigned char i
+        cdef double* u = &self.u[n*self.nu]
+
+        controlSignal(&self.a[n], self.p, &self.x[n*self.nx], u, weatherRow(&self.w[n], self.timesteps[n]*self.solverSteps))
+        for i in range(nLearned):
+            u[learnedIdx[i]] = learnedControls[i]
+
+    cdef void stepBlock(self, unsigned int b) nogil:
+        """
+        Integrates block b of SOA_BLOCK greenhouses in lockstep over one time interval, in the struct-of-arrays layout.
+        The states and control signals of the greenhouses are gathered into the buffers of the block,
+        and the states and auxiliary states are copied back to the greenhouses after the time interval.
+        """
+        cdef unsigned int first = b*SOA_BLOCK
+        cdef AuxiliaryStatesSoA* a = &self.aSoA[b]
+        cdef double* x = &self.xSoA[b*SOA_BLOCK*self.nx]
+        cdef double* u = &self.uSoA[b*SOA_BLOCK*self.nu]
+        cdef double* d = &self.dSoA[b*SOA_BLOCK*self.nd]
+        cdef double* dRow
+        cdef unsigned int l, n
+        cdef unsigned short j
+        cdef unsigned char i
+
+        for l in range(SOA_BLOCK):
+            n = first + l
+            for i in range(self.nx):
+                x[i*SOA_BLOCK + l] = self.x[n*self.nx + i]
+            for i in range(self.nu):
+                u[i*SOA_BLOCK + l] = self.u[n*self.nu + i]
+            a.mcFruitHarSum[l] = 0
+
+        updateControlsSoA(a, self.p, u)
+        if self.integrator == MULTIRATE:
+            updateSlowSoA(a, self.p, u, x)
+        for j in range(self.solverSteps):
+            for l in range(SOA_BLOCK):
+                n = first + l
+                dRow = weatherRow(&self.w[n], self.timesteps[n]*self.solverSteps + j)
+                for i in range(self.nd):
+                    d[i*SOA_BLOCK + l] = dRow[i]
+            fRK4SoA(a, self.p, u, x, d, self.h, self.nx, &self.kSoA[b*SOA_BLOCK*4*self.nx], &self.xsSoA[b*SOA_BLOCK*3*self.nx],
+                    self.integrator != MULTIRATE)
+
+        for l in range(SOA_BLOCK):
+            n = first + l
+            for i in range(self.nx):
+                self.x[n*self.nx + i] = x[i*SOA_BLOCK + l]
+            self.timesteps[n] += 1
+            self.nEvaluations[n] += 4*self.solverSteps
+        storeAuxStatesSoA(&self.a[first], a, SOA_BLOCK)
+
+    cdef void stepEnv(self, unsigned int n, float* learnedControls, unsigned char* learnedIdx, unsigned char nLearned) nogil:
+        """
+        Computes the control signals of a single greenhouse, and integrates it over one time interval.
+        Uses the states, control signals and solver buffers that belong to greenhouse n.
+        """
+        cdef unsigned short j
+        cdef AuxiliaryStates* a = &self.a[n]
+        cdef double* x = &self.x[n*self.nx]
+        cdef double* u = &self.u[n*self.nu]
+        cdef double* k = &self.k[n*7*self.nx]
+        cdef double* xs = &self.xs[n*5*self.nx]
+        cdef unsigned int row = self.timesteps[n]*self.solverSteps
+
+        self.controlEnv(n, learnedControls, learnedIdx, nLearned)
+
+        updateControls(a, self.p, u)
+        a.mcFruitHarSum = 0
+        if self.integrator == DOPRI5:
+            self.nEvaluations[n] += integrateDopri5(a, self.p, u, x, &self.w[n], row, self.solverSteps, self.h, self.nx, k, xs,
+                                                    self.rtol, self.atol, self.maxStep, &self.hAdaptive[n])
+        elif self.integrator == ROS2:
+            for j in range(self.solverSteps):
+                fRos2(a, self.p, u, x, weatherRow(&self.w[n], row + j), self.h, self.nx, k, xs, &self.W[n*self.nx*self.nx], &self.piv[n*self.nx])
+            self.nEvaluations[n] += (self.nx + 2)*self.solverSteps
+        elif self.integrator == MULTIRATE:
+            updateSlow(a, self.p, u, x)
+            for j in range(self.solverSteps):
+                fRK4Fast(a, self.p, u, x, weatherRow(&self.w[n], row + j), self.h, self.nx, k, xs)
+            self.nEvaluations[n] += 4*self.solverSteps
+        else:
+            for j in range(self.solverSteps):
+                fRK4(a, self.p, u, x, weatherRow(&self.w[n], row + j), self.h, self.nx, k, xs)
+            self.nEvaluations[n] += 4*self.solverSteps
+        self.timesteps[n] += 1
+
+    cpdef getStatesArray(self):
+        """
+        Function that copies the states of all greenhouses to a numpy array of shape (N, nx).
+        """
+        cdef unsigned int i
+        cdef cnp.ndarray[cnp.double_t, ndim=2] np_x = np.zeros((self.nEnvs, self.nx), dtype=np.double)
+        cdef double* out = <double*>np_x.data
+        for i in range(self.nEnvs * self.nx):
+            out[i] = self.x[i]
+        return np_x
+
+    cpdef getControlsArray(self):
+        """
+        Function that copies the control signals of all greenhouses to a numpy array of shape (N, nu).
+        """
+        cdef unsigned int i
+        cdef cnp.ndarray[cnp.double_t, ndim=2] np_u = np.zeros((self.nEnvs, self.nu), dtype=np.double)
+        cdef double* out = <double*>np_u.data
+        for i in range(self.nEnvs * self.nu):
+            out[i] = self.u[i]
+        return np_u
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef void fill_obs(self, double[:, :] out, const int[::1] codes) except *:
+        """
+        Writes the observed model variables of all greenhouses into out, of shape (N, at least len(codes)).
+        See GreenLight.fill_obs.
+        """
+        cdef unsigned int n
+        cdef Py_ssize_t i
+        if out.shape[0] != self.nEnvs or out.shape[1] < codes.shape[0]:
+            raise ValueError(f"Expected an output of shape ({self.nEnvs}, {codes.shape[0]}), got ({out.shape[0]}, {out.shape[1]})")
+        for n in range(self.nEnvs):
+            for i in range(codes.shape[0]):
+                out[n, i] = observation(codes[i], self.p, &self.a[n], &self.x[n*self.nx], &self.u[n*self.nu], self.time_interval)
+
+    @property
+    def reward(self):
+        # Returns the reward of every greenhouse over the past time step, computed by the reward kernel
+        return self.rewardArray[:, REWARD_TOTAL]
+
+    @property
+    def profit(self):
+        # Returns the profit of every greenhouse over the past time step [€ m^-2]
+        return self.rewardArray[:, REWARD_PROFIT]
+
+    @property
+    def violations(self):
+        # Returns the violations of the indoor climate bounds of every greenhouse, of shape (N, 3)
+        return self.rewardArray[:, REWARD_VIOLATIONS:REWARD_VIOLATIONS+N_INDOOR_OBS]
+
+    @property
+    def penalty(self):
+        # Returns the mean of the arctan penalties of every greenhouse
+        return self.rewardArray[:, REWARD_PENALTY]
+
+    cpdef get_indoor_obs(self):
+        """
+        Function that returns the indoor air temperature, CO2 concentration and relative humidity
+        of all greenhouses as a numpy array of shape (N, 3).
+        """
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=2] np_indoor_obs = np.zeros((self.nEnvs, 3), dtype=np.double)
+        for n in range(self.nEnvs):
+            np_indoor_obs[n, 0] = self.x[n*self.nx + 2]
+            np_indoor_obs[n, 1] = self.a[n].co2InPpm
+            np_indoor_obs[n, 2] = self.a[n].rhIn
+        return np_indoor_obs
+
+    @property
+    def hour_of_day_cos(self):
+        # returns the cyclic time of day, for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = 0.5 * (1+cos(2*pi * (self.a[n].timeOfDay/24)))
+        return np_out
+
+    @property
+    def hour_of_day_sin(self):
+        # returns the cyclic time of day, for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = 0.5 * (1+sin(2*pi * (self.a[n].timeOfDay/24)))
+        return np_out
+
+    @property
+    def day_of_year_cos(self):
+        # returns the cyclic day of the year, for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = 0.5 * (1+cos(2*pi * (self.a[n].dayOfYear/365)))
+        return np_out
+
+    @property
+    def day_of_year_sin(self):
+        # returns the cyclic day of the year, for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = 0.5 * (1+sin(2*pi * (self.a[n].dayOfYear/365)))
+        return np_out
+
+    @property
+    def daily_avg_temp(self):
+        # returns the daily average temperature [deg C], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.x[n*self.nx + 21]
+        return np_out
+
+    @property
+    def air_temp(self):
+        # Returns the indoor air temperature [deg C], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.x[n*self.nx + 2]
+        return np_out
+
+    @property
+    def co2_conc(self):
+        # Returns the indoor co2 PPM, for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.a[n].co2InPpm
+        return np_out
+
+    @property
+    def in_rh(self):
+        # Returns the indoor RH, for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.a[n].rhIn
+        return np_out
+
+    @property
+    def fruit_weight(self):
+        # Returns the fruit dry matter weight [kg{CH20} m^{-2}], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.x[n*self.nx + 25] * 1e-6
+        return np_out
+
+    @property
+    def fruit_harvest(self):
+        # Returns the harvested fruit dry matter over past time step [kg{CH20} m^{-2} ts^{-1}], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.a[n].mcFruitHarSum * 1e-6
+        return np_out
+
+    @property
+    def PAR(self):
+        # Returns the indoor PAR level just above the crop's leaves [W m^{-2}], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.a[n].rParGhSun + self.a[n].rParGhLamp
+        return np_out
+
+    @property
+    def co2_resource(self):
+        # Returns the CO2 injection over the past time step [kg{CO2} m^{-2} ts^{-1}], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.a[n].mcExtAir*self.time_interval*1e-6
+        return np_out
+
+    @property
+    def gas_resource(self):
+        # Returns the gas over the past time step [kg{CH4} m^{-2} ts^{-1}], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = (self.a[n].hBoilPipe*self.time_interval*1e-6)/self.p.energyContentGas
+        return np_out
+
+    @property
+    def heat_demand(self):
+        # Returns the heat demand (power) of the greenhouse [W m^{-2}], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.a[n].hBoilPipe
+        return np_out
+
+    @property
+    def electrical_resource(self):
+        # Returns the electrical demand (power) of the greenhouse [W m^{-2}], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.a[n].qLampIn
+        return np_out
+
+    @property
+    def co2InjectionRate(self):
+        # CO2 injection rate [mg m^{-2} s^{-1}], for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.a[n].mcExtAir
+        return np_out
+
+    @property
+    def time(self):
+        # time in days since 01-01-0001, for every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.double_t, ndim=1] np_out = np.empty(self.nEnvs, dtype=np.double)
+        for n in range(self.nEnvs):
+            np_out[n] = self.x[n*self.nx + 27]
+        return np_out
+
+    @property
+    def maxHeatCap(self):
+        # Returns the maximum heat capacity (power) of the greenhouse [W m^-2]
+        return self.p.pBoil / self.p.aFlr
+
+    @property
+    def maxco2rate(self):
+        # returns the maximum co2 injection rate [kg m^{-2} s^{-1}]
+        return self.p.phiExtCo2/self.p.aFlr * 1e-6
+
+    @property
+    def maxHarvest(self):
+        # returns the maximum fruit DM harvest rate [kg [DM]{CH2O} m^{-2} s^{-1}]
+        return self.p.rgFruit * 1e-6
+
+    @property
+    def energyContentGas(self) -> float:
+        # Returns the energy content of gas [J m^{-3}]
+        return self.p.energyContentGas
+
+    @property
+    def timestep(self):
+        # returns the current timestep of every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.uint32_t, ndim=1] np_t = np.zeros(self.nEnvs, dtype=np.uint32)
+        for n in range(self.nEnvs):
+            np_t[n] = self.timesteps[n]
+        return np_t
+
+    @property
+    def n_evaluations(self):
+        # returns the number of evaluations of the ODE since the reset of every greenhouse
+        cdef unsigned int n
+        cdef cnp.ndarray[cnp.uint64_t, ndim=1] np_n = np.zeros(self.nEnvs, dtype=np.uint64)
+        for n in range(self.nEnvs):
+            np_n[n] = self.nEvaluations[n]
+        return np_n
+
+    @property
+    def num_threads(self):
+        # returns the number of OpenMP threads used to integrate the greenhouses
+        return self.numThreads
+
+    @property
+    def n_envs(self):
+        # returns the number of greenhouses in the batch
+        return self.nEnvs
+
+    @property
+    def time_interval(self):
+        # Returns the time interval of the simulation
+        return self.time_interval
+
+    @property
+    def nx(self):
+        # returns the number of states
+        return self.nx
+
+    @property
+    def nu(self):
+        # returns the available number of control signals
+        return self.nu
+
+    def get_h(self):
+        return self.h
@@ -0,0 +1,4 @@
+# Single precision variant of greenlight_cy, compiled with GL_FLOAT32=True (see setup.py and precision.pxd).
+# The parameters and auxiliary states are evaluated in single precision,
+# while the states, the intermediate stage states of the solvers and the time remain double.
+include "greenlight_cy.pyx"
@@ -0,0 +1,4 @@
+# Fast-math variant of greenlight_cy, compiled with GL_FAST_MATH=True (see setup.py, precision.pxd and fast_math.pxd).
+# The model is evaluated in double precision, with exp and pow replaced by approximations with documented error bounds,
+# see greenlight_gym/tests/fast_math.py for their effect on a growing season.
+include "greenlight_cy.pyx"
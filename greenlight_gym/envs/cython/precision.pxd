@@ -0,0 +1,30 @@
+# Floating point type of the parameters and auxiliary states of the GreenLight model.
+# The default build uses double precision. The extension greenlight_cy_f32 is compiled with GL_FLOAT32=True,
+# which stores the parameters and auxiliary states in single precision and evaluates them with the single precision
+# functions of math.h. The states, the intermediate stage states of the solvers and the time are always double.
+# The extension greenlight_cy_fast is compiled with GL_FAST_MATH=True, which keeps double precision
+# but replaces exp and pow by the approximations of fast_math.pxd.
+# pow4 computes the fourth power of the absolute temperatures in the FIR fluxes, in double in every variant.
+IF GL_FLOAT32:
+    ctypedef float real
+    from libc.float cimport FLT_EPSILON as REAL_EPSILON
+    cdef extern from "<math.h>" nogil:
+        float exp "expf"(float x)
+        float log "logf"(float x)
+        float sqrt "sqrtf"(float x)
+        float cos "cosf"(float x)
+        float fabs "fabsf"(float x)
+        float fmax "fmaxf"(float x, float y)
+        float fmin "fminf"(float x, float y)
+        float pow "powf"(float x, float y)
+    from fast_math cimport exactPow4 as pow4
+ELIF GL_FAST_MATH:
+    ctypedef double real
+    from libc.float cimport DBL_EPSILON as REAL_EPSILON
+    from libc.math cimport log, sqrt, cos, fabs, fmax, fmin
+    from fast_math cimport fastExp as exp, fastPow as pow, fastPow4 as pow4
+ELSE:
+    ctypedef double real
+    from libc.float cimport DBL_EPSILON as REAL_EPSILON
+    from libc.math cimport exp, log, sqrt, cos, fabs, fmax, fmin, pow
+    from fast_math cimport exactPow4 as pow4
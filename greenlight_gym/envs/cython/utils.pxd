@@ -1,6 +1,6 @@
-from libc.math cimport exp
+from precision cimport real, exp
 
-cdef inline double satVp(temp):
+cdef inline real satVp(real temp) nogil:
 # saturated vapor pressure (Pa) at temperature temp (�C)
 # Calculation based on 
 #   http://www.conservationphysics.org/atmcalc/atmoclc2.pdf
@@ -13,7 +13,7 @@ cdef inline double satVp(temp):
         # Saturation vapor pressure of air in given temperature [Pa]
     return 610.78*exp(17.2694*temp/(temp+238.3))
 
-cdef inline double cond(hec, vp1, vp2):
+cdef inline real cond(real hec, real vp1, real vp2) nogil:
 # COND Vapor flux from the air to an object by condensation in the Vanthoor model
 # The vapor flux is measured in kg m^{-2} s^{-1}.
 # Based on Equation 43 in the electronic appendix of 
@@ -39,7 +39,7 @@ cdef inline double cond(hec, vp1, vp2):
     # sMV12 = -0.1
     return 1/(1 + exp(-0.1*(vp1-vp2))) * 6.4e-9*hec*(vp1-vp2)
 
-cdef inline double co2dens2ppm(temp, dens):
+cdef inline real co2dens2ppm(real temp, real dens) nogil:
 # CO2DENS2PPM Convert CO2 density [kg m^{-3}] to molar concetration [ppm] 
 #
 # Usage: 
@@ -0,0 +1,73 @@
+cdef struct WeatherInterpolation:
+    # PCHIP interpolation of the weather data, evaluated at the solver steps on demand
+    # Instead of the weather data resampled at every solver step, only the knots (the samples of the raw weather data)
+    # and the coefficients of the cubic polynomials between the knots are stored.
+    const double* knots         # time of the knots [s], shape (nKnots,)
+    const double* coefficients  # coefficients of the polynomials, shape (4, nKnots-1, nd), highest order first
+    unsigned int nKnots         # number of knots
+    unsigned int rows           # number of solver steps, i.e., rows of the resampled weather data
+    double start                # time of the first solver step [s]
+    double stop                 # time of the last solver step [s]
+    double step                 # time between the solver steps [s]
+
+cdef inline void interpolateWeather(WeatherInterpolation* w, unsigned int row, char nd, double* d) nogil:
+    """
+    Evaluates the weather data at solver step row, and writes the nd disturbances into d.
+    The solver steps are spaced evenly between the first and last knot, similar to np.linspace.
+    The polynomials are evaluated in the same order as scipy's PPoly, such that the disturbances
+    are equal to resampling the weather data with the PchipInterpolator.
+    """
+    cdef unsigned int nIntervals = w.nKnots - 1
+    cdef unsigned int i, kp
+    cdef unsigned char j
+    cdef double t, s, z, res
+    cdef const double* c
+
+    if row == w.rows - 1:
+        t = w.stop
+    else:
+        t = row * w.step + w.start
+
+    # guess the interval from the average spacing of the knots, and correct the guess if the knots are not equidistant
+    i = <unsigned int>((t - w.knots[0]) / (w.knots[nIntervals] - w.knots[0]) * nIntervals)
+    if i > nIntervals - 1:
+        i = nIntervals - 1
+    while i > 0 and w.knots[i] > t:
+        i -= 1
+    while i < nIntervals - 1 and w.knots[i+1] <= t:
+        i += 1
+    s = t - w.knots[i]
+
+    for j in range(nd):
+        c = &w.coefficients[i*nd + j]
+        res = 0.0
+        z = 1.0
+        for kp in range(4):
+            res = res + c[(3 - kp)*nIntervals*nd] * z
+            if kp < 3:
+                z *= s
+        d[j] = res
+
+    # set small radiation values to zero
+    if d[0] < 1e-10:
+        d[0] = 0
+
+cdef struct WeatherData:
+    # weather data of a single greenhouse, either resampled at every solver step by python or interpolated on demand
+    const double* d             # pointer to the first row of the resampled weather data
+    unsigned int stride         # number of columns of the resampled weather data
+    unsigned int rows           # number of rows, i.e., solver steps, of the weather data
+    bint lazy                   # whether the weather data is interpolated at every solver step
+    WeatherInterpolation wi     # interpolation of the weather data, used if lazy
+    double* dLazy               # weather data of the current solver step, used if lazy (nd)
+    char nd                     # number of disturbances
+
+cdef inline double* weatherRow(WeatherData* w, unsigned int row) nogil:
+    """
+    Returns the weather data at solver step row.
+    With lazy weather the weather data is interpolated into a buffer, which is overwritten by the next call.
+    """
+    if w.lazy:
+        interpolateWeather(&w.wi, row, w.nd, w.dLazy)
+        return w.dLazy
+    return <double*>&w.d[row*w.stride]
@@ -5,19 +5,39 @@ import pandas as pd
 import gymnasium as gym
 from gymnasium.spaces import Box
 
-from greenlight_gym.envs.cython.greenlight_cy import GreenLight as GL
-from greenlight_gym.common.utils import loadWeatherData
+from greenlight_gym.envs.cython import greenlight_cy, greenlight_cy_f32, greenlight_cy_fast
+from greenlight_gym.common.utils import loadWeatherData, loadWeatherInterpolation, openWeatherDataset, openWarmStartLibrary, InfoChannel
 from greenlight_gym.envs.observations import ModelObservations, WeatherObservations, AggregatedObservations, StateObservations
 from greenlight_gym.envs.rewards import AdditiveReward, HarvestHeatCO2Reward, ArcTanPenaltyReward, MultiplicativeReward
 
 from datetime import date
 
+# information in the info dict of a step, see the info_level argument of GreenLightEnv
+INFO_LEVELS = ["none", "minimal", "full"]
+
 REWARDS = {"AdditiveReward": AdditiveReward, 
            "MultiplicativeReward": MultiplicativeReward,
            "HarvestHeatCO2Reward": HarvestHeatCO2Reward,
            "ArcTanPenaltyReward": ArcTanPenaltyReward
            }
 
+# compiled variants of the GreenLight model, see greenlight_gym/envs/cython/precision.pxd
+PRECISIONS = {"double": greenlight_cy,
+              "float32": greenlight_cy_f32,
+              }
+# fast-math variants of the GreenLight model, see greenlight_gym/envs/cython/fast_math.pxd
+FAST_MATH_PRECISIONS = {"double": greenlight_cy_fast,
+                        }
+
+def model_variant(precision: str, fast_math: bool):
+    """
+    Returns the compiled variant of the GreenLight model (Cython module) with the given precision and math functions.
+    """
+    variants = FAST_MATH_PRECISIONS if fast_math else PRECISIONS
+    if precision not in variants:
+        raise ValueError(f"Unknown precision {precision}{' with fast_math' if fast_math else ''}, choose from {list(variants)}")
+    return variants[precision]
+
 class GreenLightEnv(gym.Env):
     """
     This class represents the Gymnasium Env wrapper for the GreenLight model.
@@ -48,6 +68,24 @@ class GreenLightEnv(gym.Env):
         reward_function: reward function to use
         training: whether we are training or testing
         train_days: days to train on
+        weather_dataset: path to a dataset with derived weather data (without extension), see pre_processing/build_weather_dataset.py
+        lazy_weather: whether the model interpolates the weather data at every solver step, instead of keeping the resampled weather data.
+            Then, self.weatherData only holds the weather data at the control intervals.
+        integrator: integrator that solves the ODE, rk4 (fixed step size h), dopri5 (adaptive step size with error control),
+            ros2 (fixed step size h, linearly implicit, such that h can be 30-60 seconds)
+            or multirate (rk4, with the auxiliary states of the slow soil and crop states updated once per control interval)
+        rtol: relative tolerance of the adaptive integrator
+        atol: absolute tolerance of the adaptive integrator
+        max_step: maximum step size of the adaptive integrator [s], only limits the steps if it is smaller than time_interval
+        precision: floating point precision of the parameters and auxiliary states of the model, double or float32.
+            The states remain double in both variants, see greenlight_gym/tests/single_precision.py for the drift of float32.
+        fast_math: whether the model uses fast approximations of exp and pow (only with double precision),
+            see greenlight_gym/tests/fast_math.py for the error bounds and the deviation from the exact model.
+        warm_start_library: path to a library with spun-up climate states (.npz), see pre_processing/build_warm_starts.py.
+            A reset then starts from the spun-up state of its growth year and start day, instead of the night setpoints.
+        info_level: information in the info dict of a step, none (empty dict), minimal (profit and timestep)
+            or full (also the time, control signals and violations). During training nobody reads the info dicts,
+            while SubprocVecEnv pickles them for every step. The evaluation then reads the information from an InfoChannel.
     """
 
     def __init__(
@@ -74,6 +112,16 @@ class GreenLightEnv(gym.Env):
                 reward_function: str = "None", # reward function to use
                 training: bool = True,      # whether we are training or testing
                 train_days: Optional[List[int]] = None, # days to train on
+                weather_dataset: Optional[str] = None, # path to a dataset with derived weather data
+                lazy_weather: bool = False, # whether the model interpolates the weather data at every solver step
+                integrator: str = "rk4",    # integrator that solves the ODE, rk4, dopri5, ros2 or multirate
+                rtol: float = 1e-4,         # relative tolerance of the adaptive integrator
+                atol: float = 1e-4,         # absolute tolerance of the adaptive integrator
+                max_step: float = 300,      # maximum step size of the adaptive integrator [s]
+                precision: str = "double",  # floating point precision of the auxiliary states, double or float32
+                fast_math: bool = False,    # whether the model uses fast approximations of exp and pow
+                warm_start_library: Optional[str] = None, # path to a library with spun-up climate states
+                info_level: str = "full",   # information in the info dict of a step, none, minimal or full
                 ) -> None:
         super(GreenLightEnv, self).__init__()
 
@@ -110,8 +158,39 @@ class GreenLightEnv(gym.Env):
         self.training = training
         self.eval_idx = 0
 
+        # memory mapped weather dataset, shared by all environments in the process
+        self.weather_dataset = weather_dataset
+        self.weatherDataset = openWeatherDataset(weather_dataset) if weather_dataset is not None else None
+
+        # the model evaluates the interpolated weather data on demand, instead of keeping the weather data at every solver step
+        # the weather dataset is already shared by all environments, hence lazy weather is meant for the raw weather data files
+        if lazy_weather and weather_dataset is not None:
+            raise ValueError("lazy_weather and weather_dataset cannot be used together")
+        self.lazy_weather = lazy_weather
+        # number of rows of self.weatherData between the control intervals
+        self.weather_obs_steps = 1 if lazy_weather else self.solver_steps
+        # interpolation of the weather data of the current episode, if lazy_weather
+        self.weatherInterpolation = None
+
+        # spun-up climate states at the start of the seasons, shared by all environments in the process
+        self.warm_start_library = warm_start_library
+        self.warmStartLibrary = openWarmStartLibrary(warm_start_library) if warm_start_library is not None else None
+        if self.warmStartLibrary is not None and (self.warmStartLibrary.location, self.warmStartLibrary.source) != (location, data_source):
+            raise ValueError(f"Warm start library {warm_start_library} was built for {self.warmStartLibrary.location} {self.warmStartLibrary.source}, "
+                             f"not for {location} {data_source}")
+
+        if info_level not in INFO_LEVELS:
+            raise ValueError(f"Unknown info_level {info_level}, expected one of {INFO_LEVELS}")
+        self.info_level = info_level
+        # shared-memory side channel with the information of the steps and the row of this environment, see set_info_channel
+        self.info_channel = None
+        self.info_idx = 0
+
         self.observations = None
         self.rewards = None
+        # profit and violations of the last step that was not terminal
+        self.profit = 0.
+        self.violations = np.zeros(3)
 
         self.observation_space = None
         self.action_space = None
@@ -123,6 +202,10 @@ class GreenLightEnv(gym.Env):
         self.obs_low = None
         self.obs_high = None
 
+        self.precision = precision
+        self.fast_math = fast_math
+        GL = model_variant(precision, fast_math).GreenLight
+
         # # initialize the model in cython
         self.GLModel = GL(self.h,
                           nx,
@@ -134,6 +217,11 @@ class GreenLightEnv(gym.Env):
                           int_lamps,
                           self.solver_steps,
                           )
+        self.integrator = integrator
+        self.rtol = rtol
+        self.atol = atol
+        self.max_step = max_step
+        self.GLModel.setIntegrator(integrator, rtol, atol, max_step)
 
     def step(self, action: np.ndarray) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
         """
@@ -161,6 +249,9 @@ class GreenLightEnv(gym.Env):
 
         # additional information to return
         info = self._get_info()
+        if self.info_channel is not None:
+            self.info_channel.write(self.info_idx, self.GLModel.time, self.GLModel.timestep, self.profit, self.violations,
+                                    self.GLModel.getControlsArray())
 
         return (
                 obs,
@@ -176,6 +267,16 @@ class GreenLightEnv(gym.Env):
         """
         pass
 
+    def set_info_channel(self, info_channel: Optional[InfoChannel], idx: int = 0) -> None:
+        """
+        Sets the shared-memory side channel to which the information of every step is written, in row idx.
+        Detaches from the previous channel, and from any channel if info_channel is None.
+        """
+        if self.info_channel is not None and self.info_channel is not info_channel:
+            self.info_channel.close()
+        self.info_channel = info_channel
+        self.info_idx = idx
+
     def _init_rewards(self,
                     co2_price: Optional[float] = None,
                     gas_price: Optional[float] = None,
@@ -288,7 +389,50 @@ class GreenLightEnv(gym.Env):
         Returns:
             _type_: scaled action [0,1]
         """
-        return (a-amin)/(amax-amin)
+        return (action-amin)/(amax-amin)
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Captures the state of the current episode, such that rollouts can be branched from it with restore_snapshot.
+        The simulator state is copied into a compact buffer (see GreenLight.get_snapshot),
+        while the weather data of the episode is referenced instead of copied.
+
+        Returns:
+            Dict[str, Any]: snapshot of the episode.
+        """
+        return {
+            "model": self.GLModel.get_snapshot(),
+            "growth_year": self.growth_year,
+            "start_day": self.start_day,
+            "weather_data": self.weatherData,
+            "weather_interpolation": self.weatherInterpolation,
+            "terminated": self.terminated,
+            }
+
+    def restore_snapshot(self, snapshot: Dict[str, Any]) -> np.ndarray:
+        """
+        Restores the state of an episode captured by get_snapshot.
+        If the snapshot was taken in another episode, the model is first pointed to the weather data of that episode.
+
+        Args:
+            snapshot (Dict[str, Any]): snapshot of get_snapshot.
+
+        Returns:
+            np.ndarray: observation of the restored state.
+        """
+        if snapshot["weather_data"] is not self.weatherData:
+            interpolation = snapshot["weather_interpolation"]
+            if interpolation is not None:
+                self.GLModel.resetInterpolated(interpolation.knots, interpolation.coefficients, interpolation.rows, 0)
+            else:
+                self.GLModel.reset(snapshot["weather_data"], 0)
+            self.weatherData = snapshot["weather_data"]
+            self.weatherInterpolation = interpolation
+        self.GLModel.restore_snapshot(snapshot["model"])
+        self.growth_year = snapshot["growth_year"]
+        self.start_day = snapshot["start_day"]
+        self.terminated = snapshot["terminated"]
+        return self._get_obs()
 
     def _reset_eval_idx(self):
         """
@@ -317,25 +461,44 @@ class GreenLightEnv(gym.Env):
             self.start_day = self.start_days[self.eval_idx]
             self.increase_eval_idx()
 
-        # load in weather data for specific simulation
-        self.weatherData = loadWeatherData(
-            self.weather_data_dir,
-            self.location,
-            self.data_source,
-            self.growth_year,
-            self.start_day,
-            self.season_length,
-            self.pred_horizon,
-            self.h,
-            self.nd
-            )
-
         # compute days since 01-01-0001
         # as time indicator by the model
         timeInDays = self._get_time_in_days()
 
-        # reset the GreenLight model starting settings
-        self.GLModel.reset(self.weatherData, timeInDays)
+        # load in weather data for specific simulation
+        # and reset the GreenLight model starting settings
+        if self.lazy_weather:
+            weatherInterpolation = loadWeatherInterpolation(
+                self.weather_data_dir,
+                self.location,
+                self.data_source,
+                self.growth_year,
+                self.start_day,
+                self.season_length,
+                self.pred_horizon,
+                self.h,
+                self.nd,
+                )
+            # the observations only require the weather data at the control intervals
+            self.weatherData = weatherInterpolation.resample(self.solver_steps)
+            self.weatherInterpolation = weatherInterpolation
+            self.GLModel.resetInterpolated(weatherInterpolation.knots, weatherInterpolation.coefficients, weatherInterpolation.rows, timeInDays)
+        else:
+            self.weatherData = loadWeatherData(
+                self.weather_data_dir,
+                self.location,
+                self.data_source,
+                self.growth_year,
+                self.start_day,
+                self.season_length,
+                self.pred_horizon,
+                self.h,
+                self.nd,
+                weatherDataset=self.weatherDataset
+                )
+            self.GLModel.reset(self.weatherData, timeInDays)
+        if self.warmStartLibrary is not None:
+            self.GLModel.setClimateState(self.warmStartLibrary.get(self.growth_year, self.start_day))
         self.terminated = False
         return self._get_obs(), {}
 
@@ -418,16 +581,20 @@ class GreenLightHeatCO2(GreenLightEnv):
 
     def _get_info(self):
         """
-        Information to return after each timestep.
+        Information to return after each timestep, depending on the info_level.
 
         Returns:
             _type_: information to return
         """
+        if self.info_level == "none":
+            return {}
+        elif self.info_level == "minimal":
+            return {"profit": self.profit, "timestep": self.GLModel.timestep}
         return {
             "controls": self.GLModel.getControlsArray(),
             "Time": self.GLModel.time,
-            "profit": self.rewards.rewards_list[0].profit,
-            "violations": self.rewards.rewards_list[1].abs_pen,
+            "profit": self.profit,
+            "violations": self.violations,
             "timestep": self.GLModel.timestep,
             }
 
@@ -439,7 +606,7 @@ class GreenLightHeatCO2(GreenLightEnv):
         Returns:
             np.ndarray: observation
         """
-        return self.observations.compute_obs(self.GLModel, self.solver_steps, self.weatherData)
+        return self.observations.compute_obs(self.GLModel, self.weather_obs_steps, self.weatherData)
 
     def _init_rewards(self,
                     co2_price: float,
@@ -462,16 +629,20 @@ class GreenLightHeatCO2(GreenLightEnv):
                                               )
         penalty_reward = ArcTanPenaltyReward(k, obs_low, obs_high)
         self.rewards = REWARDS[self.reward_function](rewards_list=[harvest_reward, penalty_reward], omega=omega)
-
+        # the reward modules configure the reward kernel, which computes the reward at the end of every step of the model
+        self.GLModel.setReward(**self.rewards.kernel_args())
 
     def _reward(self) -> float:
         """
-        Get the reward from the reward module.
+        Get the reward from the reward kernel of the model, configured by the reward modules.
+        The profit and violations are kept for the information of the step.
 
         Returns:
             float: reward
         """
-        return self.rewards._compute_reward(self.GLModel)
+        self.profit = self.GLModel.profit
+        self.violations = self.GLModel.violations.copy()
+        return self.GLModel.reward
 
     def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
         super().reset(seed=seed)
@@ -533,7 +704,7 @@ class GreenLightRuleBased(GreenLightEnv):
         self.control_idx = np.array([self.control_indices[control_input] for control_input in control_signals], dtype=np.uint8)
 
     def _get_obs(self) -> np.ndarray:
-        return self.observations.compute_obs(self.GLModel, self.solver_steps, self.weatherData)
+        return self.observations.compute_obs(self.GLModel, self.weather_obs_steps, self.weatherData)
 
     def _init_rewards(self,
                     co2_price: float,
@@ -556,16 +727,23 @@ class GreenLightRuleBased(GreenLightEnv):
                                                             obs_low, 
                                                             obs_high)]
         )
+        self.GLModel.setReward(**self.rewards.kernel_args())
 
     def _reward(self) -> float:
-        return self.rewards._compute_reward(self.GLModel)
+        self.profit = self.GLModel.profit
+        self.violations = self.GLModel.violations.copy()
+        return self.GLModel.reward
 
     def _get_info(self):
+        if self.info_level == "none":
+            return {}
+        elif self.info_level == "minimal":
+            return {"profit": self.profit, "timestep": self.GLModel.timestep}
         return {
             "controls": self.GLModel.getControlsArray(),
             "Time": self.GLModel.time,
-            "profit": self.rewards.rewards_list[0].profit,
-            "violations": self.rewards.rewards_list[1].abs_pen,
+            "profit": self.profit,
+            "violations": self.violations,
             "timestep": self.GLModel.timestep,
             }
 
@@ -626,6 +804,16 @@ class GreenLightStatesTest(GreenLightEnv):
 
         self.weatherData = weather
 
+    def _init_observations(self,
+                           model_obs_vars: Optional[List[str]] = None,
+                           weather_obs_vars: Optional[List[str]] = None,
+                           Np: Optional[int] = None
+                           ) -> None:
+        """
+        The observations are all states of the model, see StateObservations.
+        """
+        self.observations = AggregatedObservations([StateObservations(model_obs_vars)], model_obs_idx=0)
+
     def _get_obs(self) -> np.ndarray:
         return self.GLModel.getStatesArray()
 
@@ -29,7 +29,44 @@ class Observations:
                     weather_data: np.ndarray,
                     ) -> np.ndarray:
         """
-        Placeholder function for computing observations.
+        Computes the observations into a new array, see fill_obs.
+        """
+        obs = np.empty(self.Nobs)
+        self.fill_obs(GLModel, solver_steps, weather_data, obs)
+        return obs
+
+    def compute_obs_batch(self,
+                          GLBatch: greenlight_cy.GreenLightBatch,
+                          solver_steps: int,
+                          weather_data: np.ndarray,
+                          ) -> np.ndarray:
+        """
+        Computes the observations of a batch of greenhouses into a new array of shape (N, Nobs),
+        with weather_data of shape (N, rows, nd), see fill_obs_batch.
+        """
+        obs = np.empty((GLBatch.n_envs, self.Nobs))
+        self.fill_obs_batch(GLBatch, solver_steps, weather_data, obs)
+        return obs
+
+    def fill_obs(self,
+                 GLModel: greenlight_cy.GreenLight,
+                 solver_steps: int,
+                 weather_data: np.ndarray,
+                 out: np.ndarray,
+                 ) -> None:
+        """
+        Placeholder function for writing the observations into out, of shape (Nobs,), without allocating temporary arrays.
+        """
+        pass
+
+    def fill_obs_batch(self,
+                       GLBatch: greenlight_cy.GreenLightBatch,
+                       solver_steps: int,
+                       weather_data: np.ndarray,
+                       out: np.ndarray,
+                       ) -> None:
+        """
+        Placeholder function for writing the observations of a batch of greenhouses into out, of shape (N, Nobs).
         """
         pass
 
@@ -37,7 +74,8 @@ class ModelObservations(Observations):
     """
     Model observations module. This class is used to extract observations from the GreenLight model.
     Pass the desired variables from the model to observe in the model_obs_vars list.
-    Make sure that the model variables are available as attribute in the Cython code GreenLight model.
+    The variable names are resolved once into the codes of GreenLight.fill_obs (see greenlight_cy.OBSERVATIONS),
+    such that all model observations are retrieved with a single call per step.
 
     Args:
         - model_obs_vars (List[str]): list of variable names to be observed.
@@ -50,19 +88,32 @@ class ModelObservations(Observations):
                 high: float=1e4                 # upper bound for the observation space
                 ) -> None:
         self.var_names = model_obs_vars
+        self.codes = greenlight_cy.observation_codes(list(model_obs_vars))
         self.Nobs = len(model_obs_vars)
         self.low = np.full(self.Nobs, low)
         self.high = np.full(self.Nobs, high)
 
-    def compute_obs(self,
-                    GLModel: greenlight_cy.GreenLight,
-                    solver_steps: int,
-                    weather_data: np.ndarray,
-                    ) -> np.ndarray:
+    def fill_obs(self,
+                 GLModel: greenlight_cy.GreenLight,
+                 solver_steps: int,
+                 weather_data: np.ndarray,
+                 out: np.ndarray,
+                 ) -> None:
+        """
+        Retrieve observations from GreenLight model.
         """
-        Compute, and retrieve observations from GreenLight model.
+        GLModel.fill_obs(out, self.codes)
+
+    def fill_obs_batch(self,
+                       GLBatch: greenlight_cy.GreenLightBatch,
+                       solver_steps: int,
+                       weather_data: np.ndarray,
+                       out: np.ndarray,
+                       ) -> None:
+        """
+        Retrieve observations from all greenhouses in the GreenLightBatch model.
         """
-        return np.array([getattr(GLModel, model_var) for model_var in self.var_names])
+        GLBatch.fill_obs(out, self.codes)
 
 class WeatherObservations(Observations):
     """
@@ -84,6 +135,12 @@ class WeatherObservations(Observations):
         self.var_names = weather_obs_vars
         self.weather_cols = self.weather_vars2idx()
         self.Np = Np
+        # the current and future time intervals, broadcast against the weather columns
+        self.steps = np.arange(Np+1)[:, None]
+        # indices into the flattened weather data at timestep zero, for the solver steps and columns of flat_idx_key
+        self.flat_idx_key = None
+        self.flat_idx_start = None
+        self.flat_idx = None
         self.Nobs = len(weather_obs_vars) * (Np + 1)
         self.low = np.full(self.Nobs, low)
         self.high = np.full(self.Nobs, high)
@@ -96,17 +153,44 @@ class WeatherObservations(Observations):
                        "sky_temp": 5, "out_soil_temp": 6, "dli": 7, "is_day": 8, "is_day_smooth": 9}
         return np.array([weather_idx[weather_var] for weather_var in self.var_names])
 
-    def compute_obs(self,
-                    GLModel: greenlight_cy.GreenLight,
-                    solver_steps: int,
-                    weather_data: np.ndarray,
-                    ) -> np.ndarray:
+    def fill_obs(self,
+                 GLModel: greenlight_cy.GreenLight,
+                 solver_steps: int,
+                 weather_data: np.ndarray,
+                 out: np.ndarray,
+                 ) -> None:
+        """
+        Retrieve the weather variables at the current and the next Np time intervals.
+        The elements are taken from the flattened weather data with precomputed indices, directly into out.
+        """
+        if not weather_data.flags.c_contiguous:
+            start = GLModel.timestep*solver_steps
+            out[:] = weather_data[start:start + self.Np*solver_steps + 1:solver_steps][:, self.weather_cols].ravel()
+            return
+        if self.flat_idx_key != (solver_steps, weather_data.shape[1]):
+            self.flat_idx_key = (solver_steps, weather_data.shape[1])
+            self.flat_idx_start = ((self.steps*solver_steps)*weather_data.shape[1] + self.weather_cols).ravel()
+            self.flat_idx = np.empty_like(self.flat_idx_start)
+        np.add(self.flat_idx_start, GLModel.timestep*solver_steps*weather_data.shape[1], out=self.flat_idx)
+        # mode clip, since the default mode raise copies the result into out through a temporary array,
+        # hence the bounds are checked here
+        if self.flat_idx.shape[0] > 0 and self.flat_idx[-1] >= weather_data.size:
+            raise IndexError(f"The weather observations at timestep {GLModel.timestep} exceed the {weather_data.shape[0]} rows of the weather data")
+        weather_data.take(self.flat_idx, out=out, mode="clip")
+
+    def fill_obs_batch(self,
+                       GLBatch: greenlight_cy.GreenLightBatch,
+                       solver_steps: int,
+                       weather_data: np.ndarray,
+                       out: np.ndarray,
+                       ) -> None:
         """
-        Retrieve the weather variables.
+        Retrieve the weather variables for all greenhouses in the batch.
+        The greenhouses are at different timesteps, hence the rows are gathered with a single fancy index.
         """
-        weather_idx = np.array([GLModel.timestep*solver_steps] + [(ts + GLModel.timestep)*solver_steps for ts in range(1, self.Np+1)])
-        weather_obs = weather_data[weather_idx][:, self.weather_cols].flatten()
-        return weather_obs
+        weather_idx = (GLBatch.timestep.astype(np.int64)[:, None, None] + self.steps) * solver_steps
+        env_idx = np.arange(weather_data.shape[0])[:, None, None]
+        out.reshape(weather_data.shape[0], self.Np+1, self.weather_cols.shape[0])[:] = weather_data[env_idx, weather_idx, self.weather_cols]
 
 class StateObservations(Observations):
     """
@@ -123,21 +207,36 @@ class StateObservations(Observations):
         self.low = np.full(self.Nobs, low)
         self.high = np.full(self.Nobs, high)
 
-    def compute_obs(self,
-                    GLModel: greenlight_cy.GreenLight,
-                    solver_steps: int,
-                    weather_data: np.ndarray,
-                    ) -> np.ndarray:
+    def fill_obs(self,
+                 GLModel: greenlight_cy.GreenLight,
+                 solver_steps: int,
+                 weather_data: np.ndarray,
+                 out: np.ndarray,
+                 ) -> None:
         """
         Retrieve the state variables.
         """
-        return GLModel.getStatesArray()
+        out[:] = GLModel.getStatesArray()
+
+    def fill_obs_batch(self,
+                       GLBatch: greenlight_cy.GreenLightBatch,
+                       solver_steps: int,
+                       weather_data: np.ndarray,
+                       out: np.ndarray,
+                       ) -> None:
+        """
+        Retrieve the state variables of all greenhouses in the batch.
+        """
+        out[:] = GLBatch.getStatesArray()
 
 class AggregatedObservations(Observations):
     """
     Aggregated observations module. This class is used to aggregate multiple observation classes.
     This class uses holds a list of observation classes and aggregates them into one observation class.
     Calling the compute_obs method will return the concatenated observations from all the observation classes.
+    The observation classes write their observations into fixed slices of a single buffer, owned by this class,
+    such that fill_obs does not allocate any arrays. The buffer is overwritten by the next call,
+    hence compute_obs returns a copy, which can be kept by the caller (e.g., as terminal observation of a vectorized env).
     
     Args:
         - obs_list (List[Observations]): list of observation classes to be aggregated
@@ -152,6 +251,12 @@ class AggregatedObservations(Observations):
         self.low = np.concatenate([obs.low for obs in obs_list])
         self.high = np.concatenate([obs.high for obs in obs_list])
 
+        # slices of the observation classes in the aggregated observation
+        offsets = np.cumsum([0] + [obs.Nobs for obs in obs_list])
+        self.slices = [slice(start, end) for start, end in zip(offsets[:-1], offsets[1:])]
+        self.buffer = np.empty(self.Nobs)
+        self.views = [self.buffer[obs_slice] for obs_slice in self.slices]
+
     def compute_obs(self,
                     GLModel: greenlight_cy.GreenLight,
                     solver_steps: int,
@@ -160,7 +265,37 @@ class AggregatedObservations(Observations):
         """
         Compute, and aggregate observations from GreenLight model and weather.
         """
-        return np.concatenate([obs.compute_obs(GLModel, solver_steps, weather_data) for obs in self.obs_list])
+        return self.fill_obs(GLModel, solver_steps, weather_data).copy()
+
+    def fill_obs(self,
+                 GLModel: greenlight_cy.GreenLight,
+                 solver_steps: int,
+                 weather_data: np.ndarray,
+                 out: Optional[np.ndarray] = None,
+                 ) -> np.ndarray:
+        """
+        Writes the aggregated observations into out, or into the buffer of this class if out is None.
+        Returns the array the observations are written to.
+        """
+        if out is None:
+            for obs, view in zip(self.obs_list, self.views):
+                obs.fill_obs(GLModel, solver_steps, weather_data, view)
+            return self.buffer
+        for obs, obs_slice in zip(self.obs_list, self.slices):
+            obs.fill_obs(GLModel, solver_steps, weather_data, out[obs_slice])
+        return out
+
+    def fill_obs_batch(self,
+                       GLBatch: greenlight_cy.GreenLightBatch,
+                       solver_steps: int,
+                       weather_data: np.ndarray,
+                       out: np.ndarray,
+                       ) -> None:
+        """
+        Compute, and aggregate observations for all greenhouses in the batch.
+        """
+        for obs, obs_slice in zip(self.obs_list, self.slices):
+            obs.fill_obs_batch(GLBatch, solver_steps, weather_data, out[:, obs_slice])
 
 if __name__ == "__main__":
     obs_list = [ModelObservations(["air_temp", "air_rh", "co2_ppm", "fruit_weight"]),
@@ -1,4 +1,4 @@
-from typing import SupportsFloat, List, Optional
+from typing import SupportsFloat, List, Optional, Dict, Any
 import numpy as np
 
 from greenlight_gym.envs.cython import greenlight_cy
@@ -17,6 +17,37 @@ class BaseReward(object):
     def _compute_reward(self, GLModel: greenlight_cy.GreenLight) -> SupportsFloat:
         raise NotImplementedError
 
+    def compute_batch(self, traj: np.ndarray, var_names: List[str]) -> np.ndarray:
+        """
+        Computes the reward of every transition of stored trajectories at once, as NumPy array operations.
+        Allows to relabel logged transitions under other prices or penalty settings, without simulating them again.
+
+        Args:
+            traj (np.ndarray): model variables after every step, of shape (episodes, T, vars)
+            var_names (List[str]): names of the variables along the last axis, equal to the properties of GreenLight
+        Returns:
+            np.ndarray: reward of every transition, of shape (episodes, T)
+        """
+        raise NotImplementedError
+
+    def kernel_args(self) -> Dict[str, Any]:
+        """
+        Settings of the reward kernel that computes this reward inside the step of the (cython) GreenLight model.
+        Passed as keyword arguments to GreenLight.setReward (or GreenLightBatch.setReward).
+        """
+        raise NotImplementedError
+
+
+def trajectory_vars(traj: np.ndarray, var_names: List[str], names: List[str]) -> np.ndarray:
+    """
+    Selects the variables names from the last axis of the trajectories traj, which holds the variables var_names.
+    """
+    if traj.shape[-1] != len(var_names):
+        raise ValueError(f"Expected trajectories with {len(var_names)} variables, got shape {traj.shape}")
+    missing = [name for name in names if name not in var_names]
+    if missing:
+        raise ValueError(f"The trajectories miss the variables {missing}")
+    return traj[..., [var_names.index(name) for name in names]]
 
 class HarvestHeatCO2Reward(BaseReward):
     """
@@ -36,6 +67,9 @@ class HarvestHeatCO2Reward(BaseReward):
         max_harvest (float): maximum harvest [kg m^-2]
         energy_content_gas (float): energy content of the gas [J m^-3]
     """
+    # model variables of the profit, see compute_batch
+    traj_vars = ["fruit_harvest", "co2_resource", "gas_resource"]
+
     def __init__(self,
                  co2_price: float,
                  gas_price: float,
@@ -67,10 +101,24 @@ class HarvestHeatCO2Reward(BaseReward):
         Returns:
             SupportsFloat: profit-based reward for the agent.
         """
-        delta_harvest =  getattr(GLModel, "fruit_harvest")/self.dmfm # [kg [DM]{CH2O} m^-2]
-        self.profit = delta_harvest * self.tom_price - getattr(GLModel, "co2_resource")*self.co2_price - getattr(GLModel, "gas_resource") * self.gas_price  # [€ m^-2]
+        return self._profit_reward(*[getattr(GLModel, name) for name in self.traj_vars])
+
+    def compute_batch(self, traj: np.ndarray, var_names: List[str]) -> np.ndarray:
+        fruit_harvest, co2_resource, gas_resource = np.moveaxis(trajectory_vars(traj, var_names, self.traj_vars), -1, 0)
+        return self._profit_reward(fruit_harvest, co2_resource, gas_resource)
+
+    def _profit_reward(self, fruit_harvest, co2_resource, gas_resource) -> SupportsFloat:
+        """
+        Scaled profit from the harvest and the resource consumption over the time interval(s).
+        """
+        delta_harvest =  fruit_harvest/self.dmfm # [kg [DM]{CH2O} m^-2]
+        self.profit = delta_harvest * self.tom_price - co2_resource*self.co2_price - gas_resource * self.gas_price  # [€ m^-2]
         return self._scale(self.profit)
 
+    def kernel_args(self) -> Dict[str, Any]:
+        return {"co2Price": self.co2_price, "gasPrice": self.gas_price, "tomPrice": self.tom_price, "dmfm": self.dmfm,
+                "rmin": self.rmin, "rmax": self.rmax}
+
 class ArcTanPenaltyReward(BaseReward):
     """
     Penalty module for the GreenLight environment.
@@ -81,6 +129,9 @@ class ArcTanPenaltyReward(BaseReward):
     Args:
         BaseReward (_type_): _description_
     """
+    # indoor variables of the penalty (temp, co2, rh), see compute_batch
+    traj_vars = ["air_temp", "co2_conc", "in_rh"]
+
     def __init__(self, 
                  k: List[float],
                  obs_low: List[float],
@@ -111,15 +162,37 @@ class ArcTanPenaltyReward(BaseReward):
     def _compute_reward(self, GLModel: greenlight_cy.GreenLight) -> SupportsFloat:
         """
         Returns the mean of the inverse tangens for absolute penalty values.
+        Also accepts a GreenLightBatch model, in which case the penalty is computed for every greenhouse.
         
         Args:
             GLModel (greenlight_cy.GreenLight): GreenLight model object.
         Returns:
             SupportsFloat: penalty-based reward for the agent.
         """ 
-        self.abs_pen = self._compute_penalty(GLModel.get_indoor_obs())
+        return self._penalty_reward(GLModel.get_indoor_obs())
+
+    def compute_batch(self, traj: np.ndarray, var_names: List[str]) -> np.ndarray:
+        return self._penalty_reward(trajectory_vars(traj, var_names, self.traj_vars))
+
+    def _penalty_reward(self, obs: np.ndarray) -> SupportsFloat:
+        """
+        Mean of the inverse tangens of the absolute penalties of the indoor variables along the last axis of obs.
+        """
+        self.abs_pen = self._compute_penalty(obs)
         self.pen = 2/np.pi*np.arctan(-self.k*self.abs_pen)
-        return np.mean(self.pen)
+        return np.mean(self.pen, axis=-1)
+
+    def kernel_args(self) -> Dict[str, Any]:
+        return {"k": self.k, "obsLow": self.obs_low, "obsHigh": self.obs_high}
+
+def combined_kernel_args(rewards_list: List[BaseReward], combination: str, omega: float = 1.0) -> Dict[str, Any]:
+    """
+    Settings of the reward kernel for the combination of a profit-based and a penalty-based reward module.
+    The kernel only implements the combination of HarvestHeatCO2Reward and ArcTanPenaltyReward (in that order).
+    """
+    if [type(reward) for reward in rewards_list] != [HarvestHeatCO2Reward, ArcTanPenaltyReward]:
+        raise NotImplementedError("The reward kernel only combines a HarvestHeatCO2Reward and an ArcTanPenaltyReward")
+    return {"combination": combination, "omega": omega, **rewards_list[0].kernel_args(), **rewards_list[1].kernel_args()}
 
 class AdditiveReward(BaseReward):
     """
@@ -144,7 +217,13 @@ class AdditiveReward(BaseReward):
         Returns:
             _type_: combined reward for the agent.
         """
-        return np.sum([reward._compute_reward(GLModel) for reward in self.rewards_list])
+        return np.sum([reward._compute_reward(GLModel) for reward in self.rewards_list], axis=0)
+
+    def compute_batch(self, traj: np.ndarray, var_names: List[str]) -> np.ndarray:
+        return np.sum([reward.compute_batch(traj, var_names) for reward in self.rewards_list], axis=0)
+
+    def kernel_args(self) -> Dict[str, Any]:
+        return combined_kernel_args(self.rewards_list, "additive")
 
 class MultiplicativeReward(BaseReward):
     """
@@ -166,6 +245,14 @@ class MultiplicativeReward(BaseReward):
         penalty = self.rewards_list[1]._compute_reward(GLModel)
         return profit * (1.0 - self.omega*(-penalty))
 
+    def compute_batch(self, traj: np.ndarray, var_names: List[str]) -> np.ndarray:
+        profit = self.rewards_list[0].compute_batch(traj, var_names)
+        penalty = self.rewards_list[1].compute_batch(traj, var_names)
+        return profit * (1.0 - self.omega*(-penalty))
+
+    def kernel_args(self) -> Dict[str, Any]:
+        return combined_kernel_args(self.rewards_list, "multiplicative", self.omega)
+
 ### UNUSED REWARD FUNCTIONS ###
 # class LinearScalePenaly(BaseReward):
 #     def __init__(self, k: List[float], obs_low: List[float], obs_high: List[float]) -> None:
@@ -0,0 +1,292 @@
+import time
+import warnings
+from typing import Optional, Any, List, Dict, Type, Sequence
+
+import numpy as np
+import gymnasium as gym
+from gymnasium.utils import seeding
+from stable_baselines3.common.monitor import ResultsWriter, Monitor
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvIndices, VecEnvObs, VecEnvStepReturn
+
+from greenlight_gym.common.utils import loadWeatherData, loadWeatherInterpolation, InfoChannel
+from greenlight_gym.envs.greenlight import GreenLightHeatCO2, GreenLightRuleBased, model_variant
+
+BATCH_ENVS = {"GreenLightHeatCO2": GreenLightHeatCO2, "GreenLightRuleBased": GreenLightRuleBased}
+
+class GreenLightVecEnv(VecEnv):
+    """
+    Vectorized environment that simulates N greenhouses in a single process.
+    Replaces SubprocVecEnv + VecMonitor for the GreenLightHeatCO2 and GreenLightRuleBased environments.
+
+    The greenhouses are simulated by the GreenLightBatch model, which integrates all greenhouses in one loop.
+    Observations and terminal states are computed for all greenhouses at once,
+    using the observation modules of the environment as NumPy array operations.
+    The rewards are computed by the reward kernel of the batch, configured by the reward modules of the environment.
+    Greenhouses that reached a terminal state are reset automatically, similar to SubprocVecEnv.
+    Episode statistics are added to the info dictionaries, similar to VecMonitor.
+
+    A single instance of the environment is kept as template. It holds the settings, observation and reward modules,
+    and the observation and action spaces. Attributes that are not defined by the vectorized environment are read from it.
+
+    Args:
+        env_id (str): environment id, either GreenLightHeatCO2 or GreenLightRuleBased
+        n_envs (int): number of greenhouses to simulate
+        env_kwargs (Dict[str, Any]): arguments for the environment, i.e., base and specific environment parameters
+        options (Optional[Dict[str, Any]]): options of the evaluation environment (start_days and growth_years)
+        eval_env (bool): whether the environment is used for evaluation
+        monitor_filename (Optional[str]): file to write the episode statistics to
+        num_threads (int): number of OpenMP threads to integrate the greenhouses, uses the OpenMP default if smaller than one
+        layout (str): memory layout of the auxiliary states, aos (default) or soa, which integrates blocks of greenhouses in lockstep
+            and requires the rk4 or multirate integrator, see GreenLightBatch.setLayout
+    """
+    def __init__(self,
+                 env_id: str,
+                 n_envs: int,
+                 env_kwargs: Dict[str, Any],
+                 options: Optional[Dict[str, Any]] = None,
+                 eval_env: bool = False,
+                 monitor_filename: Optional[str] = None,
+                 num_threads: int = 0,
+                 layout: str = "aos",
+                 ) -> None:
+        self.env_id = env_id
+        self.env = BATCH_ENVS[env_id](**env_kwargs)
+        self.render_mode = None
+
+        GLBatch = model_variant(self.env.precision, self.env.fast_math).GreenLightBatch
+        self.GLBatch = GLBatch(self.env.h,
+                               self.env.nx,
+                               self.env.nu,
+                               self.env.nd,
+                               self.env.no_lamps,
+                               self.env.led_lamps,
+                               self.env.hps_lamps,
+                               self.env.int_lamps,
+                               self.env.solver_steps,
+                               n_envs,
+                               num_threads,
+                               )
+        self.GLBatch.setIntegrator(self.env.integrator, self.env.rtol, self.env.atol, self.env.max_step)
+        self.GLBatch.setLayout(layout)
+        self.GLBatch.setReward(**self.env.rewards.kernel_args())
+
+        # per greenhouse settings of the growing season
+        self.growth_years = np.zeros(n_envs, dtype=np.int64)
+        self.start_days = np.zeros(n_envs, dtype=np.int64)
+        self.eval_idx = np.zeros(n_envs, dtype=np.int64)
+        self.np_randoms = [seeding.np_random()[0] for _ in range(n_envs)]
+        if eval_env:
+            self.env.training = False
+            self.env.start_days = options["start_days"]
+            # we fix the growth year for each individual evaluation environment
+            self.growth_years[:] = options["growth_years"][:n_envs]
+
+        # weather data at the control intervals, used for the weather observations
+        self.weather_obs_data = None
+
+        # profit and violations are only updated for greenhouses that are not in a terminal state
+        self.profits = np.zeros(n_envs)
+        self.violations = np.zeros((n_envs, 3))
+
+        # shared-memory side channel with the information of the steps, and the row of every greenhouse, see set_info_channel
+        self.info_channel = None
+        self.info_channel_idx = np.arange(n_envs)
+
+        self.actions = None
+        self.t_start = time.time()
+        self.episode_returns = np.zeros(n_envs, dtype=np.float32)
+        self.episode_lengths = np.zeros(n_envs, dtype=np.int32)
+        self.results_writer = None
+        if monitor_filename:
+            self.results_writer = ResultsWriter(monitor_filename, header={"t_start": self.t_start, "env_id": env_id})
+
+        super(GreenLightVecEnv, self).__init__(n_envs, self.env.observation_space, self.env.action_space)
+
+    def _reset_env(self, idx: int, seed: Optional[int] = None) -> None:
+        """
+        Resets a single greenhouse to the start of a new growing season.
+        Follows the reset of GreenLightEnv; the observation is computed afterwards for all greenhouses at once.
+        """
+        if seed is not None:
+            self.np_randoms[idx], _ = seeding.np_random(seed)
+
+        # pick a random growth year and start day if we are training
+        # otherwise use one of the start days for evaluation
+        if self.env.training:
+            self.growth_years[idx] = self.np_randoms[idx].choice(self.env.train_years)
+            self.start_days[idx] = self.np_randoms[idx].choice(self.env.train_days)
+        else:
+            self.start_days[idx] = self.env.start_days[self.eval_idx[idx]]
+            self.eval_idx[idx] += 1
+
+        self.env.growth_year = self.growth_years[idx]
+        self.env.start_day = self.start_days[idx]
+        time_in_days = self.env._get_time_in_days()
+
+        if self.env.lazy_weather:
+            weather_interpolation = loadWeatherInterpolation(
+                self.env.weather_data_dir,
+                self.env.location,
+                self.env.data_source,
+                self.growth_years[idx],
+                self.start_days[idx],
+                self.env.season_length,
+                self.env.pred_horizon,
+                self.env.h,
+                self.env.nd,
+                )
+            weather_obs_data = weather_interpolation.resample(self.env.solver_steps)
+            self.GLBatch.resetInterpolated(idx, weather_interpolation.knots, weather_interpolation.coefficients,
+                                           weather_interpolation.rows, time_in_days)
+        else:
+            weather_data = loadWeatherData(
+                self.env.weather_data_dir,
+                self.env.location,
+                self.env.data_source,
+                self.growth_years[idx],
+                self.start_days[idx],
+                self.env.season_length,
+                self.env.pred_horizon,
+                self.env.h,
+                self.env.nd,
+                weatherDataset=self.env.weatherDataset
+                )
+            weather_obs_data = weather_data[::self.env.solver_steps]
+            self.GLBatch.reset(idx, weather_data, time_in_days)
+        if self.env.warmStartLibrary is not None:
+            self.GLBatch.setClimateState(idx, self.env.warmStartLibrary.get(self.growth_years[idx], self.start_days[idx]))
+
+        if self.weather_obs_data is None:
+            self.weather_obs_data = np.zeros((self.num_envs, weather_obs_data.shape[0], self.env.nd))
+        self.weather_obs_data[idx] = weather_obs_data
+        self.GLBatch.setCropState(idx, self.env.cLeaf, self.env.cStem, self.env.cFruit, self.env.tCanSum)
+
+    def _get_obs(self) -> np.ndarray:
+        """
+        Computes the observations of all greenhouses.
+        The weather data is stored at the control intervals, hence solver_steps equals one.
+        """
+        return self.env.observations.compute_obs_batch(self.GLBatch, 1, self.weather_obs_data)
+
+    def reset(self) -> VecEnvObs:
+        for idx in range(self.num_envs):
+            self._reset_env(idx, self._seeds[idx])
+        self._reset_seeds()
+        self.episode_returns[:] = 0
+        self.episode_lengths[:] = 0
+        return self._get_obs()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.actions = actions
+
+    def step_wait(self) -> VecEnvStepReturn:
+        # scale the action to the range of the control inputs, which is between [0, 1]
+        actions = self.env._scale(self.actions, self.env.action_space.low, self.env.action_space.high)
+        self.GLBatch.step(np.ascontiguousarray(actions, dtype=np.float32), self.env.control_idx)
+        obs = self._get_obs()
+
+        # terminal state at the end of the growing season, or for nan and inf in observation values
+        invalid = ~np.isfinite(obs).all(axis=1)
+        if invalid.any():
+            warnings.warn(f"Nan or inf in the observations of the greenhouses {np.flatnonzero(invalid).tolist()}, which terminates their episodes")
+        dones = (self.GLBatch.timestep >= self.env.N) | invalid
+
+        # the rewards are computed by the reward kernel at the end of the step of the batch
+        rewards = self.GLBatch.reward.copy()
+        rewards[dones] = 0
+        self.profits[~dones] = self.GLBatch.profit[~dones]
+        self.violations[~dones] = self.GLBatch.violations[~dones]
+
+        # information of the step, depending on the info_level of the environment
+        info_level = self.env.info_level
+        timesteps = self.GLBatch.timestep
+        if info_level == "full" or self.info_channel is not None:
+            controls = self.GLBatch.getControlsArray()
+            times = self.GLBatch.time
+        if self.info_channel is not None:
+            self.info_channel.write(self.info_channel_idx, times, timesteps, self.profits, self.violations, controls)
+        if info_level == "none":
+            infos = [{} for _ in range(self.num_envs)]
+        elif info_level == "minimal":
+            infos = [{"profit": self.profits[idx], "timestep": timesteps[idx]} for idx in range(self.num_envs)]
+        else:
+            infos = [{
+                "controls": controls[idx],
+                "Time": times[idx],
+                "profit": self.profits[idx],
+                "violations": self.violations[idx].copy(),
+                "timestep": timesteps[idx],
+                "TimeLimit.truncated": False,
+                } for idx in range(self.num_envs)]
+
+        self.episode_returns += rewards
+        self.episode_lengths += 1
+        done_idx = np.flatnonzero(dones)
+        for idx in done_idx:
+            episode_info = {"r": self.episode_returns[idx], "l": self.episode_lengths[idx], "t": round(time.time() - self.t_start, 6)}
+            infos[idx]["episode"] = episode_info
+            infos[idx]["terminal_observation"] = obs[idx].copy()
+            self.episode_returns[idx] = 0
+            self.episode_lengths[idx] = 0
+            if self.results_writer:
+                self.results_writer.write_row(episode_info)
+            self._reset_env(idx)
+
+        if done_idx.size > 0:
+            obs[done_idx] = self._get_obs()[done_idx]
+        return obs, rewards, dones, infos
+
+    def close(self) -> None:
+        if self.results_writer:
+            self.results_writer.close()
+
+    def _get_indices(self, indices: VecEnvIndices) -> Sequence[int]:
+        if indices is None:
+            indices = range(self.num_envs)
+        elif isinstance(indices, int):
+            indices = [indices]
+        return indices
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        """
+        Returns the attribute of the vectorized environment, or of the template environment.
+        """
+        target = self if attr_name in self.__dict__ else self.env
+        return [getattr(target, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        """
+        Sets the attribute of the template environment, which is shared by all greenhouses.
+        """
+        setattr(self.env, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> List[Any]:
+        """
+        Calls the per greenhouse method of the vectorized environment for the given indices.
+        """
+        method = getattr(self, method_name)
+        return [method(idx, *method_args, **method_kwargs) for idx in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None) -> List[bool]:
+        # episode statistics are recorded similar to the Monitor wrapper
+        return [wrapper_class is Monitor for _ in self._get_indices(indices)]
+
+    def _get_time(self, idx: int) -> float:
+        """
+        Returns the time in days since 01-01-0001 of greenhouse idx.
+        """
+        return self.GLBatch.time[idx]
+
+    def set_info_channel(self, idx: int, info_channel: Optional[InfoChannel], channel_idx: int = 0) -> None:
+        """
+        Sets the shared-memory side channel of greenhouse idx, to which its information is written in row channel_idx.
+        The channel is shared by all greenhouses, see GreenLightEnv.set_info_channel.
+        """
+        self.info_channel = info_channel
+        self.info_channel_idx[idx] = channel_idx
+
+    def _reset_eval_idx(self, idx: int) -> None:
+        """
+        Reset the evaluation index for picking the start day of greenhouse idx to 0.
+        """
+        self.eval_idx[idx] = 0
@@ -0,0 +1,90 @@
+"""
+Benchmark that compares the memory layouts of the auxiliary states of GreenLightBatch during the integration.
+With the array-of-structs layout (aos) every greenhouse is integrated separately with its own AuxiliaryStates struct.
+With the struct-of-arrays layout (soa) blocks of SOA_BLOCK greenhouses are integrated together,
+such that the update of the auxiliary states and the ODE are loops over the greenhouses of a block that the C compiler can vectorize.
+The soa layout only supports RK4 and the multirate integrator.
+
+The throughput is reported in greenhouse steps per second, i.e., the number of control intervals of all greenhouses.
+Run from the root of the repository:
+    python -m greenlight_gym.experiments.benchmark_layout --config_name train_eval_set
+"""
+import time
+import argparse
+
+import numpy as np
+
+from greenlight_gym.envs.cython.greenlight_cy import GreenLightBatch
+from greenlight_gym.common.utils import loadWeatherData
+from greenlight_gym.experiments.utils import load_env_params
+
+def benchmark_batch(GLBatch: GreenLightBatch, n_steps: int, control_idx: np.ndarray, seed: int = 666) -> float:
+    """
+    Steps all greenhouses of the batch n_steps times with random actions for the learned controls.
+
+    Returns:
+        float: number of greenhouse steps per second
+    """
+    rng = np.random.default_rng(seed)
+    actions = rng.random((n_steps, GLBatch.n_envs, control_idx.shape[0]), dtype=np.float32)
+    start = time.perf_counter()
+    for i in range(n_steps):
+        GLBatch.step(actions[i], control_idx)
+    return n_steps*GLBatch.n_envs/(time.perf_counter() - start)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env_id", type=str, default="GreenLightHeatCO2")
+    parser.add_argument("--config_name", type=str, default="train_eval_set")
+    parser.add_argument("--growth_year", type=int, default=2001)
+    parser.add_argument("--start_day", type=int, default=59)
+    parser.add_argument("--n_envs", type=int, nargs="+", default=[1, 16, 256])
+    parser.add_argument("--n_steps", type=int, default=100)
+    parser.add_argument("--n_repeats", type=int, default=5)
+    parser.add_argument("--integrator", type=str, default="rk4", choices=["rk4", "multirate"])
+    parser.add_argument("--num_threads", type=int, default=1)
+    args = parser.parse_args()
+
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(args.env_id, env_config_path, args.config_name)
+
+    control_indices = {"uBoil": 0, "uCO2": 1, "uThScr": 2, "uVent": 3, "uLamp": 4, "uIntLamp": 5, "uGroPipe": 6, "uBlScr": 7}
+    control_idx = np.array([control_indices[control] for control in env_specific_params.get("control_signals", [])], dtype=np.uint8)
+
+    h = env_base_params["h"]
+    weather_data = loadWeatherData(env_base_params["weather_data_dir"],
+                                   env_base_params["location"],
+                                   env_base_params["data_source"],
+                                   args.growth_year,
+                                   args.start_day,
+                                   env_base_params["season_length"],
+                                   env_base_params["pred_horizon"],
+                                   h,
+                                   env_base_params["nd"],
+                                   )
+
+    print(f"h: {h} s, time interval: {env_base_params['time_interval']} s, steps: {args.n_steps}, integrator: {args.integrator}")
+    for n_envs in args.n_envs:
+        # the layouts are measured alternately, since the timings drift on a shared machine
+        steps_per_second = {"aos": [], "soa": []}
+        for _ in range(args.n_repeats):
+            for layout in steps_per_second:
+                GLBatch = GreenLightBatch(h,
+                                          env_base_params["nx"],
+                                          env_base_params["nu"],
+                                          env_base_params["nd"],
+                                          env_base_params["no_lamps"],
+                                          env_base_params["led_lamps"],
+                                          env_base_params["hps_lamps"],
+                                          env_base_params["int_lamps"],
+                                          int(env_base_params["time_interval"]/h),
+                                          n_envs,
+                                          args.num_threads,
+                                          )
+                GLBatch.setIntegrator(args.integrator)
+                GLBatch.setLayout(layout)
+                for idx in range(n_envs):
+                    GLBatch.reset(idx, weather_data, 0)
+                steps_per_second[layout].append(benchmark_batch(GLBatch, args.n_steps, control_idx))
+        aos, soa = np.max(steps_per_second["aos"]), np.max(steps_per_second["soa"])
+        print(f"n_envs: {n_envs:4d}, aos: {aos:8.1f} steps/s, soa: {soa:8.1f} steps/s, speedup: {soa/aos:.2f}")
@@ -0,0 +1,114 @@
+"""
+Benchmark that measures the simulation throughput of the Cython GreenLight model in steps per second.
+A step corresponds to a single control interval (time_interval) of the environment,
+which the model resolves with solver_steps = time_interval/h integration steps.
+With --n_episodes, the time of complete episodes of the environment is measured instead,
+e.g., of the rule-based controller (GreenLightRuleBased) that computes all controls in the model.
+
+Run from the root of the repository:
+    python -m greenlight_gym.experiments.benchmark_throughput --config_name train_eval_set
+    python -m greenlight_gym.experiments.benchmark_throughput --env_id GreenLightRuleBased --config_name benchmark-rule-based --n_episodes 3
+"""
+import time
+import argparse
+from typing import Dict, Any
+
+import numpy as np
+
+from greenlight_gym.envs.cython.greenlight_cy import GreenLight
+from greenlight_gym.envs.greenlight import GreenLightEnv
+from greenlight_gym.common.utils import loadWeatherData
+from greenlight_gym.experiments.utils import load_env_params, make_env
+
+def init_model(env_base_params: Dict[str, Any], growth_year: int, start_day: int) -> GreenLight:
+    """
+    Creates a GreenLight model and resets it with the weather data of the given growth year and start day.
+    """
+    h = env_base_params["h"]
+    solver_steps = int(env_base_params["time_interval"]/h)
+    GLModel = GreenLight(h,
+                         env_base_params["nx"],
+                         env_base_params["nu"],
+                         env_base_params["nd"],
+                         env_base_params["no_lamps"],
+                         env_base_params["led_lamps"],
+                         env_base_params["hps_lamps"],
+                         env_base_params["int_lamps"],
+                         solver_steps,
+                         )
+    weather_data = loadWeatherData(env_base_params["weather_data_dir"],
+                                   env_base_params["location"],
+                                   env_base_params["data_source"],
+                                   growth_year,
+                                   start_day,
+                                   env_base_params["season_length"],
+                                   env_base_params["pred_horizon"],
+                                   h,
+                                   env_base_params["nd"],
+                                   )
+    GLModel.reset(weather_data, 0)
+    return GLModel
+
+def benchmark_model(GLModel: GreenLight, n_steps: int, control_idx: np.ndarray, seed: int = 666) -> float:
+    """
+    Steps the model n_steps times with random actions for the learned controls.
+
+    Returns:
+        float: number of steps per second
+    """
+    rng = np.random.default_rng(seed)
+    actions = rng.random((n_steps, control_idx.shape[0]), dtype=np.float32)
+    start = time.perf_counter()
+    for i in range(n_steps):
+        GLModel.step(actions[i], control_idx)
+    return n_steps/(time.perf_counter() - start)
+
+def benchmark_episode(env: GreenLightEnv, seed: int = 666) -> float:
+    """
+    Runs a complete episode of the environment with random actions for the learned controls.
+    The weather data is loaded before the timer starts, by resetting the environment.
+
+    Returns:
+        float: duration of the episode [s]
+    """
+    env.action_space.seed(seed)
+    env.reset(seed=seed)
+    start = time.perf_counter()
+    terminated = False
+    while not terminated:
+        _, _, terminated, _, _ = env.step(env.action_space.sample())
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env_id", type=str, default="GreenLightHeatCO2")
+    parser.add_argument("--config_name", type=str, default="train_eval_set")
+    parser.add_argument("--growth_year", type=int, default=2001)
+    parser.add_argument("--start_day", type=int, default=59)
+    parser.add_argument("--n_steps", type=int, default=1000)
+    parser.add_argument("--n_repeats", type=int, default=5)
+    parser.add_argument("--n_episodes", type=int, default=0, help="measure the time of complete episodes instead of the model steps")
+    args = parser.parse_args()
+
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(args.env_id, env_config_path, args.config_name)
+
+    if args.n_episodes > 0:
+        # every episode simulates the same growth year and start day
+        env_base_params.update(training=True, start_train_year=args.growth_year, end_train_year=args.growth_year, train_days=[args.start_day])
+        env = make_env(args.env_id, rank=0, seed=666, kwargs=env_base_params, kwargsSpecific=env_specific_params, options=options, eval_env=False)()
+        episode_times = [benchmark_episode(env) for _ in range(args.n_episodes)]
+        print(f"{args.env_id}, h: {env_base_params['h']} s, season length: {env_base_params['season_length']} days, episode steps: {env.N}")
+        print(f"episode time: {np.mean(episode_times):.3f} +/- {np.std(episode_times):.3f} s")
+        exit()
+
+    control_indices = {"uBoil": 0, "uCO2": 1, "uThScr": 2, "uVent": 3, "uLamp": 4, "uIntLamp": 5, "uGroPipe": 6, "uBlScr": 7}
+    control_idx = np.array([control_indices[control] for control in env_specific_params.get("control_signals", [])], dtype=np.uint8)
+
+    steps_per_second = []
+    for _ in range(args.n_repeats):
+        GLModel = init_model(env_base_params, args.growth_year, args.start_day)
+        steps_per_second.append(benchmark_model(GLModel, args.n_steps, control_idx))
+
+    print(f"h: {env_base_params['h']} s, time interval: {env_base_params['time_interval']} s, steps: {args.n_steps}")
+    print(f"throughput: {np.mean(steps_per_second):.1f} +/- {np.std(steps_per_second):.1f} steps/s")
@@ -15,6 +15,7 @@ from stable_baselines3.common.vec_env import SubprocVecEnv, VecNormalize, VecMon
 from greenlight_gym.common.results import Results
 from greenlight_gym.common.callbacks import TensorboardCallback, SaveVecNormalizeCallback, BaseCallback
 from greenlight_gym.envs.greenlight import GreenLightEnv, GreenLightHeatCO2, GreenLightRuleBased, GreenLightStatesTest
+from greenlight_gym.envs.vec_env import GreenLightVecEnv
 from greenlight_gym.common.learning_rate import linear_schedule
 
 ACTIVATION_FN = {"ReLU": ReLU, "SiLU": SiLU, "Tanh":Tanh, "ELU": ELU}
@@ -86,6 +87,16 @@ def load_env_params(env_id: str, path: str, filename: str) -> Tuple[Dict, Dict,
     results_columns = params["results_columns"]
     return env_base_params, env_specific_params, options, results_columns
 
+def config_seasons(env_params: Dict[str, Any], options: Dict[str, Any]) -> List[Tuple[int, int]]:
+    """
+    Seasons (growth year, start day) of training and evaluation of an environment config.
+    """
+    train_years = range(env_params["start_train_year"], env_params["end_train_year"]+1)
+    train_days = env_params.get("train_days") or range(env_params.get("start_train_day", 59), env_params.get("end_train_day", 244)+1)
+    seasons = [(year, day) for year in train_years for day in train_days]
+    seasons += [(year, day) for year in options["growth_years"] for day in options["start_days"]]
+    return seasons
+
 def loadParameters(env_id: str, path: str, filename: str, algorithm: str = None):
     with open(join(path, filename), "r") as f:
         params = yaml.load(f, Loader=yaml.FullLoader)
@@ -194,13 +205,26 @@ def make_vec_env(env_id: str,
                  eval_env: bool = False) -> VecEnv:
     """
     Creates a vectorized environment, with n individual envs.
+    The backend is selected by the vec_env flag in the options of the environment config:
+        - subproc (default): every env runs in a separate process (SubprocVecEnv + VecMonitor).
+        - greenlight: all envs are simulated in a single process by GreenLightVecEnv.
+          The num_threads option sets the number of OpenMP threads it uses (default: OMP_NUM_THREADS or all cores).
+          The layout option sets the (experimental) memory layout of the auxiliary states, aos (default) or soa.
     """
     # make dir if not exists
     if monitor_filename is not None and not os.path.exists(os.path.dirname(monitor_filename)):
         os.makedirs(os.path.dirname(monitor_filename), exist_ok=True)
 
-    env = SubprocVecEnv([make_env(env_id, rank, seed, envParams, envSpecificParams, options, eval_env=eval_env) for rank in range(n_envs)])
-    env = VecMonitor(env, filename=monitor_filename)
+    backend = options.get("vec_env", "subproc")
+    if backend == "greenlight":
+        env = GreenLightVecEnv(env_id, n_envs, {**envSpecificParams, **envParams}, options, eval_env=eval_env,
+                               monitor_filename=monitor_filename, num_threads=options.get("num_threads", 0),
+                               layout=options.get("layout", "aos"))
+    elif backend == "subproc":
+        env = SubprocVecEnv([make_env(env_id, rank, seed, envParams, envSpecificParams, options, eval_env=eval_env) for rank in range(n_envs)])
+        env = VecMonitor(env, filename=monitor_filename)
+    else:
+        raise ValueError(f"Unknown vec_env backend: {backend}")
     env = VecNormalize(env, **vec_norm_kwargs)
     env.seed(seed=seed)
     if eval_env:
@@ -0,0 +1,115 @@
+"""
+Builds a warm start library with spun-up climate and soil states of the GreenLight model for every growth year and start day.
+initStates starts every season from the night setpoints with equal temperatures and a fixed soil profile,
+such that the first hours of an episode are a transient. Here, the days before every start day are simulated
+with the rule-based controller, and the climate and soil states x[0]-x[21] at the start day are stored.
+The crop states are set to those of the environment, and are reset at the start of the episode as before.
+All seasons are simulated together in a GreenLightBatch, with lazy weather to keep the memory independent of the number of seasons.
+See common/utils.py:WarmStartLibrary and the warm_start_library argument of GreenLightEnv.
+
+Run from the root of the repository:
+    python -m greenlight_gym.pre_processing.build_warm_starts --config_name train_eval_set --spinup_days 7
+"""
+import argparse
+from datetime import date, timedelta
+from typing import List, Tuple, Dict, Any
+
+import numpy as np
+
+from greenlight_gym.envs.cython.greenlight_cy import GreenLightBatch
+from greenlight_gym.common.utils import loadWeatherInterpolation, WarmStartLibrary
+from greenlight_gym.experiments.utils import load_env_params, config_seasons
+
+N_CLIMATE_STATES = 22   # climate and soil states x[0]-x[21]
+
+def spinup_start(growth_year: int, start_day: int, spinup_days: int) -> Tuple[int, int]:
+    """
+    Year and day of the year at which the spin-up of a season starts, which may be in the previous year.
+    """
+    start = date(growth_year, 1, 1) + timedelta(days=int(start_day) - spinup_days)
+    return start.year, (start - date(start.year, 1, 1)).days
+
+def spinup_states(env_params: Dict[str, Any],
+                  seasons: List[Tuple[int, int]],
+                  spinup_days: int,
+                  num_threads: int = 0,
+                  ) -> np.ndarray:
+    """
+    Simulates spinup_days before the start of every season with the rule-based controller.
+
+    Returns:
+        np.ndarray: climate and soil states at the start of every season, of shape (len(seasons), 22)
+    """
+    h = env_params["h"]
+    solver_steps = int(env_params["time_interval"]/h)
+    GLBatch = GreenLightBatch(h,
+                              env_params["nx"],
+                              env_params["nu"],
+                              env_params["nd"],
+                              env_params["no_lamps"],
+                              env_params["led_lamps"],
+                              env_params["hps_lamps"],
+                              env_params["int_lamps"],
+                              solver_steps,
+                              len(seasons),
+                              num_threads,
+                              )
+    GLBatch.setIntegrator(env_params.get("integrator", "rk4"), env_params.get("rtol", 1e-4), env_params.get("atol", 1e-4),
+                          env_params.get("max_step", 300))
+
+    # the interpolations are referenced by the batch, and are kept alive until the spin-up is finished
+    interpolations = []
+    for idx, (growth_year, start_day) in enumerate(seasons):
+        year, day = spinup_start(growth_year, start_day, spinup_days)
+        interpolation = loadWeatherInterpolation(env_params["weather_data_dir"], env_params["location"], env_params["data_source"],
+                                                 year, day, spinup_days, 0, h, env_params["nd"])
+        time_in_days = (date(year, 1, 1) - date(1, 1, 1)).days + day
+        GLBatch.resetInterpolated(idx, interpolation.knots, interpolation.coefficients, interpolation.rows, time_in_days)
+        GLBatch.setCropState(idx, env_params["cLeaf"], env_params["cStem"], env_params["cFruit"], env_params["tCanSum"])
+        interpolations.append(interpolation)
+
+    # all control signals follow the rule-based controller
+    controls = np.zeros((len(seasons), 0), dtype=np.float32)
+    control_idx = np.zeros(0, dtype=np.uint8)
+    for _ in range(int(spinup_days*86400/env_params["time_interval"])):
+        GLBatch.step(controls, control_idx)
+    return GLBatch.getStatesArray()[:, :N_CLIMATE_STATES]
+
+def build_warm_starts(env_params: Dict[str, Any],
+                      seasons: List[Tuple[int, int]],
+                      spinup_days: int,
+                      out_path: str,
+                      num_threads: int = 0,
+                      ) -> WarmStartLibrary:
+    """
+    Builds the warm start library of all seasons, and writes it to out_path (.npz).
+    """
+    seasons = sorted(set((int(year), int(day)) for year, day in seasons))
+    states = spinup_states(env_params, seasons, spinup_days, num_threads)
+    if not np.isfinite(states).all():
+        raise ValueError("The spin-up diverged, the warm start library is not written")
+    np.savez(out_path,
+             years=np.array([year for year, _ in seasons]),
+             startDays=np.array([day for _, day in seasons]),
+             states=states,
+             spinupDays=spinup_days,
+             location=env_params["location"],
+             source=env_params["data_source"],
+             )
+    return WarmStartLibrary(out_path if out_path.endswith(".npz") else out_path + ".npz")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a library with spun-up climate states at the start of every season")
+    parser.add_argument("--env_id", type=str, default="GreenLightHeatCO2")
+    parser.add_argument("--config_name", type=str, default="train_eval_set")
+    parser.add_argument("--spinup_days", type=int, default=7, help="Number of days that are simulated before the start day")
+    parser.add_argument("--num_threads", type=int, default=0, help="OpenMP threads, 0 uses OMP_NUM_THREADS or all cores")
+    parser.add_argument("--out_path", type=str, default="greenlight_gym/envs/data/warm_starts.npz", help="Path of the library")
+    args = parser.parse_args()
+
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(args.env_id, env_config_path, args.config_name)
+    env_params = {**env_base_params, **env_specific_params}
+
+    library = build_warm_starts(env_params, config_seasons(env_params, options), args.spinup_days, args.out_path, args.num_threads)
+    print(f"{len(library.index)} seasons with {args.spinup_days} days of spin-up written to {library.path}")
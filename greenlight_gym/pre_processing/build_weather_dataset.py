@@ -0,0 +1,78 @@
+"""
+Converts the preprocessed weather data files (e.g., KNMI2001.csv) into a single dataset with the derived disturbances.
+The disturbances d[0]-d[9] (iGlob through isDaySmooth) of every season (location, growth year, start day) of an environment config
+are resampled to the solver steps exactly as loadWeatherData resamples them, and stacked into one .npy file.
+A .json file holds the season length, prediction horizon and step size h, and the index with the offset and number of rows of every season.
+loadWeatherData takes zero-copy views from the memory mapped dataset, see common/utils.py:WeatherDataset.
+
+Run from the root of the repository:
+    python -m greenlight_gym.pre_processing.build_weather_dataset --config_name train_eval_set --locations Amsterdam
+"""
+import json
+import argparse
+from typing import List, Tuple, Dict, Any
+
+import numpy as np
+
+from greenlight_gym.common.utils import WeatherStore, WeatherDataset, loadWeatherInterpolation
+from greenlight_gym.experiments.utils import load_env_params, config_seasons
+
+def build_weather_dataset(weather_data_dir: str,
+                          locations: List[str],
+                          source: str,
+                          seasons: List[Tuple[int, int]],
+                          n_days: int,
+                          pred_horizon: float,
+                          h: float,
+                          out_path: str,
+                          nd: int = 10,
+                          ) -> Dict[str, Any]:
+    """
+    Builds the weather dataset for all locations and seasons (growth year, start day), and writes it to out_path.npy and out_path.json.
+    Every season is resampled by the interpolation of loadWeatherData, such that the views of the dataset equal the csv path.
+
+    Returns:
+        Dict[str, Any]: index of the dataset
+    """
+    weather_store = WeatherStore()
+    seasons = sorted(set((int(year), int(day)) for year, day in seasons))
+
+    # the interpolations determine the number of rows, and thereby the offset of every season in the dataset
+    entries = {}
+    interpolations = {}
+    offset = 0
+    for location in locations:
+        for year, day in seasons:
+            key = WeatherDataset.key(location, source, year, day)
+            interpolations[key] = loadWeatherInterpolation(weather_data_dir, location, source, year, day, n_days, pred_horizon, h, nd,
+                                                           weather_store)
+            entries[key] = {"offset": offset, "rows": interpolations[key].rows}
+            offset += interpolations[key].rows
+
+    data = np.lib.format.open_memmap(out_path + ".npy", mode="w+", dtype=np.float64, shape=(offset, nd))
+    for key, entry in entries.items():
+        data[entry["offset"]:entry["offset"]+entry["rows"]] = interpolations.pop(key).resample()
+        print(f"{key}: {entry['rows']} rows")
+    data.flush()
+    del data
+
+    index = {"h": h, "nDays": n_days, "predHorizon": pred_horizon, "nd": nd, "entries": entries}
+    with open(out_path + ".json", "w") as f:
+        json.dump(index, f, indent=4)
+    return index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the weather data of the seasons of a config into a dataset with the derived disturbances")
+    parser.add_argument("--env_id", type=str, default="GreenLightHeatCO2")
+    parser.add_argument("--config_name", type=str, default="train_eval_set")
+    parser.add_argument("--weather_data_dir", type=str, default="greenlight_gym/envs/data/", help="Path to the weather data")
+    parser.add_argument("--locations", type=str, nargs="+", default=["Amsterdam"], help="Locations of the weather data")
+    parser.add_argument("--source", type=str, default="KNMI", help="Source of the weather data")
+    parser.add_argument("--out_path", type=str, default="greenlight_gym/envs/data/weather_dataset", help="Path of the dataset, without extension")
+    args = parser.parse_args()
+
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(args.env_id, env_config_path, args.config_name)
+    env_params = {**env_base_params, **env_specific_params}
+    build_weather_dataset(args.weather_data_dir, args.locations, args.source, config_seasons(env_params, options),
+                          env_params["season_length"], env_params["pred_horizon"], env_params["h"], args.out_path, env_params["nd"])
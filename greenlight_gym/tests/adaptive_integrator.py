@@ -0,0 +1,33 @@
+"""
+Compares the adaptive step size integrator (dopri5) of the GreenLight model with the fixed step size RK4 integrator.
+All control inputs are prescribed (open loop), see open_loop.py.
+The reference is RK4 with a step size of 0.25 s. Dopri5 should be as accurate as RK4 with h=1 s,
+while it requires fewer evaluations of the ODE.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.adaptive_integrator
+"""
+import numpy as np
+
+from greenlight_gym.tests.open_loop import prescribed_controls, simulate
+
+if __name__ == "__main__":
+    weather_data_dir = "greenlight_gym/envs/data/"
+    season_length = 1
+    rng = np.random.default_rng(0)
+
+    for growth_year, start_day in [(2001, 59), (2003, 181)]:
+        controls = prescribed_controls(rng, season_length)
+
+        reference, _, _ = simulate(weather_data_dir, growth_year, start_day, season_length, 0.25, "rk4", controls)
+        rk4, rk4_evals, rk4_time = simulate(weather_data_dir, growth_year, start_day, season_length, 1., "rk4", controls)
+        dopri5, dopri5_evals, dopri5_time = simulate(weather_data_dir, growth_year, start_day, season_length, 1., "dopri5", controls)
+
+        scale = np.abs(reference).max(axis=0) + 1e-9
+        rk4_error = np.max(np.abs(rk4 - reference)/scale)
+        dopri5_error = np.max(np.abs(dopri5 - reference)/scale)
+        print(f"{growth_year} day {start_day}: rk4 {rk4_evals} evaluations {rk4_time:.2f}s error {rk4_error:.1e}, "
+              f"dopri5 {dopri5_evals} evaluations {dopri5_time:.2f}s error {dopri5_error:.1e}")
+        assert np.isfinite(dopri5).all()
+        assert dopri5_error < 1e-3
+        assert dopri5_evals < rk4_evals
+    print("Dopri5 is as accurate as RK4 with fewer evaluations of the ODE")
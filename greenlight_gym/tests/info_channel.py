@@ -0,0 +1,63 @@
+"""
+Checks that the evaluation collects the same controls, profits and violations with a lean info_level,
+for which they are read from the shared-memory InfoChannel instead of the info dicts,
+with SubprocVecEnv (worker processes) and with GreenLightVecEnv.
+Also prints the size of the pickled info dicts of a step for every info_level.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.info_channel
+"""
+import pickle
+
+import numpy as np
+
+from greenlight_gym.envs.greenlight import GreenLightHeatCO2
+from greenlight_gym.common.evaluation import evaluate_policy
+from greenlight_gym.experiments.utils import load_env_params, make_vec_env
+
+class SinePolicy:
+    """
+    Deterministic policy that only depends on the observation.
+    """
+    def predict(self, observations, state=None, episode_start=None, deterministic=True):
+        return np.sin(observations[:, :4]).astype(np.float32), state
+
+def evaluate(env_base_params, env_specific_params, options, info_level, n_envs=2):
+    eval_env = make_vec_env(env_id, {**env_base_params, "info_level": info_level}, env_specific_params, options, seed=0,
+                            n_envs=n_envs, vec_norm_kwargs={"norm_obs": False, "norm_reward": False}, eval_env=True)
+    results = evaluate_policy(SinePolicy(), eval_env, n_eval_episodes=n_envs, return_episode_rewards=True)
+    eval_env.close()
+    return results
+
+if __name__ == "__main__":
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_id = "GreenLightHeatCO2"
+    config_name = "train_eval_set"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(env_id, env_config_path, config_name)
+    env_base_params.update({"season_length": 1, "pred_horizon": 0.25})
+
+    env = GreenLightHeatCO2(**env_specific_params, **env_base_params)
+    env.reset(seed=0)
+    action = np.zeros(env.action_space.shape[0], dtype=np.float32)
+    for info_level in ["none", "minimal", "full"]:
+        env.info_level = info_level
+        info = env.step(action)[-1]
+        print(f"info_level={info_level}: info with {list(info)}, {len(pickle.dumps(info))} bytes pickled per step")
+
+    for backend in ["subproc", "greenlight"]:
+        backend_options = {**options, "vec_env": backend, "num_threads": 1}
+        full = evaluate(env_base_params, env_specific_params, backend_options, "full")
+        for info_level in ["none", "minimal"]:
+            lean = evaluate(env_base_params, env_specific_params, backend_options, info_level)
+            rewards, lengths, actions, obs, times, profits, violations = lean
+            assert np.array_equal(rewards, full[0]) and np.array_equal(lengths, full[1])
+            assert np.array_equal(actions, full[2])
+            assert np.array_equal(profits, full[5])
+            assert np.array_equal(violations, full[6])
+            assert np.count_nonzero(profits) > 0
+        print(f"{backend}: the evaluation with the InfoChannel equals the evaluation with full info dicts")
+
+    try:
+        GreenLightHeatCO2(**env_specific_params, **{**env_base_params, "info_level": "all"})
+        raise AssertionError("GreenLightHeatCO2 accepted an unknown info_level")
+    except ValueError:
+        pass
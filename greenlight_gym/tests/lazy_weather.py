@@ -0,0 +1,41 @@
+"""
+Checks that the GreenLight model with lazy weather, which interpolates the weather data at every solver step,
+simulates the same states as the model with the resampled weather data of loadWeatherData.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.lazy_weather
+"""
+import numpy as np
+
+from greenlight_gym.envs.cython.greenlight_cy import GreenLight
+from greenlight_gym.common.utils import loadWeatherData, loadWeatherInterpolation
+
+if __name__ == "__main__":
+    weather_data_dir = "greenlight_gym/envs/data/"
+    location = "Amsterdam"
+    data_source = "KNMI"
+    h = 1.
+    nd = 10
+    solver_steps = 300
+    time_in_days = 730179
+
+    # the final season of the year continues into the next year
+    for growth_year, start_day, season_length, pred_horizon in [(2001, 59, 1, 0.), (2005, 364, 2, 0.5)]:
+        weather_data = loadWeatherData(weather_data_dir, location, data_source, growth_year, start_day, season_length, pred_horizon, h, nd)
+        weather_interpolation = loadWeatherInterpolation(weather_data_dir, location, data_source, growth_year, start_day, season_length, pred_horizon, h, nd)
+        assert np.array_equal(weather_interpolation.resample(), weather_data)
+        assert np.array_equal(weather_interpolation.resample(solver_steps), weather_data[::solver_steps])
+
+        GLModel = GreenLight(h, 28, 8, nd, 0, 1, 0, 0, solver_steps)
+        GLModelLazy = GreenLight(h, 28, 8, nd, 0, 1, 0, 0, solver_steps)
+        GLModel.reset(weather_data, time_in_days)
+        GLModelLazy.resetInterpolated(weather_interpolation.knots, weather_interpolation.coefficients, weather_interpolation.rows, time_in_days)
+        assert np.array_equal(GLModelLazy.getWeatherArray(), weather_data)
+
+        controls = np.array([0.5, 0.5], dtype=np.float32)
+        control_idx = np.array([0, 1], dtype=np.uint8)
+        for _ in range(int(season_length*86400/(h*solver_steps))):
+            GLModel.step(controls, control_idx)
+            GLModelLazy.step(controls, control_idx)
+            assert np.array_equal(GLModel.getStatesArray(), GLModelLazy.getStatesArray())
+        print(f"{growth_year} day {start_day}: weather data {weather_data.nbytes/1e6:.1f} MB, interpolation {weather_interpolation.nbytes/1e6:.2f} MB")
+    print("Lazy weather simulates the same states as the resampled weather data")
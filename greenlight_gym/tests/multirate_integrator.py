@@ -0,0 +1,32 @@
+"""
+Compares the multirate integrator of the GreenLight model with RK4.
+The multirate integrator updates the auxiliary states of the slow states (soil, tCan24 and crop) once per control interval,
+and only the auxiliary states of the fast states at every stage of the RK4 steps.
+All control inputs are prescribed (open loop), see open_loop.py.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.multirate_integrator
+"""
+import numpy as np
+
+from greenlight_gym.tests.open_loop import prescribed_controls, simulate
+
+if __name__ == "__main__":
+    weather_data_dir = "greenlight_gym/envs/data/"
+    season_length = 1
+    rng = np.random.default_rng(0)
+
+    for growth_year, start_day in [(2001, 59), (2003, 181)]:
+        controls = prescribed_controls(rng, season_length)
+
+        reference, _, _ = simulate(weather_data_dir, growth_year, start_day, season_length, 0.25, "rk4", controls)
+        _, _, rk4_time = simulate(weather_data_dir, growth_year, start_day, season_length, 1., "rk4", controls)
+        multirate, _, multirate_time = simulate(weather_data_dir, growth_year, start_day, season_length, 1., "multirate", controls)
+
+        scale = np.abs(reference).max(axis=0) + 1e-9
+        error = np.max(np.abs(multirate - reference)/scale)
+        tair_error = np.max(np.abs(multirate[:, 2] - reference[:, 2]))
+        print(f"{growth_year} day {start_day}: rk4 {rk4_time:.2f}s, multirate {multirate_time:.2f}s "
+              f"error {error:.1e}, air temperature error {tair_error:.3f} C")
+        assert np.isfinite(multirate).all()
+        assert error < 1e-2
+    print("The multirate integrator follows RK4")
@@ -0,0 +1,60 @@
+"""
+Checks that AggregatedObservations writes the observations into its preallocated buffer without allocating arrays,
+and that the observations equal the concatenation of the model properties and the weather data at the future time intervals.
+The allocations are traced with tracemalloc: filling the buffer may only allocate small (array view) objects that are freed again,
+i.e., the peak of the traced memory stays below the size of a single observation,
+and the traced memory does not grow with the number of calls (apart from a few bytes of cached objects).
+Run from the root of the repository:
+    python -m greenlight_gym.tests.observation_buffer
+"""
+import tracemalloc
+
+import numpy as np
+
+from greenlight_gym.envs.greenlight import GreenLightHeatCO2
+from greenlight_gym.experiments.utils import load_env_params
+
+def reference_obs(env):
+    """
+    Observations as concatenated from the properties of the model and fancy indexing of the weather data.
+    """
+    model_obs, weather_obs = env.observations.obs_list
+    weather_idx = (env.GLModel.timestep + np.arange(weather_obs.Np+1))*env.weather_obs_steps
+    return np.concatenate([[getattr(env.GLModel, name) for name in model_obs.var_names],
+                           env.weatherData[weather_idx][:, weather_obs.weather_cols].flatten()])
+
+if __name__ == "__main__":
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_id = "GreenLightHeatCO2"
+    config_name = "train_eval_set"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(env_id, env_config_path, config_name)
+    # a prediction horizon of half a day, such that the weather observations dominate the observation
+    env_base_params.update({"season_length": 1, "pred_horizon": 0.5})
+    rng = np.random.default_rng(0)
+
+    for lazy_weather in [False, True]:
+        env = GreenLightHeatCO2(**env_specific_params, **{**env_base_params, "lazy_weather": lazy_weather})
+        obs, _ = env.reset(seed=0)
+        assert np.array_equal(obs, reference_obs(env))
+        for _ in range(10):
+            obs = env.step(rng.uniform(-1, 1, env.action_space.shape[0]).astype(np.float32))[0]
+            assert np.array_equal(obs, reference_obs(env))
+
+        observations = env.observations
+        fill = lambda: observations.fill_obs(env.GLModel, env.weather_obs_steps, env.weatherData)
+        assert fill() is observations.buffer
+        assert np.array_equal(fill(), obs)
+
+        tracemalloc.start()
+        fill()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        for _ in range(1000):
+            fill()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"lazy_weather={lazy_weather}: {observations.Nobs} observations ({observations.buffer.nbytes} bytes), "
+              f"peak of the allocations while filling {peak - start} bytes, growth {current - start} bytes")
+        assert current - start < 256
+        assert peak - start < observations.buffer.nbytes
+    print("The observations are filled into the preallocated buffer without allocating arrays")
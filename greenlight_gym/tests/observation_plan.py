@@ -0,0 +1,50 @@
+"""
+Checks that fill_obs of GreenLight and GreenLightBatch returns the same values as the properties of the observed variables,
+for every variable of the observation plan and every compiled variant of the model.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.observation_plan
+"""
+import timeit
+
+import numpy as np
+
+from greenlight_gym.envs.cython import greenlight_cy, greenlight_cy_f32, greenlight_cy_fast
+from greenlight_gym.common.utils import loadWeatherData
+
+if __name__ == "__main__":
+    weather_data = loadWeatherData("greenlight_gym/envs/data/", "Amsterdam", "KNMI", 2001, 59, 1, 0, 1., 10)
+    var_names = list(greenlight_cy.OBSERVATIONS)
+    codes = greenlight_cy.observation_codes(var_names)
+    # the control signals are only properties of GreenLight
+    batch_names = [name for name in var_names if not name.startswith("u")]
+    batch_codes = greenlight_cy.observation_codes(batch_names)
+    control_idx = np.array([0, 1, 2, 3], dtype=np.uint8)
+    rng = np.random.default_rng(0)
+
+    for module in [greenlight_cy, greenlight_cy_f32, greenlight_cy_fast]:
+        GLModel = module.GreenLight(1., 28, 8, 10, 0, 1, 0, 0, 300)
+        GLBatch = module.GreenLightBatch(1., 28, 8, 10, 0, 1, 0, 0, 300, 2, 1)
+        GLModel.reset(weather_data, 730179)
+        GLBatch.reset(0, weather_data, 730179)
+        GLBatch.reset(1, weather_data, 730179)
+        obs = np.empty(len(codes))
+        batch_obs = np.empty((2, len(batch_codes)))
+        for _ in range(50):
+            controls = rng.random(4, dtype=np.float32)
+            GLModel.step(controls, control_idx)
+            GLBatch.step(np.stack([controls, controls]), control_idx)
+            GLModel.fill_obs(obs, codes)
+            GLBatch.fill_obs(batch_obs, batch_codes)
+            assert np.array_equal(obs, [getattr(GLModel, name) for name in var_names])
+            assert np.array_equal(batch_obs, np.stack([getattr(GLBatch, name) for name in batch_names], axis=1))
+        print(f"{module.__name__}: fill_obs equals the properties of {len(var_names)} variables")
+
+    old = timeit.repeat(lambda: np.array([getattr(GLModel, name) for name in var_names]), number=10000, repeat=5)
+    new = timeit.repeat(lambda: GLModel.fill_obs(obs, codes), number=10000, repeat=5)
+    print(f"{len(var_names)} observations: properties {min(old)/10000*1e6:.2f} us, fill_obs {min(new)/10000*1e6:.2f} us")
+
+    try:
+        greenlight_cy.observation_codes(["air_temp", "tAir"])
+        raise AssertionError("observation_codes accepted an unknown variable")
+    except ValueError:
+        pass
@@ -0,0 +1,64 @@
+"""
+Helpers of the tests that simulate the GreenLight model with prescribed control inputs (open loop),
+such as the comparisons of the integrators and of the compiled variants of the model.
+The control inputs are prescribed, since the rule-based controllers switch the ventilation and lamps
+on small differences in the states, and such switches cause large deviations between any two integrators.
+"""
+import time
+
+import numpy as np
+
+from greenlight_gym.envs.cython.greenlight_cy import GreenLight
+from greenlight_gym.common.utils import loadWeatherData
+
+def prescribed_controls(rng: np.random.Generator, season_length: int) -> np.ndarray:
+    """
+    Random control inputs at every control interval (5 minutes) of the season, with the lamps either on or off
+    and the interlighting, grow pipes and blackout screen off.
+    """
+    n = int(season_length*288)
+    controls = rng.random((n, 8), dtype=np.float32)
+    controls[:, 4:] = 0
+    controls[:, 4] = rng.random(n) > 0.5   # lamps on or off
+    return controls
+
+def simulate(weather_data_dir, growth_year, start_day, season_length, h, integrator, controls, tol=1e-4, model=GreenLight):
+    """
+    Simulates the prescribed controls, and returns the states at every control interval,
+    the number of ODE evaluations and the wall time.
+    model is the GreenLight class of the compiled variant, e.g., greenlight_cy_f32.GreenLight.
+    """
+    weather_data = loadWeatherData(weather_data_dir, "Amsterdam", "KNMI", growth_year, start_day, season_length, 0., h, 10)
+    GLModel = model(h, 28, 8, 10, 0, 1, 0, 0, int(300/h))
+    GLModel.setIntegrator(integrator, tol, tol)
+    GLModel.reset(weather_data, 730179)
+    GLModel.setCropState(0.9e5, 2.5e5, 2.8e5, 3e3)
+    control_idx = np.arange(8, dtype=np.uint8)
+
+    states = []
+    t0 = time.perf_counter()
+    for u in controls:
+        GLModel.step(u, control_idx)
+        states.append(GLModel.getStatesArray())
+    return np.array(states), GLModel.n_evaluations, time.perf_counter() - t0
+
+def drift_report(weather_data_dir, growth_year, start_day, season_length, controls, model, name):
+    """
+    Simulates the season with the exact double precision model and with the compiled variant model (RK4, h=1 s),
+    and prints the drift of the variant every 10 days.
+
+    Returns:
+        the states of the variant, the maximum relative error of all states (relative to the maximum of each state)
+        and the maximum error of the air temperature [C] over the season
+    """
+    exact, _, exact_time = simulate(weather_data_dir, growth_year, start_day, season_length, 1., "rk4", controls)
+    variant, _, variant_time = simulate(weather_data_dir, growth_year, start_day, season_length, 1., "rk4", controls, model=model)
+    print(f"exact {exact_time:.1f}s, {name} {variant_time:.1f}s")
+
+    scale = np.abs(exact).max(axis=0) + 1e-9
+    for day in range(10, season_length+1, 10):
+        error = np.max(np.abs(variant[:day*288] - exact[:day*288])/scale)
+        tair_error = np.max(np.abs(variant[:day*288, 2] - exact[:day*288, 2]))
+        crop_error = np.max(np.abs(variant[:day*288, 22:26] - exact[:day*288, 22:26])/scale[22:26])
+        print(f"day {day}: error {error:.1e}, air temperature error {tair_error:.1e} C, crop error {crop_error:.1e}")
+    return variant, error, tair_error
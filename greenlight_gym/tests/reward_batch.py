@@ -0,0 +1,64 @@
+"""
+Checks that compute_batch of the reward modules relabels stored trajectories with the same rewards
+as the reward modules compute during the simulation, for several price and penalty settings.
+The trajectories hold the model variables after every step, of shape (episodes, T, vars).
+Run from the root of the repository:
+    python -m greenlight_gym.tests.reward_batch
+"""
+import time
+
+import numpy as np
+
+from greenlight_gym.envs.cython.greenlight_cy import GreenLightBatch
+from greenlight_gym.envs.rewards import AdditiveReward, MultiplicativeReward, HarvestHeatCO2Reward, ArcTanPenaltyReward
+from greenlight_gym.common.utils import loadWeatherData
+
+def reward_modules(GLBatch, reward_class, co2_price, gas_price, k, omega):
+    harvest_reward = HarvestHeatCO2Reward(co2_price, gas_price, 1.6, 0.065, GLBatch.time_interval, GLBatch.maxco2rate,
+                                          GLBatch.maxHeatCap, GLBatch.maxHarvest, GLBatch.energyContentGas)
+    penalty_reward = ArcTanPenaltyReward(k, [18, 400, 60], [21, 900, 80])
+    return reward_class(rewards_list=[harvest_reward, penalty_reward], omega=omega)
+
+if __name__ == "__main__":
+    weather_data = loadWeatherData("greenlight_gym/envs/data/", "Amsterdam", "KNMI", 2001, 59, 2, 0, 1., 10)
+    n_episodes, T = 3, 200
+    control_idx = np.array([0, 1, 2, 3], dtype=np.uint8)
+    rng = np.random.default_rng(0)
+
+    GLBatch = GreenLightBatch(1., 28, 8, 10, 0, 1, 0, 0, 300, n_episodes, 1)
+    settings = [(reward_class, co2_price, gas_price, k, omega) for reward_class in [AdditiveReward, MultiplicativeReward]
+                for co2_price, gas_price in [(0.1, 0.26), (0.3, 0.8)]
+                for k, omega in [([1.2, 4e-3, 0.1], 0.5), ([5, 1e-2, 1], 2.0)]]
+    rewards = [reward_modules(GLBatch, *setting) for setting in settings]
+
+    # the order of the variables of a stored trajectory does not matter
+    var_names = ["in_rh", "fruit_harvest", "air_temp", "gas_resource", "co2_conc", "PAR", "co2_resource"]
+    traj = np.zeros((n_episodes, T, len(var_names)))
+    online_rewards = np.zeros((len(settings), n_episodes, T))
+    for idx in range(n_episodes):
+        GLBatch.reset(idx, weather_data, 730179)
+    for t in range(T):
+        GLBatch.step(rng.random((n_episodes, 4), dtype=np.float32), control_idx)
+        traj[:, t] = np.stack([getattr(GLBatch, name) for name in var_names], axis=1)
+        for i, reward in enumerate(rewards):
+            online_rewards[i, :, t] = reward._compute_reward(GLBatch)
+
+    for i, reward in enumerate(rewards):
+        relabeled = reward.compute_batch(traj, var_names)
+        assert relabeled.shape == (n_episodes, T)
+        assert np.array_equal(relabeled, online_rewards[i])
+        assert reward.rewards_list[0].profit.shape == (n_episodes, T)
+        assert reward.rewards_list[1].abs_pen.shape == (n_episodes, T, 3)
+    print(f"compute_batch equals the online rewards of {len(settings)} reward settings")
+
+    # relabel millions of transitions
+    large_traj = np.tile(traj, (50, 100, 1))
+    t0 = time.perf_counter()
+    relabeled = rewards[-1].compute_batch(large_traj, var_names)
+    print(f"relabeled {relabeled.size} transitions in {time.perf_counter() - t0:.2f} s")
+
+    try:
+        rewards[0].compute_batch(traj[..., 1:], var_names[1:])
+        raise AssertionError("compute_batch accepted trajectories without the relative humidity")
+    except ValueError:
+        pass
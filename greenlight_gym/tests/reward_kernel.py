@@ -0,0 +1,72 @@
+"""
+Checks that the reward kernel of GreenLight and GreenLightBatch computes the same profit, violations, penalty and reward
+as the reward modules of rewards.py, for the additive and multiplicative rewards and every compiled variant of the model.
+The profit and violations are equal; the penalty may differ in the last bits, since NumPy evaluates arctan with its own SIMD routines.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.reward_kernel
+"""
+import timeit
+
+import numpy as np
+
+from greenlight_gym.envs.cython import greenlight_cy, greenlight_cy_f32, greenlight_cy_fast
+from greenlight_gym.envs.rewards import AdditiveReward, MultiplicativeReward, HarvestHeatCO2Reward, ArcTanPenaltyReward
+from greenlight_gym.common.utils import loadWeatherData
+
+def reward_modules(GLModel, reward_class):
+    harvest_reward = HarvestHeatCO2Reward(0.1, 0.26, 1.6, 0.065, GLModel.time_interval, GLModel.maxco2rate,
+                                          GLModel.maxHeatCap, GLModel.maxHarvest, GLModel.energyContentGas)
+    # bounds that are violated during the simulation
+    penalty_reward = ArcTanPenaltyReward([1.2, 4e-3, 0.1], [18, 400, 60], [21, 900, 80])
+    return reward_class(rewards_list=[harvest_reward, penalty_reward], omega=0.5)
+
+if __name__ == "__main__":
+    weather_data = loadWeatherData("greenlight_gym/envs/data/", "Amsterdam", "KNMI", 2001, 59, 2, 0, 1., 10)
+    control_idx = np.array([0, 1, 2, 3], dtype=np.uint8)
+    rng = np.random.default_rng(0)
+
+    for module in [greenlight_cy, greenlight_cy_f32, greenlight_cy_fast]:
+        for reward_class in [AdditiveReward, MultiplicativeReward]:
+            GLModel = module.GreenLight(1., 28, 8, 10, 0, 1, 0, 0, 300)
+            GLBatch = module.GreenLightBatch(1., 28, 8, 10, 0, 1, 0, 0, 300, 3, 1)
+            rewards = reward_modules(GLModel, reward_class)
+            GLModel.setReward(**rewards.kernel_args())
+            GLBatch.setReward(**rewards.kernel_args())
+            GLModel.reset(weather_data, 730179)
+            for idx in range(3):
+                GLBatch.reset(idx, weather_data, 730179)
+            violated = 0
+            for _ in range(200):
+                controls = rng.random((3, 4), dtype=np.float32)
+                GLModel.step(controls[0], control_idx)
+                GLBatch.step(controls, control_idx)
+
+                reward = rewards._compute_reward(GLModel)
+                assert GLModel.profit == rewards.rewards_list[0].profit
+                assert np.array_equal(GLModel.violations, rewards.rewards_list[1].abs_pen)
+                assert np.isclose(GLModel.penalty, np.mean(rewards.rewards_list[1].pen), rtol=1e-14, atol=1e-15)
+                assert np.isclose(GLModel.reward, reward, rtol=1e-14, atol=1e-15)
+
+                batch_reward = rewards._compute_reward(GLBatch)
+                assert np.array_equal(GLBatch.profit, rewards.rewards_list[0].profit)
+                assert np.array_equal(GLBatch.violations, rewards.rewards_list[1].abs_pen)
+                assert np.allclose(GLBatch.reward, batch_reward, rtol=1e-14, atol=1e-15)
+                violated += np.count_nonzero(GLModel.violations)
+            assert violated > 0
+            print(f"{module.__name__} {reward_class.__name__}: the reward kernel equals the reward modules, {violated} violations")
+
+    python = timeit.repeat(lambda: rewards._compute_reward(GLModel), number=10000, repeat=5)
+    kernel = timeit.repeat(lambda: GLModel.computeReward(), number=10000, repeat=5)
+    print(f"reward modules {min(python)/10000*1e6:.2f} us, reward kernel {min(kernel)/10000*1e6:.2f} us")
+
+    # the kernel only supports the combination of a profit-based and a penalty-based module
+    try:
+        AdditiveReward([rewards.rewards_list[1], rewards.rewards_list[0]]).kernel_args()
+        raise AssertionError("kernel_args accepted the modules in reversed order")
+    except NotImplementedError:
+        pass
+    try:
+        GLModel.setReward(**{**rewards.kernel_args(), "k": [1, 1]})
+        raise AssertionError("setReward accepted two penalty weights")
+    except ValueError:
+        pass
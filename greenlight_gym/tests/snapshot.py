@@ -0,0 +1,78 @@
+"""
+Checks that restoring a snapshot of the simulator state continues the simulation exactly as the original rollout.
+Rollouts are branched from a mid-season snapshot of GreenLightHeatCO2, after the environment was reset to another episode,
+and from a snapshot of GreenLight restored into every greenhouse of a GreenLightBatch.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.snapshot
+"""
+import numpy as np
+
+from greenlight_gym.envs.greenlight import GreenLightHeatCO2
+from greenlight_gym.envs.cython.greenlight_cy import GreenLightBatch
+from greenlight_gym.experiments.utils import load_env_params
+
+def rollout(env, actions):
+    results = [env.step(action) for action in actions]
+    return np.stack([obs for obs, _, _, _, _ in results]), np.array([reward for _, reward, _, _, _ in results])
+
+if __name__ == "__main__":
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_id = "GreenLightHeatCO2"
+    config_name = "train_eval_set"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(env_id, env_config_path, config_name)
+    env_base_params["season_length"] = 1
+    rng = np.random.default_rng(666)
+
+    for lazy_weather in [True, False]:
+        env = GreenLightHeatCO2(**env_specific_params, **{**env_base_params, "lazy_weather": lazy_weather})
+        env.reset(seed=666)
+        rollout(env, rng.uniform(-1, 1, (100, env.action_space.shape[0])).astype(np.float32))
+        snapshot = env.get_snapshot()
+
+        actions = rng.uniform(-1, 1, (50, env.action_space.shape[0])).astype(np.float32)
+        obs, rewards = rollout(env, actions)
+
+        # branch from the snapshot in another episode
+        env.reset(seed=667)
+        rollout(env, actions[:10])
+        restored_obs = env.restore_snapshot(snapshot)
+        assert np.array_equal(restored_obs, env.observations.compute_obs(env.GLModel, env.weather_obs_steps, env.weatherData))
+        branch_obs, branch_rewards = rollout(env, actions)
+        assert np.array_equal(branch_obs, obs)
+        assert np.array_equal(branch_rewards, rewards)
+        print(f"lazy_weather={lazy_weather}: snapshot of {snapshot['model'].nbytes} bytes, the branched rollout is identical")
+
+    # a snapshot of a single model restored into every greenhouse of a batch
+    GLModel = env.GLModel
+    GLModel.reset(env.weatherData, 730179)
+    GLModel.setCropState(env.cLeaf, env.cStem, env.cFruit, env.tCanSum)
+    for _ in range(50):
+        GLModel.step(rng.random(env.control_idx.shape[0], dtype=np.float32), env.control_idx)
+    model_snapshot = GLModel.get_snapshot()
+    assert np.array_equal(model_snapshot, GLModel.get_snapshot())
+    controls = rng.random((20, env.control_idx.shape[0]), dtype=np.float32)
+    states = []
+    for action in controls:
+        GLModel.step(action, env.control_idx)
+        states.append(GLModel.getStatesArray())
+
+    n_envs = 3
+    GLBatch = GreenLightBatch(env.h, env.nx, env.nu, env.nd, env.no_lamps, env.led_lamps, env.hps_lamps, env.int_lamps,
+                              env.solver_steps, n_envs, 1)
+    for idx in range(n_envs):
+        GLBatch.reset(idx, env.weatherData, 730179)
+        GLBatch.restore_snapshot(idx, model_snapshot.tobytes())
+    for i, action in enumerate(controls):
+        GLBatch.step(np.tile(action, (n_envs, 1)), env.control_idx)
+        assert np.array_equal(GLBatch.getStatesArray(), np.tile(states[i], (n_envs, 1)))
+    GLModel.restore_snapshot(GLBatch.get_snapshot(0))
+    assert np.array_equal(GLModel.getStatesArray(), states[-1])
+
+    # invalid snapshots are rejected without changing the state
+    try:
+        GLModel.restore_snapshot(model_snapshot[:-1])
+        raise AssertionError("restore_snapshot accepted a truncated snapshot")
+    except ValueError:
+        pass
+    assert np.array_equal(GLModel.getStatesArray(), states[-1])
+    print("Snapshots branch identical rollouts")
@@ -0,0 +1,36 @@
+"""
+Checks that the Rosenbrock integrator (ros2) of the GreenLight model is stable at step sizes of 30 and 60 seconds,
+where RK4 diverges, and that it follows the reference trajectory.
+All control inputs are prescribed (open loop), see open_loop.py.
+The reference is RK4 with a step size of 0.25 s. compare.py only holds single states of the MATLAB implementation,
+without the weather data and controls that produced them, hence the trajectories are compared with RK4 instead.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.stiff_integrator
+"""
+import numpy as np
+
+from greenlight_gym.tests.open_loop import prescribed_controls, simulate
+
+if __name__ == "__main__":
+    weather_data_dir = "greenlight_gym/envs/data/"
+    season_length = 1
+    rng = np.random.default_rng(0)
+
+    for growth_year, start_day in [(2001, 59), (2003, 181)]:
+        controls = prescribed_controls(rng, season_length)
+
+        reference, _, _ = simulate(weather_data_dir, growth_year, start_day, season_length, 0.25, "rk4", controls)
+        _, _, rk4_time = simulate(weather_data_dir, growth_year, start_day, season_length, 1., "rk4", controls)
+        scale = np.abs(reference).max(axis=0) + 1e-9
+
+        for h in [30., 60.]:
+            rk4, _, _ = simulate(weather_data_dir, growth_year, start_day, season_length, h, "rk4", controls)
+            ros2, ros2_evals, ros2_time = simulate(weather_data_dir, growth_year, start_day, season_length, h, "ros2", controls)
+            error = np.max(np.abs(ros2 - reference)/scale)
+            tair_error = np.max(np.abs(ros2[:, 2] - reference[:, 2]))
+            print(f"{growth_year} day {start_day} h {h:.0f}: ros2 {ros2_evals} evaluations {ros2_time:.2f}s (rk4 h=1 {rk4_time:.2f}s) "
+                  f"error {error:.1e}, air temperature error {tair_error:.2f} C, rk4 finite {np.isfinite(rk4).all()}")
+            assert np.isfinite(ros2).all()
+            assert error < 5e-2
+            assert tair_error < 1.
+    print("Ros2 is stable at step sizes of 30 and 60 seconds")
@@ -0,0 +1,78 @@
+"""
+Checks that GreenLightVecEnv returns the same observations, rewards, dones and infos
+as stepping the individual GreenLightHeatCO2 environments, including the automatic reset.
+Also checks that the results do not depend on the number of threads, nor on the memory layout of the auxiliary states.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.vec_env_class
+"""
+import numpy as np
+
+from greenlight_gym.envs.greenlight import GreenLightHeatCO2
+from greenlight_gym.envs.vec_env import GreenLightVecEnv
+from greenlight_gym.experiments.utils import load_env_params
+
+if __name__ == "__main__":
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_id = "GreenLightHeatCO2"
+    config_name = "train_eval_set"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(env_id, env_config_path, config_name)
+
+    # short season such that the environments reset a few times
+    env_base_params["season_length"] = 0.1
+    n_envs = 3
+    seed = 666
+
+    vec_env = GreenLightVecEnv(env_id, n_envs, {**env_specific_params, **env_base_params}, options)
+    vec_env.seed(seed)
+    vec_obs = vec_env.reset()
+
+    envs = [GreenLightHeatCO2(**env_specific_params, **env_base_params) for _ in range(n_envs)]
+    obs = np.stack([env.reset(seed+rank)[0] for rank, env in enumerate(envs)])
+    assert np.array_equal(vec_obs, obs)
+
+    rng = np.random.default_rng(seed)
+    for _ in range(2*envs[0].N + 10):
+        actions = rng.uniform(-1, 1, (n_envs, vec_env.action_space.shape[0])).astype(np.float32)
+        vec_obs, vec_rewards, vec_dones, vec_infos = vec_env.step(actions)
+        for rank, env in enumerate(envs):
+            obs, reward, terminated, truncated, info = env.step(actions[rank])
+            assert terminated == vec_dones[rank]
+            assert reward == vec_rewards[rank]
+            assert info["profit"] == vec_infos[rank]["profit"]
+            assert np.array_equal(info["violations"], vec_infos[rank]["violations"])
+            assert np.array_equal(info["controls"], vec_infos[rank]["controls"])
+            if terminated:
+                assert np.array_equal(obs, vec_infos[rank]["terminal_observation"])
+                obs, _ = env.reset()
+            assert np.array_equal(obs, vec_obs[rank])
+    print("GreenLightVecEnv matches the individual environments")
+
+    # results of the greenhouses must not depend on the number of OpenMP threads
+    thread_obs = []
+    for num_threads in [1, 4]:
+        vec_env = GreenLightVecEnv(env_id, n_envs, {**env_specific_params, **env_base_params}, options, num_threads=num_threads)
+        vec_env.seed(seed)
+        vec_env.reset()
+        rng = np.random.default_rng(seed)
+        for _ in range(envs[0].N + 5):
+            actions = rng.uniform(-1, 1, (n_envs, vec_env.action_space.shape[0])).astype(np.float32)
+            vec_obs, vec_rewards, vec_dones, vec_infos = vec_env.step(actions)
+        thread_obs.append(vec_obs)
+    assert np.array_equal(thread_obs[0], thread_obs[1])
+    print("GreenLightVecEnv is deterministic regardless of the number of threads")
+
+    # the struct-of-arrays layout integrates blocks of greenhouses in lockstep, the remaining two greenhouses use the aos layout
+    n_envs = 10
+    layout_results = []
+    for layout in ["aos", "soa"]:
+        vec_env = GreenLightVecEnv(env_id, n_envs, {**env_specific_params, **env_base_params}, options, layout=layout)
+        vec_env.seed(seed)
+        vec_env.reset()
+        rng = np.random.default_rng(seed)
+        for _ in range(envs[0].N + 5):
+            actions = rng.uniform(-1, 1, (n_envs, vec_env.action_space.shape[0])).astype(np.float32)
+            vec_obs, vec_rewards, vec_dones, vec_infos = vec_env.step(actions)
+        layout_results.append((vec_obs, vec_rewards, vec_env.GLBatch.getStatesArray()))
+    for aos, soa in zip(*layout_results):
+        assert np.array_equal(aos, soa)
+    print("GreenLightVecEnv gives the same results with the aos and soa layouts")
@@ -0,0 +1,61 @@
+"""
+Checks that a reset with a warm start library starts from the spun-up climate state of the season,
+in GreenLightHeatCO2 and in GreenLightVecEnv.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.warm_start
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from greenlight_gym.envs.greenlight import GreenLightHeatCO2
+from greenlight_gym.envs.vec_env import GreenLightVecEnv
+from greenlight_gym.experiments.utils import load_env_params
+from greenlight_gym.pre_processing.build_warm_starts import build_warm_starts
+
+if __name__ == "__main__":
+    env_config_path = "greenlight_gym/configs/envs/"
+    env_id = "GreenLightHeatCO2"
+    config_name = "train_eval_set"
+    env_base_params, env_specific_params, options, results_columns = load_env_params(env_id, env_config_path, config_name)
+    env_base_params.update({"season_length": 1, "start_train_year": 2001, "end_train_year": 2001, "train_days": [59, 181]})
+    seasons = [(2001, 59), (2001, 181)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        library = build_warm_starts({**env_base_params, **env_specific_params}, seasons, 2, os.path.join(tmp_dir, "warm_starts.npz"))
+        env_base_params["warm_start_library"] = library.path
+
+        env = GreenLightHeatCO2(**env_specific_params, **env_base_params)
+        cold_env = GreenLightHeatCO2(**env_specific_params, **{**env_base_params, "warm_start_library": None})
+        for seed in range(4):
+            env.reset(seed=seed)
+            cold_env.reset(seed=seed)
+            states = env.GLModel.getStatesArray()
+            cold_states = cold_env.GLModel.getStatesArray()
+            assert np.array_equal(states[:22], library.get(env.growth_year, env.start_day))
+            assert np.array_equal(states[22:], cold_states[22:])
+            assert not np.array_equal(states[:22], cold_states[:22])
+            print(f"{env.growth_year} day {env.start_day}: warm start air temperature {states[2]:.1f} C, soil {states[10]:.1f}-{states[14]:.1f} C, "
+                  f"cold start air temperature {cold_states[2]:.1f} C, soil {cold_states[10]:.1f}-{cold_states[14]:.1f} C")
+
+        # the vectorized environment starts from the same states
+        vec_env = GreenLightVecEnv(env_id, 2, {**env_specific_params, **env_base_params}, options)
+        vec_env.seed(0)
+        vec_env.reset()
+        for idx in range(2):
+            states = vec_env.GLBatch.getStatesArray()[idx]
+            assert np.array_equal(states[:22], library.get(vec_env.growth_years[idx], vec_env.start_days[idx]))
+
+        # seasons that are missing from the library are an error, instead of a silent cold start
+        try:
+            library.get(2002, 59)
+            raise AssertionError("the library returned a state for a missing season")
+        except KeyError:
+            pass
+        try:
+            env.GLModel.setClimateState(np.zeros(21))
+            raise AssertionError("setClimateState accepted 21 states")
+        except ValueError:
+            pass
+    print("Resets start from the states of the warm start library")
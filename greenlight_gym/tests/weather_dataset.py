@@ -0,0 +1,43 @@
+"""
+Checks that loadWeatherData returns the same disturbances from a weather dataset as from the csv files,
+for several growth years and start days, including a season that continues in the next year.
+The dataset is built with pre_processing/build_weather_dataset.py in a temporary directory.
+Run from the root of the repository:
+    python -m greenlight_gym.tests.weather_dataset
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from greenlight_gym.common.utils import loadWeatherData, WeatherDataset
+from greenlight_gym.pre_processing.build_weather_dataset import build_weather_dataset
+
+if __name__ == "__main__":
+    weather_data_dir = "greenlight_gym/envs/data/"
+    location, source = "Amsterdam", "KNMI"
+    n_days, pred_horizon, h, nd = 3, 0.25, 1., 10
+    # the last season continues in the next year
+    seasons = [(2001, 59), (2003, 181), (2004, 243), (2005, 363)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "weather_dataset")
+        build_weather_dataset(weather_data_dir, [location], source, seasons, n_days, pred_horizon, h, path, nd)
+        dataset = WeatherDataset(path)
+
+        for year, day in seasons:
+            assert dataset.contains(location, source, year, day, n_days, pred_horizon, h)
+            view = loadWeatherData(weather_data_dir, location, source, year, day, n_days, pred_horizon, h, nd, weatherDataset=dataset)
+            csv = loadWeatherData(weather_data_dir, location, source, year, day, n_days, pred_horizon, h, nd)
+            assert np.shares_memory(view, dataset.data)
+            assert view.shape == csv.shape
+            assert np.array_equal(view, csv)
+            print(f"{year} day {day}: the view of {view.shape[0]} rows equals the csv path")
+
+        # seasons and settings that are not in the dataset are loaded from the csv files
+        assert not dataset.contains(location, source, 2002, 59, n_days, pred_horizon, h)
+        assert not dataset.contains(location, source, 2001, 59, n_days, pred_horizon, 2*h)
+        weather = loadWeatherData(weather_data_dir, location, source, 2001, 59, n_days+1, pred_horizon, h, nd, weatherDataset=dataset)
+        assert not np.shares_memory(weather, dataset.data)
+        del view, dataset
+    print("The weather dataset returns the disturbances of the csv path")
@@ -1,18 +1,55 @@
 from setuptools import setup, Extension, Command
 import numpy as np
 import os
+import sys
 from Cython.Build import cythonize
 from setuptools.command.build_ext import build_ext as _build_ext
 
 # Define the path for the Cython module
 cython_module_path = "greenlight_gym/envs/cython/greenlight_cy.pyx"
+# Single precision variant of the Cython module, see greenlight_gym/envs/cython/precision.pxd
+cython_f32_module_path = "greenlight_gym/envs/cython/greenlight_cy_f32.pyx"
+# Fast-math variant of the Cython module, see greenlight_gym/envs/cython/fast_math.pxd
+cython_fast_module_path = "greenlight_gym/envs/cython/greenlight_cy_fast.pyx"
 
-# Define the extension module
+# OpenMP flags for the parallel stepping of GreenLightBatch
+if sys.platform == "win32":
+    openmp_compile_args = ["/openmp"]
+    openmp_link_args = []
+elif sys.platform == "darwin":
+    # Apple clang requires libomp, e.g., installed via homebrew
+    openmp_compile_args = ["-Xpreprocessor", "-fopenmp"]
+    openmp_link_args = ["-lomp"]
+else:
+    openmp_compile_args = ["-fopenmp"]
+    openmp_link_args = ["-fopenmp"]
+
+# Define the extension modules
 extensions = [
     Extension(
         "greenlight_gym.envs.cython.greenlight_cy",  # Full module path
         [cython_module_path],
         include_dirs=[np.get_include()],
+        extra_compile_args=openmp_compile_args,
+        extra_link_args=openmp_link_args,
+    )
+]
+extensions_f32 = [
+    Extension(
+        "greenlight_gym.envs.cython.greenlight_cy_f32",
+        [cython_f32_module_path],
+        include_dirs=[np.get_include()],
+        extra_compile_args=openmp_compile_args,
+        extra_link_args=openmp_link_args,
+    )
+]
+extensions_fast = [
+    Extension(
+        "greenlight_gym.envs.cython.greenlight_cy_fast",
+        [cython_fast_module_path],
+        include_dirs=[np.get_include()],
+        extra_compile_args=openmp_compile_args,
+        extra_link_args=openmp_link_args,
     )
 ]
 
@@ -52,6 +89,17 @@ setup(
     ext_modules=cythonize(
         extensions,
         compiler_directives={'language_level': "3"},
+        compile_time_env={'GL_FLOAT32': False, 'GL_FAST_MATH': False},
+        annotate=False,
+    ) + cythonize(
+        extensions_f32,
+        compiler_directives={'language_level': "3"},
+        compile_time_env={'GL_FLOAT32': True, 'GL_FAST_MATH': False},
+        annotate=False,
+    ) + cythonize(
+        extensions_fast,
+        compiler_directives={'language_level': "3"},
+        compile_time_env={'GL_FLOAT32': False, 'GL_FAST_MATH': True},
         annotate=False,
     ),
     include_dirs=[np.get_include()],